@@ -16,6 +16,7 @@ from pydantic import BaseModel
 from app.worker.health_monitor import worker_health_monitor, HealthStatus
 from app.worker.metrics_collector import metrics_collector
 from app.worker.pool_manager import worker_pool_manager
+from app.worker.telemetry import telemetry_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -392,6 +393,7 @@ async def get_health_alerts(
 async def get_prometheus_metrics():
     """Get metrics in Prometheus format"""
     try:
+        metrics_collector.update_from_telemetry(telemetry_aggregator)
         metrics_data = metrics_collector.generate_metrics()
         return Response(
             content=metrics_data,
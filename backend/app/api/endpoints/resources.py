@@ -11,6 +11,7 @@ from app.core.dependencies import get_resource_mapper, get_gpu_manager, get_reso
 from app.resources import (
     ResourceSpec,
     ResourceConstraints,
+    PlacementRequest,
     AllocationStrategy,
     QualityResourceScaler,
     InsufficientResourcesError,
@@ -63,6 +64,12 @@ class ResourceAllocationResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BatchAllocationRequest(BaseModel):
+    """Allocate resources for several tasks in one placement pass"""
+    requests: List[ResourceAllocationRequest] = Field(..., max_length=10000)
+    strategy: Optional[AllocationStrategy] = None
+
+
 class ResourceReleaseRequest(BaseModel):
     """Resource release request"""
     allocation_id: str
@@ -72,6 +79,20 @@ class WorkerRegistrationRequest(BaseModel):
     """Worker registration request"""
     worker_id: str
     resources: ResourceRequirements
+    # Main process of a worker on this host, so its usage is measured per process
+    pid: Optional[int] = Field(None, ge=1)
+
+
+def _scaled_requirements(request: ResourceAllocationRequest) -> ResourceSpec:
+    """Requirements of a request, scaled for its quality level"""
+    base_requirements = ResourceSpec(**request.requirements.dict())
+    if not request.quality:
+        return base_requirements
+    return QualityResourceScaler().scale_requirements(
+        base_requirements,
+        request.quality,
+        request.task_type
+    )
 
 
 # Endpoints
@@ -84,19 +105,8 @@ async def allocate_resources(
     """Allocate resources for a task"""
     
     try:
-        # Convert requirements
-        base_requirements = ResourceSpec(**request.requirements.dict())
-        
-        # Scale for quality if specified
-        if request.quality:
-            scaler = QualityResourceScaler()
-            requirements = scaler.scale_requirements(
-                base_requirements,
-                request.quality,
-                request.task_type
-            )
-        else:
-            requirements = base_requirements
+        # Convert requirements, scaled for quality if specified
+        requirements = _scaled_requirements(request)
         
         # Convert constraints
         constraints = None
@@ -124,7 +134,8 @@ async def allocate_resources(
             gpu_devices = await gpu_manager.allocate_multi_gpu(
                 count=gpu_count,
                 memory_per_gpu_gb=memory_per_gpu,
-                compute_capability=requirements.gpu_compute_capability
+                compute_capability=requirements.gpu_compute_capability,
+                task_id=request.task_id
             )
             
             if not gpu_devices:
@@ -133,13 +144,17 @@ async def allocate_resources(
                     error="No suitable GPU devices available"
                 )
         
-        # Create allocation
-        allocation = await resource_mapper.allocate(
-            worker_id=worker_id,
-            requirements=requirements,
-            task_id=request.task_id,
-            duration_estimate=request.duration_estimate
-        )
+        # Create allocation, returning the GPUs if the worker allocation fails
+        try:
+            allocation = await resource_mapper.allocate(
+                worker_id=worker_id,
+                requirements=requirements,
+                task_id=request.task_id,
+                duration_estimate=request.duration_estimate
+            )
+        except Exception:
+            await gpu_manager.release_task_gpus(request.task_id)
+            raise
         
         # Add GPU devices to allocation
         allocation.gpu_devices = gpu_devices
@@ -161,6 +176,68 @@ async def allocate_resources(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/allocate/batch")
+async def allocate_resources_batch(
+    request: BatchAllocationRequest,
+    resource_mapper=Depends(get_resource_mapper),
+    gpu_manager=Depends(get_gpu_manager)
+) -> List[ResourceAllocationResponse]:
+    """Place and allocate a burst of tasks in one call"""
+    
+    try:
+        placements = [
+            PlacementRequest(
+                task_id=item.task_id,
+                requirements=_scaled_requirements(item),
+                constraints=ResourceConstraints(**item.constraints.dict()) if item.constraints else None,
+                duration_estimate=item.duration_estimate
+            )
+            for item in request.requests
+        ]
+        
+        allocations = await resource_mapper.place_batch(placements, request.strategy)
+        
+        responses = []
+        for placement, allocation in zip(placements, allocations):
+            if allocation is None:
+                responses.append(ResourceAllocationResponse(
+                    success=False,
+                    error="No suitable worker found for requirements"
+                ))
+                continue
+            
+            requirements = placement.requirements
+            if requirements.gpu_count > 0:
+                gpu_count, memory_per_gpu = gpu_manager.estimate_gpu_requirements(requirements)
+                gpu_devices = await gpu_manager.allocate_multi_gpu(
+                    count=gpu_count,
+                    memory_per_gpu_gb=memory_per_gpu,
+                    compute_capability=requirements.gpu_compute_capability,
+                    task_id=placement.task_id
+                )
+                if not gpu_devices:
+                    await resource_mapper.release(allocation.id)
+                    responses.append(ResourceAllocationResponse(
+                        success=False,
+                        error="No suitable GPU devices available"
+                    ))
+                    continue
+                allocation.gpu_devices = gpu_devices
+            
+            responses.append(ResourceAllocationResponse(
+                success=True,
+                allocation_id=allocation.id,
+                worker_id=allocation.worker_id,
+                resources=requirements.to_dict(),
+                expires_at=allocation.expires_at
+            ))
+        
+        return responses
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/release")
 async def release_resources(
     request: ResourceReleaseRequest,
@@ -173,13 +250,9 @@ async def release_resources(
         # Get allocation details
         allocation = resource_mapper.allocations.get(request.allocation_id)
         
-        if allocation:
-            # Release GPU devices
-            for device_idx in allocation.gpu_devices:
-                await gpu_manager.release_gpu(
-                    device_idx,
-                    allocation.resources.gpu_memory_gb / len(allocation.gpu_devices)
-                )
+        if allocation and allocation.gpu_devices:
+            # Release exactly the GPU memory recorded for the task
+            await gpu_manager.release_task_gpus(allocation.task_id)
         
         # Release allocation
         await resource_mapper.release(request.allocation_id)
@@ -243,13 +316,16 @@ async def list_workers(
 @router.post("/workers/register")
 async def register_worker(
     request: WorkerRegistrationRequest,
-    resource_mapper=Depends(get_resource_mapper)
+    resource_mapper=Depends(get_resource_mapper),
+    resource_monitor=Depends(get_resource_monitor)
 ) -> Dict[str, Any]:
     """Register a new worker with its resources"""
     
     try:
         resources = ResourceSpec(**request.resources.dict())
         await resource_mapper.register_worker(request.worker_id, resources)
+        if request.pid is not None:
+            resource_monitor.register_worker_pid(request.worker_id, request.pid)
         
         return {
             "success": True,
@@ -264,12 +340,14 @@ async def register_worker(
 @router.delete("/workers/{worker_id}")
 async def unregister_worker(
     worker_id: str,
-    resource_mapper=Depends(get_resource_mapper)
+    resource_mapper=Depends(get_resource_mapper),
+    resource_monitor=Depends(get_resource_monitor)
 ) -> Dict[str, Any]:
     """Unregister a worker"""
     
     try:
         await resource_mapper.unregister_worker(worker_id)
+        resource_monitor.unregister_worker_pid(worker_id)
         
         return {
             "success": True,
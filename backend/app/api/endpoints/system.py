@@ -8,6 +8,7 @@ import subprocess
 from fastapi import APIRouter
 
 from app.config import settings
+from app.middleware.profiling import request_profiler
 
 router = APIRouter(prefix="/system", tags=["system"])
 
@@ -69,3 +70,21 @@ async def get_system_info():
         "apiEndpoint": f"http://localhost:{settings.port}",
         "gpuSupport": gpu_support,
     }
+
+
+@router.get("/profiles")
+async def get_request_profiles(route: str | None = None):
+    """Get stack profiles of the slowest requests per route, slowest first"""
+    return {
+        "enabled": request_profiler.enabled,
+        "sampleIntervalMs": request_profiler.interval * 1000,
+        "topN": request_profiler.top_n,
+        "profiles": request_profiler.get_profiles(route),
+    }
+
+
+@router.delete("/profiles")
+async def clear_request_profiles():
+    """Discard the kept request profiles"""
+    request_profiler.reset()
+    return {"cleared": True}
@@ -116,6 +116,7 @@ async def import_project(
         import_id = f"import_{target_name}_{asyncio.get_event_loop().time()}"
 
         async def run_import():
+            result = None
             try:
                 result = await import_service.import_archive(
                     str(temp_file), target_name, import_options, progress_callback
@@ -132,17 +133,16 @@ async def import_project(
                         client_id,
                     )
 
-                # Cleanup temp file
-                temp_file.unlink(missing_ok=True)
-
             except Exception as e:
                 logger.error(f"Import failed: {str(e)}")
                 if client_id:
                     await websocket_manager.send_personal_message(
                         {"type": "import_error", "import_id": import_id, "error": str(e)}, client_id
                     )
-                # Cleanup temp file even on error
-                temp_file.unlink(missing_ok=True)
+            finally:
+                # A failed import keeps its upload, so retrying with the same temp_path resumes it
+                if result is not None and result.success:
+                    temp_file.unlink(missing_ok=True)
 
         # Add to background tasks
         background_tasks.add_task(run_import)
@@ -217,7 +217,9 @@ async def cleanup_temp_files(
         ]
 
         cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        deleted_count = 0
+
+        # Abandoned resume journals go first, together with their partial projects
+        deleted_count = import_service.cleanup_abandoned_imports(cutoff)
 
         for temp_dir in temp_dirs:
             if temp_dir.exists():
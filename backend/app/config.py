@@ -35,6 +35,11 @@ class Settings(BaseSettings):
     redis_db: int = Field(default=0, env="REDIS_DB")
     redis_progress_channel: str = "auteur:progress"
     redis_state_prefix: str = "auteur:project:"
+    redis_completion_channel: str = "auteur:task_completion"
+    redis_codec: str = Field(default="msgpack", env="REDIS_CODEC")  # msgpack, orjson or json
+    redis_codec_compression: str | None = Field(default="zstd", env="REDIS_CODEC_COMPRESSION")
+    redis_codec_compress_threshold: int = 2048  # bytes
+    redis_codec_dual_write: bool = Field(default=False, env="REDIS_CODEC_DUAL_WRITE")
 
     # WebSocket
     ws_heartbeat_interval: int = 30  # seconds
@@ -65,10 +70,16 @@ class Settings(BaseSettings):
         },
     }
     default_quality: str = "standard"
+    # Execution history behind quality impact estimates
+    quality_history_db: Path = Field(
+        default=Path("./workspace/.auteur/quality_history.sqlite3"), env="QUALITY_HISTORY_DB"
+    )
 
     # Task Dispatcher
     task_timeout: int = 300  # 5 minutes
     max_concurrent_tasks: int = 3
+    # Log of in-flight multi-step operations, compensated after a crash
+    saga_log_db: Path = Field(default=Path("./data/compensation_sagas.sqlite3"), env="SAGA_LOG_DB")
 
     # Future: Multi-agent settings
     enable_crew_ai: bool = False
@@ -78,6 +89,11 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = "json"
 
+    # Request profiling (stack samples of the slowest requests per route)
+    request_profiling: bool = Field(default=False, env="REQUEST_PROFILING")
+    request_profiling_interval_ms: float = 5.0
+    request_profiling_top_n: int = 5
+
     # Container environment
     is_docker: bool = Field(default=False, env="DOCKER_ENV")
     container_name: str = "auteur-backend"
@@ -119,8 +119,10 @@ def get_resource_monitor() -> ResourceMonitor:
     global _resource_monitor
     
     if _resource_monitor is None:
+        from app.worker.telemetry import telemetry_aggregator
+        
         resource_mapper = get_resource_mapper()
-        _resource_monitor = ResourceMonitor(resource_mapper)
+        _resource_monitor = ResourceMonitor(resource_mapper, telemetry=telemetry_aggregator)
         
         # Initialize in background
         import asyncio
@@ -214,6 +216,8 @@ async def get_error_handler() -> ErrorHandlingIntegration:
             # queue_manager=queue_manager,  # Will be injected when available
             resource_monitor=get_resource_monitor(),
             # storage_manager=storage_manager  # Will be injected when available
+            redis=redis_client,
+            saga_log_path=str(settings.saga_log_db)
         )
         
         # Start error handling systems
@@ -3,11 +3,13 @@
 from .classifier import ErrorClassifier, ErrorClassification, ErrorCategory
 from .recovery import (
     RecoveryManager, RecoveryResult, RecoveryStrategy,
-    RetryWithBackoffStrategy, QueueAndWaitStrategy,
+    RetryWithBackoffStrategy, RetryScheduler, QueueAndWaitStrategy,
     FailFastStrategy, DeadLetterQueueStrategy
 )
-from .circuit_breaker import CircuitBreaker, CircuitBreakerManager, CircuitBreakerOpenError
-from .compensation import CompensationManager, CompensationResult, Operation
+from .circuit_breaker import (
+    CircuitBreaker, CircuitBreakerManager, CircuitBreakerOpenError, SharedCircuitState
+)
+from .compensation import CompensationManager, CompensationResult, Operation, SagaLog
 from .analytics import ErrorAnalytics, ErrorAnalysisReport, ErrorAnomaly
 from .self_healing import SelfHealingSystem, SystemIssue, HealingResult
 from .context import ErrorContext, ErrorHistory
@@ -24,6 +26,7 @@ __all__ = [
     'RecoveryResult',
     'RecoveryStrategy',
     'RetryWithBackoffStrategy',
+    'RetryScheduler',
     'QueueAndWaitStrategy',
     'FailFastStrategy',
     'DeadLetterQueueStrategy',
@@ -32,11 +35,13 @@ __all__ = [
     'CircuitBreaker',
     'CircuitBreakerManager',
     'CircuitBreakerOpenError',
+    'SharedCircuitState',
     
     # Compensation
     'CompensationManager',
     'CompensationResult',
     'Operation',
+    'SagaLog',
     
     # Analytics
     'ErrorAnalytics',
@@ -1,9 +1,20 @@
-"""Error analytics and monitoring"""
+"""
+Error analytics and monitoring
 
+Counts are kept in two rings of time buckets: one per second over the last
+five minutes and one per minute over the last day. Each ring keeps running
+totals, so window rates, spike ratios and recovery rates are bucket sums
+rather than scans of individual errors. Anomaly checks run on a timer, and
+per-minute buckets can be flushed to Redis so the baseline survives restarts.
+"""
+
+import asyncio
 import logging
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import math
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Set
 
 from .models import (
     ErrorAnalysisReport, ErrorAnomaly, ErrorSeverity,
@@ -13,22 +24,97 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+class BucketRing:
+    """Counts per key in a ring of fixed-width time buckets, with running totals over the ring"""
+    
+    def __init__(self, bucket_seconds: int, size: int):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.totals: Counter = Counter()
+        self._buckets: List[Counter] = [Counter() for _ in range(size)]
+        self._epoch: Optional[int] = None  # newest bucket seen
+    
+    def epoch(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+    
+    def _advance(self, epoch: int):
+        """Clear the buckets that fell out of the ring since the newest one"""
+        if self._epoch is None:
+            self._epoch = epoch
+            return
+        if epoch <= self._epoch:
+            return
+        
+        for stale in range(max(self._epoch + 1, epoch - self.size + 1), epoch + 1):
+            bucket = self._buckets[stale % self.size]
+            if bucket:
+                self.totals.subtract(bucket)
+                for key in bucket:
+                    if self.totals[key] <= 0:
+                        del self.totals[key]
+                bucket.clear()
+        self._epoch = epoch
+    
+    def add(self, keys: Iterable[str], now: float, amount: int = 1):
+        """Count keys in the bucket covering ``now``"""
+        self.add_counts(Counter({key: amount for key in keys}), self.epoch(now))
+    
+    def add_counts(self, counts: Dict[str, int], epoch: int):
+        self._advance(epoch)
+        if epoch <= self._epoch - self.size:
+            return  # older than the ring
+        bucket = self._buckets[epoch % self.size]
+        bucket.update(counts)
+        self.totals.update(counts)
+    
+    def window(self, seconds: float, now: float) -> Counter:
+        """Counts over the last ``seconds``, including the current bucket"""
+        epoch = self.epoch(now)
+        self._advance(epoch)
+        count = math.ceil(seconds / self.bucket_seconds)
+        if count >= self.size:
+            return Counter(self.totals)
+        
+        result = Counter()
+        for past in range(epoch - count + 1, epoch + 1):
+            result.update(self._buckets[past % self.size])
+        return result
+
+
 class ErrorMetrics:
     """Container for error metrics"""
     
-    def __init__(self, window_size: int = 1000):
+    def __init__(self, second_buckets: int = 300, minute_buckets: int = 1440):
+        # Lifetime counts by category and error type
         self.error_counts = defaultdict(int)
-        self.error_trends = deque(maxlen=window_size)
         self.recovery_attempts = defaultdict(int)
         self.recovery_successes = defaultdict(int)
         self.last_errors: Dict[str, datetime] = {}
-        self.error_durations: Dict[str, List[float]] = defaultdict(list)
+        self.seconds = BucketRing(1, second_buckets)
+        self.minutes = BucketRing(60, minute_buckets)
+        self.started_at = time.time()
+    
+    def count(self, keys: List[str], now: float, amount: int = 1):
+        self.seconds.add(keys, now, amount)
+        self.minutes.add(keys, now, amount)
+    
+    def window(self, seconds: float, now: float) -> Counter:
+        """Bucket sums over a window, from the finest ring that covers it"""
+        if seconds <= self.seconds.size * self.seconds.bucket_seconds:
+            return self.seconds.window(seconds, now)
+        return self.minutes.window(seconds, now)
 
 
 class ErrorAnalytics:
     """Track and analyze error patterns"""
     
-    def __init__(self, alert_service=None):
+    def __init__(
+        self,
+        alert_service=None,
+        redis=None,
+        key_prefix: str = "error_analytics",
+        check_interval: float = 10.0
+    ):
         self.metrics = ErrorMetrics()
         self.alert_service = alert_service
         self.alert_thresholds = {
@@ -38,23 +124,39 @@ class ErrorAnalytics:
             'error_spike': 2.0,  # 2x normal rate
             'critical_errors': 3  # 3 critical errors in window
         }
-        self._baseline_error_rate = 0.05  # 5% baseline
         self._analysis_window_minutes = 5
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.check_interval = check_interval
+        # Per-minute counts not yet written to Redis, by bucket epoch
+        self._unflushed: Dict[int, Counter] = defaultdict(Counter)
+        self._active_alerts: Set[str] = set()
+        self._check_task: Optional[asyncio.Task] = None
+    
+    def _count(self, keys: List[str], amount: int = 1):
+        now = time.time()
+        self.metrics.count(keys, now, amount)
+        if self.redis is not None:
+            self._unflushed[self.metrics.minutes.epoch(now)].update({key: amount for key in keys})
+    
+    def record_request(self, count: int = 1):
+        """Count handled requests, the denominator of the error rate"""
+        self._count(['requests'], count)
     
     async def record_error(self, classification: ErrorClassification):
         """Record an error occurrence"""
         # Update counts
         self.metrics.error_counts[classification.category] += 1
         self.metrics.error_counts[classification.error_type] += 1
-        
-        # Add to trends
-        self.metrics.error_trends.append(classification)
+        self._count([
+            'errors',
+            f"category:{classification.category}",
+            f"type:{classification.error_type}",
+            f"severity:{classification.severity}"
+        ])
         
         # Update last seen
         self.metrics.last_errors[classification.error_type] = datetime.now()
-        
-        # Check for anomalies
-        await self._check_anomalies(classification)
     
     async def record_recovery_attempt(
         self,
@@ -63,8 +165,31 @@ class ErrorAnalytics:
     ):
         """Record recovery attempt result"""
         self.metrics.recovery_attempts[error_category] += 1
+        keys = ['recovery_attempts']
         if success:
             self.metrics.recovery_successes[error_category] += 1
+            keys.append('recovery_successes')
+        self._count(keys)
+    
+    def _window_summary(self, window_minutes: int, now: float) -> Dict[str, Any]:
+        counts = self.metrics.window(window_minutes * 60, now)
+        errors = counts['errors']
+        requests = counts['requests']
+        return {
+            'counts': counts,
+            'errors': errors,
+            # Unknown without request counts; other anomalies still apply
+            'error_rate': errors / requests if requests else 0.0,
+            'by_category': self._prefixed(counts, 'category:'),
+            'by_severity': self._prefixed(counts, 'severity:')
+        }
+    
+    @staticmethod
+    def _prefixed(counts: Counter, prefix: str) -> Dict[str, int]:
+        return {
+            key[len(prefix):]: count for key, count in counts.items()
+            if key.startswith(prefix)
+        }
     
     async def analyze_error_patterns(
         self,
@@ -73,60 +198,37 @@ class ErrorAnalytics:
         """Analyze recent error patterns"""
         
         window_minutes = window_minutes or self._analysis_window_minutes
-        cutoff_time = datetime.now() - timedelta(minutes=window_minutes)
-        
-        # Get recent errors
-        recent_errors = [
-            e for e in self.metrics.error_trends
-            if e.timestamp > cutoff_time
-        ]
-        
-        # Calculate metrics
-        total_errors = len(recent_errors)
-        total_requests = max(len(self.metrics.error_trends), 1)
-        error_rate = total_errors / total_requests
-        
-        # Count by category
-        error_frequency = defaultdict(int)
-        severity_counts = defaultdict(int)
-        
-        for error in recent_errors:
-            error_frequency[error.category] += 1
-            severity_counts[error.severity] += 1
+        now = time.time()
+        summary = self._window_summary(window_minutes, now)
         
         # Check for anomalies
-        anomalies = await self._detect_anomalies(
-            error_rate,
-            error_frequency,
-            severity_counts,
-            recent_errors
-        )
+        anomalies = self._detect_anomalies(summary, window_minutes, now)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
             anomalies,
-            error_frequency,
-            error_rate
+            summary['by_category'],
+            summary['error_rate']
         )
         
         return ErrorAnalysisReport(
-            total_errors=total_errors,
-            error_rate=error_rate,
-            error_distribution=dict(error_frequency),
+            total_errors=summary['errors'],
+            error_rate=summary['error_rate'],
+            error_distribution=summary['by_category'],
             anomalies=anomalies,
             recommendations=recommendations,
             analysis_window_minutes=window_minutes
         )
     
-    async def _detect_anomalies(
+    def _detect_anomalies(
         self,
-        error_rate: float,
-        error_frequency: Dict[str, int],
-        severity_counts: Dict[str, int],
-        recent_errors: List[ErrorClassification]
+        summary: Dict[str, Any],
+        window_minutes: int,
+        now: float
     ) -> List[ErrorAnomaly]:
         """Detect anomalies in error patterns"""
         anomalies = []
+        error_rate = summary['error_rate']
         
         # High error rate
         if error_rate > self.alert_thresholds['error_rate']:
@@ -138,7 +240,7 @@ class ErrorAnalytics:
             ))
         
         # Frequent specific errors
-        for error_type, count in error_frequency.items():
+        for error_type, count in summary['by_category'].items():
             if count > self.alert_thresholds['specific_error_count']:
                 anomalies.append(ErrorAnomaly(
                     type='frequent_error',
@@ -148,16 +250,17 @@ class ErrorAnalytics:
                 ))
         
         # Error spike detection
-        if self._is_error_spike(error_rate):
+        spike = self._spike_ratio(summary['errors'], window_minutes, now)
+        if spike is not None and spike > self.alert_thresholds['error_spike']:
             anomalies.append(ErrorAnomaly(
                 type='error_spike',
                 severity=ErrorSeverity.HIGH,
-                value=error_rate / self._baseline_error_rate,
+                value=spike,
                 threshold=self.alert_thresholds['error_spike']
             ))
         
         # Critical error threshold
-        critical_count = severity_counts.get(ErrorSeverity.CRITICAL, 0)
+        critical_count = summary['by_severity'].get(ErrorSeverity.CRITICAL.value, 0)
         if critical_count >= self.alert_thresholds['critical_errors']:
             anomalies.append(ErrorAnomaly(
                 type='critical_error_threshold',
@@ -167,36 +270,32 @@ class ErrorAnalytics:
             ))
         
         # Recovery failure rate
-        recovery_failure_rate = self._calculate_recovery_failure_rate()
-        if recovery_failure_rate > self.alert_thresholds['recovery_failure_rate']:
-            anomalies.append(ErrorAnomaly(
-                type='high_recovery_failure',
-                severity=ErrorSeverity.HIGH,
-                value=recovery_failure_rate,
-                threshold=self.alert_thresholds['recovery_failure_rate']
-            ))
-        
-        # Send alerts for critical anomalies
-        if anomalies and self.alert_service:
-            await self._send_anomaly_alerts(anomalies)
+        attempts = summary['counts']['recovery_attempts']
+        if attempts:
+            recovery_failure_rate = 1 - summary['counts']['recovery_successes'] / attempts
+            if recovery_failure_rate > self.alert_thresholds['recovery_failure_rate']:
+                anomalies.append(ErrorAnomaly(
+                    type='high_recovery_failure',
+                    severity=ErrorSeverity.HIGH,
+                    value=recovery_failure_rate,
+                    threshold=self.alert_thresholds['recovery_failure_rate']
+                ))
         
         return anomalies
     
-    def _is_error_spike(self, current_rate: float) -> bool:
-        """Detect if current error rate is a spike"""
-        spike_threshold = self._baseline_error_rate * self.alert_thresholds['error_spike']
-        return current_rate > spike_threshold
-    
-    def _calculate_recovery_failure_rate(self) -> float:
-        """Calculate overall recovery failure rate"""
-        total_attempts = sum(self.metrics.recovery_attempts.values())
-        total_successes = sum(self.metrics.recovery_successes.values())
+    def _spike_ratio(self, window_errors: int, window_minutes: int, now: float) -> Optional[float]:
+        """Error rate in the window over the per-minute baseline before it"""
+        minutes = self.metrics.minutes
+        span = minutes.size * minutes.bucket_seconds
+        window_seconds = window_minutes * 60
+        baseline_seconds = min(span, now - self.metrics.started_at) - window_seconds
+        if baseline_seconds < window_seconds:
+            return None  # not enough history yet
         
-        if total_attempts == 0:
-            return 0.0
-            
-        failure_rate = 1 - (total_successes / total_attempts)
-        return failure_rate
+        baseline_errors = minutes.totals['errors'] - minutes.window(window_seconds, now)['errors']
+        if baseline_errors <= 0:
+            return None
+        return (window_errors / window_seconds) / (baseline_errors / baseline_seconds)
     
     def _generate_recommendations(
         self,
@@ -258,26 +357,19 @@ class ErrorAnalytics:
         
         return recommendations
     
-    async def _check_anomalies(self, classification: ErrorClassification):
-        """Real-time anomaly checking for immediate alerts"""
-        # Check for critical errors
-        if classification.severity == ErrorSeverity.CRITICAL:
-            recent_critical = sum(
-                1 for e in list(self.metrics.error_trends)[-20:]
-                if e.severity == ErrorSeverity.CRITICAL
-            )
-            
-            if recent_critical >= self.alert_thresholds['critical_errors']:
-                if self.alert_service:
-                    await self.alert_service.send_alert(
-                        level='critical',
-                        message=f"Critical error threshold exceeded: {recent_critical} errors",
-                        details={
-                            'error_type': classification.error_type,
-                            'category': classification.category,
-                            'message': classification.message
-                        }
-                    )
+    async def check_anomalies(self) -> List[ErrorAnomaly]:
+        """Evaluate the analysis window and alert on newly active critical anomalies"""
+        now = time.time()
+        summary = self._window_summary(self._analysis_window_minutes, now)
+        anomalies = self._detect_anomalies(summary, self._analysis_window_minutes, now)
+        
+        active = {a.type for a in anomalies}
+        new = [a for a in anomalies if a.type not in self._active_alerts]
+        self._active_alerts = active
+        
+        if new and self.alert_service:
+            await self._send_anomaly_alerts(new)
+        return anomalies
     
     async def _send_anomaly_alerts(self, anomalies: List[ErrorAnomaly]):
         """Send alerts for detected anomalies"""
@@ -303,9 +395,88 @@ class ErrorAnalytics:
                 }
             )
     
+    async def start(self):
+        """Load persisted buckets and start the periodic anomaly check"""
+        if self._check_task is not None:
+            return
+        if self.redis is not None:
+            await self.load()
+        self._check_task = asyncio.create_task(self._check_loop())
+    
+    async def stop(self):
+        """Stop the periodic check, flushing counts to Redis"""
+        if self._check_task is not None:
+            self._check_task.cancel()
+            try:
+                await self._check_task
+            except asyncio.CancelledError:
+                pass
+            self._check_task = None
+        await self.flush()
+    
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check_anomalies()
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error analytics check failed: {e}")
+    
+    def _minute_key(self, epoch: int) -> str:
+        return f"{self.key_prefix}:minute:{epoch}"
+    
+    async def flush(self):
+        """Add per-minute counts recorded since the last flush to Redis"""
+        if self.redis is None or not self._unflushed:
+            return
+        
+        unflushed, self._unflushed = self._unflushed, defaultdict(Counter)
+        minutes = self.metrics.minutes
+        ttl = minutes.size * minutes.bucket_seconds + 3600
+        pipe = self.redis.pipeline(transaction=False)
+        for epoch, counts in unflushed.items():
+            key = self._minute_key(epoch)
+            for field, count in counts.items():
+                pipe.hincrby(key, field, count)
+            pipe.expire(key, ttl)
+        
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to persist error analytics: {e}")
+            for epoch, counts in unflushed.items():
+                self._unflushed[epoch].update(counts)
+    
+    async def load(self):
+        """Seed the per-minute ring from Redis, e.g. after a restart"""
+        minutes = self.metrics.minutes
+        current = minutes.epoch(time.time())
+        epochs = range(current - minutes.size + 1, current + 1)
+        pipe = self.redis.pipeline(transaction=False)
+        for epoch in epochs:
+            pipe.hgetall(self._minute_key(epoch))
+        
+        try:
+            buckets = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to load error analytics: {e}")
+            return
+        
+        for epoch, bucket in zip(epochs, buckets):
+            if not bucket:
+                continue
+            counts = {
+                (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in bucket.items()
+            }
+            minutes.add_counts(counts, epoch)
+            self.metrics.started_at = min(self.metrics.started_at, epoch * minutes.bucket_seconds)
+    
     def get_error_stats(self) -> Dict[str, Any]:
         """Get current error statistics"""
-        total_errors = sum(self.metrics.error_counts.values())
+        total_errors = sum(
+            self.metrics.error_counts.get(category, 0) for category in ErrorCategory
+        )
         
         # Calculate category distribution
         category_dist = {}
@@ -336,22 +507,11 @@ class ErrorAnalytics:
     
     def _calculate_recent_error_rate(self, minutes: int = 5) -> float:
         """Calculate error rate for recent time window"""
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        recent_errors = sum(
-            1 for e in self.metrics.error_trends
-            if e.timestamp > cutoff_time
-        )
-        
-        # Assume ~100 requests per minute as baseline
-        expected_requests = minutes * 100
-        return recent_errors / expected_requests
+        return self._window_summary(minutes, time.time())['error_rate']
     
     def _get_top_errors(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get most frequent error types"""
-        error_types = defaultdict(int)
-        
-        for error in self.metrics.error_trends:
-            error_types[error.error_type] += 1
+        """Get most frequent error types over the last day"""
+        error_types = self._prefixed(self.metrics.minutes.totals, 'type:')
         
         sorted_errors = sorted(
             error_types.items(),
@@ -362,4 +522,4 @@ class ErrorAnalytics:
         return [
             {'error_type': error_type, 'count': count}
             for error_type, count in sorted_errors[:limit]
-        ]
\ No newline at end of file
+        ]
@@ -47,6 +47,29 @@ async def get_error_stats(
         raise HTTPException(500, f"Failed to get error stats: {str(e)}")
 
 
+@router.get("/recent")
+async def get_recent_errors(
+    minutes: int = Query(5, ge=1, le=1440),
+    limit: int = Query(100, ge=1, le=1000),
+    error_handler: ErrorHandlingIntegration = Depends(get_error_handler)
+) -> Dict[str, Any]:
+    """Get the most recent errors across all tasks, newest first"""
+    try:
+        recent = error_handler.context_manager.get_recent_errors_all(
+            minutes=minutes, limit=limit
+        )
+        return {
+            "status": "success",
+            "data": [
+                {"task_id": task_id, **classification.model_dump()}
+                for task_id, classification in recent
+            ],
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(500, f"Failed to get recent errors: {str(e)}")
+
+
 @router.get("/circuit-breakers")
 async def get_circuit_breaker_status(
     error_handler: ErrorHandlingIntegration = Depends(get_error_handler)
@@ -223,7 +246,7 @@ async def get_task_error_history(
 ) -> Dict[str, Any]:
     """Get error history for a specific task"""
     try:
-        history = error_handler.context_manager.get_history(task_id)
+        history = await error_handler.context_manager.fetch_history(task_id)
         
         if not history:
             return {
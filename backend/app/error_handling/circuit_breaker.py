@@ -1,9 +1,21 @@
-"""Circuit breaker implementation for fault tolerance"""
+"""
+Circuit breaker implementation for fault tolerance
+
+Breakers trip on the failure rate over a sliding window kept in a ring of
+time buckets, and let a bounded number of probe calls through while half
+open. All bookkeeping is synchronous between awaits, so it needs no lock.
+With a ``SharedCircuitState`` the open/half-open state lives in Redis and
+changes through one Lua script, so a breaker tripping in one process sheds
+load in all of them. Shared probes hold leases with a deadline, so a probe
+whose process died or whose release was lost frees its slot once the lease
+runs out.
+"""
 
-import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Callable, Any, Type, Optional, Dict, List
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Any, Type, Optional, Dict, List, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -21,6 +33,153 @@ class CircuitBreakerOpenError(Exception):
     pass
 
 
+class SlidingWindow:
+    """Success and failure counts over the last ``window_seconds``, in a ring of time buckets"""
+    
+    def __init__(self, window_seconds: float = 60.0, buckets: int = 10):
+        self.bucket_seconds = window_seconds / buckets
+        self._size = buckets
+        self._epochs = [-1] * buckets
+        self._successes = [0] * buckets
+        self._failures = [0] * buckets
+    
+    def record(self, success: bool, now: Optional[float] = None):
+        """Count one call outcome in the current bucket"""
+        epoch = int((time.monotonic() if now is None else now) // self.bucket_seconds)
+        slot = epoch % self._size
+        if self._epochs[slot] != epoch:
+            # The slot still holds a bucket from a previous lap of the ring
+            self._epochs[slot] = epoch
+            self._successes[slot] = 0
+            self._failures[slot] = 0
+        if success:
+            self._successes[slot] += 1
+        else:
+            self._failures[slot] += 1
+    
+    def totals(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """Successes and failures inside the window"""
+        oldest = int((time.monotonic() if now is None else now) // self.bucket_seconds) - self._size
+        successes = failures = 0
+        for slot in range(self._size):
+            if self._epochs[slot] > oldest:
+                successes += self._successes[slot]
+                failures += self._failures[slot]
+        return successes, failures
+    
+    def reset(self):
+        self._epochs = [-1] * self._size
+        self._successes = [0] * self._size
+        self._failures = [0] * self._size
+
+
+# State machine shared by every process using a breaker. KEYS[1] is the
+# breaker's hash, KEYS[2] a sorted set of probe leases scored by deadline;
+# ARGV: operation, recovery timeout (ms), probe limit, success threshold,
+# lease id, lease length (ms). Closed breakers have no keys. Returns
+# {state, milliseconds until a retry is allowed}.
+_SHARED_STATE_SCRIPT = """
+local key = KEYS[1]
+local leases = KEYS[2]
+local op = ARGV[1]
+local recovery_ms = tonumber(ARGV[2])
+local max_probes = tonumber(ARGV[3])
+local success_threshold = tonumber(ARGV[4])
+local lease = ARGV[5]
+local lease_ms = tonumber(ARGV[6])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local ttl = recovery_ms * 10 + 60000
+
+local function open()
+    redis.call('HSET', key, 'state', 'open', 'opened_at', now, 'successes', 0)
+    redis.call('PEXPIRE', key, ttl)
+    redis.call('DEL', leases)
+    return {'open', recovery_ms}
+end
+
+if op == 'reset' then
+    redis.call('DEL', key, leases)
+    return {'closed', 0}
+end
+if op == 'trip' then
+    if redis.call('EXISTS', key) == 0 then
+        return open()
+    end
+    return {redis.call('HGET', key, 'state'), 0}
+end
+
+local state = redis.call('HGET', key, 'state')
+if not state then
+    return {'closed', 0}
+end
+
+if op == 'acquire' then
+    if state == 'open' then
+        local wait = tonumber(redis.call('HGET', key, 'opened_at')) + recovery_ms - now
+        if wait > 0 then
+            return {'open', wait}
+        end
+        redis.call('HSET', key, 'state', 'half_open', 'successes', 0)
+        redis.call('DEL', leases)
+        state = 'half_open'
+    end
+    -- Probes that never reported back give up their slot at the deadline
+    redis.call('ZREMRANGEBYSCORE', leases, '-inf', now)
+    if redis.call('ZCARD', leases) >= max_probes then
+        return {'busy', 0}
+    end
+    redis.call('ZADD', leases, now + lease_ms, lease)
+    redis.call('PEXPIRE', leases, ttl)
+    return {'probe', 0}
+end
+
+if state ~= 'half_open' then
+    return {state, 0}
+end
+redis.call('ZREM', leases, lease)
+if op == 'failure' then
+    return open()
+end
+if op == 'success' then
+    if redis.call('HINCRBY', key, 'successes', 1) >= success_threshold then
+        redis.call('DEL', key, leases)
+        return {'closed', 0}
+    end
+end
+return {'half_open', 0}
+"""
+
+
+class SharedCircuitState:
+    """Breaker state kept in Redis so every process sees trips and probes"""
+    
+    def __init__(self, redis, key_prefix: str = "circuit_breaker", refresh_interval: float = 1.0):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        # How long a closed breaker trusts its last look at the shared state
+        self.refresh_interval = refresh_interval
+        self._script = redis.register_script(_SHARED_STATE_SCRIPT)
+    
+    async def transition(
+        self,
+        breaker: 'CircuitBreaker',
+        op: str,
+        lease: str = ""
+    ) -> Tuple[str, float]:
+        """Run one operation of the state machine; returns (state, seconds until retry)"""
+        key = f"{self.key_prefix}:{breaker.name}"
+        state, wait_ms = await self._script(
+            keys=[key, f"{key}:probes"],
+            args=[op, int(breaker.recovery_timeout * 1000),
+                  breaker.half_open_max_calls, breaker.success_threshold,
+                  lease, int(breaker.probe_timeout * 1000)]
+        )
+        if isinstance(state, bytes):
+            state = state.decode()
+        return state, int(wait_ms) / 1000
+
+
 class CircuitBreaker:
     """Circuit breaker for external service calls"""
     
@@ -30,167 +189,293 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         expected_exception: Type[Exception] = Exception,
-        success_threshold: int = 2
+        success_threshold: int = 2,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 60.0,
+        window_buckets: int = 10,
+        half_open_max_calls: int = 1,
+        shared_state: Optional[SharedCircuitState] = None,
+        probe_timeout: Optional[float] = None
     ):
         self.name = name
+        # Trips once the window holds at least this many failures...
         self.failure_threshold = failure_threshold
+        # ...and they make up at least this share of its calls
+        self.failure_rate_threshold = failure_rate_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
         self.success_threshold = success_threshold
+        self.half_open_max_calls = half_open_max_calls
+        self.shared_state = shared_state
+        # How long a shared probe holds its slot without reporting back
+        self.probe_timeout = recovery_timeout if probe_timeout is None else probe_timeout
         
-        self.failure_count = 0
+        self.window = SlidingWindow(window_seconds, window_buckets)
         self.success_count = 0
         self.last_failure_time: Optional[datetime] = None
         self.last_success_time: Optional[datetime] = None
         self._state = CircuitBreakerState.CLOSED
-        self._lock = asyncio.Lock()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._shared_checked_at = float('-inf')
         
         # Metrics
         self.total_calls = 0
         self.total_failures = 0
         self.total_successes = 0
         self.circuit_opens = 0
+        self.rejected_calls = 0
     
     @property
     def state(self) -> CircuitBreakerState:
         """Get current state"""
         return self._state
     
+    @property
+    def failure_count(self) -> int:
+        """Failures inside the sliding window"""
+        return self.window.totals()[1]
+    
     async def call(self, func: Callable, *args, **kwargs) -> Any:
         """Execute function with circuit breaker protection"""
         
-        async with self._lock:
-            self.total_calls += 1
-            
-            if self._state == CircuitBreakerState.OPEN:
-                if self._should_attempt_reset():
-                    self._state = CircuitBreakerState.HALF_OPEN
-                    logger.info(f"Circuit breaker '{self.name}' entering half-open state")
-                else:
-                    next_attempt = self._next_attempt_time()
-                    raise CircuitBreakerOpenError(
-                        f"Circuit breaker '{self.name}' is open. "
-                        f"Next attempt at {next_attempt}"
-                    )
+        self.total_calls += 1
+        probe = await self._admit()
         
         try:
             result = await func(*args, **kwargs)
-            await self._on_success()
-            return result
-            
-        except self.expected_exception as e:
-            await self._on_failure()
+        except self.expected_exception:
+            await self._on_failure(probe)
+            raise
+        except BaseException:
+            # Neither outcome counts, but the probe slot must be returned
+            if probe:
+                await self._release_probe(probe)
             raise
+        
+        await self._on_success(probe)
+        return result
     
-    async def _on_success(self):
+    async def _admit(self) -> Optional[str]:
+        """Let a call through or raise; returns the lease of a half-open probe"""
+        if self.shared_state is not None:
+            return await self._admit_shared()
+        
+        if self._state == CircuitBreakerState.OPEN:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                self._reject(f"is open. Next attempt in {remaining:.1f}s")
+            self._enter_half_open()
+        
+        if self._state == CircuitBreakerState.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self._reject(f"is half-open with {self._probes_in_flight} probe(s) in flight")
+            self._probes_in_flight += 1
+            return uuid.uuid4().hex
+        
+        return None
+    
+    async def _admit_shared(self) -> Optional[str]:
+        """Admission through the shared state; closed breakers only look every refresh_interval"""
+        now = time.monotonic()
+        if (self._state == CircuitBreakerState.CLOSED and
+                now - self._shared_checked_at < self.shared_state.refresh_interval):
+            return None
+        remaining = self._opened_at + self.recovery_timeout - now
+        if self._state == CircuitBreakerState.OPEN and remaining > 0:
+            self._reject(f"is open. Next attempt in {remaining:.1f}s")
+        
+        lease = uuid.uuid4().hex
+        try:
+            state, wait = await self.shared_state.transition(self, 'acquire', lease)
+        except Exception as e:
+            logger.warning(f"Shared state unavailable for circuit breaker '{self.name}': {e}")
+            self._shared_checked_at = now
+            return None
+        
+        self._shared_checked_at = now
+        if state == 'closed':
+            self._set_closed()
+            return None
+        if state == 'probe':
+            if self._state != CircuitBreakerState.HALF_OPEN:
+                self._enter_half_open()
+            self._probes_in_flight += 1
+            return lease
+        if state == 'open':
+            self._set_open(now - (self.recovery_timeout - wait))
+            self._reject(f"is open. Next attempt in {wait:.1f}s")
+        self._reject("is half-open with its probe limit in flight")
+    
+    def _reject(self, reason: str):
+        self.rejected_calls += 1
+        raise CircuitBreakerOpenError(f"Circuit breaker '{self.name}' {reason}")
+    
+    async def _on_success(self, probe: Optional[str]):
         """Handle successful call"""
-        async with self._lock:
-            self.total_successes += 1
-            self.last_success_time = datetime.now()
-            
-            if self._state == CircuitBreakerState.HALF_OPEN:
-                self.success_count += 1
-                if self.success_count >= self.success_threshold:
-                    self._state = CircuitBreakerState.CLOSED
-                    self.failure_count = 0
-                    self.success_count = 0
-                    logger.info(f"Circuit breaker '{self.name}' closed after recovery")
-            else:
-                self.failure_count = 0
-    
-    async def _on_failure(self):
+        self.total_successes += 1
+        self.last_success_time = datetime.now()
+        self.window.record(True)
+        
+        if not probe:
+            return
+        
+        self._probes_in_flight -= 1
+        if self.shared_state is not None:
+            state = await self._shared_transition('success', probe)
+            if state == 'closed':
+                self._set_closed()
+                logger.info(f"Circuit breaker '{self.name}' closed after recovery")
+            return
+        
+        if self._state == CircuitBreakerState.HALF_OPEN:
+            self.success_count += 1
+            if self.success_count >= self.success_threshold:
+                self._set_closed()
+                logger.info(f"Circuit breaker '{self.name}' closed after recovery")
+    
+    async def _on_failure(self, probe: Optional[str]):
         """Handle failed call"""
-        async with self._lock:
-            self.total_failures += 1
-            self.failure_count += 1
-            self.last_failure_time = datetime.now()
-            
-            if self._state == CircuitBreakerState.HALF_OPEN:
-                # Failure in half-open state reopens the circuit
-                self._state = CircuitBreakerState.OPEN
-                self.circuit_opens += 1
+        self.total_failures += 1
+        self.last_failure_time = datetime.now()
+        self.window.record(False)
+        
+        if probe:
+            # Failure in half-open state reopens the circuit
+            self._probes_in_flight -= 1
+            if self._state != CircuitBreakerState.OPEN:
+                self._set_open(time.monotonic())
                 logger.warning(
                     f"Circuit breaker '{self.name}' reopened after failure in half-open state"
                 )
-            elif self.failure_count >= self.failure_threshold:
-                self._state = CircuitBreakerState.OPEN
-                self.circuit_opens += 1
-                logger.warning(
-                    f"Circuit breaker '{self.name}' opened after {self.failure_count} failures"
-                )
+            if self.shared_state is not None:
+                await self._shared_transition('failure', probe)
+            return
+        
+        if self._state != CircuitBreakerState.CLOSED:
+            return
+        
+        successes, failures = self.window.totals()
+        if (failures >= self.failure_threshold and
+                failures / (successes + failures) >= self.failure_rate_threshold):
+            self._set_open(time.monotonic())
+            logger.warning(
+                f"Circuit breaker '{self.name}' opened after {failures} failures "
+                f"in {successes + failures} calls"
+            )
+            if self.shared_state is not None:
+                await self._shared_transition('trip')
     
-    def _should_attempt_reset(self) -> bool:
-        """Check if circuit breaker should attempt reset"""
-        if not self.last_failure_time:
-            return True
-            
-        time_since_failure = datetime.now() - self.last_failure_time
-        return time_since_failure > timedelta(seconds=self.recovery_timeout)
+    async def _release_probe(self, lease: str):
+        self._probes_in_flight -= 1
+        if self.shared_state is not None:
+            await self._shared_transition('release', lease)
+    
+    async def _shared_transition(self, op: str, lease: str = "") -> Optional[str]:
+        try:
+            state, _ = await self.shared_state.transition(self, op, lease)
+            return state
+        except Exception as e:
+            logger.warning(f"Shared state unavailable for circuit breaker '{self.name}': {e}")
+            return None
+    
+    def _set_open(self, opened_at: float):
+        if self._state != CircuitBreakerState.OPEN:
+            self.circuit_opens += 1
+        self._state = CircuitBreakerState.OPEN
+        self._opened_at = opened_at
+    
+    def _enter_half_open(self):
+        self._state = CircuitBreakerState.HALF_OPEN
+        self.success_count = 0
+        logger.info(f"Circuit breaker '{self.name}' entering half-open state")
+    
+    def _set_closed(self):
+        if self._state != CircuitBreakerState.CLOSED:
+            self.window.reset()
+        self._state = CircuitBreakerState.CLOSED
+        self.success_count = 0
     
     def _next_attempt_time(self) -> datetime:
         """Calculate next attempt time"""
-        if not self.last_failure_time:
-            return datetime.now()
-            
-        return self.last_failure_time + timedelta(seconds=self.recovery_timeout)
+        remaining = max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        return datetime.fromtimestamp(time.time() + remaining)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get circuit breaker statistics"""
+        successes, failures = self.window.totals()
+        window_calls = successes + failures
         return {
             'name': self.name,
             'state': self._state,
-            'failure_count': self.failure_count,
+            'failure_count': failures,
+            'window_calls': window_calls,
+            'window_failure_rate': failures / window_calls if window_calls else 0,
+            'half_open_probes': self._probes_in_flight,
+            'shared': self.shared_state is not None,
             'total_calls': self.total_calls,
             'total_failures': self.total_failures,
             'total_successes': self.total_successes,
+            'rejected_calls': self.rejected_calls,
             'circuit_opens': self.circuit_opens,
             'success_rate': self.total_successes / self.total_calls if self.total_calls > 0 else 0,
+            'next_attempt_time': (
+                self._next_attempt_time().isoformat()
+                if self._state == CircuitBreakerState.OPEN else None
+            ),
             'last_failure_time': self.last_failure_time.isoformat() if self.last_failure_time else None,
             'last_success_time': self.last_success_time.isoformat() if self.last_success_time else None
         }
     
     async def reset(self):
         """Manually reset circuit breaker"""
-        async with self._lock:
-            self._state = CircuitBreakerState.CLOSED
-            self.failure_count = 0
-            self.success_count = 0
-            logger.info(f"Circuit breaker '{self.name}' manually reset")
+        self._set_closed()
+        self.window.reset()
+        if self.shared_state is not None:
+            await self._shared_transition('reset')
+        logger.info(f"Circuit breaker '{self.name}' manually reset")
 
 
 class CircuitBreakerManager:
     """Manage circuit breakers for different services"""
     
-    def __init__(self):
+    def __init__(self, redis=None):
+        # With a Redis client, breaker state is shared across processes
+        self.shared_state = SharedCircuitState(redis) if redis is not None else None
         self.breakers: Dict[str, CircuitBreaker] = {
             'default': CircuitBreaker(
                 name='default',
                 failure_threshold=5,
-                recovery_timeout=60
+                recovery_timeout=60,
+                shared_state=self.shared_state
             ),
             'comfyui': CircuitBreaker(
                 name='comfyui',
                 failure_threshold=3,
                 recovery_timeout=30,
-                success_threshold=2
+                success_threshold=2,
+                shared_state=self.shared_state
             ),
             'storage': CircuitBreaker(
                 name='storage',
                 failure_threshold=5,
                 recovery_timeout=60,
-                success_threshold=3
+                success_threshold=3,
+                shared_state=self.shared_state
             ),
             'gpu_allocation': CircuitBreaker(
                 name='gpu_allocation',
                 failure_threshold=2,
                 recovery_timeout=120,
-                success_threshold=1
+                success_threshold=1,
+                shared_state=self.shared_state
             ),
             'external_api': CircuitBreaker(
                 name='external_api',
                 failure_threshold=4,
                 recovery_timeout=45,
-                success_threshold=2
+                success_threshold=2,
+                shared_state=self.shared_state
             )
         }
     
@@ -204,7 +489,8 @@ class CircuitBreakerManager:
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         expected_exception: Type[Exception] = Exception,
-        success_threshold: int = 2
+        success_threshold: int = 2,
+        **options
     ) -> CircuitBreaker:
         """Add a new circuit breaker"""
         breaker = CircuitBreaker(
@@ -212,7 +498,9 @@ class CircuitBreakerManager:
             failure_threshold=failure_threshold,
             recovery_timeout=recovery_timeout,
             expected_exception=expected_exception,
-            success_threshold=success_threshold
+            success_threshold=success_threshold,
+            shared_state=self.shared_state,
+            **options
         )
         self.breakers[service] = breaker
         return breaker
@@ -1,13 +1,37 @@
 """Error classification system"""
 
 import re
+import threading
 import traceback
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from .models import ErrorClassification, ErrorCategory, RecoveryStrategy, ErrorSeverity
 
 
+# Parts of a message that vary between repeats of the same error. Paths only
+# count as whole tokens, so words joined by a slash stay in the template.
+_VOLATILE = re.compile(
+    r"""(?<![^\s'"(])(?:[a-z]:)?[\\/][^\s'"]*"""  # file paths
+    r'|\b0x[0-9a-f]+'                              # addresses
+    r'|\d+(?:\.\d+)?'                              # numbers
+)
+
+
+def normalize_message(message: str) -> str:
+    """Message template with paths and numbers replaced, used as the cache key"""
+    return _VOLATILE.sub('#', message.lower())
+
+
+def _compile_categories(categories: Dict[ErrorCategory, Dict[str, Any]]) -> "re.Pattern":
+    """One alternation with a named group per category, in priority order"""
+    return re.compile('|'.join(
+        f"(?P<{category.value}>{'|'.join(config['patterns'])})"
+        for category, config in categories.items()
+    ))
+
+
 class ErrorClassifier:
     """Classify errors and determine recovery strategies"""
     
@@ -86,27 +110,28 @@ class ErrorClassifier:
         'NotImplementedError': ErrorCategory.PERMANENT
     }
     
+    CATEGORY_PATTERN = _compile_categories(ERROR_CATEGORIES)
+    CATEGORY_RANK = {category.value: rank for rank, category in enumerate(ERROR_CATEGORIES)}
+    
+    def __init__(self, cache_size: int = 4096):
+        # Repeats of an error differ only in numbers and paths; resolve each template once
+        self._cache_size = cache_size
+        self._categories: "OrderedDict[tuple, Optional[ErrorCategory]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
     def classify_error(self, error: Exception, context: Optional[Dict[str, Any]] = None) -> ErrorClassification:
         """Classify an error and determine recovery strategy"""
-        error_str = str(error).lower()
+        message = str(error)
         error_type = type(error).__name__
         
-        # First check exception type mapping
-        if error_type in self.EXCEPTION_TYPE_MAPPING:
-            category = self.EXCEPTION_TYPE_MAPPING[error_type]
-            config = self.ERROR_CATEGORIES[category]
+        category = self._resolve_category(error_type, message)
+        if category is not None:
             return self._create_classification(
-                category, config, error_type, str(error), context
+                category, self.ERROR_CATEGORIES[category], error_type, message, context
             )
         
-        # Check against known patterns
-        for category, config in self.ERROR_CATEGORIES.items():
-            for pattern in config['patterns']:
-                if re.search(pattern, error_str, re.IGNORECASE):
-                    return self._create_classification(
-                        category, config, error_type, str(error), context
-                    )
-        
         # Default classification for unknown errors
         return ErrorClassification(
             category=ErrorCategory.UNKNOWN,
@@ -118,6 +143,38 @@ class ErrorClassifier:
             metadata=self._extract_metadata(error, context)
         )
     
+    def _resolve_category(self, error_type: str, message: str) -> Optional[ErrorCategory]:
+        """Category cached under the message template, matched against the message itself"""
+        key = (error_type, normalize_message(message))
+        with self._cache_lock:
+            if key in self._categories:
+                self._cache_hits += 1
+                self._categories.move_to_end(key)
+                return self._categories[key]
+            self._cache_misses += 1
+        
+        category = self._match_category(error_type, message.lower())
+        with self._cache_lock:
+            self._categories[key] = category
+            if len(self._categories) > self._cache_size:
+                self._categories.popitem(last=False)
+        return category
+    
+    def _match_category(self, error_type: str, message: str) -> Optional[ErrorCategory]:
+        """Category from the exception type, else the highest-priority pattern found"""
+        # First check exception type mapping
+        if error_type in self.EXCEPTION_TYPE_MAPPING:
+            return self.EXCEPTION_TYPE_MAPPING[error_type]
+        
+        # Single pass over the message; the earliest category listed wins
+        best = None
+        for match in self.CATEGORY_PATTERN.finditer(message):
+            if best is None or self.CATEGORY_RANK[match.lastgroup] < self.CATEGORY_RANK[best]:
+                best = match.lastgroup
+                if self.CATEGORY_RANK[best] == 0:
+                    break
+        return None if best is None else ErrorCategory(best)
+    
     def _create_classification(
         self,
         category: ErrorCategory,
@@ -205,4 +262,14 @@ class ErrorClassifier:
                 'severity': config.get('severity', ErrorSeverity.MEDIUM)
             }
             
-        return stats
\ No newline at end of file
+        return stats
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Hit and miss counts of the classification cache"""
+        with self._cache_lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'size': len(self._categories),
+                'max_size': self._cache_size
+            }
\ No newline at end of file
@@ -1,11 +1,20 @@
 """Compensation and rollback mechanisms"""
 
 import asyncio
+import json
 import logging
-from typing import Dict, Any, Callable, Optional, List
+import socket
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Callable, Deque, Optional, List
 from datetime import datetime
 import os
 
+import psutil
+
 from .models import CompensationResult
 
 logger = logging.getLogger(__name__)
@@ -27,11 +36,192 @@ class Operation:
         self.timestamp = timestamp or datetime.now()
 
 
+_SAGA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saga_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    saga_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    operation_id TEXT,
+    operation_type TEXT,
+    data TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_saga_events_saga ON saga_events (saga_id);
+"""
+
+# Events that close a saga; anything else is still in flight
+SAGA_BEGIN = 'begin'
+SAGA_STEP = 'step'
+SAGA_COMPLETED = 'completed'
+SAGA_COMPENSATED = 'compensated'
+SAGA_COMPENSATION_FAILED = 'compensation_failed'
+
+
+def _process_owner() -> Dict[str, Any]:
+    """Identify this process; the start time tells a reused pid apart"""
+    process = psutil.Process()
+    return {
+        'host': socket.gethostname(),
+        'pid': process.pid,
+        'started': process.create_time()
+    }
+
+
+def _owner_alive(owner: Optional[Dict[str, Any]]) -> bool:
+    """Whether the process that began a saga is still running"""
+    if not owner:
+        return False
+    if owner.get('host') != socket.gethostname():
+        # Processes on other hosts can't be checked from here; leave them theirs.
+        # A container re-created under a new hostname counts as another host,
+        # so deployments sharing the log need stable hostnames (see README).
+        return True
+    try:
+        started = psutil.Process(owner['pid']).create_time()
+    except psutil.NoSuchProcess:
+        return False
+    except psutil.AccessDenied:
+        return True
+    return abs(started - owner.get('started', 0)) < 1.0
+
+
+class SagaLog:
+    """
+    Append-only SQLite log of multi-step operations.
+    
+    Every completed step is committed (WAL, synchronous=FULL) before the
+    caller moves on, so after a crash the sagas without a closing event list
+    exactly the side effects that still need compensating. The log may be
+    shared by several processes, so each saga records the process that began
+    it and only sagas whose process is gone are handed to recovery.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path,
+        retention_seconds: float = 86400,
+        compact_every: int = 1000
+    ):
+        self.db_path = Path(db_path)
+        self.retention_seconds = retention_seconds
+        self.compact_every = compact_every
+        
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        if str(self.db_path) != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SAGA_SCHEMA)
+        self._finished = 0
+        self._owner = _process_owner()
+        # Writes come from worker threads; one transaction at a time
+        self._lock = threading.Lock()
+    
+    def close(self):
+        self._conn.close()
+    
+    def _append(
+        self,
+        saga_id: str,
+        kind: str,
+        operation: Optional[Operation] = None,
+        data: Optional[Dict[str, Any]] = None
+    ):
+        if operation:
+            data = operation.data
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO saga_events (saga_id, kind, operation_id, operation_type, "
+                "data, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    saga_id,
+                    kind,
+                    operation.operation_id if operation else None,
+                    operation.type if operation else None,
+                    json.dumps(data, default=str) if data is not None else None,
+                    time.time()
+                )
+            )
+    
+    def begin(self, saga_id: str):
+        # The begin event carries its owner, so recovery can skip live sagas
+        self._append(saga_id, SAGA_BEGIN, data=self._owner)
+    
+    def record_step(self, saga_id: str, operation: Operation):
+        self._append(saga_id, SAGA_STEP, operation)
+    
+    def finish(self, saga_id: str, status: str):
+        self._append(saga_id, status)
+        self._finished += 1
+        if self._finished % self.compact_every == 0:
+            self.compact()
+    
+    def incomplete(self) -> Dict[str, List[Operation]]:
+        """
+        Steps of every saga without a closing event whose process is gone,
+        in the order they ran.
+        """
+        open_sagas = (
+            "SELECT saga_id FROM saga_events GROUP BY saga_id "
+            "HAVING SUM(kind NOT IN (?, ?)) = 0"
+        )
+        with self._lock:
+            owners = self._conn.execute(
+                "SELECT saga_id, data FROM saga_events "
+                f"WHERE kind = ? AND saga_id IN ({open_sagas})",
+                (SAGA_BEGIN, SAGA_BEGIN, SAGA_STEP)
+            ).fetchall()
+            rows = self._conn.execute(
+                "SELECT saga_id, operation_id, operation_type, data, recorded_at "
+                f"FROM saga_events WHERE kind = ? AND saga_id IN ({open_sagas}) ORDER BY id",
+                (SAGA_STEP, SAGA_BEGIN, SAGA_STEP)
+            ).fetchall()
+        
+        # Sagas that stopped before their first step have nothing to undo,
+        # but are still listed so recovery closes them
+        sagas: Dict[str, List[Operation]] = {
+            saga_id: [] for saga_id, owner in owners
+            if not _owner_alive(json.loads(owner) if owner else None)
+        }
+        for saga_id, operation_id, operation_type, data, recorded_at in rows:
+            if saga_id not in sagas:
+                continue
+            sagas[saga_id].append(Operation(
+                operation_id=operation_id,
+                operation_type=operation_type,
+                data=json.loads(data),
+                timestamp=datetime.fromtimestamp(recorded_at)
+            ))
+        return sagas
+    
+    def compact(self):
+        """Drop finished sagas older than the retention period"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM saga_events WHERE saga_id IN ("
+                "  SELECT saga_id FROM saga_events GROUP BY saga_id"
+                "  HAVING SUM(kind NOT IN (?, ?)) > 0 AND MAX(recorded_at) < ?"
+                ")",
+                (SAGA_BEGIN, SAGA_STEP, cutoff)
+            )
+
+
 class CompensationManager:
     """Handle compensation logic for failed operations"""
     
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        history_size: int = 1000,
+        max_failure_records: int = 1000,
+        recovery_concurrency: int = 8
+    ):
         self.storage_path = storage_path
+        # Without a storage path sagas are only compensated in-process
+        self.saga_log = SagaLog(Path(storage_path)) if storage_path else None
+        self.recovery_concurrency = recovery_concurrency
         self.compensation_handlers: Dict[str, Callable] = {
             'file_upload': self._compensate_file_upload,
             'resource_allocation': self._compensate_resource_allocation,
@@ -41,8 +231,11 @@ class CompensationManager:
             'database_write': self._compensate_database_write,
             'queue_operation': self._compensate_queue_operation
         }
-        self.compensation_history: List[CompensationResult] = []
-        self._failed_compensations: List[Dict[str, Any]] = []
+        self.compensation_history: Deque[CompensationResult] = deque(maxlen=history_size)
+        self._failed_compensations: Deque[Dict[str, Any]] = deque(maxlen=max_failure_records)
+        # Running totals, since the history only keeps the latest results
+        self._total_compensations = 0
+        self._successful_compensations = 0
     
     async def compensate(
         self,
@@ -70,7 +263,7 @@ class CompensationManager:
                 f"{result.action_taken}"
             )
             
-            self.compensation_history.append(result)
+            self._record_result(result)
             return result
             
         except Exception as comp_error:
@@ -86,9 +279,90 @@ class CompensationManager:
                 error=str(comp_error)
             )
             
-            self.compensation_history.append(result)
+            self._record_result(result)
             return result
     
+    def _record_result(self, result: CompensationResult):
+        self.compensation_history.append(result)
+        self._total_compensations += 1
+        if result.success:
+            self._successful_compensations += 1
+    
+    async def begin_saga(self, saga_id: str):
+        """Start logging a multi-step operation"""
+        if self.saga_log:
+            await asyncio.to_thread(self.saga_log.begin, saga_id)
+    
+    async def record_step(self, saga_id: str, operation: Operation):
+        """
+        Log a completed step before the saga moves on to the next one.
+        
+        The commit fsyncs, so it runs in a worker thread off the event loop.
+        """
+        if self.saga_log:
+            await asyncio.to_thread(self.saga_log.record_step, saga_id, operation)
+    
+    async def complete_saga(self, saga_id: str):
+        """Mark a saga as finished so recovery leaves its steps alone"""
+        if self.saga_log:
+            await asyncio.to_thread(self.saga_log.finish, saga_id, SAGA_COMPLETED)
+    
+    async def compensate_saga(
+        self,
+        saga_id: str,
+        operations: List[Operation],
+        error: Exception
+    ) -> List[CompensationResult]:
+        """Compensate a saga's steps in reverse order and close it in the log"""
+        results = []
+        for operation in reversed(operations):
+            results.append(await self.compensate(operation, error))
+        
+        if self.saga_log:
+            status = (
+                SAGA_COMPENSATED if all(r.success for r in results)
+                else SAGA_COMPENSATION_FAILED
+            )
+            await asyncio.to_thread(self.saga_log.finish, saga_id, status)
+        return results
+    
+    async def recover_incomplete_sagas(self) -> Dict[str, List[CompensationResult]]:
+        """
+        Compensate sagas left open by a process that is no longer running.
+        
+        Sagas are independent, so they are replayed concurrently (at most
+        ``recovery_concurrency`` at a time); steps within a saga still run
+        in reverse order.
+        """
+        if not self.saga_log:
+            return {}
+        
+        sagas = await asyncio.to_thread(self.saga_log.incomplete)
+        if not sagas:
+            return {}
+        
+        logger.warning(f"Compensating {len(sagas)} sagas left incomplete by a stopped process")
+        semaphore = asyncio.Semaphore(self.recovery_concurrency)
+        
+        async def replay(saga_id: str, operations: List[Operation]):
+            async with semaphore:
+                error = RuntimeError(f"Process stopped before saga {saga_id} finished")
+                try:
+                    return saga_id, await self.compensate_saga(saga_id, operations, error)
+                except Exception as e:
+                    logger.error(f"Failed to recover saga {saga_id}: {e}")
+                    return saga_id, []
+        
+        results = await asyncio.gather(
+            *(replay(saga_id, operations) for saga_id, operations in sagas.items())
+        )
+        await asyncio.to_thread(self.saga_log.compact)
+        return dict(results)
+    
+    def close(self):
+        if self.saga_log:
+            self.saga_log.close()
+    
     async def _compensate_file_upload(
         self,
         operation: Operation,
@@ -380,8 +654,8 @@ class CompensationManager:
     
     def get_compensation_stats(self) -> Dict[str, Any]:
         """Get compensation statistics"""
-        total = len(self.compensation_history)
-        successful = sum(1 for r in self.compensation_history if r.success)
+        total = self._total_compensations
+        successful = self._successful_compensations
         
         return {
             'total_compensations': total,
@@ -393,4 +667,4 @@ class CompensationManager:
     
     def get_failed_compensations(self) -> List[Dict[str, Any]]:
         """Get list of failed compensations requiring manual intervention"""
-        return self._failed_compensations.copy()
\ No newline at end of file
+        return list(self._failed_compensations)
\ No newline at end of file
@@ -1,17 +1,134 @@
-"""Error context management"""
+"""
+Error context management
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+Contexts and histories live in one LRU- and TTL-bounded in-memory tier.
+Entries pushed out of it are spilled to Redis hashes when a client is
+configured, so memory stays flat however many tasks run. A task that comes
+back after its spill was written starts a new in-memory history, which is
+appended to the spilled one rather than replacing it. Errors are also
+indexed in time order, so recent-error queries read only what they return.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 from .models import ErrorContext, ErrorHistory, ErrorClassification, RecoveryResult
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """Everything held in memory for one task"""
+    context: Optional[ErrorContext] = None
+    history: Optional[ErrorHistory] = None
+    touched: float = 0.0  # monotonic time of the last access
+    size: int = 0  # serialized bytes, for footprint metrics
+    # Started in memory while an earlier history may already be in Redis
+    merge: bool = False
+
+
+def _merge_histories(stored: ErrorHistory, recent: ErrorHistory) -> ErrorHistory:
+    """A spilled history followed by what the task recorded since it came back"""
+    return ErrorHistory(
+        task_id=recent.task_id,
+        errors=stored.errors + recent.errors,
+        recovery_attempts=stored.recovery_attempts + recent.recovery_attempts,
+        total_retries=stored.total_retries + recent.total_retries,
+        last_error_time=recent.last_error_time or stored.last_error_time
+    )
+
 
 class ErrorContextManager:
     """Manage error contexts for tasks"""
     
-    def __init__(self):
-        self._contexts: Dict[str, ErrorContext] = {}
-        self._histories: Dict[str, ErrorHistory] = {}
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 24 * 3600,
+        redis=None,
+        key_prefix: str = "error_context",
+        spill_ttl_seconds: int = 7 * 24 * 3600,
+        recent_index_size: int = 10000,
+        flush_interval: float = 5.0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.flush_interval = flush_interval
+        
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Evicted entries waiting to be written to Redis
+        self._spill: "OrderedDict[str, _Entry]" = OrderedDict()
+        # (timestamp, task_id, classification), oldest first
+        self._recent: deque = deque(maxlen=recent_index_size)
+        self._bytes = 0
+        self._evicted = 0
+        self._expired = 0
+        self._spilled = 0
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def _entry(self, task_id: str, create: bool = False) -> Optional[_Entry]:
+        """Look up an entry and mark it as recently used"""
+        entry = self._entries.get(task_id)
+        now = time.monotonic()
+        
+        if entry is not None and now - entry.touched > self.ttl_seconds:
+            self._remove(task_id, expired=True)
+            entry = None
+        
+        if entry is None:
+            if not create:
+                return None
+            # A task coming back before its spill was written picks up where it was
+            entry = self._spill.pop(task_id, None) or _Entry(merge=self.redis is not None)
+            entry.touched = now
+            self._entries[task_id] = entry
+            self._bytes += entry.size
+            self._evict(now)
+        else:
+            entry.touched = now
+            self._entries.move_to_end(task_id)
+        
+        return entry
+    
+    def _evict(self, now: float):
+        """Drop expired entries from the cold end, then enforce the size limit"""
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            task_id, entry = next(iter(self._entries.items()))
+            if entry.touched >= cutoff:
+                break
+            self._remove(task_id, expired=True)
+        
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+    
+    def _remove(self, task_id: str, expired: bool = False):
+        entry = self._entries.pop(task_id)
+        self._bytes -= entry.size
+        if expired:
+            self._expired += 1
+        else:
+            self._evicted += 1
+        
+        if self.redis is not None:
+            self._spill[task_id] = entry
+            # Keep the buffer bounded if Redis falls behind
+            while len(self._spill) > self.max_entries:
+                self._spill.popitem(last=False)
+    
+    def _grow(self, entry: _Entry, record) -> None:
+        size = len(record.model_dump_json())
+        entry.size += size
+        self._bytes += size
     
     def create_context(
         self,
@@ -31,17 +148,20 @@ class ErrorContextManager:
             metadata=metadata or {}
         )
         
-        self._contexts[task_id] = context
+        entry = self._entry(task_id, create=True)
+        entry.context = context
+        self._grow(entry, context)
         
         # Initialize history if not exists
-        if task_id not in self._histories:
-            self._histories[task_id] = ErrorHistory(task_id=task_id)
+        if entry.history is None:
+            entry.history = ErrorHistory(task_id=task_id)
             
         return context
     
     def get_context(self, task_id: str) -> Optional[ErrorContext]:
         """Get error context for a task"""
-        return self._contexts.get(task_id)
+        entry = self._entry(task_id)
+        return entry.context if entry else None
     
     def update_context(
         self, 
@@ -50,7 +170,7 @@ class ErrorContextManager:
         metadata_update: Optional[Dict[str, Any]] = None
     ) -> Optional[ErrorContext]:
         """Update error context"""
-        context = self._contexts.get(task_id)
+        context = self.get_context(task_id)
         if not context:
             return None
             
@@ -62,19 +182,23 @@ class ErrorContextManager:
             
         return context
     
+    def _history(self, task_id: str) -> Tuple[_Entry, ErrorHistory]:
+        entry = self._entry(task_id, create=True)
+        if entry.history is None:
+            entry.history = ErrorHistory(task_id=task_id)
+        return entry, entry.history
+    
     def add_error_to_history(
         self, 
         task_id: str, 
         classification: ErrorClassification
     ):
         """Add error to task history"""
-        history = self._histories.get(task_id)
-        if not history:
-            history = ErrorHistory(task_id=task_id)
-            self._histories[task_id] = history
-            
+        entry, history = self._history(task_id)
         history.errors.append(classification)
         history.last_error_time = datetime.now()
+        self._grow(entry, classification)
+        self._recent.append((classification.timestamp, task_id, classification))
     
     def add_recovery_attempt(
         self,
@@ -82,18 +206,38 @@ class ErrorContextManager:
         result: RecoveryResult
     ):
         """Add recovery attempt to history"""
-        history = self._histories.get(task_id)
-        if not history:
-            history = ErrorHistory(task_id=task_id)
-            self._histories[task_id] = history
-            
+        entry, history = self._history(task_id)
         history.recovery_attempts.append(result)
         if result.action == 'retry_scheduled':
             history.total_retries += 1
+        self._grow(entry, result)
     
     def get_history(self, task_id: str) -> Optional[ErrorHistory]:
-        """Get error history for a task"""
-        return self._histories.get(task_id)
+        """Get error history for a task held in memory or waiting to be spilled"""
+        entry = self._entry(task_id) or self._spill.get(task_id)
+        return entry.history if entry else None
+    
+    async def fetch_history(self, task_id: str) -> Optional[ErrorHistory]:
+        """Get error history for a task, reading spilled histories back from Redis"""
+        entry = self._entry(task_id) or self._spill.get(task_id)
+        history = entry.history if entry else None
+        if self.redis is None or (history is not None and not entry.merge):
+            return history
+        
+        data = await self.redis.hget(self._key(task_id), 'history')
+        if not data:
+            return history
+        stored = ErrorHistory.model_validate_json(data)
+        if history is None:
+            return stored
+        
+        # Complete the in-memory history so later reads and spills carry it all
+        entry.history = _merge_histories(stored, history)
+        entry.merge = False
+        entry.size += len(data)
+        if task_id in self._entries:
+            self._bytes += len(data)
+        return entry.history
     
     def get_recent_errors(
         self, 
@@ -101,35 +245,130 @@ class ErrorContextManager:
         minutes: int = 5
     ) -> List[ErrorClassification]:
         """Get recent errors for a task"""
-        history = self._histories.get(task_id)
+        history = self.get_history(task_id)
         if not history:
             return []
-            
-        cutoff_time = datetime.now().timestamp() - (minutes * 60)
-        return [
-            error for error in history.errors
-            if error.timestamp.timestamp() > cutoff_time
-        ]
+        
+        # Errors are appended in time order: walk back to the cutoff only
+        cutoff = datetime.now() - timedelta(minutes=minutes)
+        recent = []
+        for error in reversed(history.errors):
+            if error.timestamp <= cutoff:
+                break
+            recent.append(error)
+        recent.reverse()
+        return recent
+    
+    def get_recent_errors_all(
+        self,
+        minutes: int = 5,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, ErrorClassification]]:
+        """Most recent errors across all tasks as (task_id, classification), newest first"""
+        cutoff = datetime.now() - timedelta(minutes=minutes)
+        recent = []
+        for timestamp, task_id, classification in reversed(self._recent):
+            if timestamp <= cutoff or (limit is not None and len(recent) >= limit):
+                break
+            recent.append((task_id, classification))
+        return recent
     
     def cleanup_old_contexts(self, hours: int = 24):
         """Clean up old contexts"""
-        cutoff_time = datetime.now().timestamp() - (hours * 3600)
+        cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        # Clean up contexts
-        old_contexts = [
-            task_id for task_id, context in self._contexts.items()
-            if context.start_time.timestamp() < cutoff_time
-        ]
+        for task_id, entry in list(self._entries.items()):
+            if entry.context and entry.context.start_time < cutoff_time:
+                entry.context = None
+            if entry.history and entry.history.last_error_time and \
+                    entry.history.last_error_time < cutoff_time:
+                entry.history = None
+            if entry.context is None and entry.history is None:
+                self._entries.pop(task_id)
+                self._bytes -= entry.size
         
-        for task_id in old_contexts:
-            del self._contexts[task_id]
+        self._evict(time.monotonic())
+    
+    def _key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:{task_id}"
+    
+    async def flush(self) -> int:
+        """Write evicted entries to Redis hashes; returns how many were written"""
+        if self.redis is None or not self._spill:
+            return 0
+        
+        spill, self._spill = self._spill, OrderedDict()
+        try:
+            await self._merge_stored_histories(spill)
             
-        # Clean up histories
-        old_histories = [
-            task_id for task_id, history in self._histories.items()
-            if history.last_error_time and 
-            history.last_error_time.timestamp() < cutoff_time
-        ]
-        
-        for task_id in old_histories:
-            del self._histories[task_id]
\ No newline at end of file
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id, entry in spill.items():
+                fields = {}
+                if entry.context is not None:
+                    fields['context'] = entry.context.model_dump_json()
+                if entry.history is not None:
+                    fields['history'] = entry.history.model_dump_json()
+                if fields:
+                    pipe.hset(self._key(task_id), mapping=fields)
+                    pipe.expire(self._key(task_id), self.spill_ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to spill {len(spill)} error contexts to Redis: {e}")
+            # Keep them for the next flush, behind anything evicted since
+            spill.update(self._spill)
+            self._spill = spill
+            return 0
+        
+        self._spilled += len(spill)
+        return len(spill)
+    
+    async def _merge_stored_histories(self, spill: "OrderedDict[str, _Entry]"):
+        """Prepend histories already in Redis to entries that restarted in memory"""
+        task_ids = [task_id for task_id, entry in spill.items()
+                    if entry.merge and entry.history is not None]
+        if not task_ids:
+            return
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hget(self._key(task_id), 'history')
+        for task_id, data in zip(task_ids, await pipe.execute()):
+            entry = spill[task_id]
+            if data:
+                entry.history = _merge_histories(ErrorHistory.model_validate_json(data), entry.history)
+            entry.merge = False
+    
+    async def start(self):
+        """Start spilling evicted entries in the background"""
+        if self.redis is not None and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        """Stop the background spill, writing anything still pending"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Footprint of the in-memory tier"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'estimated_bytes': self._bytes,
+            'recent_index_size': len(self._recent),
+            'pending_spill': len(self._spill),
+            'evicted': self._evicted,
+            'expired': self._expired,
+            'spilled': self._spilled
+        }
@@ -2,10 +2,11 @@
 
 import asyncio
 import logging
+import uuid
 from typing import Dict, Any, Optional, Callable
 
 from .classifier import ErrorClassifier
-from .recovery import RecoveryManager
+from .recovery import RecoveryManager, RetryScheduler
 from .circuit_breaker import CircuitBreakerManager, CircuitBreakerOpenError
 from .compensation import CompensationManager, Operation
 from .analytics import ErrorAnalytics
@@ -29,14 +30,25 @@ class ErrorHandlingIntegration:
         worker_manager=None,
         queue_manager=None,
         resource_monitor=None,
-        storage_manager=None
+        storage_manager=None,
+        redis=None,
+        saga_log_path: Optional[str] = None
     ):
         # Initialize components
         self.classifier = ErrorClassifier()
-        self.circuit_breakers = CircuitBreakerManager()
-        self.compensation = CompensationManager()
-        self.analytics = ErrorAnalytics(alert_service)
-        self.context_manager = ErrorContextManager()
+        # Breaker state is shared across API processes when Redis is given
+        self.circuit_breakers = CircuitBreakerManager(redis=redis)
+        # Steps of multi-step operations are logged so a restart can undo them
+        self.compensation = CompensationManager(storage_path=saga_log_path)
+        self.analytics = ErrorAnalytics(alert_service, redis=redis)
+        # Evicted contexts and histories spill to Redis when it is available
+        self.context_manager = ErrorContextManager(redis=redis)
+        
+        # Delayed retries are kept in Redis when it is available
+        self.retry_scheduler = (
+            RetryScheduler(redis, task_queue) if redis is not None and task_queue is not None
+            else None
+        )
         
         # Initialize recovery manager
         self.recovery = RecoveryManager(
@@ -44,7 +56,9 @@ class ErrorHandlingIntegration:
             resource_queue=resource_queue,
             dead_letter_queue=dead_letter_queue,
             notification_service=notification_service,
-            alert_service=alert_service
+            alert_service=alert_service,
+            retry_scheduler=self.retry_scheduler,
+            context_manager=self.context_manager
         )
         
         # Initialize self-healing
@@ -64,9 +78,18 @@ class ErrorHandlingIntegration:
             
         self._running = True
         
+        # Undo whatever a crashed process left half done
+        await self.compensation.recover_incomplete_sagas()
+        
         # Start self-healing
         await self.self_healing.start()
         
+        if self.retry_scheduler:
+            await self.retry_scheduler.start()
+        
+        await self.context_manager.start()
+        await self.analytics.start()
+        
         # Start periodic cleanup
         asyncio.create_task(self._periodic_cleanup())
         
@@ -79,6 +102,12 @@ class ErrorHandlingIntegration:
         # Stop self-healing
         await self.self_healing.stop()
         
+        if self.retry_scheduler:
+            await self.retry_scheduler.stop()
+        
+        await self.context_manager.stop()
+        await self.analytics.stop()
+        
         logger.info("Error handling integration stopped")
     
     async def wrap_task_execution(
@@ -99,6 +128,8 @@ class ErrorHandlingIntegration:
             original_task=task_data
         )
         
+        self.analytics.record_request()
+        
         # Get circuit breaker for service
         service_name = task_data.get('service', 'default')
         breaker = self.circuit_breakers.get_breaker(service_name)
@@ -219,6 +250,7 @@ class ErrorHandlingIntegration:
             'recovery': recovery_stats,
             'compensation': compensation_stats,
             'self_healing': healing_stats,
+            'error_contexts': self.context_manager.get_memory_stats(),
             'health_status': self.circuit_breakers.get_health_status()
         }
     
@@ -287,6 +319,7 @@ class ErrorHandlingContext:
         self.task_data = task_data
         self.context = None
         self.operations = []
+        self.saga_id = f"{task_id}:{uuid.uuid4().hex}"
     
     async def __aenter__(self):
         """Enter context"""
@@ -296,6 +329,7 @@ class ErrorHandlingContext:
             operation_type=self.operation_type,
             original_task=self.task_data
         )
+        await self.error_handler.compensation.begin_saga(self.saga_id)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -308,15 +342,17 @@ class ErrorHandlingContext:
             )
             
             # Compensate operations
-            for operation in reversed(self.operations):
-                await self.error_handler.compensation.compensate(
-                    operation,
-                    exc_val
-                )
+            await self.error_handler.compensation.compensate_saga(
+                self.saga_id,
+                self.operations,
+                exc_val
+            )
+        else:
+            await self.error_handler.compensation.complete_saga(self.saga_id)
         
         return False  # Don't suppress exceptions
     
-    def record_operation(
+    async def record_operation(
         self,
         operation_type: str,
         data: Dict[str, Any]
@@ -327,4 +363,5 @@ class ErrorHandlingContext:
             operation_type=operation_type,
             data=data
         )
-        self.operations.append(operation)
\ No newline at end of file
+        self.operations.append(operation)
+        await self.error_handler.compensation.record_step(self.saga_id, operation)
\ No newline at end of file
@@ -1,8 +1,11 @@
 """Recovery strategy implementations"""
 
 import asyncio
+import json
 import random
 import logging
+import time
+import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
@@ -30,14 +33,108 @@ class RecoveryStrategy(ABC):
         pass
 
 
+# Pops up to ARGV[2] retries due by ARGV[1] in one step, so schedulers in
+# several processes never submit the same retry twice.
+_POP_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+class RetryScheduler:
+    """
+    Durable delayed retries.
+    
+    Retries are members of a Redis sorted set scored by their due time, so
+    they survive an API restart and cost no coroutine while waiting. One
+    loop pops due retries in batches and submits them to the task queue.
+    """
+    
+    def __init__(
+        self,
+        redis,
+        task_queue,
+        key: str = "error_handling:retries",
+        batch_size: int = 100,
+        poll_interval: float = 0.5
+    ):
+        self.redis = redis
+        self.task_queue = task_queue
+        self.key = key
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._pop_due = redis.register_script(_POP_DUE_SCRIPT)
+        self._loop_task: Optional[asyncio.Task] = None
+    
+    async def schedule(self, task: Dict[str, Any], delay: float):
+        """Store a retry to be submitted after ``delay`` seconds"""
+        # The ID keeps identical payloads from collapsing into one member
+        member = json.dumps({'id': uuid.uuid4().hex, 'task': task}, default=str)
+        await self.redis.zadd(self.key, {member: time.time() + delay})
+    
+    async def run_due(self, now: Optional[float] = None) -> int:
+        """Submit one batch of due retries; returns how many were popped"""
+        due = await self._pop_due(
+            keys=[self.key],
+            args=[time.time() if now is None else now, self.batch_size]
+        )
+        
+        for member in due:
+            task = json.loads(member)['task']
+            try:
+                await self.task_queue.submit(task)
+            except Exception as e:
+                # Popped but not submitted: put it back rather than lose it
+                logger.error(f"Failed to submit retry {task.get('task_id')}: {e}")
+                await self.redis.zadd(self.key, {member: time.time() + self.poll_interval * 10})
+        
+        return len(due)
+    
+    async def pending(self) -> int:
+        """Number of retries waiting in Redis"""
+        return await self.redis.zcard(self.key)
+    
+    async def start(self):
+        """Start the scheduler loop"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the scheduler loop; pending retries stay in Redis"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                # A full batch means more may be due already
+                if await self.run_due() < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Retry scheduler error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+
 class RetryWithBackoffStrategy(RecoveryStrategy):
     """Retry with exponential backoff"""
     
-    def __init__(self, task_queue=None):
+    def __init__(self, task_queue=None, scheduler: Optional[RetryScheduler] = None):
         self.base_delay = 1.0  # seconds
         self.max_delay = 60.0
         self.jitter_factor = 0.1
         self.task_queue = task_queue
+        # Without a scheduler retries wait in memory and are lost on restart
+        self.scheduler = scheduler
     
     async def recover(
         self,
@@ -81,7 +178,10 @@ class RetryWithBackoffStrategy(RecoveryStrategy):
             retry_task['retry_delay'] = delay
             
             # Schedule task after delay
-            asyncio.create_task(self._delayed_submit(retry_task, delay))
+            if self.scheduler:
+                await self.scheduler.schedule(retry_task, delay)
+            else:
+                asyncio.create_task(self._delayed_submit(retry_task, delay))
         
         return RecoveryResult(
             success=True,
@@ -235,19 +335,23 @@ class RecoveryManager:
         resource_queue=None,
         dead_letter_queue=None,
         notification_service=None,
-        alert_service=None
+        alert_service=None,
+        retry_scheduler: Optional[RetryScheduler] = None,
+        context_manager: Optional[ErrorContextManager] = None
     ):
         self.strategies = {
-            RecoveryStrategyEnum.RETRY_WITH_BACKOFF: RetryWithBackoffStrategy(task_queue),
+            RecoveryStrategyEnum.RETRY_WITH_BACKOFF: RetryWithBackoffStrategy(
+                task_queue, retry_scheduler
+            ),
             RecoveryStrategyEnum.QUEUE_AND_WAIT: QueueAndWaitStrategy(resource_queue),
             RecoveryStrategyEnum.FAIL_FAST: FailFastStrategy(notification_service),
             RecoveryStrategyEnum.DEAD_LETTER_QUEUE: DeadLetterQueueStrategy(
                 dead_letter_queue, alert_service
             ),
-            RecoveryStrategyEnum.RETRY_ONCE: RetryWithBackoffStrategy(task_queue)
+            RecoveryStrategyEnum.RETRY_ONCE: RetryWithBackoffStrategy(task_queue, retry_scheduler)
         }
         
-        self.context_manager = ErrorContextManager()
+        self.context_manager = context_manager or ErrorContextManager()
         self._recovery_metrics = {
             'total_attempts': 0,
             'successful_recoveries': 0,
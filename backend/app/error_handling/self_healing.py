@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Callable, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Callable, Awaitable, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import psutil
 
@@ -11,38 +13,110 @@ from .models import SystemIssue, HealingResult, HealingRecord, ErrorSeverity
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class DiagnosticCheck:
+    """A registered check with its own cadence and its last result"""
+    name: str
+    func: Callable[[], Awaitable[List[SystemIssue]]]
+    interval: float
+    timeout: float
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    issues: List[SystemIssue] = field(default_factory=list)
+    running: bool = False
+    
+    def is_due(self, now: float) -> bool:
+        return not self.running and (
+            self.last_run is None or now - self.last_run >= self.interval
+        )
+
+
 class SystemDiagnostics:
     """System health diagnostics"""
     
-    def __init__(self):
-        self.checks = {
-            'worker_health': self._check_worker_health,
-            'queue_depth': self._check_queue_depth,
-            'resource_usage': self._check_resource_usage,
-            'model_integrity': self._check_model_integrity,
-            'storage_space': self._check_storage_space,
-            'network_connectivity': self._check_network_connectivity,
-            'service_availability': self._check_service_availability
-        }
+    def __init__(self, max_concurrency: int = 4):
+        self.checks: Dict[str, DiagnosticCheck] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Cheap probes run often, scans of disks and models rarely
+        self.register_check('worker_health', self._check_worker_health, interval=30, timeout=10)
+        self.register_check('queue_depth', self._check_queue_depth, interval=15, timeout=5)
+        self.register_check('resource_usage', self._check_resource_usage, interval=30, timeout=5)
+        self.register_check('model_integrity', self._check_model_integrity, interval=600, timeout=60)
+        self.register_check('storage_space', self._check_storage_space, interval=300, timeout=30)
+        self.register_check('network_connectivity', self._check_network_connectivity, interval=60, timeout=10)
+        self.register_check('service_availability', self._check_service_availability, interval=60, timeout=10)
+    
+    def register_check(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[List[SystemIssue]]],
+        interval: float = 60.0,
+        timeout: float = 10.0
+    ):
+        """Register (or replace) a check run every ``interval`` seconds"""
+        self.checks[name] = DiagnosticCheck(name, func, interval, timeout)
     
     async def run_diagnostics(self) -> List[SystemIssue]:
-        """Run all diagnostic checks"""
-        issues = []
-        
-        for check_name, check_func in self.checks.items():
-            try:
-                check_issues = await check_func()
-                issues.extend(check_issues)
-            except Exception as e:
-                logger.error(f"Diagnostic check {check_name} failed: {e}")
-                issues.append(SystemIssue(
-                    type='diagnostic_failure',
-                    severity=ErrorSeverity.MEDIUM,
-                    target=check_name,
-                    details={'error': str(e)}
-                ))
-        
-        return issues
+        """Run all diagnostic checks concurrently and return their issues"""
+        await asyncio.gather(
+            *(self._run_check(check) for check in self.checks.values() if not check.running)
+        )
+        return self.snapshot()
+    
+    async def run_due_checks(self, now: Optional[float] = None) -> List[str]:
+        """Run the checks whose interval has elapsed; returns their names"""
+        now = time.monotonic() if now is None else now
+        due = [check for check in self.checks.values() if check.is_due(now)]
+        await asyncio.gather(*(self._run_check(check) for check in due))
+        return [check.name for check in due]
+    
+    def snapshot(self) -> List[SystemIssue]:
+        """Issues found by the latest run of every check"""
+        return [issue for check in self.checks.values() for issue in check.issues]
+    
+    async def _run_check(self, check: DiagnosticCheck):
+        check.running = True
+        try:
+            async with self._semaphore:
+                started = time.monotonic()
+                try:
+                    check.issues = await asyncio.wait_for(check.func(), check.timeout)
+                    check.last_error = None
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        error = f"Timed out after {check.timeout}s"
+                    else:
+                        error = str(e)
+                    logger.error(f"Diagnostic check {check.name} failed: {error}")
+                    check.last_error = error
+                    check.issues = [SystemIssue(
+                        type='diagnostic_failure',
+                        severity=ErrorSeverity.MEDIUM,
+                        target=check.name,
+                        details={'error': error}
+                    )]
+                check.last_run = time.monotonic()
+                check.last_duration = check.last_run - started
+        finally:
+            check.running = False
+    
+    def get_check_status(self) -> Dict[str, Any]:
+        """Cadence and outcome of every check's latest run"""
+        now = time.monotonic()
+        return {
+            check.name: {
+                'interval': check.interval,
+                'timeout': check.timeout,
+                'seconds_since_run': None if check.last_run is None else now - check.last_run,
+                'last_duration': check.last_duration,
+                'last_error': check.last_error,
+                'issues': len(check.issues),
+                'running': check.running
+            }
+            for check in self.checks.values()
+        }
     
     async def _check_worker_health(self) -> List[SystemIssue]:
         """Check worker health status"""
@@ -110,8 +184,8 @@ class SystemDiagnostics:
         issues = []
         
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous run, without blocking the loop
+            cpu_percent = psutil.cpu_percent(interval=None)
             if cpu_percent > 90:
                 issues.append(SystemIssue(
                     type='high_cpu_usage',
@@ -201,14 +275,20 @@ class SelfHealingSystem:
         worker_manager=None,
         queue_manager=None,
         resource_monitor=None,
-        storage_manager=None
+        storage_manager=None,
+        diagnostics: Optional[SystemDiagnostics] = None,
+        tick_interval: float = 5.0,
+        heal_cooldown: float = 60.0
     ):
         self.worker_manager = worker_manager
         self.queue_manager = queue_manager
         self.resource_monitor = resource_monitor
         self.storage_manager = storage_manager
         
-        self.diagnostics = SystemDiagnostics()
+        self.diagnostics = diagnostics or SystemDiagnostics()
+        self.tick_interval = tick_interval
+        # Seconds after a heal before the same issue may be healed again
+        self.heal_cooldown = heal_cooldown
         self.healing_actions = {
             'worker_unresponsive': self._heal_unresponsive_worker,
             'queue_backlog': self._heal_queue_backlog,
@@ -223,6 +303,12 @@ class SelfHealingSystem:
         self.healing_history: List[HealingRecord] = []
         self._running = False
         self._healing_task = None
+        # Keyed by (issue type, target): heals in flight, when the last one
+        # finished (monotonic) and the detection it acted on
+        self._healing_in_progress: Set[Tuple[str, Optional[str]]] = set()
+        self._last_healed: Dict[Tuple[str, Optional[str]], float] = {}
+        self._healed_detections: Dict[Tuple[str, Optional[str]], datetime] = {}
+        self._heal_tasks: Set[asyncio.Task] = set()
     
     async def start(self):
         """Start self-healing system"""
@@ -242,27 +328,32 @@ class SelfHealingSystem:
                 await self._healing_task
             except asyncio.CancelledError:
                 pass
+        for task in list(self._heal_tasks):
+            task.cancel()
         logger.info("Self-healing system stopped")
     
     async def _healing_loop(self):
         """Continuous diagnosis and healing loop"""
         while self._running:
             try:
-                # Run diagnostics
-                issues = await self.diagnostics.run_diagnostics()
+                # Run the checks that are due; the rest keep their last result
+                await self.diagnostics.run_due_checks()
+                issues = self.diagnostics.snapshot()
                 
                 # Log issues
                 if issues:
-                    logger.info(f"Detected {len(issues)} system issues")
+                    logger.debug(f"{len(issues)} system issues in current snapshot")
                 
-                # Attempt healing for each issue
+                # Heal in the background so a slow heal does not hold up checks
                 for issue in issues:
                     if not self._running:
                         break
-                    await self._attempt_healing(issue)
+                    if not self._is_debounced(issue):
+                        task = asyncio.create_task(self._attempt_healing(issue))
+                        self._heal_tasks.add(task)
+                        task.add_done_callback(self._heal_tasks.discard)
                 
-                # Wait before next check
-                await asyncio.sleep(60)  # Run every minute
+                await asyncio.sleep(self.tick_interval)
                 
             except asyncio.CancelledError:
                 break
@@ -271,19 +362,27 @@ class SelfHealingSystem:
                 await asyncio.sleep(300)  # Back off on error
     
     async def diagnose_and_heal(self) -> List[HealingResult]:
-        """Run single diagnostic and healing cycle"""
-        issues = await self.diagnostics.run_diagnostics()
-        results = []
-        
-        for issue in issues:
-            result = await self._attempt_healing(issue)
-            if result:
-                results.append(result)
-        
-        return results
+        """Run due checks and heal the issues in the current snapshot"""
+        await self.diagnostics.run_due_checks()
+        results = await asyncio.gather(
+            *(self._attempt_healing(issue) for issue in self.diagnostics.snapshot())
+        )
+        return [result for result in results if result]
+    
+    def _is_debounced(self, issue: SystemIssue) -> bool:
+        """Whether a heal for this issue is running, finished too recently or
+        already acted on this detection"""
+        key = (issue.type, issue.target)
+        if key in self._healing_in_progress:
+            return True
+        healed = self._healed_detections.get(key)
+        if healed is not None and issue.detected_at <= healed:
+            return True
+        last = self._last_healed.get(key)
+        return last is not None and time.monotonic() - last < self.heal_cooldown
     
     async def _attempt_healing(self, issue: SystemIssue) -> Optional[HealingResult]:
-        """Attempt to heal a system issue"""
+        """Attempt to heal a system issue, unless it is already being healed"""
         
         handler = self.healing_actions.get(issue.type)
         if not handler:
@@ -292,6 +391,20 @@ class SelfHealingSystem:
             )
             return None
         
+        if self._is_debounced(issue):
+            logger.debug(f"Skipping heal of {issue.type} ({issue.target}): debounced")
+            return None
+        
+        key = (issue.type, issue.target)
+        self._healing_in_progress.add(key)
+        self._healed_detections[key] = issue.detected_at
+        try:
+            return await self._run_healing(handler, issue)
+        finally:
+            self._healing_in_progress.discard(key)
+            self._last_healed[key] = time.monotonic()
+    
+    async def _run_healing(self, handler: Callable, issue: SystemIssue) -> HealingResult:
         logger.info(
             f"Attempting to heal {issue.type} issue "
             f"(severity: {issue.severity})"
@@ -552,6 +665,8 @@ class SelfHealingSystem:
             'successful_healings': successful,
             'success_rate': successful / total_attempts if total_attempts > 0 else 0,
             'by_issue_type': by_type,
+            'healing_in_progress': len(self._healing_in_progress),
+            'checks': self.diagnostics.get_check_status(),
             'recent_healings': [
                 {
                     'timestamp': r.timestamp.isoformat(),
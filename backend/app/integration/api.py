@@ -6,7 +6,7 @@ REST API endpoints for Function Runner integration system.
 
 import logging
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
 from pydantic import BaseModel
 
 from .task_handler import IntegratedTaskSubmissionHandler
@@ -141,6 +141,38 @@ async def get_task_status(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/tasks/{task_id}/wait", response_model=TaskStatusResponse)
+async def wait_for_task(
+    task_id: str,
+    timeout: float = Query(25.0, ge=0.0, le=60.0, description="Seconds to hold the request open"),
+    handler: IntegratedTaskSubmissionHandler = Depends(get_task_handler)
+) -> TaskStatusResponse:
+    """
+    Long-poll a task: responds as soon as the task reaches a terminal state,
+    or with the current status when the timeout elapses.
+    """
+    
+    try:
+        status = await handler.wait_for_task(task_id, timeout)
+    except Exception as e:
+        logger.error(f"Error waiting for task: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    if not status:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return TaskStatusResponse(
+        task_id=task_id,
+        status=status.get('state', 'unknown'),
+        progress=status.get('progress', 0.0),
+        stage=status.get('stage'),
+        message=status.get('message'),
+        outputs=status.get('outputs') or {},
+        error_message=status.get('error_message'),
+        execution_time=status.get('execution_time') or 0.0
+    )
+
+
 @router.post("/tasks/{task_id}/cancel")
 async def cancel_task(
     task_id: str,
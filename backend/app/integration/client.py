@@ -247,6 +247,37 @@ class FunctionRunnerClient:
             response.raise_for_status()
             return await response.json()
     
+    async def wait_for_task(self, task_id: str, timeout: float = 25.0) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll a task until it finishes or ``timeout`` elapses.
+        
+        Args:
+            task_id: Task identifier
+            timeout: Seconds the server holds the request open
+            
+        Returns:
+            Task status, or None if the server has no long-poll endpoint
+        """
+        await self._ensure_session()
+        
+        async with self.session.get(
+            f"{self.base_url}/api/v1/integration/tasks/{task_id}/wait",
+            params={"timeout": timeout},
+            timeout=aiohttp.ClientTimeout(total=timeout + self.timeout)
+        ) as response:
+            if response.status == 405:
+                return None
+            if response.status == 404:
+                # The endpoint's own 404 is about the task; any other means no endpoint
+                try:
+                    detail = (await response.json()).get("detail")
+                except (aiohttp.ContentTypeError, ValueError, AttributeError):
+                    detail = None
+                if detail != "Task not found":
+                    return None
+            response.raise_for_status()
+            return await response.json()
+    
     async def wait_for_task_completion(
         self,
         task_id: str,
@@ -254,21 +285,31 @@ class FunctionRunnerClient:
         poll_interval: float = 1.0
     ) -> Dict[str, Any]:
         """
-        Wait for task completion with polling.
+        Wait for task completion.
+        
+        Uses the long-poll endpoint, so the server answers as soon as the task
+        finishes; falls back to status polling against servers without it.
+        Either way a completed task returns ``get_task_result``.
         
         Args:
             task_id: Task identifier
             timeout: Maximum wait time in seconds
-            poll_interval: Polling interval in seconds
+            poll_interval: Polling interval in seconds when falling back
             
         Returns:
             Final task result
         """
         start_time = datetime.now()
+        long_poll = True
         
-        while (datetime.now() - start_time).total_seconds() < timeout:
+        while (elapsed := (datetime.now() - start_time).total_seconds()) < timeout:
             try:
-                status = await self.get_task_status(task_id)
+                status = None
+                if long_poll:
+                    status = await self.wait_for_task(task_id, min(timeout - elapsed, 25.0))
+                    long_poll = status is not None
+                if status is None:
+                    status = await self.get_task_status(task_id)
                 state = status.get("status", "unknown")
                 
                 if state == "completed":
@@ -277,8 +318,9 @@ class FunctionRunnerClient:
                     return status
                 elif state == "cancelled":
                     return {"status": "cancelled"}
-                    
-                await asyncio.sleep(poll_interval)
+                
+                if not long_poll:
+                    await asyncio.sleep(poll_interval)
                 
             except Exception as e:
                 logger.error(f"Error checking task status: {e}")
@@ -21,6 +21,13 @@ class IntegrationStatus(str, Enum):
     UNHEALTHY = "unhealthy"
 
 
+class OverflowPolicy(str, Enum):
+    """What the event bus does with a publish when its queue is full"""
+    BLOCK = "block"              # publisher waits for space
+    DROP_NEWEST = "drop_newest"  # discard the incoming event
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued event
+
+
 class OutputContext:
     """Context for storing function outputs"""
     
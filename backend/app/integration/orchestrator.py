@@ -26,10 +26,18 @@ from app.templates.registry import TemplateRegistry
 from app.quality.presets import QualityPresetManager
 from app.progress.tracker import ProgressTracker
 from app.services.takes import TakesService
+from app.services.task_completion import task_completions
 from app.templates.base import FunctionTemplate
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_TASK_STATES = {
+    TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED, TaskState.TIMEOUT
+}
+
+# Status attributes carried into a WorkflowResult
+RESULT_FIELDS = ('outputs', 'execution_time', 'resource_usage', 'metadata', 'error_message')
+
 
 class FunctionRunnerOrchestrator:
     """Orchestrate complete Function Runner workflow execution"""
@@ -40,6 +48,7 @@ class FunctionRunnerOrchestrator:
         self.quality_manager = QualityPresetManager()
         self.progress_tracker = ProgressTracker()
         self.takes_service = TakesService()
+        self.completions = task_completions
         self._active_tasks: Dict[str, WorkerTask] = {}
         self._task_callbacks: Dict[str, Any] = {}
         
@@ -211,6 +220,13 @@ class FunctionRunnerOrchestrator:
                     message="Task cancelled by user"
                 )
                 
+                # Wake anyone waiting on the task
+                await self.completions.notify(
+                    task_id,
+                    TaskState.CANCELLED.value,
+                    error_message="Task cancelled by user"
+                )
+                
                 # Clean up
                 await self._cleanup_task(task_id)
                 
@@ -234,6 +250,28 @@ class FunctionRunnerOrchestrator:
             logger.error(f"Error getting status for task {task_id}: {e}")
             return None
     
+    async def wait_for_task(self, task_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll a task's status.
+        
+        Returns the terminal status as soon as the task finishes, or the
+        current status once ``timeout`` elapses.
+        """
+        completion = self.completions.get_result(task_id)
+        if completion is None:
+            status = await self.get_task_status(task_id)
+            if status and status.get('state') in {s.value for s in TERMINAL_TASK_STATES}:
+                return status
+            completion = await self.completions.wait(task_id, timeout)
+        
+        if completion is None:
+            return await self.get_task_status(task_id)
+        
+        result = dict(completion)
+        if result['state'] == TaskState.COMPLETED.value:
+            result.setdefault('progress', 100.0)
+        return result
+    
     async def _validate_inputs(self, 
                              template: FunctionTemplate, 
                              inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -267,57 +305,60 @@ class FunctionRunnerOrchestrator:
                 'reason': f"Resource check failed: {e}"
             }
     
-    async def _wait_for_completion(self, task_id: str) -> WorkflowResult:
-        """Wait for task completion with proper error handling"""
+    async def _wait_for_completion(self, task_id: str, timeout: float = 600) -> WorkflowResult:
+        """
+        Wait for task completion with proper error handling.
         
-        timeout = 600  # 10 minutes default timeout
-        start_time = time.time()
+        Status is read once to catch tasks that already finished; after that
+        the wait parks on the task's completion future, which is resolved by
+        the progress tracker or a completion notification from a worker.
+        """
+        try:
+            status = await self.progress_tracker.get_status(task_id)
+        except Exception as e:
+            logger.error(f"Error getting status for task {task_id}: {e}")
+            status = None
         
-        while time.time() - start_time < timeout:
-            try:
-                status = await self.progress_tracker.get_status(task_id)
-                
-                if not status:
-                    await asyncio.sleep(0.5)
-                    continue
-                
-                if status.state == TaskState.COMPLETED:
-                    return WorkflowResult(
-                        task_id=task_id,
-                        status=TaskState.COMPLETED,
-                        outputs=status.outputs or {},
-                        execution_time=status.execution_time,
-                        resource_usage=status.resource_usage or {},
-                        metadata=status.metadata or {}
-                    )
-                
-                elif status.state == TaskState.FAILED:
-                    return WorkflowResult(
-                        task_id=task_id,
-                        status=TaskState.FAILED,
-                        error_message=status.error_message,
-                        execution_time=status.execution_time,
-                        metadata=status.metadata or {}
-                    )
-                
-                elif status.state == TaskState.CANCELLED:
-                    return WorkflowResult(
-                        task_id=task_id,
-                        status=TaskState.CANCELLED,
-                        error_message="Task was cancelled",
-                        metadata=status.metadata or {}
-                    )
-                
-                # Still running, wait a bit
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error waiting for task {task_id}: {e}")
-                await asyncio.sleep(1.0)
+        if status and status.state in TERMINAL_TASK_STATES:
+            fields = {name: getattr(status, name, None) for name in RESULT_FIELDS}
+            return self._workflow_result(task_id, status.state, fields)
         
-        # Timeout reached
-        await self.cancel_task(task_id)
-        raise WorkflowTimeoutError(f"Task {task_id} timed out after {timeout}s")
+        completion = await self.completions.wait(task_id, timeout)
+        if completion is None:
+            # Timeout reached
+            await self.cancel_task(task_id)
+            raise WorkflowTimeoutError(f"Task {task_id} timed out after {timeout}s")
+        
+        return self._workflow_result(task_id, TaskState(completion['state']), completion)
+    
+    @staticmethod
+    def _workflow_result(task_id: str, state: TaskState, fields: Dict[str, Any]) -> WorkflowResult:
+        """Build the result for a task in a terminal state"""
+        if state == TaskState.COMPLETED:
+            return WorkflowResult(
+                task_id=task_id,
+                status=TaskState.COMPLETED,
+                outputs=fields.get('outputs') or {},
+                execution_time=fields.get('execution_time') or 0.0,
+                resource_usage=fields.get('resource_usage') or {},
+                metadata=fields.get('metadata') or {}
+            )
+        
+        if state == TaskState.CANCELLED:
+            return WorkflowResult(
+                task_id=task_id,
+                status=TaskState.CANCELLED,
+                error_message="Task was cancelled",
+                metadata=fields.get('metadata') or {}
+            )
+        
+        return WorkflowResult(
+            task_id=task_id,
+            status=state,
+            error_message=fields.get('error_message'),
+            execution_time=fields.get('execution_time') or 0.0,
+            metadata=fields.get('metadata') or {}
+        )
     
     async def _store_result(self, 
                           result: WorkflowResult, 
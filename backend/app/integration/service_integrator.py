@@ -6,10 +6,15 @@ Orchestrates integration between all platform services.
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable, Deque, Set
 from datetime import datetime
 
-from app.integration.models import ServiceEvent, IntegrationError, ServiceUnavailableError
+from app.integration.models import (
+    ServiceEvent, IntegrationError, ServiceUnavailableError, OverflowPolicy
+)
 from app.services.workspace import WorkspaceService
 from app.services.takes import TakesService
 from app.services.git import GitService
@@ -18,14 +23,80 @@ from app.services.websocket import WebSocketManager
 logger = logging.getLogger(__name__)
 
 
-class EventBus:
-    """Simple event bus for service communication"""
+def _task_key(event: ServiceEvent) -> Optional[str]:
+    """Default ordering key: events for the same task are handled in publish order"""
+    return event.data.get('task_id') or event.metadata.get('task_id')
+
+
+class _TrieNode:
+    """Node of the prefix trie holding handlers for ``prefix*`` patterns"""
+    
+    __slots__ = ('children', 'handlers')
     
     def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.handlers: List[callable] = []
+
+
+@dataclass
+class HandlerMetrics:
+    """Latency and error counts for one event handler"""
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'mean_ms': self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+            'max_ms': self.max_seconds * 1000
+        }
+
+
+class EventBus:
+    """
+    Event bus for service communication.
+    
+    Patterns are compiled into an exact-match dict and a prefix trie for
+    trailing wildcards, so routing an event type costs one dict lookup plus
+    a walk over its characters (cached per event type). A pool of workers
+    drains a bounded queue; events sharing a key (the task ID by default)
+    are handled one after another in publish order, while unrelated events
+    and the handlers of a single event run concurrently. A queue slot is
+    freed as soon as a worker takes the event, so handlers that publish
+    never wait on their own event.
+    """
+    
+    # Resolved handler lists kept per event type before the cache is reset
+    ROUTE_CACHE_SIZE = 1024
+    
+    def __init__(self,
+                 workers: int = 4,
+                 max_queue_size: int = 10000,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 key_fn: Callable[[ServiceEvent], Optional[str]] = _task_key):
         self._subscribers: Dict[str, List[callable]] = {}
+        self._exact: Dict[str, List[callable]] = {}
+        self._prefixes = _TrieNode()
+        self._globs: List[tuple] = []  # (pattern, handlers) with a wildcard elsewhere
+        self._routes: Dict[str, List[callable]] = {}
+        
         self._running = False
-        self._event_queue = asyncio.Queue()
-        self._worker_task: Optional[asyncio.Task] = None
+        self._workers = workers
+        self._overflow_policy = OverflowPolicy(overflow_policy)
+        self._key_fn = key_fn
+        self._event_queue: asyncio.Queue = asyncio.Queue()
+        # Held from publish until a worker takes the event off the queue
+        self._slots = asyncio.Semaphore(max_queue_size)
+        # Deferred events put back on stop; they gave up their slot when first taken
+        self._unslotted: Set[int] = set()
+        self._active_keys: Dict[str, Deque[ServiceEvent]] = {}
+        self._worker_tasks: List[asyncio.Task] = []
+        
+        self._dropped = 0
+        self._handler_metrics: Dict[str, HandlerMetrics] = {}
     
     async def start(self):
         """Start the event bus"""
@@ -33,19 +104,19 @@ class EventBus:
             return
         
         self._running = True
-        self._worker_task = asyncio.create_task(self._event_worker())
-        logger.info("Event bus started")
+        self._worker_tasks = [
+            asyncio.create_task(self._event_worker()) for _ in range(self._workers)
+        ]
+        logger.info(f"Event bus started with {self._workers} workers")
     
     async def stop(self):
         """Stop the event bus"""
         self._running = False
         
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
         
         logger.info("Event bus stopped")
     
@@ -55,6 +126,7 @@ class EventBus:
             self._subscribers[pattern] = []
         
         self._subscribers[pattern].append(handler)
+        self._compile()
         logger.debug(f"Subscribed to {pattern}")
     
     def unsubscribe(self, pattern: str, handler: callable):
@@ -64,52 +136,146 @@ class EventBus:
                 self._subscribers[pattern].remove(handler)
                 if not self._subscribers[pattern]:
                     del self._subscribers[pattern]
+                self._compile()
                 logger.debug(f"Unsubscribed from {pattern}")
             except ValueError:
                 pass
     
+    def _compile(self):
+        """Rebuild the routing indexes from the subscriptions"""
+        exact: Dict[str, List[callable]] = {}
+        prefixes = _TrieNode()
+        globs = []
+        
+        for pattern, handlers in self._subscribers.items():
+            if '*' not in pattern:
+                exact[pattern] = list(handlers)
+            elif pattern.index('*') == len(pattern) - 1:
+                node = prefixes
+                for char in pattern[:-1]:
+                    node = node.children.setdefault(char, _TrieNode())
+                node.handlers.extend(handlers)
+            else:
+                globs.append((pattern, list(handlers)))
+        
+        self._exact, self._prefixes, self._globs = exact, prefixes, globs
+        self._routes = {}
+    
+    def _handlers_for(self, event_type: str) -> List[callable]:
+        """Handlers subscribed to an event type, resolved once per type"""
+        handlers = self._routes.get(event_type)
+        if handlers is not None:
+            return handlers
+        
+        handlers = list(self._exact.get(event_type, ()))
+        node = self._prefixes
+        handlers.extend(node.handlers)
+        for char in event_type:
+            node = node.children.get(char)
+            if node is None:
+                break
+            handlers.extend(node.handlers)
+        for pattern, pattern_handlers in self._globs:
+            if self._pattern_matches(pattern, event_type):
+                handlers.extend(pattern_handlers)
+        
+        if len(self._routes) >= self.ROUTE_CACHE_SIZE:
+            self._routes = {}
+        self._routes[event_type] = handlers
+        return handlers
+    
     async def publish(self, event: ServiceEvent):
-        """Publish an event"""
-        if self._running:
-            await self._event_queue.put(event)
+        """Publish an event, applying the overflow policy when the queue is full"""
+        if not self._running:
+            return
+        
+        if self._slots.locked():
+            if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                self._drop(event)
+                return
+            if self._overflow_policy == OverflowPolicy.DROP_OLDEST:
+                try:
+                    oldest = self._event_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    # Everything pending is already with a worker
+                    self._drop(event)
+                    return
+                # The new event takes over the evicted event's slot
+                self._drop(oldest)
+                if id(oldest) in self._unslotted:
+                    self._unslotted.discard(id(oldest))
+                    self._unslotted.add(id(event))
+                self._event_queue.put_nowait(event)
+                return
+        
+        await self._slots.acquire()
+        self._event_queue.put_nowait(event)
+    
+    def _drop(self, event: ServiceEvent):
+        self._dropped += 1
+        logger.warning(f"Event queue full, dropped {event.service}.{event.type}")
     
     async def _event_worker(self):
         """Process events in the background"""
-        while self._running:
-            try:
-                # Wait for event with timeout
-                event = await asyncio.wait_for(
-                    self._event_queue.get(), 
-                    timeout=1.0
-                )
-                
+        while True:
+            event = await self._event_queue.get()
+            if id(event) in self._unslotted:
+                self._unslotted.discard(id(event))
+            else:
+                self._slots.release()
+            key = self._key_fn(event)
+            
+            if key is None:
                 await self._process_event(event)
-                
-            except asyncio.TimeoutError:
-                # Normal timeout, continue
                 continue
-            except Exception as e:
-                logger.error(f"Error processing event: {e}")
+            
+            backlog = self._active_keys.get(key)
+            if backlog is not None:
+                # The worker holding this key runs it after the current event
+                backlog.append(event)
+                continue
+            
+            backlog = self._active_keys[key] = deque()
+            try:
+                await self._process_event(event)
+                while backlog:
+                    await self._process_event(backlog.popleft())
+            finally:
+                # Only left over when stopped mid-backlog; keep them for a restart
+                for pending in backlog:
+                    self._unslotted.add(id(pending))
+                    self._event_queue.put_nowait(pending)
+                del self._active_keys[key]
     
     async def _process_event(self, event: ServiceEvent):
-        """Process a single event"""
-        event_type = f"{event.service}.{event.type}"
-        
-        # Find matching subscribers
-        handlers = []
-        for pattern, pattern_handlers in self._subscribers.items():
-            if self._pattern_matches(pattern, event_type):
-                handlers.extend(pattern_handlers)
-        
-        # Call handlers
-        for handler in handlers:
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
-            except Exception as e:
-                logger.error(f"Error in event handler: {e}")
+        """Process a single event, running its handlers concurrently"""
+        handlers = self._handlers_for(f"{event.service}.{event.type}")
+        if len(handlers) == 1:
+            await self._call_handler(handlers[0], event)
+        elif handlers:
+            await asyncio.gather(*(self._call_handler(handler, event) for handler in handlers))
+    
+    async def _call_handler(self, handler: callable, event: ServiceEvent):
+        """Call one handler, recording its latency"""
+        name = getattr(handler, '__qualname__', None) or repr(handler)
+        metrics = self._handler_metrics.get(name)
+        if metrics is None:
+            metrics = self._handler_metrics[name] = HandlerMetrics()
+        
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(event)
+            else:
+                handler(event)
+        except Exception as e:
+            metrics.errors += 1
+            logger.error(f"Error in event handler {name}: {e}")
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.calls += 1
+            metrics.total_seconds += elapsed
+            metrics.max_seconds = max(metrics.max_seconds, elapsed)
     
     def _pattern_matches(self, pattern: str, event_type: str) -> bool:
         """Check if pattern matches event type"""
@@ -121,6 +287,18 @@ class EventBus:
                 return event_type.startswith(prefix) and event_type.endswith(suffix)
         
         return pattern == event_type
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, drops and per-handler latency"""
+        return {
+            'queue_depth': self._event_queue.qsize(),
+            'active_keys': len(self._active_keys),
+            'dropped_events': self._dropped,
+            'overflow_policy': self._overflow_policy.value,
+            'handlers': {
+                name: metrics.to_dict() for name, metrics in self._handler_metrics.items()
+            }
+        }
 
 
 class ServiceHealthMonitor:
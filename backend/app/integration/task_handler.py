@@ -416,6 +416,10 @@ class IntegratedTaskSubmissionHandler:
         """Get current status of a task"""
         return await self.orchestrator.get_task_status(task_id)
     
+    async def wait_for_task(self, task_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait up to ``timeout`` seconds for a task to finish"""
+        return await self.orchestrator.wait_for_task(task_id, timeout)
+    
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel an active task"""
         
@@ -2,10 +2,16 @@
 WebSocket Integration Layer
 
 Integrates Function Runner events with the WebSocket system.
+
+Subscriptions are indexed both ways (client -> channels and channel ->
+clients), so task, project and user targeting resolve to client IDs on the
+server and only subscribed sockets receive an event. Sends fan out
+concurrently with a per-client timeout.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, Set
+from typing import Dict, Any, Iterable, Optional, Set
 import json
 
 from app.integration.models import ServiceEvent, WebSocketEvent
@@ -17,8 +23,9 @@ logger = logging.getLogger(__name__)
 class WebSocketIntegrationLayer:
     """Integrate WebSocket events across all services"""
     
-    def __init__(self, ws_manager: WebSocketManager):
+    def __init__(self, ws_manager: WebSocketManager, send_timeout: float = 5.0):
         self.ws_manager = ws_manager
+        self.send_timeout = send_timeout
         self.event_handlers = {
             'task.progress': self._handle_task_progress,
             'task.completed': self._handle_task_completed,
@@ -30,6 +37,8 @@ class WebSocketIntegrationLayer:
             'service.health': self._handle_service_health
         }
         self._subscriptions: Dict[str, Set[str]] = {}  # client_id -> set of channels
+        self._channel_clients: Dict[str, Set[str]] = {}  # channel -> set of client_ids
+        self._send_timeouts = 0
     
     async def route_event(self, event: ServiceEvent):
         """Route service events to WebSocket clients"""
@@ -219,22 +228,21 @@ class WebSocketIntegrationLayer:
         """Send message to specific user"""
         
         try:
-            await self.ws_manager.send_to_user(user_id, message)
+            client_ids = self._channel_clients.get(f"user.{user_id}")
+            if client_ids:
+                await self._fan_out(client_ids, message)
+            elif hasattr(self.ws_manager, 'send_to_user'):
+                # Managers that track users themselves
+                await self.ws_manager.send_to_user(user_id, message)
             logger.debug(f"Sent message to user {user_id}")
         except Exception as e:
             logger.error(f"Error sending to user {user_id}: {e}")
     
     async def _send_to_project(self, project_id: str, message: Dict[str, Any]):
-        """Send message to all users in project"""
+        """Send message to clients subscribed to a project"""
         
         try:
-            # Get users in project (would need to implement this)
-            # For now, just broadcast with project filter
-            filtered_message = {
-                **message,
-                'filter': {'project_id': project_id}
-            }
-            await self.ws_manager.broadcast(filtered_message)
+            await self._fan_out(self._channel_clients.get(f"project.{project_id}", ()), message)
             logger.debug(f"Sent message to project {project_id}")
         except Exception as e:
             logger.error(f"Error sending to project {project_id}: {e}")
@@ -243,16 +251,34 @@ class WebSocketIntegrationLayer:
         """Send message to clients subscribed to a specific task"""
         
         try:
-            # Find clients subscribed to this task
-            channel = f"task.{task_id}"
-            for client_id, channels in self._subscriptions.items():
-                if channel in channels:
-                    await self.ws_manager.send_to_client(client_id, message)
-            
+            await self._fan_out(self._channel_clients.get(f"task.{task_id}", ()), message)
             logger.debug(f"Sent message to task {task_id} subscribers")
         except Exception as e:
             logger.error(f"Error sending to task subscribers {task_id}: {e}")
     
+    async def _fan_out(self, client_ids: Iterable[str], message: Dict[str, Any]):
+        """Send to clients concurrently; a slow client only delays itself"""
+        
+        # Copy: the index may change while sends are in flight
+        client_ids = list(client_ids)
+        if not client_ids:
+            return
+        
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(self.ws_manager.send_personal_message(message, client_id), self.send_timeout)
+                for client_id in client_ids
+            ),
+            return_exceptions=True
+        )
+        
+        for client_id, result in zip(client_ids, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self._send_timeouts += 1
+                logger.warning(f"Send to client {client_id} timed out after {self.send_timeout}s")
+            elif isinstance(result, Exception):
+                logger.error(f"Error sending to client {client_id}: {result}")
+    
     async def _broadcast_to_admins(self, message: Dict[str, Any]):
         """Send message to admin users only"""
         
@@ -268,13 +294,14 @@ class WebSocketIntegrationLayer:
             logger.error(f"Error broadcasting to admins: {e}")
     
     async def subscribe_client(self, client_id: str, channels: list[str]):
-        """Subscribe client to specific channels"""
+        """Subscribe client to specific channels (``task.<id>``, ``project.<id>``, ``user.<id>``)"""
         
         if client_id not in self._subscriptions:
             self._subscriptions[client_id] = set()
         
         for channel in channels:
             self._subscriptions[client_id].add(channel)
+            self._channel_clients.setdefault(channel, set()).add(client_id)
             logger.debug(f"Client {client_id} subscribed to {channel}")
     
     async def unsubscribe_client(self, client_id: str, channels: list[str] = None):
@@ -285,12 +312,13 @@ class WebSocketIntegrationLayer:
         
         if channels is None:
             # Unsubscribe from all
-            del self._subscriptions[client_id]
+            self._remove_client(client_id)
             logger.debug(f"Client {client_id} unsubscribed from all channels")
         else:
             # Unsubscribe from specific channels
             for channel in channels:
                 self._subscriptions[client_id].discard(channel)
+                self._discard_from_channel(channel, client_id)
                 logger.debug(f"Client {client_id} unsubscribed from {channel}")
             
             # Clean up if no subscriptions left
@@ -301,9 +329,20 @@ class WebSocketIntegrationLayer:
         """Handle client disconnection"""
         
         if client_id in self._subscriptions:
-            del self._subscriptions[client_id]
+            self._remove_client(client_id)
             logger.debug(f"Cleaned up subscriptions for disconnected client {client_id}")
     
+    def _remove_client(self, client_id: str):
+        for channel in self._subscriptions.pop(client_id, ()):
+            self._discard_from_channel(channel, client_id)
+    
+    def _discard_from_channel(self, channel: str, client_id: str):
+        clients = self._channel_clients.get(channel)
+        if clients is not None:
+            clients.discard(client_id)
+            if not clients:
+                del self._channel_clients[channel]
+    
     async def get_client_subscriptions(self, client_id: str) -> list[str]:
         """Get list of channels client is subscribed to"""
         
@@ -312,12 +351,7 @@ class WebSocketIntegrationLayer:
     async def get_channel_subscribers(self, channel: str) -> list[str]:
         """Get list of clients subscribed to a channel"""
         
-        subscribers = []
-        for client_id, channels in self._subscriptions.items():
-            if channel in channels:
-                subscribers.append(client_id)
-        
-        return subscribers
+        return list(self._channel_clients.get(channel, ()))
     
     def get_stats(self) -> Dict[str, Any]:
         """Get WebSocket integration statistics"""
@@ -327,6 +361,7 @@ class WebSocketIntegrationLayer:
         return {
             'active_clients': len(self._subscriptions),
             'total_subscriptions': total_subscriptions,
-            'channels': list(set().union(*self._subscriptions.values())),
+            'channels': list(self._channel_clients),
+            'send_timeouts': self._send_timeouts,
             'event_handlers': list(self.event_handlers.keys())
         }
\ No newline at end of file
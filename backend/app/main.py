@@ -65,6 +65,24 @@ def create_app() -> FastAPI:
             logger.error(f"Failed to connect to Redis: {e}")
             # Continue without Redis for development
 
+        # Aggregate worker telemetry pushed to the Redis stream
+        from app.worker.telemetry import telemetry_aggregator
+
+        if redis_client.redis is not None:
+            try:
+                await telemetry_aggregator.start(redis_client.redis)
+            except Exception as e:
+                logger.error(f"Failed to start worker telemetry aggregator: {e}")
+
+        # Resolve task completion waiters from notifications sent by other processes
+        from app.services.task_completion import task_completions
+
+        if redis_client.redis is not None:
+            try:
+                await task_completions.start(redis_client.redis)
+            except Exception as e:
+                logger.error(f"Failed to start task completion listener: {e}")
+
         # Register task handlers
         from app.core.dispatcher import GenerationTaskHandler
 
@@ -104,6 +122,16 @@ def create_app() -> FastAPI:
         # Cancel active tasks
         await task_dispatcher.shutdown()
 
+        # Stop consuming worker telemetry
+        from app.worker.telemetry import telemetry_aggregator
+
+        await telemetry_aggregator.stop()
+
+        # Stop listening for task completions
+        from app.services.task_completion import task_completions
+
+        await task_completions.stop()
+
         # Stop worker pool manager
         from app.worker.pool_manager import worker_pool_manager
         try:
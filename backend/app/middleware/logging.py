@@ -3,62 +3,172 @@ Logging middleware for request tracking.
 """
 
 import logging
+import sys
 import time
 import uuid
-from collections.abc import Callable
+from contextvars import ContextVar
 
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from prometheus_client import Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.profiling import RequestProfiler, request_profiler
+from app.worker.metrics_collector import metrics_collector
 
 logger = logging.getLogger(__name__)
 
+# ID of the request being handled, visible to everything it awaits
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Served with the worker metrics by the /health/metrics endpoint
+REQUEST_LATENCY = Histogram(
+    "auteur_http_request_duration_seconds",
+    "Time from receiving a request until its response body is sent, by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_collector.registry,
+)
+
+RESPONSE_START_LATENCY = Histogram(
+    "auteur_http_response_start_seconds",
+    "Time from receiving a request until its response headers are sent, by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_collector.registry,
+)
+
+# Incoming X-Request-ID values longer than this are replaced
+MAX_REQUEST_ID_LENGTH = 128
+
+
+def get_request_id() -> str | None:
+    """ID of the request the current task is serving, if any"""
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Add the current request ID to every log record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests with tracking ID"""
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, so path parameters do not split the series"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return getattr(route, "path_format", None) or getattr(route, "path", "unmatched")
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
 
-        # Start timer
-        start_time = time.time()
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware logging requests with a tracking ID.
 
-        # Log request
+    Records per-route latency histograms and, when the profiler is enabled,
+    keeps stack samples of the slowest requests. Response bodies are passed
+    through untouched, so streaming responses keep streaming.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming_request_id(scope) or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
         logger.info(
             "Request started",
             extra={
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else None,
+                "method": method,
+                "path": path,
+                "client": client[0] if client else None,
             },
         )
 
-        # Process request
-        response = await call_next(request)
+        status_code = 500
+        response_started: float | None = None
+        header = (b"x-request-id", request_id.encode("latin-1"))
 
-        # Calculate duration
-        duration = time.time() - start_time
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = time.perf_counter()
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+        frame = sys._getframe()
+        profile = self.profiler.begin(frame)
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            route = route_template(scope)
 
-        # Log response
-        logger.info(
-            "Request completed",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration": round(duration, 3),
-            },
-        )
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(duration)
+            if response_started is not None:
+                RESPONSE_START_LATENCY.labels(method, route).observe(response_started - start_time)
+            if profile is not None:
+                self.profiler.end(
+                    frame,
+                    profile,
+                    duration,
+                    request_id=request_id,
+                    method=method,
+                    route=route,
+                    path=path,
+                    status_code=status_code,
+                )
 
-        return response
+            logger.info(
+                "Request completed",
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "route": route,
+                    "status_code": status_code,
+                    "duration": round(duration, 3),
+                },
+            )
+            request_id_var.reset(token)
+
+    @staticmethod
+    def _incoming_request_id(scope: Scope) -> str | None:
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1").strip()
+                if 0 < len(request_id) <= MAX_REQUEST_ID_LENGTH:
+                    return request_id
+        return None
 
 
 def setup_logging_middleware(app: FastAPI) -> None:
     """Setup logging middleware"""
+    request_profiler.configure(
+        enabled=settings.request_profiling,
+        interval=settings.request_profiling_interval_ms / 1000,
+        top_n=settings.request_profiling_top_n,
+    )
     app.add_middleware(LoggingMiddleware)
+
+    request_id_filter = RequestIdFilter()
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(request_id_filter)
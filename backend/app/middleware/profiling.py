@@ -0,0 +1,175 @@
+"""
+Sampling profiler for slow requests.
+
+A background thread samples the stacks of threads that are serving requests.
+Because an awaiting coroutine chain sits on the stack while its task runs, each
+sample can be attributed to the request whose middleware frame it passes
+through. Only the slowest requests per route keep their profile.
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any
+
+
+class _Profile:
+    """Samples collected for one in-flight request"""
+
+    __slots__ = ("samples", "total")
+
+    def __init__(self) -> None:
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.total = 0
+
+
+class RequestProfiler:
+    """
+    Built-in stack sampler keeping the ``top_n`` slowest profiles per route.
+
+    Only code running on the request's own thread is sampled: handlers moved
+    to the thread pool appear as unsampled wall time.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        interval: float = 0.005,
+        top_n: int = 5,
+        max_depth: int = 64,
+        max_stacks: int = 50,
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.top_n = top_n
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+
+        self._lock = threading.Lock()
+        # Middleware frame of each profiled request -> its samples
+        self._active: dict[FrameType, _Profile] = {}
+        # Thread ident -> number of profiled requests running on it
+        self._threads: Counter[int] = Counter()
+        # Route -> min-heap of (duration, tie-breaker, profile)
+        self._slowest: dict[str, list[tuple[float, int, dict[str, Any]]]] = {}
+        self._order = itertools.count()
+        self._labels: dict[CodeType, str] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def configure(
+        self, enabled: bool, interval: float | None = None, top_n: int | None = None
+    ) -> None:
+        self.enabled = enabled
+        if interval is not None:
+            self.interval = interval
+        if top_n is not None:
+            self.top_n = top_n
+        if not enabled:
+            self.stop()
+
+    def begin(self, frame: FrameType) -> _Profile | None:
+        """Start sampling the request whose middleware runs in ``frame``"""
+        if not self.enabled:
+            return None
+        self._ensure_thread()
+        profile = _Profile()
+        with self._lock:
+            self._active[frame] = profile
+            self._threads[threading.get_ident()] += 1
+        return profile
+
+    def end(self, frame: FrameType, profile: _Profile, duration: float, **details: Any) -> None:
+        """Stop sampling and keep the profile if it is among the slowest for its route"""
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active.pop(frame, None)
+            self._threads[thread_id] -= 1
+            if self._threads[thread_id] <= 0:
+                del self._threads[thread_id]
+
+            route = details.get("route", "unmatched")
+            heap = self._slowest.setdefault(route, [])
+            if len(heap) >= self.top_n and duration <= heap[0][0]:
+                return
+
+            stacks = profile.samples.most_common(self.max_stacks)
+            entry = {
+                **details,
+                "duration_ms": round(duration * 1000, 3),
+                "samples": profile.total,
+                "sample_interval_ms": self.interval * 1000,
+                "stacks": [{"stack": ";".join(stack), "count": count} for stack, count in stacks],
+            }
+            item = (duration, next(self._order), entry)
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heapreplace(heap, item)
+
+    def get_profiles(self, route: str | None = None) -> list[dict[str, Any]]:
+        """Kept profiles, slowest first"""
+        with self._lock:
+            heaps = [self._slowest.get(route, [])] if route else list(self._slowest.values())
+            items = [item for heap in heaps for item in heap]
+        return [entry for _, _, entry in sorted(items, key=lambda item: -item[0])]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._slowest.clear()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self._threads:
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id in self._threads:
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        self._attribute(frame)
+
+    def _attribute(self, frame: FrameType) -> None:
+        """Walk outwards from the leaf until a profiled middleware frame is found"""
+        stack: list[str] = []
+        current: FrameType | None = frame
+        while current is not None:
+            profile = self._active.get(current)
+            if profile is not None:
+                stack.reverse()
+                profile.samples[tuple(stack)] += 1
+                profile.total += 1
+                return
+            if len(stack) < self.max_depth:
+                stack.append(self._label(current.f_code))
+            current = current.f_back
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+# Process-wide profiler, configured by setup_logging_middleware
+request_profiler = RequestProfiler()
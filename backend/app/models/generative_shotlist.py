@@ -6,9 +6,12 @@ Defines the JSON schema for structured shot lists that integrate with the expand
 and provide a comprehensive foundation for generative filmmaking workflows.
 """
 
-from typing import Dict, List, Optional, Union, Literal, Any
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union, Literal, Any
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from enum import Enum
 
 from app.models.asset_types import AssetReference, AssetType
@@ -335,8 +338,23 @@ class SequenceStructure(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
 
 
+# Columns of export_to_csv / iter_csv
+CSV_COLUMNS = [
+    "shot_id", "sequence_id", "shot_number", "shot_type",
+    "description", "duration", "status", "priority"
+]
+
+
 class GenerativeShotList(BaseModel):
-    """Complete structured shot list for generative filmmaking."""
+    """
+    Complete structured shot list for generative filmmaking.
+    
+    Shot and sequence lookups go through a private index that add_sequence,
+    add_shot, remove_shot and move_shot keep up to date, together with the
+    totals and validation state. Lists edited directly are re-indexed on the
+    next lookup once their shape (sequences or shot counts) changes; call
+    calculate_totals() after editing shots in place.
+    """
     
     # Project identification
     project_id: str = Field(..., description="Project identifier")
@@ -377,107 +395,330 @@ class GenerativeShotList(BaseModel):
     is_valid: bool = Field(default=True, description="Overall validation status")
     validation_errors: List[str] = Field(default_factory=list, description="Validation errors")
     
-    def calculate_totals(self) -> None:
-        """Calculate total statistics."""
-        self.total_shots = len(self.standalone_shots) + sum(len(seq.shots) for seq in self.sequences)
-        self.total_duration = sum(
-            shot.timing.estimated_duration 
-            for seq in self.sequences 
-            for shot in seq.shots
-        ) + sum(
-            shot.timing.estimated_duration 
-            for shot in self.standalone_shots
+    # Lookup and validation state; sequence_id None means standalone shots
+    _shot_index: Dict[str, Tuple[Optional[str], int]] = PrivateAttr(default_factory=dict)
+    _sequence_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _id_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _duplicate_ids: Set[str] = PrivateAttr(default_factory=set)
+    _invalid_durations: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _index_shape: Optional[Tuple] = PrivateAttr(default=None)
+    
+    def _shape(self) -> Tuple:
+        """Cheap fingerprint of the list structure, to notice direct edits."""
+        return (
+            id(self.sequences),
+            id(self.standalone_shots),
+            len(self.standalone_shots),
+            tuple((id(seq), id(seq.shots), len(seq.shots)) for seq in self.sequences)
         )
+    
+    def _ensure_index(self) -> None:
+        if self._index_shape != self._shape():
+            self._rebuild_index()
+    
+    def _rebuild_index(self) -> None:
+        """Index every shot and recompute totals in one pass."""
+        self._shot_index.clear()
+        self._sequence_index.clear()
+        self._id_counts.clear()
+        self._duplicate_ids.clear()
+        self._invalid_durations.clear()
+        
+        total_duration = 0.0
+        for seq_pos, seq in enumerate(self.sequences):
+            self._sequence_index.setdefault(seq.sequence_id, seq_pos)
+            for pos, shot in enumerate(seq.shots):
+                self._index_shot(shot, seq.sequence_id, pos)
+                total_duration += shot.timing.estimated_duration
+        for pos, shot in enumerate(self.standalone_shots):
+            self._index_shot(shot, None, pos)
+            total_duration += shot.timing.estimated_duration
+        
+        self.total_shots = sum(self._id_counts.values())
+        self.total_duration = total_duration
         self.total_sequences = len(self.sequences)
+        self._index_shape = self._shape()
+    
+    def _index_shot(self, shot: GenerativeShot, sequence_id: Optional[str], position: int) -> None:
+        shot_id = shot.shot_id
+        # The first occurrence wins, as with a front-to-back scan
+        self._shot_index.setdefault(shot_id, (sequence_id, position))
+        count = self._id_counts.get(shot_id, 0) + 1
+        self._id_counts[shot_id] = count
+        if count > 1:
+            self._duplicate_ids.add(shot_id)
+        if sequence_id is not None and shot.timing.estimated_duration <= 0:
+            self._invalid_durations[shot_id] = self._invalid_durations.get(shot_id, 0) + 1
+    
+    def _unindex_shot(self, shot: GenerativeShot, sequence_id: Optional[str]) -> None:
+        shot_id = shot.shot_id
+        self._shot_index.pop(shot_id, None)
+        count = self._id_counts[shot_id] - 1
+        if count:
+            self._id_counts[shot_id] = count
+        else:
+            del self._id_counts[shot_id]
+        if count <= 1:
+            self._duplicate_ids.discard(shot_id)
+        if sequence_id is not None and shot.timing.estimated_duration <= 0:
+            remaining = self._invalid_durations.get(shot_id, 0) - 1
+            if remaining > 0:
+                self._invalid_durations[shot_id] = remaining
+            else:
+                self._invalid_durations.pop(shot_id, None)
+    
+    def _reindex_from(self, sequence_id: Optional[str], start: int) -> None:
+        """Update positions of the shots after an insert or removal."""
+        shots = self._shots_of(sequence_id)
+        for pos in range(start, len(shots)):
+            shot_id = shots[pos].shot_id
+            if shot_id in self._duplicate_ids:
+                self._rebuild_index()
+                return
+            self._shot_index[shot_id] = (sequence_id, pos)
+    
+    def _shots_of(self, sequence_id: Optional[str]) -> List[GenerativeShot]:
+        if sequence_id is None:
+            return self.standalone_shots
+        position = self._sequence_index.get(sequence_id)
+        if position is None:
+            raise ValueError(f"Sequence {sequence_id} not found")
+        return self.sequences[position].shots
+    
+    def add_sequence(self, sequence: SequenceStructure) -> None:
+        """Append a sequence and index its shots."""
+        self._ensure_index()
+        if sequence.sequence_id in self._sequence_index:
+            raise ValueError(f"Sequence {sequence.sequence_id} already exists")
+        
+        self.sequences.append(sequence)
+        self._sequence_index[sequence.sequence_id] = len(self.sequences) - 1
+        for pos, shot in enumerate(sequence.shots):
+            self._index_shot(shot, sequence.sequence_id, pos)
+        
+        sequence.calculate_total_duration()
+        self.total_shots += len(sequence.shots)
+        self.total_duration += sequence.total_duration
+        self.total_sequences += 1
+        self._index_shape = self._shape()
+    
+    def remove_sequence(self, sequence_id: str) -> Optional[SequenceStructure]:
+        """Remove a sequence and all of its shots."""
+        self._ensure_index()
+        position = self._sequence_index.get(sequence_id)
+        if position is None:
+            return None
+        
+        sequence = self.sequences.pop(position)
+        for shot in sequence.shots:
+            self._unindex_shot(shot, sequence_id)
+            self.total_duration -= shot.timing.estimated_duration
+        self.total_shots -= len(sequence.shots)
+        self.total_sequences -= 1
+        
+        if any(shot.shot_id in self._id_counts for shot in sequence.shots):
+            # A shot elsewhere shares an ID with a removed one; find it again
+            self._rebuild_index()
+            return sequence
+        self._sequence_index.clear()
+        for seq_pos, seq in enumerate(self.sequences):
+            self._sequence_index.setdefault(seq.sequence_id, seq_pos)
+        self._index_shape = self._shape()
+        return sequence
+    
+    def add_shot(
+        self,
+        shot: GenerativeShot,
+        sequence_id: Optional[str] = None,
+        position: Optional[int] = None
+    ) -> None:
+        """Insert a shot into a sequence (or the standalone shots) at a position, appending by default."""
+        self._ensure_index()
+        shots = self._shots_of(sequence_id)
+        position = len(shots) if position is None else max(0, min(position, len(shots)))
+        
+        shots.insert(position, shot)
+        shot.sequence_id = sequence_id
+        self._index_shot(shot, sequence_id, position)
+        self._reindex_from(sequence_id, position + 1)
+        
+        duration = shot.timing.estimated_duration
+        if sequence_id is not None:
+            sequence = self.sequences[self._sequence_index[sequence_id]]
+            if shot.shot_id not in sequence.shot_order:
+                sequence.shot_order.insert(min(position, len(sequence.shot_order)), shot.shot_id)
+            sequence.total_duration += duration
+        self.total_shots += 1
+        self.total_duration += duration
+        self._index_shape = self._shape()
+    
+    def remove_shot(self, shot_id: str) -> Optional[GenerativeShot]:
+        """Remove a shot by its ID and return it."""
+        self._ensure_index()
+        location = self._locate_shot(shot_id)
+        if location is None:
+            return None
+        
+        sequence_id, position = location
+        shot = self._shots_of(sequence_id).pop(position)
+        self._unindex_shot(shot, sequence_id)
+        if shot_id in self._id_counts:
+            # Another shot shares the ID; find it again
+            self._rebuild_index()
+        else:
+            self._reindex_from(sequence_id, position)
+        
+        duration = shot.timing.estimated_duration
+        if sequence_id is not None:
+            sequence = self.sequences[self._sequence_index[sequence_id]]
+            if shot_id in sequence.shot_order:
+                sequence.shot_order.remove(shot_id)
+            sequence.total_duration -= duration
+        self.total_shots -= 1
+        self.total_duration -= duration
+        self._index_shape = self._shape()
+        return shot
+    
+    def move_shot(
+        self,
+        shot_id: str,
+        sequence_id: Optional[str] = None,
+        position: Optional[int] = None
+    ) -> Optional[GenerativeShot]:
+        """Move a shot to another sequence (or standalone) and/or position."""
+        self._ensure_index()
+        # Fail before removing anything if the target does not exist
+        self._shots_of(sequence_id)
+        shot = self.remove_shot(shot_id)
+        if shot is not None:
+            self.add_shot(shot, sequence_id, position)
+        return shot
+    
+    def calculate_totals(self) -> None:
+        """Calculate total statistics."""
+        self._rebuild_index()
     
     def validate_shot_list(self) -> bool:
         """Validate the complete shot list."""
+        self._ensure_index()
         errors = []
         
         # Check for duplicate shot IDs
-        shot_ids = []
-        for seq in self.sequences:
-            shot_ids.extend([shot.shot_id for shot in seq.shots])
-        shot_ids.extend([shot.shot_id for shot in self.standalone_shots])
-        
-        if len(shot_ids) != len(set(shot_ids)):
+        if self._duplicate_ids:
             errors.append("Duplicate shot IDs found")
         
         # Check timing consistency
-        for seq in self.sequences:
-            for shot in seq.shots:
-                if shot.timing.estimated_duration <= 0:
-                    errors.append(f"Invalid duration for shot {shot.shot_id}")
+        for shot_id in self._invalid_durations:
+            errors.append(f"Invalid duration for shot {shot_id}")
         
         self.validation_errors = errors
         self.is_valid = len(errors) == 0
         return self.is_valid
     
+    def _locate_shot(self, shot_id: str) -> Optional[Tuple[Optional[str], int]]:
+        location = self._shot_index.get(shot_id)
+        if location is not None and self._holds(location, shot_id):
+            return location
+        
+        # Stale entry, or a miss after the lists were edited directly
+        if location is not None or self._index_shape != self._shape():
+            self._rebuild_index()
+            location = self._shot_index.get(shot_id)
+        return location
+    
+    def _holds(self, location: Tuple[Optional[str], int], shot_id: str) -> bool:
+        """Whether an index entry still points at the shot, without re-indexing."""
+        sequence_id, position = location
+        if sequence_id is None:
+            shots = self.standalone_shots
+        else:
+            seq_pos = self._sequence_index.get(sequence_id)
+            if seq_pos is None or seq_pos >= len(self.sequences) or \
+                    self.sequences[seq_pos].sequence_id != sequence_id:
+                return False
+            shots = self.sequences[seq_pos].shots
+        return position < len(shots) and shots[position].shot_id == shot_id
+    
     def get_shot_by_id(self, shot_id: str) -> Optional[GenerativeShot]:
         """Get a shot by its ID."""
-        for seq in self.sequences:
-            for shot in seq.shots:
-                if shot.shot_id == shot_id:
-                    return shot
-        
-        for shot in self.standalone_shots:
-            if shot.shot_id == shot_id:
-                return shot
-        
-        return None
+        location = self._locate_shot(shot_id)
+        if location is None:
+            return None
+        sequence_id, position = location
+        return self._shots_of(sequence_id)[position]
     
     def get_sequence_by_id(self, sequence_id: str) -> Optional[SequenceStructure]:
         """Get a sequence by its ID."""
-        for seq in self.sequences:
-            if seq.sequence_id == sequence_id:
-                return seq
-        return None
+        position = self._sequence_index.get(sequence_id)
+        if position is not None and position < len(self.sequences) and \
+                self.sequences[position].sequence_id == sequence_id:
+            return self.sequences[position]
+        
+        if position is not None or self._index_shape != self._shape():
+            self._rebuild_index()
+            position = self._sequence_index.get(sequence_id)
+        return None if position is None else self.sequences[position]
+    
+    def iter_json(self) -> Iterator[str]:
+        """Yield the shot list as compact JSON, one shot at a time."""
+        separators = (",", ":")
+        header = self.model_dump(mode="json", exclude_none=True,
+                                 exclude={"sequences", "standalone_shots"})
+        yield json.dumps(header, separators=separators)[:-1]
+        
+        yield ',"sequences":['
+        for i, seq in enumerate(self.sequences):
+            seq_header = seq.model_dump(mode="json", exclude_none=True, exclude={"shots"})
+            yield ("," if i else "") + json.dumps(seq_header, separators=separators)[:-1] + ',"shots":['
+            for j, shot in enumerate(seq.shots):
+                yield ("," if j else "") + shot.model_dump_json(exclude_none=True)
+            yield "]}"
+        
+        yield '],"standalone_shots":['
+        for j, shot in enumerate(self.standalone_shots):
+            yield ("," if j else "") + shot.model_dump_json(exclude_none=True)
+        yield "]}"
     
     def export_to_json(self) -> str:
         """Export shot list to JSON format."""
-        return self.model_dump_json(indent=2, exclude_none=True)
+        return "".join(self.iter_json())
     
-    def export_to_csv(self) -> str:
-        """Export shot list to CSV format."""
-        import csv
-        import io
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the CSV export one row at a time, header first."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
         
-        output = io.StringIO()
-        writer = csv.writer(output)
+        def row(values: List[Any]) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
         
-        # Write header
-        writer.writerow([
-            "shot_id", "sequence_id", "shot_number", "shot_type", 
-            "description", "duration", "status", "priority"
-        ])
+        yield row(CSV_COLUMNS)
         
-        # Write shots
         for seq in self.sequences:
             for shot in seq.shots:
-                writer.writerow([
-                    shot.shot_id,
-                    seq.sequence_id,
-                    shot.shot_number,
-                    shot.shot_type.value,
-                    shot.shot_description,
-                    shot.timing.estimated_duration,
-                    shot.status,
-                    shot.render_priority
-                ])
+                yield row(self._csv_values(shot, seq.sequence_id))
         
         for shot in self.standalone_shots:
-            writer.writerow([
-                shot.shot_id,
-                "",
-                shot.shot_number,
-                shot.shot_type.value,
-                shot.shot_description,
-                shot.timing.estimated_duration,
-                shot.status,
-                shot.render_priority
-            ])
-        
-        return output.getvalue()
+            yield row(self._csv_values(shot, ""))
+    
+    @staticmethod
+    def _csv_values(shot: GenerativeShot, sequence_id: str) -> List[Any]:
+        return [
+            shot.shot_id,
+            sequence_id,
+            shot.shot_number,
+            shot.shot_type.value,
+            shot.shot_description,
+            shot.timing.estimated_duration,
+            shot.status,
+            shot.render_priority
+        ]
+    
+    def export_to_csv(self) -> str:
+        """Export shot list to CSV format."""
+        return "".join(self.iter_csv())
 
 
 class ShotListTemplate(BaseModel):
@@ -13,6 +13,9 @@ from app.progress.models import (
 from app.progress.stage_manager import StageManager
 from app.progress.eta_predictor import ETAPredictor
 from app.progress.preview_generator import PreviewGenerator
+from app.config import settings
+from app.redis_codec import binary_client, get_codec
+from app.services.task_completion import task_completions
 from app.services.websocket import WebSocketManager
 
 
@@ -26,6 +29,9 @@ class ProgressTracker:
         preview_dir: Optional[str] = None
     ):
         self.redis = redis_client
+        # Progress blobs are stored framed by the codec, which needs raw bytes
+        self.store = binary_client(redis_client)
+        self.codec = get_codec()
         self.ws_manager = ws_manager
         self.eta_predictor = ETAPredictor()
         self.preview_generator = PreviewGenerator(preview_dir)
@@ -161,6 +167,9 @@ class ProgressTracker:
             # Save and broadcast
             await self._save_progress(task_progress)
             await self._broadcast_progress(task_progress)
+            
+            if task_progress.status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
+                await self._notify_completion(task_progress)
     
     async def update_resource_usage(
         self, 
@@ -210,11 +219,15 @@ class ProgressTracker:
             return self.progress_cache[task_id]
         
         # Load from Redis
-        data = await self.redis.get(f"progress:{task_id}")
+        key = f"progress:{task_id}"
+        data = await self.store.get(self.codec.key(key))
+        if data is None:
+            # Progress written before the codec was introduced
+            data = await self.store.get(key)
         if not data:
             return None
         
-        progress = TaskProgress.model_validate_json(data)
+        progress = self.codec.decode_model(TaskProgress, data)
         self.progress_cache[task_id] = progress
         return progress
     
@@ -329,11 +342,13 @@ class ProgressTracker:
     async def _save_progress(self, progress: TaskProgress):
         """Save progress to Redis"""
         key = f"progress:{progress.task_id}"
-        await self.redis.setex(
-            key,
+        await self.store.setex(
+            self.codec.key(key),
             86400,  # 24 hour TTL
-            progress.model_dump_json()
+            self.codec.encode_model(progress)
         )
+        if settings.redis_codec_dual_write:
+            await self.store.setex(key, 86400, self.codec.legacy(progress))
         
         # Update cache
         self.progress_cache[progress.task_id] = progress
@@ -365,6 +380,20 @@ class ProgressTracker:
             'data': update.model_dump()
         })
     
+    async def _notify_completion(self, progress: TaskProgress):
+        """Resolve anyone waiting on this task"""
+        execution_time = 0.0
+        if progress.started_at and progress.completed_at:
+            execution_time = (progress.completed_at - progress.started_at).total_seconds()
+        
+        await task_completions.notify(
+            progress.task_id,
+            progress.status.value,
+            execution_time=execution_time,
+            resource_usage=progress.resource_usage,
+            error_message=progress.error
+        )
+    
     async def _record_completion(self, progress: TaskProgress):
         """Record completed task for ETA prediction"""
         if progress.started_at and progress.completed_at:
@@ -6,12 +6,17 @@ and output quality.
 """
 
 import hashlib
+import json
+import math
+import sqlite3
 import statistics
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 
+from app.config import settings
 from app.templates.base import FunctionTemplate
 from app.quality.models import QualityPreset, QualityLevel
 
@@ -110,57 +115,230 @@ class TaskExecution:
     timestamp: datetime
 
 
+@dataclass
+class ExecutionAggregate:
+    """Rolling statistics of recent executions for one key"""
+    count: int  # all executions ever recorded for the key
+    mean_duration: float
+    stdev_duration: float
+    p50_duration: float
+    p90_duration: float
+    resource_peaks: Dict[str, float] = field(default_factory=dict)
+
+
+# input_hash of the per (template, preset) rollup across all inputs
+ANY_INPUT = "*"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    template_id TEXT NOT NULL,
+    preset_id TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    duration REAL NOT NULL,
+    resource_usage TEXT NOT NULL,
+    output_metrics TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_key
+    ON executions (template_id, preset_id, input_hash, id);
+CREATE TABLE IF NOT EXISTS aggregates (
+    template_id TEXT NOT NULL,
+    preset_id TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean_duration REAL NOT NULL,
+    stdev_duration REAL NOT NULL,
+    p50_duration REAL NOT NULL,
+    p90_duration REAL NOT NULL,
+    resource_peaks TEXT NOT NULL,
+    window TEXT NOT NULL,
+    PRIMARY KEY (template_id, preset_id, input_hash)
+);
+"""
+
+
 class HistoricalDataStore:
-    """Store and retrieve historical execution data"""
+    """
+    Store and retrieve historical execution data.
+    
+    Executions are persisted in SQLite, indexed by (template, preset, input
+    hash). Each key, and each (template, preset) across all inputs, keeps a
+    rolling window of recent durations and resource usage whose statistics
+    are recomputed on insert, so estimates read one aggregate instead of
+    scanning executions.
+    """
     
-    def __init__(self):
-        self.executions: List[TaskExecution] = []
-        self.cache = {}
+    def __init__(self,
+                 db_path: Optional[Path] = None,
+                 window_size: int = 200,
+                 max_executions: int = 10000):
+        self.db_path = db_path or settings.quality_history_db
+        self.window_size = window_size
+        self.max_executions = max_executions
+        
+        if str(self.db_path) != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if str(self.db_path) != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        
+        # (template_id, preset_id, input_hash) -> (aggregate, window)
+        self.cache: Dict[Tuple[str, str, str], Tuple[ExecutionAggregate, List]] = {}
+        self._inserts = 0
+    
+    def close(self):
+        self._conn.close()
     
     async def find_similar(self, 
                           template_id: str,
                           preset_id: str,
                           input_hash: str,
                           limit: int = 10) -> List[TaskExecution]:
-        """Find similar historical executions"""
+        """Find similar historical executions, exact input matches first"""
         
         # Exact matches first
-        exact_matches = [
-            e for e in self.executions
-            if e.template_id == template_id 
-            and e.preset_id == preset_id
-            and e.input_hash == input_hash
-        ]
-        
-        if len(exact_matches) >= limit:
-            return exact_matches[:limit]
+        rows = self._conn.execute(
+            "SELECT * FROM executions WHERE template_id = ? AND preset_id = ? AND input_hash = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (template_id, preset_id, input_hash, limit)
+        ).fetchall()
         
         # Same template and preset
-        similar = [
-            e for e in self.executions
-            if e.template_id == template_id 
-            and e.preset_id == preset_id
-            and e.input_hash != input_hash
-        ]
-        
-        # Combine and return
-        results = exact_matches + similar
-        return results[:limit]
+        if len(rows) < limit:
+            rows += self._conn.execute(
+                "SELECT * FROM executions WHERE template_id = ? AND preset_id = ? AND input_hash != ? "
+                "ORDER BY id DESC LIMIT ?",
+                (template_id, preset_id, input_hash, limit - len(rows))
+            ).fetchall()
+        
+        return [self._row_to_execution(row) for row in rows]
     
     async def add_execution(self, execution: TaskExecution):
-        """Add new execution data"""
-        self.executions.append(execution)
+        """Add new execution data and update the aggregates it belongs to"""
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO executions (template_id, preset_id, input_hash, duration, "
+                "resource_usage, output_metrics, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    execution.template_id,
+                    execution.preset_id,
+                    execution.input_hash,
+                    execution.duration,
+                    json.dumps(execution.resource_usage),
+                    json.dumps(execution.output_metrics, default=str),
+                    execution.timestamp.isoformat()
+                )
+            )
+            for input_hash in (execution.input_hash, ANY_INPUT):
+                self._update_aggregate(
+                    (execution.template_id, execution.preset_id, input_hash), execution
+                )
+        
+        # Keep only recent raw executions; aggregates are unaffected
+        self._inserts += 1
+        if self._inserts % 100 == 0:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM executions WHERE id <= (SELECT MAX(id) FROM executions) - ?",
+                    (self.max_executions,)
+                )
+    
+    def get_aggregate(self,
+                      template_id: str,
+                      preset_id: str,
+                      input_hash: str = ANY_INPUT) -> Optional[ExecutionAggregate]:
+        """Rolling statistics for a key; ANY_INPUT for the (template, preset) rollup"""
+        entry = self._load((template_id, preset_id, input_hash))
+        return entry[0] if entry else None
+    
+    def _load(self, key: Tuple[str, str, str]) -> Optional[Tuple[ExecutionAggregate, List]]:
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+        
+        row = self._conn.execute(
+            "SELECT * FROM aggregates WHERE template_id = ? AND preset_id = ? AND input_hash = ?",
+            key
+        ).fetchone()
+        if row is None:
+            return None
+        
+        entry = (
+            ExecutionAggregate(
+                count=row["count"],
+                mean_duration=row["mean_duration"],
+                stdev_duration=row["stdev_duration"],
+                p50_duration=row["p50_duration"],
+                p90_duration=row["p90_duration"],
+                resource_peaks=json.loads(row["resource_peaks"])
+            ),
+            json.loads(row["window"])
+        )
+        self.cache[key] = entry
+        return entry
+    
+    def _update_aggregate(self, key: Tuple[str, str, str], execution: TaskExecution):
+        previous = self._load(key)
+        count = previous[0].count + 1 if previous else 1
+        window = list(previous[1]) if previous else []
+        
+        window.append([execution.duration, execution.resource_usage])
+        del window[:-self.window_size]
+        
+        durations = sorted(duration for duration, _ in window)
+        peaks: Dict[str, float] = {}
+        for _, usage in window:
+            for name, value in usage.items():
+                if isinstance(value, (int, float)) and value > peaks.get(name, float('-inf')):
+                    peaks[name] = value
+        
+        aggregate = ExecutionAggregate(
+            count=count,
+            mean_duration=statistics.mean(durations),
+            stdev_duration=statistics.stdev(durations) if len(durations) > 1 else 0.0,
+            p50_duration=statistics.median(durations),
+            p90_duration=durations[max(0, math.ceil(0.9 * len(durations)) - 1)],
+            resource_peaks=peaks
+        )
         
-        # Keep only recent data (last 1000 executions)
-        if len(self.executions) > 1000:
-            self.executions = self.executions[-1000:]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO aggregates (template_id, preset_id, input_hash, count, "
+            "mean_duration, stdev_duration, p50_duration, p90_duration, resource_peaks, window) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            key + (
+                aggregate.count,
+                aggregate.mean_duration,
+                aggregate.stdev_duration,
+                aggregate.p50_duration,
+                aggregate.p90_duration,
+                json.dumps(peaks),
+                json.dumps(window)
+            )
+        )
+        self.cache[key] = (aggregate, window)
+    
+    @staticmethod
+    def _row_to_execution(row: sqlite3.Row) -> TaskExecution:
+        return TaskExecution(
+            template_id=row["template_id"],
+            preset_id=row["preset_id"],
+            input_hash=row["input_hash"],
+            duration=row["duration"],
+            resource_usage=json.loads(row["resource_usage"]),
+            output_metrics=json.loads(row["output_metrics"]),
+            timestamp=datetime.fromisoformat(row["timestamp"])
+        )
 
 
 class QualityImpactEstimator:
     """Estimate impact of quality settings on outputs"""
     
-    def __init__(self):
-        self.historical_data = HistoricalDataStore()
+    def __init__(self, historical_data: Optional[HistoricalDataStore] = None):
+        self.historical_data = historical_data or HistoricalDataStore()
         self.base_estimates = {
             'image_generation': {'time': 30, 'vram': 6, 'memory': 8},
             'video_generation': {'time': 120, 'vram': 10, 'memory': 16},
@@ -174,26 +352,30 @@ class QualityImpactEstimator:
                             inputs: Dict[str, Any]) -> QualityImpact:
         """Estimate the impact of quality settings"""
         
-        # Get historical data for similar tasks
+        # Get historical statistics, preferring runs with the same inputs
         input_hash = self._hash_inputs(inputs)
-        similar_tasks = await self.historical_data.find_similar(
-            template_id=template.id,
-            preset_id=preset.id,
-            input_hash=input_hash
-        )
+        historical = self._historical_aggregate(template, preset, input_hash)
         
         # Calculate estimates
-        time_estimate = await self._estimate_time(template, preset, similar_tasks, inputs)
-        resource_estimate = await self._estimate_resources(template, preset, inputs)
+        time_estimate = await self._estimate_time(template, preset, historical, inputs)
+        resource_estimate = await self._estimate_resources(template, preset, inputs, historical)
         quality_metrics = self._estimate_quality_metrics(preset, inputs)
         
         # Calculate confidence based on historical data
-        confidence = self._calculate_confidence(similar_tasks)
+        confidence = self._calculate_confidence(historical)
         
         # Estimate cost
         cost_estimate = self._estimate_cost(time_estimate, resource_estimate)
         
         # Get sample outputs if available
+        similar_tasks = []
+        if historical:
+            similar_tasks = await self.historical_data.find_similar(
+                template_id=template.id,
+                preset_id=preset.id,
+                input_hash=input_hash,
+                limit=3
+            )
         sample_outputs = await self._get_sample_outputs(template, preset, similar_tasks)
         
         # Generate warnings
@@ -209,6 +391,35 @@ class QualityImpactEstimator:
             warnings=warnings
         )
     
+    async def record_execution(self,
+                               template: FunctionTemplate,
+                               preset: QualityPreset,
+                               inputs: Dict[str, Any],
+                               duration: float,
+                               resource_usage: Optional[Dict[str, float]] = None,
+                               output_metrics: Optional[Dict[str, Any]] = None):
+        """Feed a finished execution back into the estimates"""
+        await self.historical_data.add_execution(TaskExecution(
+            template_id=template.id,
+            preset_id=preset.id,
+            input_hash=self._hash_inputs(inputs),
+            duration=duration,
+            resource_usage=resource_usage or {},
+            output_metrics=output_metrics or {},
+            timestamp=datetime.now()
+        ))
+    
+    def _historical_aggregate(self,
+                              template: FunctionTemplate,
+                              preset: QualityPreset,
+                              input_hash: str) -> Optional[ExecutionAggregate]:
+        """Statistics for these exact inputs if there are enough, else for the preset"""
+        for key_hash in (input_hash, ANY_INPUT):
+            aggregate = self.historical_data.get_aggregate(template.id, preset.id, key_hash)
+            if aggregate and aggregate.count >= 3:
+                return aggregate
+        return None
+    
     def _hash_inputs(self, inputs: Dict[str, Any]) -> str:
         """Create hash of inputs for similarity matching"""
         # Exclude quality preset from hash
@@ -221,7 +432,7 @@ class QualityImpactEstimator:
     async def _estimate_time(self,
                            template: FunctionTemplate,
                            preset: QualityPreset,
-                           historical: List[TaskExecution],
+                           historical: Optional[ExecutionAggregate],
                            inputs: Dict[str, Any] = None) -> TimeEstimate:
         """Estimate execution time"""
         
@@ -233,26 +444,16 @@ class QualityImpactEstimator:
         )
         base_time = template.resources.estimated_time_seconds or base_config['time']
         
-        if historical and len(historical) >= 3:
+        if historical and historical.count >= 3:
             # Use historical data
-            times = [t.duration for t in historical]
-            median_time = statistics.median(times)
-            
-            if len(times) > 1:
-                std_dev = statistics.stdev(times)
-                return TimeEstimate(
-                    min_seconds=max(1, median_time - std_dev),
-                    max_seconds=median_time + std_dev,
-                    expected_seconds=median_time,
-                    confidence=min(0.95, 0.7 + len(times) * 0.02)
-                )
-            else:
-                return TimeEstimate(
-                    min_seconds=median_time * 0.8,
-                    max_seconds=median_time * 1.2,
-                    expected_seconds=median_time,
-                    confidence=0.7
-                )
+            median_time = historical.p50_duration
+            std_dev = historical.stdev_duration
+            return TimeEstimate(
+                min_seconds=max(1, median_time - std_dev),
+                max_seconds=max(median_time + std_dev, historical.p90_duration),
+                expected_seconds=median_time,
+                confidence=min(0.95, 0.7 + min(historical.count, 10) * 0.02)
+            )
         else:
             # Use multipliers
             expected = base_time * preset.time_multiplier
@@ -274,7 +475,8 @@ class QualityImpactEstimator:
     async def _estimate_resources(self,
                                 template: FunctionTemplate,
                                 preset: QualityPreset,
-                                inputs: Dict[str, Any]) -> ResourceEstimate:
+                                inputs: Dict[str, Any],
+                                historical: Optional[ExecutionAggregate] = None) -> ResourceEstimate:
         """Estimate resource requirements"""
         
         # Start with template requirements
@@ -298,6 +500,14 @@ class QualityImpactEstimator:
             vram_gb *= (1 + (batch_size - 1) * 0.3)  # Not linear scaling
             memory_gb *= (1 + (batch_size - 1) * 0.2)
         
+        # Observed peaks of recent runs replace the scaled guesses
+        if historical:
+            peaks = historical.resource_peaks
+            if 'vram_gb' in peaks:
+                vram_gb = peaks['vram_gb'] * 1.1
+            if 'memory_gb' in peaks:
+                memory_gb = peaks['memory_gb'] * 1.1
+        
         return ResourceEstimate(
             cpu_cores=base_resources.cpu_cores,
             memory_gb=round(memory_gb, 1),
@@ -356,20 +566,18 @@ class QualityImpactEstimator:
             accuracy=scores['accuracy']
         )
     
-    def _calculate_confidence(self, similar_tasks: List[TaskExecution]) -> float:
+    def _calculate_confidence(self, historical: Optional[ExecutionAggregate]) -> float:
         """Calculate confidence based on historical data"""
-        if not similar_tasks:
+        if not historical:
             return 0.5
         
         # More historical data = higher confidence
-        base_confidence = min(0.9, 0.5 + len(similar_tasks) * 0.05)
+        base_confidence = min(0.9, 0.5 + historical.count * 0.05)
         
         # Check consistency of historical data
-        if len(similar_tasks) > 2:
-            times = [t.duration for t in similar_tasks]
-            mean_time = statistics.mean(times)
-            std_dev = statistics.stdev(times)
-            cv = std_dev / mean_time if mean_time > 0 else 1.0
+        if historical.count > 2:
+            mean_time = historical.mean_duration
+            cv = historical.stdev_duration / mean_time if mean_time > 0 else 1.0
             
             # Lower coefficient of variation = higher confidence
             consistency_factor = max(0.5, 1.0 - cv)
@@ -2,11 +2,20 @@
 Preset Storage and Retrieval
 
 Handles persistence of custom quality presets.
+
+Presets live in a single SQLite catalog indexed by user, shared flag and
+last-used time, so listings are one indexed query instead of a directory
+walk. Usage counters are buffered in memory and flushed at most
+``usage_flush_interval`` seconds after the first buffered bump.
+Exports keep the standalone JSON file format.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -15,21 +24,56 @@ from .exceptions import PresetNotFoundError, PresetValidationError
 
 logger = logging.getLogger(__name__)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    user_id TEXT NOT NULL,
+    preset_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    shared INTEGER NOT NULL DEFAULT 0,
+    shared_at TEXT,
+    created_at TEXT,
+    usage_count INTEGER NOT NULL DEFAULT 0,
+    last_used_at REAL NOT NULL,
+    PRIMARY KEY (user_id, preset_id)
+);
+CREATE INDEX IF NOT EXISTS idx_presets_id ON presets (preset_id);
+CREATE INDEX IF NOT EXISTS idx_presets_shared ON presets (shared) WHERE shared = 1;
+CREATE INDEX IF NOT EXISTS idx_presets_last_used ON presets (last_used_at);
+"""
+
 
 class PresetStorage:
     """Store and retrieve custom presets"""
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(self, storage_path: Optional[Path] = None, usage_flush_interval: float = 30.0):
         self.storage_path = storage_path or Path("./data/quality_presets")
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.cache = {}
+        self.usage_flush_interval = usage_flush_interval
+        
+        # preset_id -> (usage count, last used timestamp) not yet written
+        self._pending_usage: Dict[str, Tuple[int, float]] = {}
+        self._last_flush = time.monotonic()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        
         self._ensure_storage()
     
     def _ensure_storage(self):
-        """Ensure storage directories exist"""
-        (self.storage_path / "users").mkdir(exist_ok=True)
-        (self.storage_path / "shared").mkdir(exist_ok=True)
+        """Ensure storage directories and the catalog exist"""
         (self.storage_path / "exports").mkdir(exist_ok=True)
+        
+        self._conn = sqlite3.connect(str(self.storage_path / "catalog.sqlite3"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        
+        self._migrate_preset_files()
+    
+    def close(self):
+        """Flush buffered usage and close the catalog"""
+        self.flush_usage()
+        self._conn.close()
     
     async def save_preset(self, preset: QualityPreset, user_id: str) -> bool:
         """Save custom preset"""
@@ -41,19 +85,8 @@ class PresetStorage:
         if not preset.name:
             raise PresetValidationError("Preset must have a name")
         
-        # Create user directory if needed
-        user_dir = self.storage_path / "users" / user_id
-        user_dir.mkdir(exist_ok=True)
-        
-        # Save preset file
-        preset_file = user_dir / f"{preset.id}.json"
-        
         try:
-            preset_data = preset.to_dict()
-            preset_data['user_id'] = user_id
-            
-            with open(preset_file, 'w') as f:
-                json.dump(preset_data, f, indent=2)
+            self._write_preset(preset, user_id)
             
             # Update cache
             cache_key = f"{user_id}:{preset.id}"
@@ -61,11 +94,31 @@ class PresetStorage:
             
             logger.info(f"Saved preset {preset.id} for user {user_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to save preset {preset.id}: {e}")
             raise PresetValidationError(f"Failed to save preset: {e}")
     
+    def _write_preset(self, preset: QualityPreset, user_id: str, shared: bool = False):
+        """Insert or replace a catalog row, keeping sharing state of an existing row"""
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO presets (user_id, preset_id, data, shared, created_at, usage_count, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, preset_id) DO UPDATE SET "
+                "data = excluded.data, created_at = excluded.created_at, "
+                "usage_count = excluded.usage_count, last_used_at = excluded.last_used_at",
+                (
+                    user_id,
+                    preset.id,
+                    json.dumps(preset.to_dict()),
+                    int(shared),
+                    preset.created_at.isoformat() if preset.created_at else None,
+                    preset.usage_count,
+                    time.time()
+                )
+            )
+    
     async def get_preset(self, preset_id: str, user_id: Optional[str] = None) -> Optional[QualityPreset]:
         """Get a specific preset"""
         
@@ -75,46 +128,35 @@ class PresetStorage:
             if cache_key in self.cache:
                 return self.cache[cache_key]
         
-        # Search in user presets
-        if user_id:
-            preset_file = self.storage_path / "users" / user_id / f"{preset_id}.json"
-            if preset_file.exists():
-                return await self._load_preset_file(preset_file, user_id)
-        
-        # Search in shared presets
-        shared_file = self.storage_path / "shared" / f"{preset_id}.json"
-        if shared_file.exists():
-            return await self._load_preset_file(shared_file)
-        
-        # Search all users (admin access)
-        for user_dir in (self.storage_path / "users").iterdir():
-            if user_dir.is_dir():
-                preset_file = user_dir / f"{preset_id}.json"
-                if preset_file.exists():
-                    return await self._load_preset_file(preset_file, user_dir.name)
-        
-        return None
+        # The user's own preset first, then a shared one, then any user's (admin access)
+        row = self._conn.execute(
+            "SELECT * FROM presets WHERE preset_id = ? "
+            "ORDER BY user_id = ? DESC, shared DESC LIMIT 1",
+            (preset_id, user_id)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        preset = self._load_preset_row(row)
+        if preset and row["user_id"] == user_id:
+            self.cache[f"{user_id}:{preset_id}"] = preset
+        return preset
     
     async def get_user_presets(self, user_id: str) -> List[QualityPreset]:
         """Get all presets for a user"""
         
-        presets = []
-        user_dir = self.storage_path / "users" / user_id
-        
-        if not user_dir.exists():
-            return presets
-        
-        # Load all preset files
-        for preset_file in user_dir.glob("*.json"):
-            try:
-                preset = await self._load_preset_file(preset_file, user_id)
-                if preset:
-                    presets.append(preset)
-            except Exception as e:
-                logger.warning(f"Failed to load preset {preset_file}: {e}")
-        
         # Sort by creation date (newest first)
-        presets.sort(key=lambda p: p.created_at or datetime.min, reverse=True)
+        rows = self._conn.execute(
+            "SELECT * FROM presets WHERE user_id = ? ORDER BY created_at IS NULL, created_at DESC",
+            (user_id,)
+        ).fetchall()
+        
+        presets = []
+        for row in rows:
+            preset = self._load_preset_row(row)
+            if preset:
+                self.cache[f"{user_id}:{preset.id}"] = preset
+                presets.append(preset)
         
         return presets
     
@@ -138,55 +180,74 @@ class PresetStorage:
     async def delete_preset(self, preset_id: str, user_id: str) -> bool:
         """Delete a preset"""
         
-        preset_file = self.storage_path / "users" / user_id / f"{preset_id}.json"
-        
-        if not preset_file.exists():
-            raise PresetNotFoundError(f"Preset {preset_id} not found")
-        
         try:
-            # Remove file
-            preset_file.unlink()
-            
-            # Remove from cache
-            cache_key = f"{user_id}:{preset_id}"
-            self.cache.pop(cache_key, None)
-            
-            logger.info(f"Deleted preset {preset_id} for user {user_id}")
-            return True
-            
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM presets WHERE user_id = ? AND preset_id = ?",
+                    (user_id, preset_id)
+                ).rowcount
         except Exception as e:
             logger.error(f"Failed to delete preset {preset_id}: {e}")
             return False
+        
+        if not deleted:
+            raise PresetNotFoundError(f"Preset {preset_id} not found")
+        
+        # Remove from cache
+        cache_key = f"{user_id}:{preset_id}"
+        self.cache.pop(cache_key, None)
+        
+        logger.info(f"Deleted preset {preset_id} for user {user_id}")
+        return True
     
     async def update_usage_stats(self, preset_id: str, usage_count: int) -> bool:
         """Update usage statistics for a preset"""
         
-        # Find preset file
-        preset_file = None
-        for path in [self.storage_path / "shared", self.storage_path / "users"]:
-            for file in path.rglob(f"{preset_id}.json"):
-                preset_file = file
-                break
-        
-        if not preset_file:
-            return False
-        
+        if preset_id not in self._pending_usage:
+            exists = self._conn.execute(
+                "SELECT 1 FROM presets WHERE preset_id = ? LIMIT 1", (preset_id,)
+            ).fetchone()
+            if not exists:
+                return False
+        
+        # Buffered; written on the next flush
+        self._pending_usage[preset_id] = (usage_count, time.time())
+        
+        elapsed = time.monotonic() - self._last_flush
+        if elapsed >= self.usage_flush_interval:
+            self.flush_usage()
+        elif self._flush_handle is None:
+            # Flush on the loop even if no further bump arrives
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.usage_flush_interval - elapsed, self.flush_usage
+            )
+        
+        return True
+    
+    def flush_usage(self) -> int:
+        """Write buffered usage counters to the catalog in one transaction"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._last_flush = time.monotonic()
+        if not self._pending_usage:
+            return 0
+        
+        pending, self._pending_usage = self._pending_usage, {}
         try:
-            # Load and update
-            with open(preset_file, 'r') as f:
-                data = json.load(f)
-            
-            data['usage_count'] = usage_count
-            data['updated_at'] = datetime.now().isoformat()
-            
-            with open(preset_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            return True
-            
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE presets SET usage_count = ?, last_used_at = ? WHERE preset_id = ?",
+                    [(count, used_at, preset_id) for preset_id, (count, used_at) in pending.items()]
+                )
         except Exception as e:
-            logger.error(f"Failed to update usage stats for {preset_id}: {e}")
-            return False
+            logger.error(f"Failed to flush usage stats: {e}")
+            # Keep newer bumps that arrived meanwhile
+            pending.update(self._pending_usage)
+            self._pending_usage = pending
+            return 0
+        
+        return len(pending)
     
     async def export_preset(self, preset_id: str, user_id: str) -> Optional[str]:
         """Export a preset for sharing"""
@@ -209,7 +270,7 @@ class PresetStorage:
                 json.dump(export_data, f, indent=2)
             
             return str(export_file)
-            
+        
         except Exception as e:
             logger.error(f"Failed to export preset {preset_id}: {e}")
             return None
@@ -218,16 +279,13 @@ class PresetStorage:
         """Import a preset from exported data"""
         
         try:
-            # Convert level if needed
-            if isinstance(preset_data.get('level'), int):
-                preset_data['level'] = QualityLevel(preset_data['level'])
-            
             # Create new preset with new ID
-            preset_data['id'] = f"imported_{preset_data.get('id', 'unknown')}_{datetime.now().timestamp():.0f}"
+            now = datetime.now()
+            preset_data['id'] = f"imported_{preset_data.get('id', 'unknown')}_{now.timestamp():.0f}"
             preset_data['is_custom'] = True
             preset_data['created_by'] = user_id
-            preset_data['created_at'] = datetime.now()
-            preset_data['updated_at'] = datetime.now()
+            preset_data['created_at'] = now.isoformat()
+            preset_data['updated_at'] = now.isoformat()
             preset_data['usage_count'] = 0
             
             # Remove export metadata
@@ -240,7 +298,7 @@ class PresetStorage:
             await self.save_preset(preset, user_id)
             
             return preset
-            
+        
         except Exception as e:
             logger.error(f"Failed to import preset: {e}")
             raise PresetValidationError(f"Failed to import preset: {e}")
@@ -255,21 +313,16 @@ class PresetStorage:
         if preset.created_by != user_id:
             raise PresetValidationError("Cannot share preset created by another user")
         
-        # Copy to shared directory
-        source_file = self.storage_path / "users" / user_id / f"{preset_id}.json"
-        dest_file = self.storage_path / "shared" / f"{preset_id}.json"
-        
         try:
-            preset_data = preset.to_dict()
-            preset_data['shared_by'] = user_id
-            preset_data['shared_at'] = datetime.now().isoformat()
-            
-            with open(dest_file, 'w') as f:
-                json.dump(preset_data, f, indent=2)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE presets SET shared = 1, shared_at = ? WHERE user_id = ? AND preset_id = ?",
+                    (datetime.now().isoformat(), user_id, preset_id)
+                )
             
             logger.info(f"Shared preset {preset_id} from user {user_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to share preset {preset_id}: {e}")
             return False
@@ -277,75 +330,102 @@ class PresetStorage:
     async def get_shared_presets(self) -> List[QualityPreset]:
         """Get all shared presets"""
         
-        presets = []
-        shared_dir = self.storage_path / "shared"
-        
-        if not shared_dir.exists():
-            return presets
-        
-        for preset_file in shared_dir.glob("*.json"):
-            try:
-                preset = await self._load_preset_file(preset_file)
-                if preset:
-                    presets.append(preset)
-            except Exception as e:
-                logger.warning(f"Failed to load shared preset {preset_file}: {e}")
+        rows = self._conn.execute(
+            "SELECT * FROM presets WHERE shared = 1 ORDER BY shared_at DESC"
+        ).fetchall()
         
-        return presets
+        return [preset for preset in map(self._load_preset_row, rows) if preset]
     
-    async def _load_preset_file(self, preset_file: Path, user_id: Optional[str] = None) -> Optional[QualityPreset]:
-        """Load preset from file"""
+    def _load_preset_row(self, row: sqlite3.Row) -> Optional[QualityPreset]:
+        """Load preset from a catalog row"""
         
         try:
-            with open(preset_file, 'r') as f:
-                data = json.load(f)
-            
-            # Convert timestamps
-            for field in ['created_at', 'updated_at']:
-                if data.get(field):
-                    data[field] = datetime.fromisoformat(data[field])
-            
-            # Convert level
-            if isinstance(data.get('level'), int):
-                data['level'] = QualityLevel(data['level'])
+            preset = self._preset_from_data(json.loads(row["data"]))
             
-            preset = QualityPreset(**{k: v for k, v in data.items() if k != 'user_id'})
-            
-            # Cache it
-            if user_id:
-                cache_key = f"{user_id}:{preset.id}"
-                self.cache[cache_key] = preset
+            # Usage lives in its own columns; buffered counts are newer still
+            pending = self._pending_usage.get(preset.id)
+            preset.usage_count = pending[0] if pending else row["usage_count"]
             
             return preset
-            
+        
         except Exception as e:
-            logger.error(f"Failed to load preset from {preset_file}: {e}")
+            logger.error(f"Failed to load preset {row['preset_id']} of user {row['user_id']}: {e}")
             return None
     
-    async def cleanup_old_presets(self, days: int = 90) -> int:
-        """Clean up old unused presets"""
+    @staticmethod
+    def _preset_from_data(data: Dict[str, Any]) -> QualityPreset:
+        # Convert timestamps
+        for field in ['created_at', 'updated_at']:
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+        
+        # Convert level
+        if isinstance(data.get('level'), int):
+            data['level'] = QualityLevel(data['level'])
+        
+        return QualityPreset(**{
+            k: v for k, v in data.items() if k not in ('user_id', 'shared_by', 'shared_at')
+        })
+    
+    def _migrate_preset_files(self):
+        """Import presets stored as one JSON file each by earlier versions"""
+        
+        users_dir = self.storage_path / "users"
+        shared_dir = self.storage_path / "shared"
+        if not users_dir.is_dir() and not shared_dir.is_dir():
+            return
         
         count = 0
-        cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
+        shared_files = {p.stem: p for p in shared_dir.glob("*.json")} if shared_dir.is_dir() else {}
+        for preset_file in sorted(users_dir.glob("*/*.json")) if users_dir.is_dir() else []:
+            try:
+                with open(preset_file, 'r') as f:
+                    preset = self._preset_from_data(json.load(f))
+                shared_file = shared_files.get(preset.id)
+                self._write_preset(preset, preset_file.parent.name, shared=shared_file is not None)
+            except Exception as e:
+                # Left on disk, with any shared copy, to retry on the next start
+                logger.warning(f"Failed to migrate preset {preset_file}: {e}")
+                continue
+            
+            preset_file.unlink()
+            if shared_file is not None:
+                shared_file.unlink()
+                del shared_files[preset.id]
+            count += 1
         
-        for user_dir in (self.storage_path / "users").iterdir():
-            if not user_dir.is_dir():
+        # Shared copies whose owner file is gone or failed to migrate
+        for preset_file in shared_files.values():
+            try:
+                with open(preset_file, 'r') as f:
+                    data = json.load(f)
+                preset = self._preset_from_data(dict(data))
+                self._write_preset(preset, data.get('shared_by') or preset.created_by or "", shared=True)
+            except Exception as e:
+                logger.warning(f"Failed to migrate shared preset {preset_file}: {e}")
                 continue
             
-            for preset_file in user_dir.glob("*.json"):
-                try:
-                    # Check last modified time
-                    if preset_file.stat().st_mtime < cutoff_date:
-                        # Check usage
-                        with open(preset_file, 'r') as f:
-                            data = json.load(f)
-                        
-                        if data.get('usage_count', 0) == 0:
-                            preset_file.unlink()
-                            count += 1
-                            logger.info(f"Cleaned up unused preset {preset_file.name}")
-                
-                except Exception as e:
-                    logger.warning(f"Failed to check preset {preset_file}: {e}")
-        
-        return count
\ No newline at end of file
+            preset_file.unlink()
+            count += 1
+        
+        if count:
+            logger.info(f"Migrated {count} preset files into the catalog")
+    
+    async def cleanup_old_presets(self, days: int = 90) -> int:
+        """Clean up old unused presets"""
+        
+        self.flush_usage()
+        cutoff_date = time.time() - (days * 24 * 60 * 60)
+        
+        with self._conn:
+            count = self._conn.execute(
+                "DELETE FROM presets WHERE last_used_at < ? AND usage_count = 0 AND shared = 0",
+                (cutoff_date,)
+            ).rowcount
+        
+        if count:
+            # Drop cached copies of whatever was removed
+            self.cache.clear()
+            logger.info(f"Cleaned up {count} unused presets")
+        
+        return count
@@ -1,6 +1,10 @@
 """
 Redis client for pub/sub and caching functionality.
 Handles project state management and progress updates.
+
+Structured state is written through the codec in ``app.redis_codec`` to
+versioned keys over a binary connection; reads fall back to the legacy
+text-JSON keys.
 """
 
 import json
@@ -11,6 +15,7 @@ import redis
 import redis.asyncio as aioredis
 
 from app.config import settings
+from app.redis_codec import RedisCodec, get_codec
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +23,11 @@ logger = logging.getLogger(__name__)
 class RedisClient:
     """Async Redis client for pub/sub and state management"""
 
-    def __init__(self):
+    def __init__(self, codec: RedisCodec | None = None):
         self.redis: aioredis.Redis | None = None
+        self.binary: aioredis.Redis | None = None
         self.pubsub: aioredis.client.PubSub | None = None
+        self.codec = codec or get_codec()
 
     async def connect(self):
         """Initialize Redis connection"""
@@ -28,6 +35,7 @@ class RedisClient:
             self.redis = await aioredis.from_url(
                 settings.redis_url, encoding="utf-8", decode_responses=True
             )
+            self.binary = await aioredis.from_url(settings.redis_url)
             self.pubsub = self.redis.pubsub()
 
             # Test connection
@@ -41,6 +49,8 @@ class RedisClient:
         """Close Redis connections"""
         if self.pubsub:
             await self.pubsub.close()
+        if self.binary:
+            await self.binary.close()
         if self.redis:
             await self.redis.close()
         logger.info("Redis client disconnected")
@@ -54,22 +64,32 @@ class RedisClient:
     async def get_project_state(self, project_id: str) -> dict | None:
         """Get project state from Redis"""
         key = f"{settings.redis_state_prefix}{project_id}"
-        data = await self.redis.get(key)
-        return json.loads(data) if data else None
+        return await self._read_state(key)
 
     async def set_project_state(self, project_id: str, state: dict):
         """Store project state in Redis"""
         key = f"{settings.redis_state_prefix}{project_id}"
-        await self.redis.set(
-            key,
-            json.dumps(state),
-            ex=3600,  # 1 hour expiry
-        )
+        await self._write_state(key, state, 3600)  # 1 hour expiry
 
     async def delete_project_state(self, project_id: str):
         """Delete project state from Redis"""
         key = f"{settings.redis_state_prefix}{project_id}"
-        await self.redis.delete(key)
+        await self.binary.delete(self.codec.key(key), key)
+
+    async def _write_state(self, key: str, value: Any, expiry_seconds: int):
+        """Write an encoded value, plus the legacy JSON key when dual-writing"""
+        if settings.redis_codec_dual_write:
+            pipe = self.binary.pipeline(transaction=False)
+            pipe.set(self.codec.key(key), self.codec.encode(value), ex=expiry_seconds)
+            pipe.set(key, self.codec.legacy(value), ex=expiry_seconds)
+            await pipe.execute()
+        else:
+            await self.binary.set(self.codec.key(key), self.codec.encode(value), ex=expiry_seconds)
+
+    async def _read_state(self, key: str) -> Any:
+        """Read the versioned value, falling back to the legacy key, in one round trip"""
+        versioned, legacy = await self.binary.mget(self.codec.key(key), key)
+        return self.codec.pick(versioned, legacy)
 
     async def flushdb(self):
         """Flush all keys from current database (for testing)"""
@@ -88,20 +108,19 @@ class RedisClient:
 
     async def set_with_expiry(self, key: str, value: Any, expiry_seconds: int = 300):
         """Set a key with expiry"""
-        if self.redis:
-            await self.redis.set(key, json.dumps(value), ex=expiry_seconds)
+        if self.binary:
+            await self._write_state(key, value, expiry_seconds)
 
     async def get(self, key: str) -> Any:
         """Get a value by key"""
-        if self.redis:
-            data = await self.redis.get(key)
-            return json.loads(data) if data else None
+        if self.binary:
+            return await self._read_state(key)
         return None
 
     async def delete(self, key: str):
         """Delete a key"""
-        if self.redis:
-            await self.redis.delete(key)
+        if self.binary:
+            await self.binary.delete(self.codec.key(key), key)
 
     async def publish(self, channel: str, message: str):
         """Publish message to channel"""
@@ -112,8 +131,10 @@ class RedisClient:
 class SynchronousRedisClient:
     """Synchronous Redis client for worker components"""
     
-    def __init__(self):
+    def __init__(self, codec: RedisCodec | None = None):
         self.redis: redis.Redis | None = None
+        self.binary: redis.Redis | None = None
+        self.codec = codec or get_codec()
     
     def connect(self):
         """Initialize synchronous Redis connection"""
@@ -121,6 +142,7 @@ class SynchronousRedisClient:
             self.redis = redis.from_url(
                 settings.redis_url, encoding="utf-8", decode_responses=True
             )
+            self.binary = redis.from_url(settings.redis_url)
             # Test connection
             self.redis.ping()
             logger.info(f"Synchronous Redis client connected to {settings.redis_url}")
@@ -128,36 +150,27 @@ class SynchronousRedisClient:
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self.redis = None
+            self.binary = None
             return None
     
     def disconnect(self):
         """Close Redis connection"""
+        if self.binary:
+            self.binary.close()
         if self.redis:
             self.redis.close()
         logger.info("Synchronous Redis client disconnected")
     
     def set_with_expiry(self, key: str, value: Any, expiry_seconds: int = 300) -> bool:
         """Set a key with expiry"""
-        if self.redis:
-            try:
-                serialized_value = json.dumps(value) if not isinstance(value, str) else value
-                return self.redis.setex(key, expiry_seconds, serialized_value)
-            except Exception as e:
-                logger.error(f"Error setting key {key}: {e}")
-                return False
-        return False
+        return self.setex(key, expiry_seconds, value)
     
     def get(self, key: str) -> Any:
         """Get a value by key"""
-        if self.redis:
+        if self.binary:
             try:
-                data = self.redis.get(key)
-                if data:
-                    try:
-                        return json.loads(data)
-                    except json.JSONDecodeError:
-                        return data  # Return as string if not JSON
-                return None
+                versioned, legacy = self.binary.mget(self.codec.key(key), key)
+                return self.codec.pick(versioned, legacy)
             except Exception as e:
                 logger.error(f"Error getting key {key}: {e}")
                 return None
@@ -165,9 +178,9 @@ class SynchronousRedisClient:
     
     def delete(self, key: str) -> bool:
         """Delete a key"""
-        if self.redis:
+        if self.binary:
             try:
-                return bool(self.redis.delete(key))
+                return bool(self.binary.delete(self.codec.key(key), key))
             except Exception as e:
                 logger.error(f"Error deleting key {key}: {e}")
                 return False
@@ -237,18 +250,35 @@ class SynchronousRedisClient:
         """Check if key exists"""
         if self.redis:
             try:
-                return bool(self.redis.exists(key))
+                return bool(self.redis.exists(self.codec.key(key), key))
             except Exception as e:
                 logger.error(f"Error checking existence of {key}: {e}")
                 return False
         return False
     
     def setex(self, key: str, time: int, value: Any) -> bool:
-        """Set key with expiration"""
-        if self.redis:
+        """
+        Set key with expiration.
+        
+        Strings are stored verbatim under ``key`` and drop any versioned
+        value, which ``get`` would otherwise prefer; other values are encoded
+        with the codec under the versioned key.
+        """
+        if self.binary:
             try:
-                serialized_value = json.dumps(value) if not isinstance(value, str) else value
-                return bool(self.redis.setex(key, time, serialized_value))
+                if isinstance(value, str):
+                    pipe = self.binary.pipeline(transaction=False)
+                    pipe.setex(key, time, value)
+                    pipe.delete(self.codec.key(key))
+                    return bool(pipe.execute()[0])
+                
+                if not settings.redis_codec_dual_write:
+                    return bool(self.binary.setex(self.codec.key(key), time, self.codec.encode(value)))
+                
+                pipe = self.binary.pipeline(transaction=False)
+                pipe.setex(self.codec.key(key), time, self.codec.encode(value))
+                pipe.setex(key, time, self.codec.legacy(value))
+                return bool(pipe.execute()[0])
             except Exception as e:
                 logger.error(f"Error setting {key} with expiration: {e}")
                 return False
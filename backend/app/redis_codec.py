@@ -0,0 +1,225 @@
+"""
+Codec layer for Redis-stored state.
+
+Values are framed with a one-byte header naming the serializer and whether the
+payload is zstd-compressed, so any reader can decode whatever a writer
+produced. Framed values live under versioned keys (``<key>:v2``); readers fall
+back to the legacy text-JSON key so state written by older instances stays
+readable during a rolling upgrade.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, TypeVar
+
+import msgpack
+import redis
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Version segment appended to keys holding framed values
+STATE_VERSION = 2
+
+# Header byte values
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+SERIALIZERS = ('msgpack', 'orjson', 'json')
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+def _default(obj: Any) -> Any:
+    """Fallback conversion for types the serializers do not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class RedisCodec:
+    """
+    Encodes values for Redis with a pluggable serializer and optional zstd.
+
+    Payloads larger than ``compress_threshold`` bytes are compressed when
+    ``compression='zstd'`` and the zstandard package is installed.
+    """
+
+    def __init__(self, serializer: str = 'msgpack', compression: str | None = None,
+                 compress_threshold: int = 2048, compression_level: int = 3):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown Redis serializer: {serializer}")
+        if serializer == 'orjson' and orjson is None:
+            logger.warning("orjson not available - falling back to json for Redis state")
+            serializer = 'json'
+
+        self.serializer = serializer
+        self.format = FORMAT_MSGPACK if serializer == 'msgpack' else FORMAT_JSON
+        self.compress_threshold = compress_threshold
+
+        self._compressor = None
+        self._decompressor = None
+        if compression == 'zstd':
+            if zstandard is None:
+                logger.warning("zstandard not available - Redis state will not be compressed")
+            else:
+                self._compressor = zstandard.ZstdCompressor(level=compression_level)
+                self._decompressor = zstandard.ZstdDecompressor()
+        elif compression:
+            raise ValueError(f"Unknown Redis compression: {compression}")
+
+    @property
+    def compression(self) -> str | None:
+        return 'zstd' if self._compressor else None
+
+    @staticmethod
+    def key(key: str) -> str:
+        """Versioned key holding the framed value for ``key``"""
+        return f"{key}:v{STATE_VERSION}"
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value and frame it"""
+        if self.format == FORMAT_MSGPACK:
+            payload = msgpack.packb(value, default=_default, use_bin_type=True)
+        elif self.serializer == 'orjson':
+            payload = orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(value, default=_default, separators=(',', ':')).encode()
+        return self._frame(self.format, payload)
+
+    def encode_model(self, model: BaseModel) -> bytes:
+        """Serialize a pydantic model, using its native JSON encoder where possible"""
+        if self.format == FORMAT_MSGPACK:
+            payload = msgpack.packb(model.model_dump(mode='json'), use_bin_type=True)
+        else:
+            payload = model.model_dump_json().encode()
+        return self._frame(self.format, payload)
+
+    def decode(self, data: Any) -> Any:
+        """Decode a framed value, or a legacy text value written before framing"""
+        if data is None:
+            return None
+
+        fmt, payload = self._unframe(data)
+        if fmt == FORMAT_MSGPACK:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if fmt == FORMAT_JSON:
+            return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+        # Legacy values are plain text: JSON, or an opaque string
+        text = payload.decode('utf-8') if isinstance(payload, bytes) else payload
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
+    def decode_model(self, model_cls: type[ModelT], data: Any) -> ModelT | None:
+        """Decode a value written by :meth:`encode_model` (or legacy JSON)"""
+        if data is None:
+            return None
+
+        fmt, payload = self._unframe(data)
+        if fmt == FORMAT_MSGPACK:
+            return model_cls.model_validate(
+                msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            )
+        return model_cls.model_validate_json(payload)
+
+    def legacy(self, value: Any) -> str:
+        """Text JSON as written before framing, for dual writes during a rollout"""
+        if isinstance(value, BaseModel):
+            return value.model_dump_json()
+        return json.dumps(value, default=_default)
+
+    def pick(self, versioned: Any, legacy: Any) -> Any:
+        """Decode the versioned value if present, otherwise the legacy one"""
+        return self.decode(versioned if versioned is not None else legacy)
+
+    def _frame(self, fmt: int, payload: bytes) -> bytes:
+        if self._compressor is not None and len(payload) > self.compress_threshold:
+            return bytes((fmt | FLAG_ZSTD,)) + self._compressor.compress(payload)
+        return bytes((fmt,)) + payload
+
+    def _unframe(self, data: Any):
+        """Split a stored value into (format, payload); format is None for legacy text"""
+        if isinstance(data, str):
+            return None, data
+
+        header = data[0] if data else 0
+        fmt = header & ~FLAG_ZSTD
+        if fmt not in (FORMAT_JSON, FORMAT_MSGPACK):
+            return None, data
+
+        payload = data[1:]
+        if header & FLAG_ZSTD:
+            if self._decompressor is None:
+                if zstandard is None:
+                    raise RuntimeError("zstandard is required to read compressed Redis state")
+                self._decompressor = zstandard.ZstdDecompressor()
+            payload = self._decompressor.decompress(payload)
+        return fmt, payload
+
+
+def binary_client(client: Any) -> Any:
+    """
+    Client sharing ``client``'s connection settings but returning raw bytes.
+
+    Framed values are binary, so they cannot be read through a connection
+    created with ``decode_responses=True``. Anything that is not a real
+    redis-py client (e.g. a test double) is returned unchanged.
+    """
+    pool = getattr(client, 'connection_pool', None)
+    if not isinstance(pool, (redis.ConnectionPool, aioredis.ConnectionPool)):
+        return client
+    if not pool.connection_kwargs.get('decode_responses'):
+        return client
+
+    kwargs = {**pool.connection_kwargs, 'decode_responses': False}
+    binary_pool = type(pool)(
+        connection_class=pool.connection_class,
+        max_connections=pool.max_connections,
+        **kwargs
+    )
+    return type(client)(connection_pool=binary_pool)
+
+
+# Global instance configured from settings
+_codec: RedisCodec | None = None
+
+
+def get_codec() -> RedisCodec:
+    """Get the process-wide codec configured from settings"""
+    global _codec
+    if _codec is None:
+        _codec = RedisCodec(
+            serializer=settings.redis_codec,
+            compression=settings.redis_codec_compression,
+            compress_threshold=settings.redis_codec_compress_threshold
+        )
+    return _codec
@@ -11,14 +11,20 @@ from .models import (
     ResourceAllocation,
     ResourceReservation,
     ResourceConstraints,
+    PlacementRequest,
     GPUDevice,
     GPUAllocation,
+    GPUTaskAllocation,
+    GPUAffinity,
     ResourceMetrics,
     ResourcePrediction,
     AllocationStrategy
 )
 from .mapper import ResourceMapper
+from .placement import CapacityIndex, PlacementStrategy
+from .simulation import PlacementSimulator, SimulationWorkload, SimulationReport
 from .gpu_manager import GPUResourceManager
+from .gpu_provider import GPUDeviceProvider, NVMLDeviceProvider, FakeDeviceProvider
 from .quality_scaler import QualityResourceScaler
 from .monitor import ResourceMonitor
 from .exceptions import (
@@ -34,15 +40,26 @@ __all__ = [
     "ResourceAllocation",
     "ResourceReservation",
     "ResourceConstraints",
+    "PlacementRequest",
     "GPUDevice",
     "GPUAllocation",
+    "GPUTaskAllocation",
+    "GPUAffinity",
     "ResourceMetrics",
     "ResourcePrediction",
     "AllocationStrategy",
     
     # Core components
     "ResourceMapper",
+    "CapacityIndex",
+    "PlacementStrategy",
+    "PlacementSimulator",
+    "SimulationWorkload",
+    "SimulationReport",
     "GPUResourceManager",
+    "GPUDeviceProvider",
+    "NVMLDeviceProvider",
+    "FakeDeviceProvider",
     "QualityResourceScaler",
     "ResourceMonitor",
     
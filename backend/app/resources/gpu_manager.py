@@ -1,5 +1,9 @@
 """
 GPU resource management for efficient device allocation
+
+Allocations are recorded per task and per device, so releasing a task
+returns exactly the memory it holds. Multi-GPU (gang) requests are placed in
+one pass over the devices and committed all-or-nothing under a single lock.
 """
 
 import asyncio
@@ -7,8 +11,12 @@ import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 
-from .models import GPUDevice, GPUAllocation, ResourceSpec
+from .models import (
+    GPUDevice, GPUAllocation, GPUTaskAllocation, GPUAffinity, ResourceSpec,
+    parse_compute_capability
+)
 from .exceptions import InsufficientResourcesError
+from .gpu_provider import GPUDeviceProvider, NVMLDeviceProvider
 
 logger = logging.getLogger(__name__)
 
@@ -16,31 +24,23 @@ logger = logging.getLogger(__name__)
 class GPUResourceManager:
     """Manages GPU device allocation"""
     
-    def __init__(self):
+    def __init__(self, provider: Optional[GPUDeviceProvider] = None):
         """Initialize GPU resource manager"""
+        self.provider = provider or NVMLDeviceProvider()
         self.devices: List[GPUDevice] = []
         self.allocations: Dict[int, GPUAllocation] = {}
+        self.task_allocations: Dict[str, GPUTaskAllocation] = {}
         self._lock = asyncio.Lock()
         self._monitor_task = None
-        self._nvml_available = False
-        self._init_nvml()
-        
-    def _init_nvml(self):
-        """Initialize NVIDIA Management Library"""
-        try:
-            import pynvml
-            pynvml.nvmlInit()
-            self._nvml_available = True
-            logger.info("NVML initialized successfully")
-        except ImportError:
-            logger.warning("pynvml not available - GPU monitoring disabled")
-        except Exception as e:
-            logger.warning(f"Failed to initialize NVML: {e}")
+    
+    @property
+    def _nvml_available(self) -> bool:
+        return self.provider.available
     
     async def start(self):
         """Start GPU monitoring"""
         await self._discover_devices()
-        if self._nvml_available and not self._monitor_task:
+        if self.provider.available and not self._monitor_task:
             self._monitor_task = asyncio.create_task(self._monitor_devices())
     
     async def stop(self):
@@ -54,62 +54,10 @@ class GPUResourceManager:
     
     async def _discover_devices(self) -> List[GPUDevice]:
         """Discover available GPU devices"""
-        devices = []
-        
-        if not self._nvml_available:
-            return devices
+        if not self.provider.available:
+            return []
         
-        try:
-            import pynvml
-            
-            device_count = pynvml.nvmlDeviceGetCount()
-            for i in range(device_count):
-                try:
-                    handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                    
-                    # Get device info
-                    name = pynvml.nvmlDeviceGetName(handle).decode()
-                    memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                    compute_capability = pynvml.nvmlDeviceGetCudaComputeCapability(handle)
-                    
-                    # Get utilization
-                    try:
-                        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                        gpu_util = util.gpu
-                    except:
-                        gpu_util = 0.0
-                    
-                    # Get temperature
-                    try:
-                        temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
-                    except:
-                        temp = None
-                    
-                    # Get power draw
-                    try:
-                        power = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0  # Convert to watts
-                    except:
-                        power = None
-                    
-                    device = GPUDevice(
-                        index=i,
-                        name=name,
-                        memory_total_gb=memory.total / (1024**3),
-                        memory_free_gb=memory.free / (1024**3),
-                        compute_capability=f"{compute_capability[0]}.{compute_capability[1]}",
-                        utilization_percent=gpu_util,
-                        temperature_c=temp,
-                        power_draw_w=power
-                    )
-                    
-                    devices.append(device)
-                    logger.info(f"Discovered GPU {i}: {name} ({device.memory_total_gb:.1f}GB, compute {device.compute_capability})")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to get info for GPU {i}: {e}")
-                    
-        except Exception as e:
-            logger.error(f"GPU discovery failed: {e}")
+        devices = self.provider.discover()
         
         async with self._lock:
             self.devices = devices
@@ -119,7 +67,8 @@ class GPUResourceManager:
     async def allocate_gpu(self, 
                           memory_gb: float,
                           compute_capability: Optional[str] = None,
-                          preferred_device: Optional[int] = None) -> Optional[int]:
+                          preferred_device: Optional[int] = None,
+                          task_id: Optional[str] = None) -> Optional[int]:
         """
         Allocate GPU device for task.
         
@@ -127,6 +76,7 @@ class GPUResourceManager:
             memory_gb: Required GPU memory in GB
             compute_capability: Minimum compute capability required
             preferred_device: Preferred device index
+            task_id: Task to record the allocation against
             
         Returns:
             Device index if allocated, None if no suitable device
@@ -134,131 +84,196 @@ class GPUResourceManager:
         async with self._lock:
             # Check preferred device first
             if preferred_device is not None:
-                if await self._try_allocate_device(preferred_device, memory_gb, compute_capability):
+                device = self._device(preferred_device)
+                if device and self._fits(device, memory_gb, compute_capability):
+                    self._commit(task_id, [preferred_device], memory_gb)
                     return preferred_device
             
-            # Find suitable device
+            # Prefer the least utilized device that fits, then the one with most free memory
             candidates = []
             for device in self.devices:
-                # Get allocated memory
-                allocated = self.allocations.get(device.index, GPUAllocation(
-                    device_index=device.index,
-                    memory_gb=0
-                )).memory_gb
-                
-                free_memory = device.memory_total_gb - allocated
-                
-                # Check requirements
-                if free_memory < memory_gb:
-                    continue
-                
-                if compute_capability and device.compute_capability < compute_capability:
+                if device.memory_total_gb <= 0 or not self._fits(device, memory_gb, compute_capability):
                     continue
-                
-                # Score device (prefer less utilized)
-                score = free_memory / device.memory_total_gb
-                candidates.append((score, device.index))
-            
-            # Sort by score (higher is better)
-            candidates.sort(reverse=True)
-            
-            # Try to allocate on best candidate
-            for _, device_index in candidates:
-                if await self._try_allocate_device(device_index, memory_gb, compute_capability):
-                    return device_index
+                free = self._free_memory(device)
+                candidates.append((free / device.memory_total_gb, free, -device.index))
+            if not candidates:
+                return None
             
-            return None
-    
-    async def _try_allocate_device(self,
-                                  device_index: int,
-                                  memory_gb: float,
-                                  compute_capability: Optional[str]) -> bool:
-        """Try to allocate on specific device"""
-        if device_index >= len(self.devices):
-            return False
-        
-        device = self.devices[device_index]
-        
-        # Check compute capability
-        if compute_capability and device.compute_capability < compute_capability:
-            return False
-        
-        # Check available memory
-        if device_index in self.allocations:
-            allocated = self.allocations[device_index].memory_gb
-            free = device.memory_total_gb - allocated
-        else:
-            free = device.memory_total_gb
-        
-        if free < memory_gb:
-            return False
-        
-        # Allocate
-        if device_index not in self.allocations:
-            self.allocations[device_index] = GPUAllocation(
-                device_index=device_index,
-                memory_gb=memory_gb
-            )
-        else:
-            self.allocations[device_index].memory_gb += memory_gb
-        
-        logger.info(f"Allocated {memory_gb:.1f}GB on GPU {device_index}")
-        return True
+            *_, negative_index = max(candidates)
+            device_index = -negative_index
+            self._commit(task_id, [device_index], memory_gb)
+            return device_index
     
     async def allocate_multi_gpu(self,
                                count: int,
                                memory_per_gpu_gb: float,
-                               compute_capability: Optional[str] = None) -> Optional[List[int]]:
+                               compute_capability: Optional[str] = None,
+                               task_id: Optional[str] = None,
+                               affinity: GPUAffinity = GPUAffinity.NONE) -> Optional[List[int]]:
         """
-        Allocate multiple GPU devices.
+        Allocate multiple GPU devices as one gang.
+        
+        Either every device is reserved or none is. Devices are chosen
+        best-fit (least free memory left over) so large devices stay
+        available for large requests.
         
         Args:
             count: Number of GPUs needed
             memory_per_gpu_gb: Memory required per GPU
             compute_capability: Minimum compute capability
+            task_id: Task to record the allocation against
+            affinity: Whether devices must share a topology group
             
         Returns:
             List of device indices if allocated, None if not enough devices
         """
+        if count <= 0:
+            return []
+        
         async with self._lock:
-            allocated_devices = []
+            device_indices = self._select_gang(
+                count, memory_per_gpu_gb, compute_capability, affinity
+            )
+            if device_indices is None:
+                return None
+            
+            self._commit(task_id, device_indices, memory_per_gpu_gb)
+            return device_indices
+    
+    def _select_gang(self,
+                     count: int,
+                     memory_gb: float,
+                     compute_capability: Optional[str],
+                     affinity: GPUAffinity) -> Optional[List[int]]:
+        """Choose ``count`` devices in one pass without reserving anything"""
+        # Single pass: bucket eligible devices by topology group
+        groups: Dict[Optional[int], List[Tuple[float, int]]] = {}
+        eligible: List[Tuple[float, int]] = []
+        for device in self.devices:
+            if not self._fits(device, memory_gb, compute_capability):
+                continue
+            entry = (self._free_memory(device) - memory_gb, device.index)
+            eligible.append(entry)
+            if device.topology_group is not None:
+                groups.setdefault(device.topology_group, []).append(entry)
+        
+        if len(eligible) < count:
+            return None
+        
+        if affinity != GPUAffinity.NONE:
+            # Tightest group that can hold the whole gang
+            best_group = None
+            for members in groups.values():
+                if len(members) < count:
+                    continue
+                chosen = sorted(members)[:count]
+                leftover = sum(left for left, _ in chosen)
+                if best_group is None or leftover < best_group[0]:
+                    best_group = (leftover, chosen)
             
-            # Try to allocate requested number of devices
-            for _ in range(count):
-                device_index = await self.allocate_gpu(
-                    memory_gb=memory_per_gpu_gb,
-                    compute_capability=compute_capability
+            if best_group is not None:
+                return [index for _, index in best_group[1]]
+            if affinity == GPUAffinity.REQUIRE:
+                return None
+        
+        return [index for _, index in sorted(eligible)[:count]]
+    
+    def _device(self, device_index: int) -> Optional[GPUDevice]:
+        for device in self.devices:
+            if device.index == device_index:
+                return device
+        return None
+    
+    def _free_memory(self, device: GPUDevice) -> float:
+        allocation = self.allocations.get(device.index)
+        return device.memory_total_gb - (allocation.memory_gb if allocation else 0.0)
+    
+    def _fits(self, device: GPUDevice, memory_gb: float, compute_capability: Optional[str]) -> bool:
+        if compute_capability and (parse_compute_capability(device.compute_capability)
+                                   < parse_compute_capability(compute_capability)):
+            return False
+        return self._free_memory(device) >= memory_gb
+    
+    def _commit(self, task_id: Optional[str], device_indices: List[int], memory_gb: float):
+        """Record a reservation on each device; caller holds the lock"""
+        record = None
+        if task_id is not None:
+            record = self.task_allocations.setdefault(task_id, GPUTaskAllocation(task_id=task_id))
+        
+        for device_index in device_indices:
+            allocation = self.allocations.get(device_index)
+            if allocation is None:
+                allocation = self.allocations[device_index] = GPUAllocation(
+                    device_index=device_index,
+                    memory_gb=0.0
                 )
-                
-                if device_index is None:
-                    # Rollback allocations
-                    for idx in allocated_devices:
-                        await self.release_gpu(idx, memory_per_gpu_gb)
-                    return None
-                
-                allocated_devices.append(device_index)
+            allocation.memory_gb += memory_gb
+            
+            if record is not None:
+                record.devices[device_index] = record.devices.get(device_index, 0.0) + memory_gb
+                if task_id not in allocation.tasks:
+                    allocation.tasks.append(task_id)
             
-            return allocated_devices
+            logger.info(f"Allocated {memory_gb:.1f}GB on GPU {device_index}")
     
-    async def release_gpu(self, device_index: int, memory_gb: float):
+    def _uncommit(self, device_index: int, memory_gb: float):
+        """Return memory to a device; caller holds the lock"""
+        allocation = self.allocations.get(device_index)
+        if allocation is None:
+            return
+        
+        allocation.memory_gb -= memory_gb
+        if allocation.memory_gb <= 1e-9:
+            del self.allocations[device_index]
+    
+    async def release_gpu(self, device_index: int, memory_gb: float,
+                          task_id: Optional[str] = None):
         """Release GPU allocation"""
         async with self._lock:
-            if device_index in self.allocations:
-                self.allocations[device_index].memory_gb -= memory_gb
-                
-                if self.allocations[device_index].memory_gb <= 0:
-                    del self.allocations[device_index]
-                
-                logger.info(f"Released {memory_gb:.1f}GB on GPU {device_index}")
+            if device_index not in self.allocations:
+                return
+            
+            self._uncommit(device_index, memory_gb)
+            
+            record = self.task_allocations.get(task_id) if task_id else None
+            if record is not None and device_index in record.devices:
+                remaining = record.devices[device_index] - memory_gb
+                if remaining <= 1e-9:
+                    del record.devices[device_index]
+                    allocation = self.allocations.get(device_index)
+                    if allocation and task_id in allocation.tasks:
+                        allocation.tasks.remove(task_id)
+                else:
+                    record.devices[device_index] = remaining
+                if not record.devices:
+                    del self.task_allocations[task_id]
+            
+            logger.info(f"Released {memory_gb:.1f}GB on GPU {device_index}")
     
-    async def release_task_gpus(self, task_id: str):
-        """Release all GPU allocations for a task"""
+    async def release_task_gpus(self, task_id: str) -> Dict[int, float]:
+        """
+        Release all GPU allocations for a task.
+        
+        Returns:
+            Memory returned per device index
+        """
         async with self._lock:
-            for device_index, allocation in list(self.allocations.items()):
-                if task_id in allocation.tasks:
+            record = self.task_allocations.pop(task_id, None)
+            if record is None:
+                return {}
+            
+            for device_index, memory_gb in record.devices.items():
+                allocation = self.allocations.get(device_index)
+                if allocation and task_id in allocation.tasks:
                     allocation.tasks.remove(task_id)
-                    # Note: This simplified version doesn't track memory per task
-                    # In production, would need task->memory mapping
+                self._uncommit(device_index, memory_gb)
+            
+            logger.info(f"Released {record.memory_gb:.1f}GB across {len(record.devices)} GPU(s) for task {task_id}")
+            return dict(record.devices)
+    
+    def get_task_allocation(self, task_id: str) -> Optional[GPUTaskAllocation]:
+        """Get the GPU memory held by a task"""
+        return self.task_allocations.get(task_id)
     
     async def get_gpu_status(self) -> Dict[str, Any]:
         """Get current GPU status"""
@@ -266,26 +281,26 @@ class GPUResourceManager:
             device_statuses = []
             
             for device in self.devices:
-                allocated = self.allocations.get(device.index, GPUAllocation(
-                    device_index=device.index,
-                    memory_gb=0
-                )).memory_gb
+                allocation = self.allocations.get(device.index)
+                allocated = allocation.memory_gb if allocation else 0.0
                 
                 device_statuses.append({
                     "index": device.index,
                     "name": device.name,
                     "compute_capability": device.compute_capability,
+                    "topology_group": device.topology_group,
                     "memory_total_gb": device.memory_total_gb,
                     "memory_allocated_gb": allocated,
                     "memory_free_gb": device.memory_total_gb - allocated,
                     "utilization_percent": device.utilization_percent,
                     "temperature_c": device.temperature_c,
                     "power_draw_w": device.power_draw_w,
+                    "tasks": list(allocation.tasks) if allocation else [],
                     "allocation_percent": (allocated / device.memory_total_gb * 100) if device.memory_total_gb > 0 else 0
                 })
             
             total_memory = sum(d.memory_total_gb for d in self.devices)
-            total_allocated = sum(self.allocations.get(d.index, GPUAllocation(device_index=d.index, memory_gb=0)).memory_gb for d in self.devices)
+            total_allocated = sum(s["memory_allocated_gb"] for s in device_statuses)
             
             return {
                 "devices": device_statuses,
@@ -294,7 +309,8 @@ class GPUResourceManager:
                     "total_memory_gb": total_memory,
                     "allocated_memory_gb": total_allocated,
                     "free_memory_gb": total_memory - total_allocated,
-                    "allocation_percent": (total_allocated / total_memory * 100) if total_memory > 0 else 0
+                    "allocation_percent": (total_allocated / total_memory * 100) if total_memory > 0 else 0,
+                    "task_count": len(self.task_allocations)
                 }
             }
     
@@ -322,41 +338,13 @@ class GPUResourceManager:
             try:
                 await asyncio.sleep(30)  # Update every 30 seconds
                 
-                if not self._nvml_available:
+                if not self.provider.available:
                     continue
                 
-                import pynvml
-                
                 async with self._lock:
                     for device in self.devices:
                         try:
-                            handle = pynvml.nvmlDeviceGetHandleByIndex(device.index)
-                            
-                            # Update memory info
-                            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                            device.memory_free_gb = memory.free / (1024**3)
-                            
-                            # Update utilization
-                            try:
-                                util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                                device.utilization_percent = util.gpu
-                            except:
-                                pass
-                            
-                            # Update temperature
-                            try:
-                                device.temperature_c = pynvml.nvmlDeviceGetTemperature(
-                                    handle, pynvml.NVML_TEMPERATURE_GPU
-                                )
-                            except:
-                                pass
-                            
-                            # Update power
-                            try:
-                                device.power_draw_w = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
-                            except:
-                                pass
-                                
+                            self.provider.refresh(device)
                         except Exception as e:
                             logger.error(f"Failed to update GPU {device.index} status: {e}")
                             
@@ -0,0 +1,156 @@
+"""
+GPU device providers.
+
+The GPU resource manager reads devices through a provider so allocation logic
+is independent of NVML. ``FakeDeviceProvider`` serves a synthetic device set
+for exercising multi-GPU scheduling on machines without GPUs.
+"""
+
+import logging
+from collections.abc import Sequence
+
+from .models import GPUDevice
+
+logger = logging.getLogger(__name__)
+
+
+class GPUDeviceProvider:
+    """Source of GPU device information"""
+
+    @property
+    def available(self) -> bool:
+        """Whether devices can be queried at all"""
+        return False
+
+    def discover(self) -> list[GPUDevice]:
+        """Enumerate devices"""
+        return []
+
+    def refresh(self, device: GPUDevice):
+        """Update the dynamic fields (free memory, utilization, ...) of a device"""
+
+
+class NVMLDeviceProvider(GPUDeviceProvider):
+    """Devices reported by the NVIDIA Management Library"""
+
+    def __init__(self):
+        self._available = False
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            self._available = True
+            logger.info("NVML initialized successfully")
+        except ImportError:
+            logger.warning("pynvml not available - GPU monitoring disabled")
+        except Exception as e:
+            logger.warning(f"Failed to initialize NVML: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    def discover(self) -> list[GPUDevice]:
+        devices = []
+        if not self._available:
+            return devices
+
+        try:
+            import pynvml
+
+            device_count = pynvml.nvmlDeviceGetCount()
+            for i in range(device_count):
+                try:
+                    handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+
+                    # Get device info
+                    name = pynvml.nvmlDeviceGetName(handle)
+                    if isinstance(name, bytes):
+                        name = name.decode()
+                    memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                    compute_capability = pynvml.nvmlDeviceGetCudaComputeCapability(handle)
+
+                    device = GPUDevice(
+                        index=i,
+                        name=name,
+                        memory_total_gb=memory.total / (1024**3),
+                        memory_free_gb=memory.free / (1024**3),
+                        compute_capability=f"{compute_capability[0]}.{compute_capability[1]}",
+                        topology_group=self._topology_group(pynvml, handle)
+                    )
+                    self.refresh(device, handle)
+
+                    devices.append(device)
+                    logger.info(f"Discovered GPU {i}: {name} ({device.memory_total_gb:.1f}GB, compute {device.compute_capability})")
+
+                except Exception as e:
+                    logger.error(f"Failed to get info for GPU {i}: {e}")
+
+        except Exception as e:
+            logger.error(f"GPU discovery failed: {e}")
+
+        return devices
+
+    def refresh(self, device: GPUDevice, handle=None):
+        if not self._available:
+            return
+
+        import pynvml
+
+        if handle is None:
+            handle = pynvml.nvmlDeviceGetHandleByIndex(device.index)
+
+        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        device.memory_free_gb = memory.free / (1024**3)
+
+        try:
+            device.utilization_percent = pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+        except Exception:
+            pass
+
+        try:
+            device.temperature_c = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+        except Exception:
+            pass
+
+        try:
+            device.power_draw_w = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0  # Convert to watts
+        except Exception:
+            pass
+
+    @staticmethod
+    def _topology_group(pynvml, handle) -> int | None:
+        """NUMA node the device is attached to, when the driver reports it"""
+        try:
+            return pynvml.nvmlDeviceGetNumaNodeId(handle)
+        except Exception:
+            return None
+
+
+class FakeDeviceProvider(GPUDeviceProvider):
+    """Synthetic devices for tests and benchmarks on CPU-only machines"""
+
+    def __init__(self, devices: Sequence[GPUDevice]):
+        self.devices = list(devices)
+
+    @classmethod
+    def uniform(cls, count: int, memory_gb: float = 24.0, compute_capability: str = "8.6",
+                group_size: int | None = None) -> "FakeDeviceProvider":
+        """``count`` identical devices, grouped ``group_size`` per topology group"""
+        return cls([
+            GPUDevice(
+                index=i,
+                name=f"Fake GPU {i}",
+                memory_total_gb=memory_gb,
+                memory_free_gb=memory_gb,
+                compute_capability=compute_capability,
+                topology_group=i // group_size if group_size else None
+            )
+            for i in range(count)
+        ])
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def discover(self) -> list[GPUDevice]:
+        return [GPUDevice(**device.__dict__) for device in self.devices]
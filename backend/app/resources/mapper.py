@@ -3,8 +3,9 @@ Resource mapper for allocating tasks to workers based on resource requirements
 """
 
 import asyncio
+import itertools
 import uuid
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime, timedelta
 from collections import defaultdict
 import logging
@@ -15,7 +16,18 @@ from .models import (
     ResourceAllocation,
     ResourceReservation,
     ResourceConstraints,
-    AllocationStrategy
+    PlacementRequest,
+    AllocationStrategy,
+    parse_compute_capability
+)
+from .placement import (
+    CapacityIndex,
+    PlacementStrategy,
+    FirstFitStrategy,
+    BestFitStrategy,
+    LoadBalanceStrategy,
+    PackStrategy,
+    SpreadStrategy
 )
 from .exceptions import InsufficientResourcesError, ResourceConflictError
 
@@ -36,13 +48,24 @@ class ResourceMapper:
         self.allocations: Dict[str, ResourceAllocation] = {}
         self.reservations: Dict[str, ResourceReservation] = {}
         self.strategy = strategy
+        self.strategies: Dict[Union[AllocationStrategy, str], PlacementStrategy] = {
+            AllocationStrategy.FIRST_FIT: FirstFitStrategy(),
+            AllocationStrategy.BEST_FIT: BestFitStrategy(),
+            AllocationStrategy.LOAD_BALANCE: LoadBalanceStrategy(),
+            AllocationStrategy.PACK: PackStrategy(),
+            AllocationStrategy.SPREAD: SpreadStrategy(),
+        }
+        self._index = CapacityIndex()
+        # Registration order, used to break ties between equally scored workers
+        self._order: Dict[str, int] = {}
+        self._sequence = itertools.count()
         self._lock = asyncio.Lock()
         self._cleanup_task = None
         
     async def start(self):
         """Start the resource mapper"""
         if not self._cleanup_task:
-            self._cleanup_task = asyncio.create_task(self._cleanup_expired())
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
     
     async def stop(self):
         """Stop the resource mapper"""
@@ -52,14 +75,22 @@ class ResourceMapper:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
+            self._cleanup_task = None
+    
+    def register_strategy(self, name: Union[AllocationStrategy, str], strategy: PlacementStrategy):
+        """Add or replace a placement strategy"""
+        self.strategies[name] = strategy
     
     async def register_worker(self, worker_id: str, resources: ResourceSpec):
         """Register a worker with its available resources"""
         async with self._lock:
-            self.workers[worker_id] = WorkerResources(
+            worker = WorkerResources(
                 worker_id=worker_id,
                 total=resources
             )
+            self.workers[worker_id] = worker
+            self._order.setdefault(worker_id, next(self._sequence))
+            self._index.update(worker)
             logger.info(f"Registered worker {worker_id} with resources: {resources}")
     
     async def unregister_worker(self, worker_id: str):
@@ -78,12 +109,14 @@ class ResourceMapper:
                     )
                 
                 del self.workers[worker_id]
+                self._order.pop(worker_id, None)
+                self._index.remove(worker_id)
                 logger.info(f"Unregistered worker {worker_id}")
     
     async def find_worker(self, 
                          requirements: ResourceSpec,
                          constraints: Optional[ResourceConstraints] = None,
-                         strategy: Optional[AllocationStrategy] = None) -> Optional[str]:
+                         strategy: Optional[Union[AllocationStrategy, str]] = None) -> Optional[str]:
         """
         Find suitable worker for requirements.
         
@@ -96,19 +129,12 @@ class ResourceMapper:
             Worker ID if found, None otherwise
         """
         async with self._lock:
-            # Get candidate workers
-            candidates = self._get_candidates(requirements, constraints)
-            
-            if not candidates:
-                logger.warning(f"No candidates found for requirements: {requirements}")
-                return None
-            
-            # Apply allocation strategy
-            use_strategy = strategy or self.strategy
-            selected = self._select_worker(candidates, requirements, use_strategy)
+            selected = self._find_worker(requirements, constraints, strategy or self.strategy)
             
             if selected:
                 logger.info(f"Selected worker {selected} for requirements: {requirements}")
+            else:
+                logger.warning(f"No candidates found for requirements: {requirements}")
             
             return selected
     
@@ -152,6 +178,7 @@ class ResourceMapper:
             
             # Update worker reserved resources
             worker.reserved = worker.reserved + requirements
+            self._index.update(worker)
             self.reservations[reservation_id] = reservation
             
             logger.info(f"Created reservation {reservation_id} on worker {worker_id}")
@@ -194,6 +221,7 @@ class ResourceMapper:
                 # Remove reservation
                 worker.reserved = worker.reserved - reservation.resources
                 del self.reservations[reservation_id]
+                self._index.update(worker)
             
             # Check availability
             if not worker.can_allocate(requirements):
@@ -201,47 +229,100 @@ class ResourceMapper:
                     f"Worker {worker_id} cannot fulfill requirements: {requirements}"
                 )
             
-            # Create allocation
-            allocation_id = str(uuid.uuid4())
-            allocation = ResourceAllocation(
-                id=allocation_id,
-                worker_id=worker_id,
-                task_id=task_id,
-                resources=requirements,
-                allocated_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(seconds=duration_estimate) if duration_estimate else None
-            )
-            
-            # Update worker allocated resources
-            worker.allocated = worker.allocated + requirements
-            self.allocations[allocation_id] = allocation
+            return self._allocate(worker, requirements, task_id, duration_estimate)
+    
+    async def place_batch(self,
+                          requests: List[PlacementRequest],
+                          strategy: Optional[Union[AllocationStrategy, str]] = None,
+                          largest_first: bool = True) -> List[Optional[ResourceAllocation]]:
+        """
+        Find workers for and allocate a batch of tasks in one call.
+        
+        Args:
+            requests: Tasks to place
+            strategy: Override default allocation strategy
+            largest_first: Place the largest requests first, which leaves less
+                stranded capacity than arrival order
             
-            logger.info(f"Created allocation {allocation_id} for task {task_id} on worker {worker_id}")
-            return allocation
+        Returns:
+            Allocations in request order, None where a task could not be placed
+        """
+        order = list(range(len(requests)))
+        if largest_first:
+            order.sort(key=lambda i: (
+                -requests[i].requirements.gpu_count,
+                -requests[i].requirements.memory_gb,
+                -requests[i].requirements.cpu_cores
+            ))
+        
+        results: List[Optional[ResourceAllocation]] = [None] * len(requests)
+        use_strategy = strategy or self.strategy
+        
+        async with self._lock:
+            for i in order:
+                request = requests[i]
+                worker_id = self._find_worker(request.requirements, request.constraints, use_strategy)
+                if worker_id is None:
+                    continue
+                results[i] = self._allocate(
+                    self.workers[worker_id],
+                    request.requirements,
+                    request.task_id,
+                    request.duration_estimate
+                )
+        
+        placed = sum(1 for allocation in results if allocation)
+        logger.info(f"Placed {placed}/{len(requests)} tasks in batch")
+        return results
+    
+    def _allocate(self,
+                  worker: WorkerResources,
+                  requirements: ResourceSpec,
+                  task_id: str,
+                  duration_estimate: Optional[int]) -> ResourceAllocation:
+        """Record an allocation on a worker known to fit it; caller holds the lock"""
+        allocation_id = str(uuid.uuid4())
+        allocation = ResourceAllocation(
+            id=allocation_id,
+            worker_id=worker.worker_id,
+            task_id=task_id,
+            resources=requirements,
+            allocated_at=datetime.now(),
+            expires_at=datetime.now() + timedelta(seconds=duration_estimate) if duration_estimate else None
+        )
+        
+        # Update worker allocated resources
+        worker.allocated = worker.allocated + requirements
+        self._index.update(worker)
+        self.allocations[allocation_id] = allocation
+        
+        logger.debug(f"Created allocation {allocation_id} for task {task_id} on worker {worker.worker_id}")
+        return allocation
     
     async def release(self, allocation_id: str):
         """Release an allocation"""
         async with self._lock:
-            if allocation_id not in self.allocations:
-                logger.warning(f"Unknown allocation: {allocation_id}")
-                return
-            
-            allocation = self.allocations[allocation_id]
-            worker_id = allocation.worker_id
-            
-            if worker_id in self.workers:
-                worker = self.workers[worker_id]
-                worker.allocated = worker.allocated - allocation.resources
-            
-            del self.allocations[allocation_id]
-            logger.info(f"Released allocation {allocation_id}")
+            self._release(allocation_id)
+    
+    def _release(self, allocation_id: str):
+        if allocation_id not in self.allocations:
+            logger.warning(f"Unknown allocation: {allocation_id}")
+            return
+        
+        allocation = self.allocations.pop(allocation_id)
+        worker = self.workers.get(allocation.worker_id)
+        if worker:
+            worker.allocated = worker.allocated - allocation.resources
+            self._index.update(worker)
+        
+        logger.info(f"Released allocation {allocation_id}")
     
     async def get_resource_status(self) -> Dict[str, Any]:
         """Get current resource utilization status"""
         async with self._lock:
-            total = ResourceSpec()
-            allocated = ResourceSpec()
-            reserved = ResourceSpec()
+            total = ResourceSpec.zero()
+            allocated = ResourceSpec.zero()
+            reserved = ResourceSpec.zero()
             
             worker_statuses = []
             for worker_id, worker in self.workers.items():
@@ -275,21 +356,44 @@ class ResourceMapper:
                 "active_reservations": len(self.reservations)
             }
     
+    def _find_worker(self,
+                     requirements: ResourceSpec,
+                     constraints: Optional[ResourceConstraints],
+                     strategy: Union[AllocationStrategy, str]) -> Optional[str]:
+        """Candidate lookup plus strategy selection; caller holds the lock"""
+        placement = self.strategies.get(strategy)
+        if placement is None:
+            logger.warning(f"Unknown allocation strategy {strategy}, using first fit")
+            placement = self.strategies[AllocationStrategy.FIRST_FIT]
+        
+        candidates = self._get_candidates(requirements, constraints, placement)
+        return self._select_worker(candidates, requirements, placement)
+    
     def _get_candidates(self, 
                        requirements: ResourceSpec,
-                       constraints: Optional[ResourceConstraints]) -> List[str]:
-        """Get workers that can fulfill requirements"""
-        candidates = []
+                       constraints: Optional[ResourceConstraints],
+                       placement: Optional[PlacementStrategy] = None) -> List[Tuple[WorkerResources, ResourceSpec]]:
+        """Get workers that can fulfill requirements, with their free resources"""
+        if constraints and constraints.preferred_worker:
+            # Only one worker can match, skip the index
+            indexed = [constraints.preferred_worker] if constraints.preferred_worker in self.workers else []
+        else:
+            indexed = self._index.candidates(
+                requirements,
+                constraints.require_compute_capability if constraints else None,
+                placement.tightest_first if placement else None
+            )
+        limit = placement.candidate_limit if placement else None
         
-        for worker_id, resources in self.workers.items():
-            # Check basic resource availability
-            if not resources.can_allocate(requirements):
+        candidates = []
+        for worker_id in indexed:
+            resources = self.workers[worker_id]
+            available = self._index.available(worker_id)
+            if not requirements.fits_within(available):
                 continue
             
             # Check constraints
             if constraints:
-                if constraints.preferred_worker and worker_id != constraints.preferred_worker:
-                    continue
                 if constraints.exclude_workers and worker_id in constraints.exclude_workers:
                     continue
                 if constraints.require_gpu_type:
@@ -298,153 +402,72 @@ class ResourceMapper:
                 if constraints.require_compute_capability:
                     if not resources.total.gpu_compute_capability:
                         continue
-                    if resources.total.gpu_compute_capability < constraints.require_compute_capability:
+                    if (parse_compute_capability(resources.total.gpu_compute_capability)
+                            < parse_compute_capability(constraints.require_compute_capability)):
                         continue
             
-            candidates.append(worker_id)
+            candidates.append((resources, available))
+            if limit and len(candidates) >= limit:
+                break
         
         return candidates
     
     def _select_worker(self, 
-                      candidates: List[str], 
+                      candidates: List[Tuple[WorkerResources, ResourceSpec]], 
                       requirements: ResourceSpec,
-                      strategy: AllocationStrategy) -> Optional[str]:
-        """Select best worker from candidates based on strategy"""
+                      placement: PlacementStrategy) -> Optional[str]:
+        """Select best worker from candidates in one scoring pass"""
         if not candidates:
             return None
         
-        if strategy == AllocationStrategy.FIRST_FIT:
-            # Return first available worker
-            return candidates[0]
-        
-        elif strategy == AllocationStrategy.BEST_FIT:
-            # Find worker with least waste
-            best_worker = None
-            min_waste = float('inf')
-            
-            for worker_id in candidates:
-                worker = self.workers[worker_id]
-                available = worker.available
-                
-                # Calculate waste (excess resources)
-                cpu_waste = available.cpu_cores - requirements.cpu_cores
-                mem_waste = available.memory_gb - requirements.memory_gb
-                total_waste = cpu_waste + mem_waste
-                
-                if total_waste < min_waste:
-                    min_waste = total_waste
-                    best_worker = worker_id
-            
-            return best_worker
-        
-        elif strategy == AllocationStrategy.LOAD_BALANCE:
-            # Select worker with lowest utilization
-            scores = []
-            
-            for worker_id in candidates:
-                worker = self.workers[worker_id]
-                score = self._calculate_allocation_score(worker, requirements)
-                scores.append((score, worker_id))
-            
-            # Sort by score (higher is better)
-            scores.sort(reverse=True)
-            return scores[0][1] if scores else None
-        
-        elif strategy == AllocationStrategy.PACK:
-            # Select worker with highest utilization that can still fit
-            best_worker = None
-            max_utilization = -1
-            
-            for worker_id in candidates:
-                worker = self.workers[worker_id]
-                utilization = worker.utilization
-                avg_util = (utilization['cpu'] + utilization['memory']) / 2
-                
-                if avg_util > max_utilization:
-                    max_utilization = avg_util
-                    best_worker = worker_id
-            
-            return best_worker
-        
-        elif strategy == AllocationStrategy.SPREAD:
-            # Select worker with lowest utilization
-            best_worker = None
-            min_utilization = 101
-            
-            for worker_id in candidates:
-                worker = self.workers[worker_id]
-                utilization = worker.utilization
-                avg_util = (utilization['cpu'] + utilization['memory']) / 2
-                
-                if avg_util < min_utilization:
-                    min_utilization = avg_util
-                    best_worker = worker_id
-            
-            return best_worker
-        
-        # Default to first fit
-        return candidates[0]
-    
-    def _calculate_allocation_score(self, 
-                                   worker: WorkerResources,
-                                   requirements: ResourceSpec) -> float:
-        """Calculate allocation score for load balancing"""
-        available = worker.available
-        
-        # Factors:
-        # 1. Resource fit (prefer workers with just enough resources)
-        # 2. Current utilization (prefer less loaded workers)
-        # 3. Resource fragmentation (prefer keeping resources together)
-        
-        # Resource fit score (0-1, where 1 is perfect fit)
-        cpu_fit = 1.0 - min(1.0, abs(available.cpu_cores - requirements.cpu_cores) / (available.cpu_cores + 0.01))
-        mem_fit = 1.0 - min(1.0, abs(available.memory_gb - requirements.memory_gb) / (available.memory_gb + 0.01))
-        fit_score = (cpu_fit + mem_fit) / 2
-        
-        # Utilization score (0-1, where 1 is low utilization)
-        utilization = worker.utilization
-        util_score = 1.0 - ((utilization['cpu'] + utilization['memory']) / 200)
+        if len(candidates) == 1:
+            return candidates[0][0].worker_id
         
-        # GPU bonus (prefer GPU workers for GPU tasks)
-        gpu_bonus = 0.2 if requirements.gpu_count > 0 and worker.total.gpu_count > 0 else 0
+        best_worker = None
+        best_key = None
+        for worker, available in candidates:
+            # Ties go to the earliest registered worker
+            key = (placement.score(worker, available, requirements), -self._order[worker.worker_id])
+            if best_key is None or key > best_key:
+                best_key = key
+                best_worker = worker.worker_id
         
-        # GPU fit penalty (avoid using GPU workers for non-GPU tasks)
-        gpu_penalty = -0.1 if requirements.gpu_count == 0 and worker.total.gpu_count > 0 else 0
-        
-        return fit_score * 0.4 + util_score * 0.6 + gpu_bonus + gpu_penalty
+        return best_worker
     
-    async def _cleanup_expired(self):
-        """Cleanup expired allocations and reservations"""
+    async def _cleanup_loop(self):
+        """Periodically cleanup expired allocations and reservations"""
         while True:
             try:
                 await asyncio.sleep(30)  # Check every 30 seconds
-                
-                async with self._lock:
-                    # Cleanup expired reservations
-                    expired_reservations = [
-                        res_id for res_id, res in self.reservations.items()
-                        if res.is_expired
-                    ]
-                    
-                    for res_id in expired_reservations:
-                        reservation = self.reservations[res_id]
-                        if reservation.worker_id in self.workers:
-                            worker = self.workers[reservation.worker_id]
-                            worker.reserved = worker.reserved - reservation.resources
-                        del self.reservations[res_id]
-                        logger.info(f"Cleaned up expired reservation {res_id}")
-                    
-                    # Cleanup expired allocations
-                    expired_allocations = [
-                        alloc_id for alloc_id, alloc in self.allocations.items()
-                        if alloc.is_expired
-                    ]
-                    
-                    for alloc_id in expired_allocations:
-                        await self.release(alloc_id)
-                        logger.info(f"Cleaned up expired allocation {alloc_id}")
-                        
+                await self._cleanup_expired()
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
\ No newline at end of file
+                logger.error(f"Error in cleanup task: {e}")
+    
+    async def _cleanup_expired(self):
+        """Cleanup expired allocations and reservations"""
+        async with self._lock:
+            # Cleanup expired reservations
+            expired_reservations = [
+                res_id for res_id, res in self.reservations.items()
+                if res.is_expired
+            ]
+            
+            for res_id in expired_reservations:
+                reservation = self.reservations.pop(res_id)
+                if reservation.worker_id in self.workers:
+                    worker = self.workers[reservation.worker_id]
+                    worker.reserved = worker.reserved - reservation.resources
+                    self._index.update(worker)
+                logger.info(f"Cleaned up expired reservation {res_id}")
+            
+            # Cleanup expired allocations
+            expired_allocations = [
+                alloc_id for alloc_id, alloc in self.allocations.items()
+                if alloc.is_expired
+            ]
+            
+            for alloc_id in expired_allocations:
+                self._release(alloc_id)
+                logger.info(f"Cleaned up expired allocation {alloc_id}")
@@ -3,11 +3,19 @@ Resource management data models
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 
 
+def parse_compute_capability(value: Optional[str]) -> Tuple[int, ...]:
+    """Parse a compute capability such as "8.6" for numeric comparison"""
+    try:
+        return tuple(int(part) for part in value.split('.'))
+    except (AttributeError, ValueError):
+        return (0,)
+
+
 @dataclass
 class ResourceSpec:
     """Specification of required resources"""
@@ -26,8 +34,9 @@ class ResourceSpec:
             memory_gb=self.memory_gb + other.memory_gb,
             gpu_count=max(self.gpu_count, other.gpu_count),
             gpu_memory_gb=max(self.gpu_memory_gb, other.gpu_memory_gb),
-            gpu_compute_capability=max(self.gpu_compute_capability or "0", 
-                                      other.gpu_compute_capability or "0"),
+            gpu_compute_capability=max(self.gpu_compute_capability or "0",
+                                      other.gpu_compute_capability or "0",
+                                      key=parse_compute_capability),
             disk_gb=self.disk_gb + other.disk_gb,
             network_bandwidth_mbps=(self.network_bandwidth_mbps or 0) + (other.network_bandwidth_mbps or 0) if self.network_bandwidth_mbps or other.network_bandwidth_mbps else None
         )
@@ -44,6 +53,11 @@ class ResourceSpec:
             network_bandwidth_mbps=max(0, (self.network_bandwidth_mbps or 0) - (other.network_bandwidth_mbps or 0)) if self.network_bandwidth_mbps or other.network_bandwidth_mbps else None
         )
     
+    @classmethod
+    def zero(cls) -> 'ResourceSpec':
+        """Empty spec, used as the starting point for sums"""
+        return cls(cpu_cores=0.0, memory_gb=0.0, disk_gb=0.0)
+    
     def fits_within(self, available: 'ResourceSpec') -> bool:
         """Check if requirements fit within available resources"""
         return (
@@ -74,8 +88,8 @@ class WorkerResources:
     """Available resources on a worker"""
     worker_id: str
     total: ResourceSpec
-    allocated: ResourceSpec = field(default_factory=ResourceSpec)
-    reserved: ResourceSpec = field(default_factory=ResourceSpec)
+    allocated: ResourceSpec = field(default_factory=ResourceSpec.zero)
+    reserved: ResourceSpec = field(default_factory=ResourceSpec.zero)
     
     @property
     def available(self) -> ResourceSpec:
@@ -152,6 +166,15 @@ class ResourceConstraints:
     locality: Optional[str] = None  # e.g., "same-rack", "same-datacenter"
 
 
+@dataclass
+class PlacementRequest:
+    """One task in a batch placement"""
+    task_id: str
+    requirements: ResourceSpec
+    constraints: Optional[ResourceConstraints] = None
+    duration_estimate: Optional[int] = None  # seconds
+
+
 @dataclass
 class GPUDevice:
     """GPU device information"""
@@ -163,6 +186,7 @@ class GPUDevice:
     utilization_percent: float = 0.0
     temperature_c: Optional[float] = None
     power_draw_w: Optional[float] = None
+    topology_group: Optional[int] = None  # e.g. NUMA node / interconnect island
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -174,7 +198,8 @@ class GPUDevice:
             "compute_capability": self.compute_capability,
             "utilization_percent": self.utilization_percent,
             "temperature_c": self.temperature_c,
-            "power_draw_w": self.power_draw_w
+            "power_draw_w": self.power_draw_w,
+            "topology_group": self.topology_group
         }
 
 
@@ -187,6 +212,27 @@ class GPUAllocation:
     allocated_at: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class GPUTaskAllocation:
+    """GPU memory held by one task, per device"""
+    task_id: str
+    devices: Dict[int, float] = field(default_factory=dict)  # device index -> GB
+    allocated_at: datetime = field(default_factory=datetime.now)
+    
+    @property
+    def memory_gb(self) -> float:
+        return sum(self.devices.values())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "task_id": self.task_id,
+            "devices": dict(self.devices),
+            "memory_gb": self.memory_gb,
+            "allocated_at": self.allocated_at.isoformat()
+        }
+
+
 @dataclass
 class ResourceMetrics:
     """Real-time resource usage metrics"""
@@ -198,9 +244,9 @@ class ResourceMetrics:
     gpu_utilization: Optional[float] = None
     gpu_memory_used_gb: Optional[float] = None
     gpu_memory_percent: Optional[float] = None
-    io_read_mbps: float = 0.0
+    io_read_mbps: float = 0.0  # MB/s
     io_write_mbps: float = 0.0
-    network_rx_mbps: float = 0.0
+    network_rx_mbps: float = 0.0  # Mbit/s
     network_tx_mbps: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
@@ -230,6 +276,8 @@ class ResourcePrediction:
     based_on_samples: int
     prediction_window_seconds: int
     predicted_duration_seconds: float
+    predicted_io_read_mbps: float = 0.0  # MB/s
+    predicted_io_write_mbps: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -239,7 +287,9 @@ class ResourcePrediction:
             "confidence": self.confidence,
             "based_on_samples": self.based_on_samples,
             "prediction_window_seconds": self.prediction_window_seconds,
-            "predicted_duration_seconds": self.predicted_duration_seconds
+            "predicted_duration_seconds": self.predicted_duration_seconds,
+            "predicted_io_read_mbps": self.predicted_io_read_mbps,
+            "predicted_io_write_mbps": self.predicted_io_write_mbps
         }
 
 
@@ -249,4 +299,11 @@ class AllocationStrategy(Enum):
     FIRST_FIT = "first_fit"  # Fastest allocation
     LOAD_BALANCE = "load_balance"  # Distribute load evenly
     PACK = "pack"  # Consolidate to fewer workers
-    SPREAD = "spread"  # Spread across many workers
\ No newline at end of file
+    SPREAD = "spread"  # Spread across many workers
+
+
+class GPUAffinity(Enum):
+    """Topology constraints for multi-GPU allocations"""
+    NONE = "none"  # Any devices
+    PREFER = "prefer"  # Same topology group when possible
+    REQUIRE = "require"  # Same topology group or fail
\ No newline at end of file
@@ -1,19 +1,87 @@
 """
-Resource monitoring and prediction system
+Resource monitoring and prediction system.
+
+Each collection takes one host sample off the event loop and derives disk and
+network rates from counter deltas since the previous sample. Workers with a
+registered PID get their own process CPU, memory and disk figures; the rest
+are attributed a share of the host by allocation. Per-task-type usage feeds
+bounded ring buffers and streaming quantile profiles used for prediction.
 """
 
 import asyncio
 import logging
+import time
 from collections import deque, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Deque, Any
+from typing import Dict, List, Optional, Deque, Any, Hashable, Tuple
 import statistics
 
 from .models import ResourceMetrics, ResourcePrediction, ResourceSpec
 from .mapper import ResourceMapper
+from .streaming import TaskTypeProfile
 
 logger = logging.getLogger(__name__)
 
+BYTES_PER_MB = 1024 * 1024
+# Network rates are reported in megabits per second
+BITS_PER_MBIT = 1_000_000
+
+
+@dataclass
+class ProcessSample:
+    """Usage of one worker's process tree"""
+    cpu_percent: float  # psutil convention: 100 per fully used core
+    memory_gb: float
+    io_read_mbps: float = 0.0
+    io_write_mbps: float = 0.0
+
+
+@dataclass
+class HostSample:
+    """One host-wide sample shared by every worker in a collection"""
+    timestamp: datetime
+    cpu_percent: float
+    io_read_mbps: float = 0.0
+    io_write_mbps: float = 0.0
+    network_rx_mbps: float = 0.0
+    network_tx_mbps: float = 0.0
+    processes: Dict[str, ProcessSample] = field(default_factory=dict)
+
+
+class CounterRates:
+    """Per-second rates of monotonically increasing counters"""
+    
+    def __init__(self):
+        self._last: Dict[Hashable, Tuple[float, Tuple[float, ...], Optional[Tuple[float, ...]]]] = {}
+    
+    def rates(self, key: Hashable, timestamp: float,
+              counters: Tuple[float, ...]) -> Optional[Tuple[float, ...]]:
+        """
+        Rates since the previous reading for ``key``.
+        
+        None on the first reading. A reading with an unchanged timestamp
+        returns the previous rates; a counter that went backwards (restart,
+        wrap-around) counts as zero for that interval.
+        """
+        previous = self._last.get(key)
+        if previous is not None and timestamp == previous[0]:
+            return previous[2]
+        
+        rates = None
+        if previous is not None and timestamp > previous[0]:
+            elapsed = timestamp - previous[0]
+            rates = tuple(
+                max(0.0, current - last) / elapsed
+                for current, last in zip(counters, previous[1])
+            )
+        
+        self._last[key] = (timestamp, counters, rates)
+        return rates
+    
+    def forget(self, key: Hashable):
+        self._last.pop(key, None)
+
 
 class ResourceMonitor:
     """Monitor and track resource usage"""
@@ -21,7 +89,9 @@ class ResourceMonitor:
     def __init__(self, 
                  resource_mapper: ResourceMapper,
                  history_size: int = 1000,
-                 collection_interval: int = 10):
+                 collection_interval: int = 10,
+                 telemetry=None,
+                 task_history_size: int = 500):
         """
         Initialize resource monitor.
         
@@ -29,11 +99,24 @@ class ResourceMonitor:
             resource_mapper: Resource mapper instance
             history_size: Number of historical data points to keep
             collection_interval: Metrics collection interval in seconds
+            telemetry: Worker telemetry aggregate; reported samples are used
+                in place of local sampling when available
+            task_history_size: Raw samples kept per task type
         """
         self.resource_mapper = resource_mapper
+        self.telemetry = telemetry
         self.history: Deque[Dict[str, ResourceMetrics]] = deque(maxlen=history_size)
-        self.task_history: Dict[str, List[ResourceMetrics]] = defaultdict(list)
+        self.task_history: Dict[str, Deque[ResourceMetrics]] = defaultdict(
+            lambda: deque(maxlen=task_history_size)
+        )
+        self.task_profiles: Dict[str, TaskTypeProfile] = defaultdict(TaskTypeProfile)
         self.collection_interval = collection_interval
+        # Worker id -> PID of the worker's main process, for per-process attribution
+        self.worker_pids: Dict[str, int] = {}
+        self._rates = CounterRates()
+        # psutil.Process handles, kept so CPU percentages are measured between collections
+        self._processes: Dict[int, Any] = {}
+        self._cpu_count = 1
         self._monitor_task = None
         self._psutil_available = False
         self._init_psutil()
@@ -43,10 +126,23 @@ class ResourceMonitor:
         try:
             import psutil
             self._psutil_available = True
+            self._cpu_count = psutil.cpu_count() or 1
+            # Prime the non-blocking CPU counter so the first collection has a baseline
+            psutil.cpu_percent(interval=None)
             logger.info("psutil initialized for resource monitoring")
         except ImportError:
             logger.warning("psutil not available - limited resource monitoring")
     
+    def register_worker_pid(self, worker_id: str, pid: int):
+        """Attribute usage of a process (and its children) to a worker"""
+        self.worker_pids[worker_id] = pid
+    
+    def unregister_worker_pid(self, worker_id: str):
+        pid = self.worker_pids.pop(worker_id, None)
+        self._rates.forget(('worker', worker_id))
+        if pid is not None:
+            self._processes.pop(pid, None)
+    
     async def start(self):
         """Start resource monitoring"""
         if not self._monitor_task:
@@ -66,87 +162,215 @@ class ResourceMonitor:
         while True:
             try:
                 await asyncio.sleep(self.collection_interval)
-                
-                timestamp = datetime.now()
-                metrics = {}
-                
-                # Collect metrics for each worker
-                for worker_id, worker_resources in self.resource_mapper.workers.items():
-                    # Get real-time usage (simplified - would need worker agent in production)
-                    usage = await self._get_worker_usage(worker_id)
-                    
-                    if usage:
-                        metrics[worker_id] = usage
-                        
-                        # Track by task type if possible
-                        for alloc_id, allocation in self.resource_mapper.allocations.items():
-                            if allocation.worker_id == worker_id:
-                                task_type = self._extract_task_type(allocation.task_id)
-                                if task_type:
-                                    self.task_history[task_type].append(usage)
-                
-                # Store metrics
-                if metrics:
-                    self.history.append(metrics)
-                    await self._check_alerts(metrics)
-                    
+                await self.collect_once()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error collecting metrics: {e}")
                 await asyncio.sleep(self.collection_interval)
     
-    async def _get_worker_usage(self, worker_id: str) -> Optional[ResourceMetrics]:
-        """Get real-time usage from worker"""
-        # In production, this would query the actual worker
-        # For now, simulate based on allocations
+    async def collect_once(self) -> Dict[str, ResourceMetrics]:
+        """Take one collection: a single host sample attributed to every worker"""
+        workers = self.resource_mapper.workers
         
-        if not self._psutil_available:
-            return None
+        host = None
+        if self._psutil_available and workers:
+            host = await asyncio.to_thread(self._sample_host)
+        
+        # Task types running on each worker, from one pass over allocations
+        task_types: Dict[str, set] = defaultdict(set)
+        for allocation in list(self.resource_mapper.allocations.values()):
+            task_type = self._extract_task_type(allocation.task_id)
+            if task_type:
+                task_types[allocation.worker_id].add(task_type)
+        
+        allocated_cpu = sum(worker.allocated.cpu_cores for worker in workers.values())
+        
+        metrics = {}
+        for worker_id in list(workers):
+            usage = self._get_worker_usage(worker_id, host, allocated_cpu)
+            if usage:
+                metrics[worker_id] = usage
+                for task_type in task_types.get(worker_id, ()):
+                    self.record_task_usage(task_type, usage)
+        
+        # Store metrics
+        if metrics:
+            self.history.append(metrics)
+            await self._check_alerts(metrics)
+        
+        return metrics
+    
+    def record_task_usage(self, task_type: str, usage: ResourceMetrics):
+        """Add a usage sample to a task type's history and prediction profile"""
+        self.task_history[task_type].append(usage)
+        self.task_profiles[task_type].add(usage)
+    
+    def _sample_host(self) -> HostSample:
+        """Read host counters once; runs in a worker thread"""
+        import psutil
+        
+        now = time.monotonic()
+        sample = HostSample(
+            timestamp=datetime.now(),
+            cpu_percent=psutil.cpu_percent(interval=None)
+        )
+        
+        disk_io = psutil.disk_io_counters()
+        if disk_io:
+            rates = self._rates.rates('host:disk', now, (disk_io.read_bytes, disk_io.write_bytes))
+            if rates:
+                sample.io_read_mbps, sample.io_write_mbps = (r / BYTES_PER_MB for r in rates)
+        
+        net_io = psutil.net_io_counters()
+        if net_io:
+            rates = self._rates.rates('host:net', now, (net_io.bytes_recv, net_io.bytes_sent))
+            if rates:
+                sample.network_rx_mbps, sample.network_tx_mbps = (r * 8 / BITS_PER_MBIT for r in rates)
         
+        seen_pids = set()
+        for worker_id, pid in list(self.worker_pids.items()):
+            process_sample = self._sample_process(psutil, worker_id, pid, now, seen_pids)
+            if process_sample:
+                sample.processes[worker_id] = process_sample
+        
+        # Drop handles of processes that are gone
+        for pid in list(self._processes):
+            if pid not in seen_pids:
+                del self._processes[pid]
+        
+        return sample
+    
+    def _process(self, psutil, pid: int):
+        process = self._processes.get(pid)
+        if process is None:
+            process = psutil.Process(pid)
+            process.cpu_percent(interval=None)
+            self._processes[pid] = process
+        return process
+    
+    def _sample_process(self, psutil, worker_id: str, pid: int, now: float,
+                        seen_pids: set) -> Optional[ProcessSample]:
+        """CPU, memory and disk I/O of a worker's process tree"""
         try:
-            import psutil
-            
-            # Get system-wide metrics (would be per-worker in production)
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            
-            # Get GPU metrics if available
-            gpu_util = None
-            gpu_memory_gb = None
-            gpu_memory_percent = None
-            
-            # Network I/O
-            net_io = psutil.net_io_counters()
-            
-            # Disk I/O
-            disk_io = psutil.disk_io_counters()
-            
-            worker = self.resource_mapper.workers.get(worker_id)
-            if not worker:
-                return None
-            
-            # Calculate based on allocations
-            allocated_percent = worker.utilization
-            
-            return ResourceMetrics(
-                timestamp=datetime.now(),
-                worker_id=worker_id,
-                cpu_percent=min(100, cpu_percent * allocated_percent['cpu'] / 100),
-                memory_used_gb=worker.allocated.memory_gb,
-                memory_percent=allocated_percent['memory'],
-                gpu_utilization=gpu_util,
-                gpu_memory_used_gb=worker.allocated.gpu_memory_gb if worker.allocated.gpu_count > 0 else None,
-                gpu_memory_percent=allocated_percent.get('gpu_memory', 0) if worker.allocated.gpu_count > 0 else None,
-                io_read_mbps=0.0,  # Would calculate from disk_io
-                io_write_mbps=0.0,
-                network_rx_mbps=0.0,  # Would calculate from net_io
-                network_tx_mbps=0.0
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to get worker {worker_id} usage: {e}")
+            root = self._process(psutil, pid)
+            tree = [root]
+            for child in root.children(recursive=True):
+                try:
+                    tree.append(self._process(psutil, child.pid))
+                except psutil.Error:
+                    continue
+        except psutil.NoSuchProcess:
+            logger.debug(f"Process {pid} of worker {worker_id} is gone")
+            self._rates.forget(('worker', worker_id))
+            return None
+        except psutil.Error as e:
+            logger.debug(f"Cannot sample process {pid} of worker {worker_id}: {e}")
+            return None
+        
+        cpu_percent = 0.0
+        rss = 0
+        read_bytes = write_bytes = 0
+        io_available = True
+        for process in tree:
+            seen_pids.add(process.pid)
+            try:
+                with process.oneshot():
+                    cpu_percent += process.cpu_percent(interval=None)
+                    rss += process.memory_info().rss
+                    if io_available:
+                        io = process.io_counters()
+                        read_bytes += io.read_bytes
+                        write_bytes += io.write_bytes
+            except (AttributeError, NotImplementedError, psutil.AccessDenied):
+                # No per-process I/O counters on this platform or for this user
+                io_available = False
+            except psutil.Error:
+                continue
+        
+        sample = ProcessSample(cpu_percent=cpu_percent, memory_gb=rss / (1024**3))
+        if io_available:
+            rates = self._rates.rates(('worker', worker_id), now, (read_bytes, write_bytes))
+            if rates:
+                sample.io_read_mbps, sample.io_write_mbps = (r / BYTES_PER_MB for r in rates)
+        return sample
+    
+    def _get_worker_usage(self, worker_id: str, host: Optional[HostSample],
+                          allocated_cpu: float) -> Optional[ResourceMetrics]:
+        """Usage of one worker, from its telemetry or its share of the host sample"""
+        sample = self.telemetry.latest_metrics(worker_id) if self.telemetry else None
+        if sample is not None:
+            return self._usage_from_telemetry(worker_id, sample)
+        
+        if host is None:
+            return None
+        
+        worker = self.resource_mapper.workers.get(worker_id)
+        if not worker:
+            return None
+        
+        allocated_percent = worker.utilization
+        # Share of host traffic attributed to this worker, by allocated CPU
+        share = worker.allocated.cpu_cores / allocated_cpu if allocated_cpu > 0 else 0.0
+        
+        process = host.processes.get(worker_id)
+        if process is not None:
+            cores = worker.total.cpu_cores or self._cpu_count
+            cpu_percent = min(100.0, process.cpu_percent / cores)
+            memory_used_gb = process.memory_gb
+            memory_percent = (memory_used_gb / worker.total.memory_gb * 100) if worker.total.memory_gb > 0 else 0.0
+            io_read, io_write = process.io_read_mbps, process.io_write_mbps
+        else:
+            cpu_percent = min(100, host.cpu_percent * allocated_percent['cpu'] / 100)
+            memory_used_gb = worker.allocated.memory_gb
+            memory_percent = allocated_percent['memory']
+            io_read, io_write = host.io_read_mbps * share, host.io_write_mbps * share
+        
+        return ResourceMetrics(
+            timestamp=host.timestamp,
+            worker_id=worker_id,
+            cpu_percent=cpu_percent,
+            memory_used_gb=memory_used_gb,
+            memory_percent=memory_percent,
+            gpu_utilization=None,
+            gpu_memory_used_gb=worker.allocated.gpu_memory_gb if worker.allocated.gpu_count > 0 else None,
+            gpu_memory_percent=allocated_percent.get('gpu_memory', 0) if worker.allocated.gpu_count > 0 else None,
+            io_read_mbps=io_read,
+            io_write_mbps=io_write,
+            # psutil has no per-process network counters
+            network_rx_mbps=host.network_rx_mbps * share,
+            network_tx_mbps=host.network_tx_mbps * share
+        )
+    
+    def _usage_from_telemetry(self, worker_id: str,
+                              sample: Dict[str, float]) -> Optional[ResourceMetrics]:
+        """Build usage metrics from the sample a worker pushed to the telemetry stream"""
+        worker = self.resource_mapper.workers.get(worker_id)
+        if not worker:
             return None
+        
+        # Workers report cumulative network totals in MB
+        network_rx = network_tx = 0.0
+        if 'network_recv_mb' in sample and 'network_sent_mb' in sample:
+            rates = self._rates.rates(
+                ('telemetry', worker_id), sample['timestamp'],
+                (sample['network_recv_mb'], sample['network_sent_mb'])
+            )
+            if rates:
+                network_rx, network_tx = (r * BYTES_PER_MB * 8 / BITS_PER_MBIT for r in rates)
+        
+        return ResourceMetrics(
+            timestamp=datetime.fromtimestamp(sample['timestamp']),
+            worker_id=worker_id,
+            cpu_percent=sample.get('cpu_percent', 0.0),
+            memory_used_gb=sample.get('memory_mb', 0.0) / 1024,
+            memory_percent=sample.get('memory_percent', 0.0),
+            gpu_utilization=sample.get('gpu_utilization'),
+            gpu_memory_used_gb=worker.allocated.gpu_memory_gb if worker.allocated.gpu_count > 0 else None,
+            gpu_memory_percent=sample.get('gpu_memory_percent'),
+            network_rx_mbps=network_rx,
+            network_tx_mbps=network_tx
+        )
     
     async def predict_resource_needs(self, 
                                    task_type: str,
@@ -163,28 +387,22 @@ class ResourceMonitor:
         Returns:
             Resource prediction or None if insufficient data
         """
-        history = self.task_history.get(task_type, [])
+        profile = self.task_profiles.get(task_type)
+        samples = profile.count if profile else 0
         
-        if len(history) < min_samples:
-            logger.debug(f"Insufficient history for {task_type}: {len(history)} < {min_samples}")
+        if samples < min_samples:
+            logger.debug(f"Insufficient history for {task_type}: {samples} < {min_samples}")
             return None
         
-        # Use recent history (last 50 samples)
-        recent_history = history[-50:]
-        
-        # Calculate statistics
-        cpu_values = [m.cpu_percent for m in recent_history if m.cpu_percent is not None]
-        memory_values = [m.memory_used_gb for m in recent_history]
-        gpu_memory_values = [m.gpu_memory_used_gb for m in recent_history if m.gpu_memory_used_gb is not None]
-        
-        # Predict using 90th percentile to be safe
-        predicted_cpu = statistics.quantiles(cpu_values, n=10)[8] if cpu_values else 1.0
-        predicted_memory = statistics.quantiles(memory_values, n=10)[8] if memory_values else 1.0
-        predicted_gpu_memory = statistics.quantiles(gpu_memory_values, n=10)[8] if gpu_memory_values else 0.0
+        # Predict using streaming 90th percentiles to be safe
+        predicted_cpu = profile.quantile('cpu_percent', default=1.0)
+        predicted_memory = profile.quantile('memory_used_gb', default=1.0)
+        predicted_gpu_memory = profile.quantile('gpu_memory_used_gb')
+        predicted_network = profile.quantile('network_rx_mbps') + profile.quantile('network_tx_mbps')
         
-        # Calculate confidence based on variance
-        cpu_variance = statistics.variance(cpu_values) if len(cpu_values) > 1 else 100
-        memory_variance = statistics.variance(memory_values) if len(memory_values) > 1 else 100
+        # Calculate confidence based on variance of recent samples
+        cpu_variance = profile.variance('cpu_percent')
+        memory_variance = profile.variance('memory_used_gb')
         
         # Simple confidence calculation (lower variance = higher confidence)
         confidence = max(0.0, min(1.0, 1.0 - (cpu_variance + memory_variance) / 200))
@@ -199,18 +417,22 @@ class ResourceMonitor:
         predicted_resources = ResourceSpec(
             cpu_cores=max(0.1, predicted_cpu / 100 * 4),  # Assuming 4 cores max
             memory_gb=predicted_memory,
-            gpu_count=1 if gpu_memory_values else 0,
+            gpu_count=1 if profile.seen('gpu_memory_used_gb') else 0,
             gpu_memory_gb=predicted_gpu_memory,
-            disk_gb=10.0  # Default
+            disk_gb=10.0,  # Default
+            network_bandwidth_mbps=predicted_network if predicted_network > 0 else None
         )
         
+        window = len(self.task_history.get(task_type, ()))
         return ResourcePrediction(
             task_type=task_type,
             predicted_resources=predicted_resources,
             confidence=confidence,
-            based_on_samples=len(recent_history),
-            prediction_window_seconds=self.collection_interval * len(recent_history),
-            predicted_duration_seconds=estimated_duration
+            based_on_samples=samples,
+            prediction_window_seconds=self.collection_interval * window,
+            predicted_duration_seconds=estimated_duration,
+            predicted_io_read_mbps=profile.quantile('io_read_mbps'),
+            predicted_io_write_mbps=profile.quantile('io_write_mbps')
         )
     
     async def get_worker_metrics(self, 
@@ -0,0 +1,216 @@
+"""
+Worker placement for the resource mapper.
+
+Workers are indexed by capability (free GPU slots, compute capability) and by
+power-of-two tiers of free CPU, memory and GPU memory. A placement only looks
+at workers whose tiers can hold the request, and strategies pick among those
+candidates in a single scoring pass instead of sorting them.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from .models import ResourceSpec, WorkerResources, parse_compute_capability
+
+# Free capacity below this lands in tier 0; tiers then double (0.25, 0.5, 1, 2, ...)
+TIER_BASE = 0.25
+
+
+def capacity_tier(value: float) -> int:
+    """Power-of-two bucket of a capacity amount"""
+    if value < TIER_BASE:
+        return 0
+    # frexp(x) = m * 2**e with 0.5 <= m < 1, so e - 1 == floor(log2(x))
+    return math.frexp(value / TIER_BASE)[1]
+
+
+def _tiers(spec: ResourceSpec) -> tuple[int, int, int]:
+    return (
+        capacity_tier(spec.cpu_cores),
+        capacity_tier(spec.memory_gb),
+        capacity_tier(spec.gpu_memory_gb)
+    )
+
+
+class CapacityIndex:
+    """Workers bucketed by capability and free-capacity tiers"""
+
+    def __init__(self):
+        # (free gpu slots, compute capability, cpu tier, memory tier, gpu memory tier) -> worker ids
+        self._buckets: dict[tuple, dict[str, None]] = {}
+        self._keys: dict[str, tuple] = {}
+        # Free resources as of the last update, so lookups need not recompute them
+        self._available: dict[str, ResourceSpec] = {}
+        # Bucket keys from least to most free capacity, rebuilt when buckets come or go
+        self._ordered: list[tuple] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, worker_id: str) -> bool:
+        return worker_id in self._keys
+
+    def update(self, worker: WorkerResources):
+        """(Re)index a worker after its free capacity changed"""
+        available = worker.available
+        self._available[worker.worker_id] = available
+        key = (available.gpu_count, worker.total.gpu_compute_capability) + _tiers(available)
+
+        previous = self._keys.get(worker.worker_id)
+        if previous == key:
+            return
+        if previous is not None:
+            self._discard(worker.worker_id, previous)
+
+        members = self._buckets.get(key)
+        if members is None:
+            members = self._buckets[key] = {}
+            self._ordered = None
+        members[worker.worker_id] = None
+        self._keys[worker.worker_id] = key
+
+    def remove(self, worker_id: str):
+        """Drop a worker from the index"""
+        self._available.pop(worker_id, None)
+        key = self._keys.pop(worker_id, None)
+        if key is not None:
+            self._discard(worker_id, key)
+
+    def available(self, worker_id: str) -> ResourceSpec | None:
+        """Free resources recorded at the worker's last update"""
+        return self._available.get(worker_id)
+
+    def _discard(self, worker_id: str, key: tuple):
+        members = self._buckets[key]
+        del members[worker_id]
+        if not members:
+            del self._buckets[key]
+            self._ordered = None
+
+    def _tightest_first(self) -> list[tuple]:
+        if self._ordered is None:
+            self._ordered = sorted(self._buckets, key=lambda key: (key[2] + key[3] + key[4], key[0]))
+        return self._ordered
+
+    def candidates(self, requirements: ResourceSpec,
+                   min_compute_capability: str | None = None,
+                   tightest_first: bool | None = None) -> Iterator[str]:
+        """
+        Worker ids whose buckets may hold ``requirements``.
+
+        A worker in a lower tier than the request on any dimension cannot fit
+        and is never visited; callers still confirm the exact fit. Buckets are
+        visited from least to most free capacity, the reverse, or (None) in
+        index order.
+        """
+        cpu, memory, gpu_memory = _tiers(requirements)
+        required_capability = (parse_compute_capability(min_compute_capability)
+                               if min_compute_capability else None)
+
+        if tightest_first is None:
+            keys = list(self._buckets)
+        elif tightest_first:
+            keys = self._tightest_first()
+        else:
+            keys = reversed(self._tightest_first())
+
+        for key in keys:
+            gpu_slots, capability, worker_cpu, worker_memory, worker_gpu_memory = key
+            if gpu_slots < requirements.gpu_count:
+                continue
+            if required_capability and (
+                not capability or parse_compute_capability(capability) < required_capability
+            ):
+                continue
+            if worker_cpu < cpu or worker_memory < memory or worker_gpu_memory < gpu_memory:
+                continue
+            # Copy: callers may allocate while iterating
+            yield from list(self._buckets.get(key, ()))
+
+
+class PlacementStrategy(ABC):
+    """
+    Scores candidate workers for a request; the highest score wins.
+
+    Strategies also say where in the index to start looking and how many
+    fitting candidates to score, which bounds the cost of one placement.
+    """
+
+    # Visit the fullest (True) or emptiest (False) capacity tiers first; None keeps index order
+    tightest_first: bool | None = None
+    # Score at most this many fitting candidates; None scores all of them
+    candidate_limit: int | None = None
+
+    @abstractmethod
+    def score(self, worker: WorkerResources, available: ResourceSpec,
+              requirements: ResourceSpec) -> float:
+        """Score of placing the request on a worker with this much free capacity"""
+        pass
+
+
+class FirstFitStrategy(PlacementStrategy):
+    """Fastest allocation: the first fitting worker in index order"""
+
+    candidate_limit = 1
+
+    def score(self, worker, available, requirements):
+        return 0.0
+
+
+class BestFitStrategy(PlacementStrategy):
+    """Minimize wasted CPU and memory"""
+
+    tightest_first = True
+    candidate_limit = 16
+
+    def score(self, worker, available, requirements):
+        cpu_waste = available.cpu_cores - requirements.cpu_cores
+        mem_waste = available.memory_gb - requirements.memory_gb
+        return -(cpu_waste + mem_waste)
+
+
+class LoadBalanceStrategy(PlacementStrategy):
+    """Balance resource fit against current utilization"""
+
+    tightest_first = False
+    candidate_limit = 16
+
+    def score(self, worker, available, requirements):
+        # Factors:
+        # 1. Resource fit (prefer workers with just enough resources)
+        # 2. Current utilization (prefer less loaded workers)
+        # 3. GPU affinity (keep GPU workers for GPU tasks)
+        cpu_fit = 1.0 - min(1.0, abs(available.cpu_cores - requirements.cpu_cores) / (available.cpu_cores + 0.01))
+        mem_fit = 1.0 - min(1.0, abs(available.memory_gb - requirements.memory_gb) / (available.memory_gb + 0.01))
+        fit_score = (cpu_fit + mem_fit) / 2
+
+        utilization = worker.utilization
+        util_score = 1.0 - ((utilization['cpu'] + utilization['memory']) / 200)
+
+        gpu_bonus = 0.2 if requirements.gpu_count > 0 and worker.total.gpu_count > 0 else 0
+        gpu_penalty = -0.1 if requirements.gpu_count == 0 and worker.total.gpu_count > 0 else 0
+
+        return fit_score * 0.4 + util_score * 0.6 + gpu_bonus + gpu_penalty
+
+
+class PackStrategy(PlacementStrategy):
+    """Consolidate onto the busiest worker that still fits"""
+
+    tightest_first = True
+    candidate_limit = 16
+
+    def score(self, worker, available, requirements):
+        utilization = worker.utilization
+        return (utilization['cpu'] + utilization['memory']) / 2
+
+
+class SpreadStrategy(PlacementStrategy):
+    """Spread across the least loaded workers"""
+
+    tightest_first = False
+    candidate_limit = 16
+
+    def score(self, worker, available, requirements):
+        utilization = worker.utilization
+        return -(utilization['cpu'] + utilization['memory']) / 2
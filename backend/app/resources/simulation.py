@@ -0,0 +1,210 @@
+"""
+Deterministic placement simulation.
+
+Replays a seeded synthetic workload (a mixed CPU/GPU fleet and bursts of
+tasks with random sizes and durations) against a ResourceMapper on a virtual
+clock, and reports placement latency, fragmentation and utilization per
+strategy. The workload only depends on the seed, so strategy runs are
+directly comparable.
+"""
+
+import random
+import statistics
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .mapper import ResourceMapper
+from .models import AllocationStrategy, PlacementRequest, ResourceSpec
+from .placement import PlacementStrategy
+
+# (cpu cores, memory GB, gpu count, gpu memory GB) of the simulated worker types
+WORKER_SHAPES = [
+    (8.0, 32.0, 0, 0.0),
+    (16.0, 64.0, 0, 0.0),
+    (16.0, 64.0, 1, 24.0),
+    (32.0, 128.0, 1, 80.0),
+]
+
+# Task shapes and their relative frequency
+TASK_SHAPES = [
+    ((1.0, 2.0, 0, 0.0), 40),
+    ((2.0, 8.0, 0, 0.0), 25),
+    ((4.0, 16.0, 0, 0.0), 15),
+    ((2.0, 16.0, 1, 12.0), 12),
+    ((8.0, 32.0, 1, 40.0), 8),
+]
+
+
+def _spec(shape: tuple[float, float, int, float]) -> ResourceSpec:
+    cpu, memory, gpus, gpu_memory = shape
+    return ResourceSpec(cpu_cores=cpu, memory_gb=memory, gpu_count=gpus,
+                        gpu_memory_gb=gpu_memory, disk_gb=0.0)
+
+
+@dataclass
+class SimulationWorkload:
+    """Seeded fleet and task arrivals"""
+    workers: list[tuple[str, ResourceSpec]]
+    # (arrival tick, duration in ticks, request)
+    tasks: list[tuple[int, int, PlacementRequest]]
+
+    @classmethod
+    def generate(cls, seed: int = 0, workers: int = 200, tasks: int = 5000,
+                 ticks: int = 100, max_duration: int = 20) -> "SimulationWorkload":
+        rng = random.Random(seed)
+
+        fleet = [
+            (f"worker-{i}", _spec(rng.choice(WORKER_SHAPES)))
+            for i in range(workers)
+        ]
+
+        shapes = [shape for shape, _ in TASK_SHAPES]
+        weights = [weight for _, weight in TASK_SHAPES]
+        arrivals = []
+        for i in range(tasks):
+            shape = rng.choices(shapes, weights)[0]
+            arrivals.append((
+                rng.randrange(ticks),
+                rng.randint(1, max_duration),
+                PlacementRequest(task_id=f"task-{i}", requirements=_spec(shape))
+            ))
+        arrivals.sort(key=lambda item: item[0])
+
+        return cls(workers=fleet, tasks=arrivals)
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of replaying a workload with one strategy"""
+    strategy: str
+    placed: int
+    rejected: int
+    batches: int
+    # Wall-clock time to place one batch, in milliseconds
+    batch_latency_ms: list[float] = field(default_factory=list)
+    # Per-tick samples
+    cpu_utilization: list[float] = field(default_factory=list)
+    memory_utilization: list[float] = field(default_factory=list)
+    fragmentation: list[float] = field(default_factory=list)
+
+    @property
+    def per_task_latency_us(self) -> float:
+        total = self.placed + self.rejected
+        return sum(self.batch_latency_ms) * 1000 / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary statistics"""
+        latencies = sorted(self.batch_latency_ms)
+
+        def mean(values):
+            return statistics.fmean(values) if values else 0.0
+
+        return {
+            "strategy": self.strategy,
+            "placed": self.placed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "per_task_latency_us": self.per_task_latency_us,
+            "batch_latency_p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+            "batch_latency_p99_ms": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+            "cpu_utilization": mean(self.cpu_utilization),
+            "memory_utilization": mean(self.memory_utilization),
+            "fragmentation": mean(self.fragmentation)
+        }
+
+
+def fragmentation(mapper: ResourceMapper, probe: ResourceSpec) -> float:
+    """
+    Share of free capacity that is stranded for a probe-sized task.
+
+    Compares how many probes fit on the workers individually with how many
+    would fit if all free CPU and memory were pooled: 0 means no free capacity
+    is lost to splitting, 1 means none of it is usable.
+    """
+    free_cpu = free_memory = 0.0
+    placeable = 0
+    for worker in mapper.workers.values():
+        available = worker.available
+        free_cpu += available.cpu_cores
+        free_memory += available.memory_gb
+        placeable += int(min(available.cpu_cores // probe.cpu_cores,
+                             available.memory_gb // probe.memory_gb))
+
+    pooled = int(min(free_cpu // probe.cpu_cores, free_memory // probe.memory_gb))
+    if pooled == 0:
+        return 0.0
+    return 1.0 - placeable / pooled
+
+
+class PlacementSimulator:
+    """Replays a workload tick by tick against a fresh mapper per strategy"""
+
+    def __init__(self,
+                 workload: SimulationWorkload,
+                 probe: ResourceSpec | None = None,
+                 custom_strategies: dict[str, PlacementStrategy] | None = None):
+        self.workload = workload
+        # Medium CPU task, used to measure fragmentation
+        self.probe = probe or _spec(TASK_SHAPES[1][0])
+        self.custom_strategies = custom_strategies or {}
+
+    async def run(self, strategy: AllocationStrategy | str) -> SimulationReport:
+        mapper = ResourceMapper(strategy=strategy)
+        for name, placement in self.custom_strategies.items():
+            mapper.register_strategy(name, placement)
+        for worker_id, resources in self.workload.workers:
+            await mapper.register_worker(worker_id, resources)
+
+        name = strategy.value if isinstance(strategy, AllocationStrategy) else str(strategy)
+        report = SimulationReport(strategy=name, placed=0, rejected=0, batches=0)
+
+        total_cpu = sum(spec.cpu_cores for _, spec in self.workload.workers)
+        total_memory = sum(spec.memory_gb for _, spec in self.workload.workers)
+
+        # tick -> allocation ids finishing then
+        finishing: dict[int, list[str]] = {}
+        tasks = self.workload.tasks
+        position = 0
+        tick = 0
+        while position < len(tasks) or finishing:
+            for allocation_id in finishing.pop(tick, []):
+                await mapper.release(allocation_id)
+
+            batch = []
+            durations = []
+            while position < len(tasks) and tasks[position][0] == tick:
+                _, duration, request = tasks[position]
+                batch.append(request)
+                durations.append(duration)
+                position += 1
+
+            if batch:
+                started = time.perf_counter()
+                allocations = await mapper.place_batch(batch)
+                report.batch_latency_ms.append((time.perf_counter() - started) * 1000)
+                report.batches += 1
+
+                for allocation, duration in zip(allocations, durations, strict=True):
+                    if allocation is None:
+                        report.rejected += 1
+                        continue
+                    report.placed += 1
+                    finishing.setdefault(tick + duration, []).append(allocation.id)
+
+            allocated_cpu = sum(w.allocated.cpu_cores for w in mapper.workers.values())
+            allocated_memory = sum(w.allocated.memory_gb for w in mapper.workers.values())
+            report.cpu_utilization.append(allocated_cpu / total_cpu if total_cpu else 0.0)
+            report.memory_utilization.append(allocated_memory / total_memory if total_memory else 0.0)
+            report.fragmentation.append(fragmentation(mapper, self.probe))
+            tick += 1
+
+        return report
+
+    async def compare(self, strategies: Sequence[AllocationStrategy | str] | None = None
+                      ) -> list[SimulationReport]:
+        """Run the same workload once per strategy"""
+        if strategies is None:
+            strategies = list(AllocationStrategy) + list(self.custom_strategies)
+        return [await self.run(strategy) for strategy in strategies]
@@ -0,0 +1,153 @@
+"""
+Streaming statistics for resource prediction.
+
+Each estimator takes one sample at a time in O(1) time and memory, so
+per-task-type profiles can absorb every collection without keeping or
+re-sorting the raw history.
+"""
+
+
+from .models import ResourceMetrics
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac).
+
+    Tracks five markers whose heights converge on the minimum, p/2, p,
+    (1+p)/2 quantiles and the maximum; the middle marker is the estimate.
+    """
+
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float):
+        self.count += 1
+        heights = self._heights
+
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Find the cell containing x, stretching the extremes if needed
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self) -> float | None:
+        """Current estimate, exact while five or fewer samples were seen"""
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return self._heights[min(len(self._heights) - 1, int(self.p * len(self._heights)))]
+        return self._heights[2]
+
+
+class DecayingStats:
+    """Exponentially weighted mean and variance, dominated by the last ``span`` samples"""
+
+    def __init__(self, span: int = 50):
+        self.alpha = 2.0 / (span + 1)
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def add(self, x: float):
+        self.count += 1
+        if self.count == 1:
+            self.mean = x
+            return
+        diff = x - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+
+
+# ResourceMetrics fields profiled per task type
+PROFILED_METRICS: tuple[str, ...] = (
+    'cpu_percent',
+    'memory_used_gb',
+    'gpu_memory_used_gb',
+    'io_read_mbps',
+    'io_write_mbps',
+    'network_rx_mbps',
+    'network_tx_mbps',
+)
+
+
+class TaskTypeProfile:
+    """Streaming p90 and spread of each resource metric for one task type"""
+
+    def __init__(self, quantile: float = 0.9, span: int = 50):
+        self.count = 0
+        self.quantiles: dict[str, P2Quantile] = {
+            name: P2Quantile(quantile) for name in PROFILED_METRICS
+        }
+        self.stats: dict[str, DecayingStats] = {
+            name: DecayingStats(span) for name in PROFILED_METRICS
+        }
+
+    def add(self, metrics: ResourceMetrics):
+        self.count += 1
+        for name in PROFILED_METRICS:
+            value = getattr(metrics, name)
+            if value is None:
+                continue
+            self.quantiles[name].add(value)
+            self.stats[name].add(value)
+
+    def quantile(self, name: str, default: float = 0.0) -> float:
+        value = self.quantiles[name].value
+        return default if value is None else value
+
+    def variance(self, name: str, default: float = 100.0) -> float:
+        stats = self.stats[name]
+        return stats.variance if stats.count > 1 else default
+
+    def seen(self, name: str) -> bool:
+        return self.quantiles[name].count > 0
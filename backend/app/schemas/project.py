@@ -235,6 +235,7 @@ class ImportOptions(BaseModel):
     rename_on_conflict: bool = Field(default=True, description="Rename if project exists")
     restore_git_history: bool = Field(default=True, description="Restore Git history")
     verify_lfs_objects: bool = Field(default=True, description="Verify LFS objects")
+    restore_lfs_objects: bool = Field(default=True, description="Restore LFS objects")
 
 
 class ImportResult(BaseModel):
@@ -285,12 +286,3 @@ class ExportManifest(BaseModel):
     exported_at: str
     export_options: dict[str, Any]
     statistics: ExportStatistics
-
-
-class ImportOptions(BaseModel):
-    """Options for project import."""
-
-    overwrite_existing: bool = Field(default=False, description="Overwrite if project exists")
-    validate_integrity: bool = Field(default=True, description="Validate archive integrity")
-    restore_git_history: bool = Field(default=True, description="Restore Git history")
-    restore_lfs_objects: bool = Field(default=True, description="Restore LFS objects")
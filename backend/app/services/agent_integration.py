@@ -8,6 +8,7 @@ for AI-driven content generation workflows.
 
 import json
 import asyncio
+import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass
@@ -79,13 +80,20 @@ class AgentRecommendation:
 class AgentIntegrationBridge:
     """Central bridge between asset system and agentic crew."""
     
-    def __init__(self, project_root: str, asset_registry: AssetRegistry):
+    def __init__(self, project_root: str, asset_registry: AssetRegistry, max_concurrency: int = 8):
         self.project_root = project_root
         self.asset_registry = asset_registry
         self.active_tasks: Dict[str, AgentTask] = {}
         self.completed_tasks: Dict[str, AgentTask] = {}
         self.recommendations: List[AgentRecommendation] = []
         
+        # Recommendations run concurrently, at most max_concurrency at a time
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # (role, shot_id) -> (shot fingerprint, recommendation); reused while the shot is unchanged
+        self._recommendation_cache: Dict[Tuple[AgentRole, str], Tuple[str, Optional[AgentRecommendation]]] = {}
+        # recommendation_id -> result of processing it, so reused recommendations are not registered twice
+        self._processed_recommendations: Dict[str, Dict[str, Any]] = {}
+        
         # Agent specialization mapping
         self.agent_specializations = {
             AgentRole.DRAMATURG: {
@@ -244,29 +252,52 @@ class AgentIntegrationBridge:
         recommendation: AgentRecommendation
     ) -> Dict[str, Any]:
         """Process and potentially act on an agent recommendation."""
+        results = await self.process_agent_recommendations([recommendation])
+        return results[0]
+    
+    async def process_agent_recommendations(
+        self,
+        recommendations: List[AgentRecommendation]
+    ) -> List[Dict[str, Any]]:
+        """Process recommendations, registering all resulting assets in one batch."""
+        results: List[Optional[Dict[str, Any]]] = []
+        pending: List[Tuple[int, AgentRecommendation, BaseAsset]] = []
         
-        # Store recommendation
-        self.recommendations.append(recommendation)
-        
-        # Create asset if recommendation meets criteria
-        if recommendation.confidence_score >= 0.7:
-            asset_data = self._create_asset_from_recommendation(recommendation)
+        for recommendation in recommendations:
+            # Recommendations reused for unchanged shots were already acted on
+            processed = self._processed_recommendations.get(recommendation.recommendation_id)
+            if processed is not None:
+                results.append(processed)
+                continue
             
-            # Register the new asset
-            asset = await self.asset_registry.register_asset(asset_data)
+            # Store recommendation
+            self.recommendations.append(recommendation)
             
-            return {
+            # Create asset if recommendation meets criteria
+            if recommendation.confidence_score >= 0.7:
+                asset = self._create_asset_from_recommendation(recommendation)
+                pending.append((len(results), recommendation, asset))
+                results.append(None)
+            else:
+                results.append({
+                    "status": "review_needed",
+                    "recommendation_id": recommendation.recommendation_id,
+                    "confidence_score": recommendation.confidence_score
+                })
+                self._processed_recommendations[recommendation.recommendation_id] = results[-1]
+        
+        # Register the new assets
+        asset_ids = await self.asset_registry.register_assets([asset for _, _, asset in pending])
+        for (position, recommendation, _), asset_id in zip(pending, asset_ids):
+            results[position] = {
                 "status": "created",
-                "asset_id": asset,
+                "asset_id": asset_id,
                 "recommendation_id": recommendation.recommendation_id,
                 "confidence_score": recommendation.confidence_score
             }
+            self._processed_recommendations[recommendation.recommendation_id] = results[position]
         
-        return {
-            "status": "review_needed",
-            "recommendation_id": recommendation.recommendation_id,
-            "confidence_score": recommendation.confidence_score
-        }
+        return results
     
     def _create_asset_from_recommendation(self, rec: AgentRecommendation) -> BaseAsset:
         """Create an asset instance from an agent recommendation."""
@@ -295,15 +326,44 @@ class AgentIntegrationBridge:
         
         recommendations = {role.value: [] for role in agent_roles}
         
+        jobs = []
         for sequence in shot_list.sequences:
             for shot in sequence.shots:
+                fingerprint = self._shot_fingerprint(shot)
                 for role in agent_roles:
-                    rec = await self._generate_shot_recommendation(shot, role)
-                    if rec:
-                        recommendations[role.value].append(rec)
+                    jobs.append((role, self._memoised_shot_recommendation(shot, role, fingerprint)))
+        
+        # gather keeps results in shot order
+        results = await asyncio.gather(*(job for _, job in jobs))
+        for (role, _), rec in zip(jobs, results):
+            if rec:
+                recommendations[role.value].append(rec)
         
         return recommendations
     
+    @staticmethod
+    def _shot_fingerprint(shot: GenerativeShot) -> str:
+        """Hash of the shot content that recommendations are derived from."""
+        content = shot.model_dump_json(exclude={"created_at", "updated_at"})
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    async def _memoised_shot_recommendation(
+        self,
+        shot: GenerativeShot,
+        agent_role: AgentRole,
+        fingerprint: str
+    ) -> Optional[AgentRecommendation]:
+        """Reuse the last recommendation for an unchanged shot, else generate one."""
+        key = (agent_role, shot.shot_id)
+        cached = self._recommendation_cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        async with self._semaphore:
+            rec = await self._generate_shot_recommendation(shot, agent_role)
+        self._recommendation_cache[key] = (fingerprint, rec)
+        return rec
+    
     async def _generate_shot_recommendation(
         self, 
         shot: GenerativeShot, 
@@ -6,6 +6,7 @@ Manages registration, storage, and retrieval of all asset types
 with support for the expanded asset system.
 """
 
+import asyncio
 import uuid
 import json
 from typing import Dict, List, Optional, Type, Union
@@ -59,33 +60,53 @@ class AssetRegistry:
         # Update timestamps
         asset.updated_at = datetime.now()
         
-        # Store in cache
-        self._asset_cache[asset.asset_id] = asset
+        # Store in cache and update indices
+        self._index_asset(asset)
         
-        # Update indices
+        # Persist to disk
+        await self._persist_asset(asset)
+        
+        return asset.asset_id
+    
+    async def register_assets(self, assets: List[BaseAsset]) -> List[str]:
+        """Register several assets, writing all their files in one batch off the event loop."""
+        now = datetime.now()
+        for asset in assets:
+            if not asset.asset_id:
+                asset.asset_id = str(uuid.uuid4())
+            asset.updated_at = now
+            self._index_asset(asset)
+        
+        if assets:
+            await asyncio.to_thread(self._write_assets, assets)
+        
+        return [asset.asset_id for asset in assets]
+    
+    def _index_asset(self, asset: BaseAsset) -> None:
+        """Add an asset to the cache and the type and category indices."""
+        self._asset_cache[asset.asset_id] = asset
         self._type_index[asset.asset_type].append(asset.asset_id)
         
         category_key = f"{asset.asset_type.value}_{asset.category.value}"
         if category_key not in self._category_index:
             self._category_index[category_key] = []
         self._category_index[category_key].append(asset.asset_id)
-        
-        # Persist to disk
-        await self._persist_asset(asset)
-        
-        return asset.asset_id
     
     async def _persist_asset(self, asset: BaseAsset) -> None:
         """Persist asset to filesystem."""
-        asset_dir = self._get_asset_directory(asset)
-        asset_file = asset_dir / f"{asset.asset_id}.json"
-        
-        # Ensure directory exists
-        asset_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write asset data
-        with open(asset_file, 'w') as f:
-            json.dump(asset.model_dump(), f, indent=2, default=str)
+        self._write_assets([asset])
+    
+    def _write_assets(self, assets: List[BaseAsset]) -> None:
+        """Write asset files, creating each target directory once."""
+        created = set()
+        for asset in assets:
+            asset_dir = self._get_asset_directory(asset)
+            if asset_dir not in created:
+                asset_dir.mkdir(parents=True, exist_ok=True)
+                created.add(asset_dir)
+            
+            with open(asset_dir / f"{asset.asset_id}.json", 'w') as f:
+                json.dump(asset.model_dump(), f, indent=2, default=str)
     
     def _get_asset_directory(self, asset: BaseAsset) -> Path:
         """Get the directory path for storing an asset."""
@@ -335,14 +356,7 @@ class AssetRegistry:
                         with open(asset_file, 'r') as f:
                             data = json.load(f)
                         asset = create_asset_from_dict(data)
-                        
-                        self._asset_cache[asset.asset_id] = asset
-                        self._type_index[asset.asset_type].append(asset.asset_id)
-                        
-                        category_key = f"{asset.asset_type.value}_{asset.category.value}"
-                        if category_key not in self._category_index:
-                            self._category_index[category_key] = []
-                        self._category_index[category_key].append(asset.asset_id)
+                        self._index_asset(asset)
                         
                     except Exception as e:
                         print(f"Error loading asset {asset_file}: {e}")
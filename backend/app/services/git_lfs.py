@@ -1,15 +1,29 @@
 """
 Git LFS (Large File Storage) service for managing large media files.
 Provides comprehensive LFS operations and validation.
+
+Tracking edits .gitattributes directly, so any number of paths costs one
+rewrite. The tracked-file inventory covers the paths in the Git index that
+match an LFS pattern. Like ``git lfs ls-files``, it reads the pointer blobs
+stored in the index with one batched ``git cat-file`` rather than the working
+tree, so checked-out objects are never hashed. It is cached per project until
+the Git index or .gitattributes changes.
 """
 
 import logging
+import re
 import subprocess
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+LFS_ATTRIBUTES = "filter=lfs diff=lfs merge=lfs -text"
+
+# Pointer files start with this line and are never larger than 1024 bytes
+POINTER_HEADER = b"version https://git-lfs"
+POINTER_MAX_SIZE = 1024
+
 
 class GitLFSService:
     """Service for managing Git LFS operations"""
@@ -97,6 +111,9 @@ class GitLFSService:
     def __init__(self):
         self.lfs_available = self.check_lfs_installed()
 
+        # project path -> ((index mtime, .gitattributes mtime), inventory, initialized)
+        self._inventory_cache: dict[Path, tuple[tuple[int, int], list[dict[str, Any]], bool]] = {}
+
     def check_lfs_installed(self) -> bool:
         """Check if Git LFS is installed and available"""
         try:
@@ -197,24 +214,40 @@ class GitLFSService:
 
     def track_file(self, project_path: Path, file_path: str) -> bool:
         """Track a specific file with Git LFS"""
+        return self.track_files(project_path, [file_path])
+
+    def track_files(self, project_path: Path, file_paths: list[str]) -> bool:
+        """Track many files or patterns with one .gitattributes rewrite"""
         if not self.lfs_available:
             raise RuntimeError("Git LFS is not installed")
 
+        gitattributes = project_path / ".gitattributes"
         try:
-            subprocess.run(
-                ["git", "lfs", "track", file_path],
-                cwd=project_path,
-                check=True,
-                capture_output=True,
-            )
+            content = gitattributes.read_text() if gitattributes.exists() else ""
+            tracked = set(self._parse_patterns(content))
+
+            new_lines = []
+            for file_path in file_paths:
+                pattern = self._escape_pattern(Path(file_path).as_posix())
+                if pattern not in tracked:
+                    tracked.add(pattern)
+                    new_lines.append(f"{pattern} {LFS_ATTRIBUTES}\n")
+
+            if not new_lines:
+                return True
+
+            if content and not content.endswith("\n"):
+                content += "\n"
+            gitattributes.write_text(content + "".join(new_lines))
 
             # Stage the updated .gitattributes
             subprocess.run(["git", "add", ".gitattributes"], cwd=project_path, check=True)
 
+            logger.debug(f"Tracked {len(new_lines)} new paths with Git LFS in {project_path}")
             return True
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to track file with LFS: {e.stderr}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error(f"Failed to track files with LFS: {e}")
             return False
 
     def untrack_file(self, project_path: Path, pattern: str) -> bool:
@@ -241,27 +274,203 @@ class GitLFSService:
         if not self.lfs_available:
             return []
 
+        return self._get_inventory(project_path)[0]
+
+    def invalidate(self, project_path: Path) -> None:
+        """Drop the cached inventory of a project"""
+        self._inventory_cache.pop(project_path, None)
+
+    def _get_inventory(self, project_path: Path) -> tuple[list[dict[str, Any]], bool]:
+        """Tracked files and LFS initialization, rebuilt when the index or attributes change"""
+        key = (
+            self._mtime(project_path / ".git" / "index"),
+            self._mtime(project_path / ".gitattributes"),
+        )
+        cached = self._inventory_cache.get(project_path)
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+
+        result = subprocess.run(
+            ["git", "config", "--get", "filter.lfs.clean"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+        )
+        initialized = result.returncode == 0
+
+        gitattributes = project_path / ".gitattributes"
+        patterns = self._parse_patterns(gitattributes.read_text()) if gitattributes.exists() else []
+        candidates = self._match_files(self._index_entries(project_path), patterns)
+        pointers = self._read_pointers(project_path, {blob for blob, _ in candidates})
+
+        files = [
+            {"oid": pointers[blob][0], "size": pointers[blob][1], "path": path}
+            for blob, path in candidates
+            if blob in pointers
+        ]
+
+        # Without an index there is nothing to key the cache on
+        if key[0]:
+            self._inventory_cache[project_path] = (key, files, initialized)
+        return files, initialized
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
         try:
-            result = subprocess.run(
-                ["git", "lfs", "ls-files"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            files = []
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    # Parse: oid size path
-                    parts = line.split(None, 2)
-                    if len(parts) >= 3:
-                        files.append({"oid": parts[0], "size": int(parts[1]), "path": parts[2]})
-
-            return files
+            return path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _escape_pattern(pattern: str) -> str:
+        """Escape a path for .gitattributes the way ``git lfs track`` does"""
+        pattern = pattern.replace(" ", "[[:space:]]")
+        return "\\" + pattern if pattern.startswith("#") else pattern
+
+    @staticmethod
+    def _parse_patterns(content: str) -> list[str]:
+        """Patterns assigned the LFS filter in .gitattributes content"""
+        patterns = []
+        for line in content.splitlines():
+            parts = line.split()
+            if parts and not parts[0].startswith("#") and "filter=lfs" in parts[1:]:
+                patterns.append(parts[0])
+        return patterns
+
+    @staticmethod
+    def _index_entries(project_path: Path) -> list[tuple[str, str]]:
+        """(blob id, path) of the Git index; untracked files are never LFS files"""
+        result = subprocess.run(
+            ["git", "ls-files", "-s", "-z"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return []
 
-        except subprocess.CalledProcessError:
+        entries = []
+        for record in result.stdout.split("\0"):
+            # <mode> <blob> <stage>\t<path>
+            info, _, path = record.partition("\t")
+            fields = info.split()
+            if path and len(fields) == 3 and fields[0] != "160000":
+                entries.append((fields[1], path))
+        return entries
+
+    @staticmethod
+    def _pattern_regex(pattern: str) -> re.Pattern:
+        """
+        A .gitattributes pattern as a regex over index paths.
+
+        Patterns without a slash match the file name at any depth. Otherwise
+        they are anchored at the root, and as in Git ``*`` and ``?`` stop at
+        ``/`` while ``**`` spans directories.
+        """
+        pattern = pattern.replace("[[:space:]]", " ")
+        if "/" not in pattern.rstrip("/"):
+            pattern = "**/" + pattern
+        pattern = pattern.lstrip("/")
+
+        regex = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                regex.append(".*")
+                i += 2
+            elif pattern[i] == "*":
+                regex.append("[^/]*")
+                i += 1
+            elif pattern[i] == "?":
+                regex.append("[^/]")
+                i += 1
+            elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+                end = pattern.index("]", i + 2)
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex.append("[" + body + "]")
+                i = end + 1
+            elif pattern[i] == "\\" and i + 1 < len(pattern):
+                regex.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                regex.append(re.escape(pattern[i]))
+                i += 1
+        return re.compile("".join(regex) + "$")
+
+    def _match_files(
+        self, index_entries: list[tuple[str, str]], patterns: list[str]
+    ) -> list[tuple[str, str]]:
+        """Index entries whose path matches any LFS pattern"""
+        if not patterns:
             return []
+        regexes = [self._pattern_regex(pattern) for pattern in patterns]
+        return [(blob, path) for blob, path in index_entries if any(r.match(path) for r in regexes)]
+
+    @staticmethod
+    def _read_pointers(project_path: Path, blobs: set[str]) -> dict[str, tuple[str, int]]:
+        """
+        Blob id -> (oid, size) for the blobs that are LFS pointers.
+
+        Sizes are checked first, so the contents of blobs committed without
+        the LFS filter (which are not LFS files) are never read.
+        """
+        if not blobs:
+            return {}
+
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objectsize)"],
+            cwd=project_path,
+            input="\n".join(sorted(blobs)) + "\n",
+            capture_output=True,
+            text=True,
+        )
+        small = []
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[1].isdigit() and int(fields[1]) <= POINTER_MAX_SIZE:
+                small.append(fields[0])
+        if result.returncode != 0 or not small:
+            return {}
+
+        result = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            cwd=project_path,
+            input="\n".join(small).encode() + b"\n",
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            return {}
+
+        # Each object is "<blob> <type> <size>\n<content>\n"
+        pointers = {}
+        output = result.stdout
+        position = 0
+        while position < len(output):
+            header_end = output.index(b"\n", position)
+            header = output[position:header_end].split()
+            position = header_end + 1
+            if len(header) != 3:
+                continue
+            size = int(header[2])
+            content = output[position : position + size]
+            position += size + 1
+
+            if content.startswith(POINTER_HEADER):
+                try:
+                    fields = dict(
+                        line.split(" ", 1) for line in content.decode().splitlines() if " " in line
+                    )
+                    oid = fields.get("oid", "").split(":", 1)[-1]
+                    if oid:
+                        pointers[header[0].decode()] = (oid, int(fields.get("size", 0)))
+                except ValueError as e:
+                    logger.warning(f"Invalid LFS pointer {header[0].decode()}: {e}")
+        return pointers
 
     def check_file_size(self, file_path: Path) -> bool:
         """Check if file should be tracked by LFS based on size"""
@@ -278,24 +487,13 @@ class GitLFSService:
 
         try:
             # Check if LFS is initialized
-            result = subprocess.run(
-                ["git", "config", "--get", "filter.lfs.clean"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-            )
-
-            lfs_initialized = result.returncode == 0
+            _, lfs_initialized = self._get_inventory(project_path)
 
             # Get tracked patterns
             patterns = []
             gitattributes = project_path / ".gitattributes"
             if gitattributes.exists():
-                with open(gitattributes) as f:
-                    for line in f:
-                        if "filter=lfs" in line:
-                            pattern = line.split()[0]
-                            patterns.append(pattern)
+                patterns = self._parse_patterns(gitattributes.read_text())
 
             # Get LFS files
             lfs_files = self.get_lfs_files(project_path)
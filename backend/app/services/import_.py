@@ -2,20 +2,34 @@
 Project import service for restoring project archives.
 
 Handles importing project archives with validation, migration, and Git/LFS restoration.
+
+Archives are validated from their member list, read together with the
+manifest in one pass, and then streamed into a hidden staging project: project
+files to their final paths, LFS objects into .git/lfs/objects. The Git bundle
+is fetched while the remaining members are still being written. The staged
+project is renamed into the workspace only once every phase has finished, so a
+failed import never shows up as a project. A journal per archive content and
+target lets an interrupted import resume where it stopped, including from a
+fresh upload of the same archive.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import shutil
 import tarfile
 import tempfile
+import threading
 import zipfile
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
+from functools import partial
+from pathlib import Path, PurePosixPath
 from typing import Any
 
 from app.config import settings
@@ -32,13 +46,44 @@ class ImportFormat(str, Enum):
     TAR_GZ = "tar.gz"
 
 
+# Archive entries that are never written to the project
+EXCLUDED_NAMES = {"__pycache__", ".DS_Store", "Thumbs.db"}
+EXCLUDED_SUFFIXES = (".pyc",)
+
+MANIFEST_NAME = "export_manifest.json"
+BUNDLE_NAME = "git-bundle.bundle"
+LFS_OBJECTS_DIR = ".git-lfs-objects"
+
+# Where the bundle waits inside the restored repository until it is fetched
+BUNDLE_SCRATCH = PurePosixPath(".git") / "auteur-import.bundle"
+
+# Where imports are assembled, inside the workspace so the final rename is atomic
+STAGING_DIR = PurePosixPath(".auteur") / "imports"
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Bytes read from each end of an archive to fingerprint its content
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+@dataclass
+class ArchiveEntry:
+    """A regular file in an archive and where it goes in the project"""
+
+    name: str  # Name inside the archive
+    path: PurePosixPath  # Destination relative to the project root
+    size: int
+    kind: str = "file"  # file, lfs, bundle or manifest (read, never written)
+
+
 class ProjectImportService:
     """Service for importing project archives."""
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 4):
         self.workspace_root = Path(settings.workspace_root)
         self.temp_dir = Path(tempfile.gettempdir()) / "auteur-imports"
         self.temp_dir.mkdir(exist_ok=True)
+        self.max_workers = max_workers
 
         # Version migration registry
         self.migrations = {"1.0": self._migrate_v1_to_v2, "1.1": self._migrate_v1_1_to_v2}
@@ -56,6 +101,9 @@ class ProjectImportService:
         """
         Import a project from an archive.
 
+        Re-running an interrupted import of the same archive content under
+        the same target name resumes it: files already written are skipped.
+
         Args:
             archive_path: Path to the archive file
             target_name: Target project name
@@ -71,60 +119,90 @@ class ProjectImportService:
         if not archive_path.exists():
             raise ValueError(f"Archive file not found: {archive_path}")
 
-        # Create temporary extraction directory
-        extract_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        extract_dir = self.temp_dir / f"import_{extract_id}"
-        extract_dir.mkdir(exist_ok=True)
+        journal_path = await asyncio.to_thread(self._journal_path, archive_path, target_name)
+        journal = self._load_journal(journal_path)
+        # Everything is written here and only renamed into the workspace at the end
+        target_path = self._staging_path(journal_path)
 
         try:
-            # Step 1: Extract archive
-            await self._update_progress(progress_callback, 0.1, "Extracting archive...")
-            await self._extract_archive(archive_path, extract_dir)
-
-            # Find project root (might be nested)
-            project_root = await self._find_project_root(extract_dir)
-            if not project_root:
+            # Step 1: Read the archive index
+            await self._update_progress(progress_callback, 0.1, "Reading archive...")
+            entries, root, manifest = await asyncio.to_thread(
+                self._read_archive_index, archive_path
+            )
+            if root is None:
                 raise ValueError("No valid project found in archive")
 
             # Step 2: Validate structure
             await self._update_progress(progress_callback, 0.2, "Validating project structure...")
-            validation = await self._validate_project_structure(project_root)
+            validation = self._validate_archive_entries(entries, manifest)
             if not validation.valid:
                 raise ValueError(f"Invalid project structure: {', '.join(validation.errors)}")
 
-            # Step 3: Check version and migrate if needed
-            await self._update_progress(progress_callback, 0.3, "Checking project version...")
-            if validation.version != self.current_version:
-                await self._migrate_project(project_root, validation.version, self.current_version)
-
-            # Step 4: Resolve naming conflicts
-            await self._update_progress(progress_callback, 0.4, "Resolving naming conflicts...")
-            final_name = await self._resolve_project_name(target_name, options.rename_on_conflict)
-
-            # Step 5: Copy to workspace
-            await self._update_progress(progress_callback, 0.5, "Copying project files...")
-            target_path = self.workspace_root / final_name
-            await self._copy_project_files(project_root, target_path)
-
-            # Step 6: Restore Git repository
-            if options.restore_git_history and (project_root / "git-bundle.bundle").exists():
-                await self._update_progress(progress_callback, 0.7, "Restoring Git history...")
-                await self._restore_git_repository(project_root / "git-bundle.bundle", target_path)
+            # Step 3: Resolve naming conflicts, unless resuming an earlier staging
+            await self._update_progress(progress_callback, 0.3, "Resolving naming conflicts...")
+            if journal and target_path.is_dir():
+                final_name = journal["final_name"]
+                logger.info(f"Resuming import of {archive_path.name} into {final_name}")
             else:
-                # Initialize new Git repository
-                await git_service.init_repository(str(target_path))
+                final_name = await self._resolve_project_name(
+                    target_name, options.rename_on_conflict
+                )
+                journal = {
+                    "final_name": final_name,
+                    "staging": target_path.name,
+                    "phase": "extracting",
+                }
+            target_path.mkdir(parents=True, exist_ok=True)
+            self._save_journal(journal_path, journal)
+
+            entries = [e for e in entries if e.kind != "manifest"]
+            restore_git = options.restore_git_history and any(e.kind == "bundle" for e in entries)
+            if not restore_git:
+                entries = [e for e in entries if e.kind != "bundle"]
+            if not options.restore_lfs_objects:
+                entries = [e for e in entries if e.kind != "lfs"]
+
+            # Step 4: Stream files into place, fetching Git history meanwhile
+            if journal["phase"] == "extracting":
+                await self._update_progress(progress_callback, 0.4, "Extracting project files...")
+                statistics = await self._restore_entries(
+                    archive_path, entries, target_path, restore_git, progress_callback
+                )
+                journal.update(phase="extracted", statistics=statistics)
+                self._save_journal(journal_path, journal)
+            statistics = journal["statistics"]
 
-            # Step 7: Restore LFS objects
-            if (project_root / ".git-lfs-objects").exists():
-                await self._update_progress(progress_callback, 0.8, "Restoring LFS objects...")
-                await self._restore_lfs_objects(project_root / ".git-lfs-objects", target_path)
+            # Step 5: Check version and migrate if needed
+            await self._update_progress(progress_callback, 0.8, "Checking project version...")
+            if validation.version != self.current_version:
+                await self._migrate_project(target_path, validation.version, self.current_version)
+            for dir_name in self._get_required_directories(self.current_version):
+                (target_path / dir_name).mkdir(exist_ok=True)
+
+            # Step 6: Attach the restored history to the extracted working tree
+            if restore_git:
+                await self._update_progress(progress_callback, 0.85, "Restoring Git history...")
+                await self._checkout_restored_history(target_path)
+                if any(e.kind == "lfs" for e in entries):
+                    await self._checkout_lfs_objects(target_path)
+            elif not (target_path / ".git" / "HEAD").exists():
+                # Initialize new Git repository
+                await git_service.initialize_repository(target_path)
 
-            # Step 8: Update project metadata
+            # Step 7: Update project metadata, under a name that may have been
+            # taken by another project while this one was being staged
             await self._update_progress(progress_callback, 0.9, "Updating project metadata...")
+            if (self.workspace_root / final_name).exists():
+                final_name = await self._resolve_project_name(
+                    target_name, options.rename_on_conflict
+                )
             await self._update_project_metadata(target_path, final_name)
+            statistics["git_commits"] = await self._count_commits(target_path)
 
-            # Calculate import statistics
-            statistics = await self._calculate_import_statistics(target_path)
+            # Step 8: Publish the finished project
+            await asyncio.to_thread(os.rename, target_path, self.workspace_root / final_name)
+            journal_path.unlink(missing_ok=True)
 
             await self._update_progress(progress_callback, 1.0, "Import completed successfully")
 
@@ -140,6 +218,7 @@ class ProjectImportService:
             )
 
         except Exception as e:
+            # Files written so far stay staged with the journal, so a retry resumes
             logger.error(f"Import failed: {str(e)}")
             duration = (datetime.now() - start_time).total_seconds()
             return ImportResult(
@@ -150,58 +229,310 @@ class ProjectImportService:
                 statistics={},
                 errors=[str(e)],
             )
-        finally:
-            # Cleanup temporary directory
-            if extract_dir.exists():
-                shutil.rmtree(extract_dir)
 
-    async def _extract_archive(self, archive_path: Path, extract_dir: Path):
-        """Extract archive to temporary directory."""
-        file_extension = archive_path.suffix.lower()
+    def _journal_path(self, archive_path: Path, target_name: str) -> Path:
+        """
+        Resume journal of one archive's content imported under one name.
 
-        def _extract():
-            if file_extension == ".zip":
-                with zipfile.ZipFile(archive_path, "r") as zf:
-                    zf.extractall(extract_dir)
-            elif archive_path.name.endswith(".tar.gz"):
-                with tarfile.open(archive_path, "r:gz") as tf:
-                    tf.extractall(extract_dir)
+        Keyed on content rather than the upload path, so a re-upload of the
+        same archive resumes. The size and both ends of the file identify it:
+        the tail holds the ZIP central directory (every member's CRC) or the
+        gzip trailer (CRC of the whole stream).
+        """
+        size = archive_path.stat().st_size
+        digest = hashlib.sha256(f"{size}:{target_name}:".encode())
+        with open(archive_path, "rb") as f:
+            digest.update(f.read(FINGERPRINT_BYTES))
+            if size > FINGERPRINT_BYTES:
+                f.seek(max(size - FINGERPRINT_BYTES, FINGERPRINT_BYTES))
+                digest.update(f.read())
+        return self.temp_dir / f"resume_{digest.hexdigest()}.json"
+
+    def _staging_path(self, journal_path: Path) -> Path:
+        """Hidden directory an import is assembled in, one per journal"""
+        return self.workspace_root / STAGING_DIR / journal_path.stem.removeprefix("resume_")
+
+    def cleanup_abandoned_imports(self, older_than: float) -> int:
+        """
+        Drop resume journals last touched before ``older_than`` (a timestamp).
+
+        A journal outlives only imports that never completed, so the
+        staged project it belongs to is removed with it.
+        """
+        removed = 0
+        for journal_path in self.temp_dir.glob("resume_*.json"):
+            try:
+                if journal_path.stat().st_mtime >= older_than:
+                    continue
+            except OSError:
+                continue
+
+            staging_path = self._staging_path(journal_path)
+            if staging_path.is_dir():
+                shutil.rmtree(staging_path, ignore_errors=True)
+                logger.info(f"Removed partial import {staging_path}")
+            journal_path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _load_journal(journal_path: Path) -> dict[str, Any] | None:
+        try:
+            with open(journal_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_journal(journal_path: Path, journal: dict[str, Any]):
+        temp_path = journal_path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(journal, f)
+        os.replace(temp_path, journal_path)
+
+    @staticmethod
+    def _safe_path(name: str) -> PurePosixPath:
+        """Archive member name as a relative path that cannot leave the target"""
+        path = PurePosixPath(name.replace("\\", "/"))
+        if path.is_absolute() or ".." in path.parts or (path.parts and ":" in path.parts[0]):
+            raise ValueError(f"Unsafe path in archive: {name}")
+        return path
+
+    def _list_archive(self, archive_path: Path) -> tuple[list[tuple[str, int]], dict[str, bytes]]:
+        """
+        (name, size) of the regular files in an archive, and the content of
+        every manifest among them, without extracting anything else.
+
+        A gzip stream can only be read front to back, so both come from a
+        single sequential pass.
+        """
+        files = []
+        manifests = {}
+        if archive_path.suffix.lower() == ".zip":
+            with zipfile.ZipFile(archive_path, "r") as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    files.append((info.filename, info.file_size))
+                    if PurePosixPath(info.filename).name == MANIFEST_NAME:
+                        manifests[info.filename] = zf.read(info)
+        elif archive_path.name.endswith(".tar.gz"):
+            with tarfile.open(archive_path, "r|gz") as tf:
+                for member in tf:
+                    if member.isfile():
+                        files.append((member.name, member.size))
+                        if PurePosixPath(member.name).name == MANIFEST_NAME:
+                            manifests[member.name] = tf.extractfile(member).read()
+                    elif not member.isdir():
+                        logger.warning(f"Skipping non-regular archive member: {member.name}")
+        else:
+            raise ValueError(f"Unsupported archive format: {archive_path.suffix.lower()}")
+        return files, manifests
+
+    def _read_archive_index(
+        self, archive_path: Path
+    ) -> tuple[list[ArchiveEntry], PurePosixPath | None, bytes | None]:
+        """
+        Project files of an archive mapped to their destinations, the project
+        root, and the project's manifest if it has one.
+        """
+        listing, manifests = self._list_archive(archive_path)
+        files = [(name, self._safe_path(name), size) for name, size in listing]
+
+        # Project root (might be nested): the shallowest directory with a manifest
+        roots = [
+            path.parent for _, path, _ in files if path.name in ("project.json", MANIFEST_NAME)
+        ]
+        if not roots:
+            return [], None, None
+        root = min(roots, key=lambda path: len(path.parts))
+
+        entries = []
+        manifest = None
+        for name, path, size in files:
+            try:
+                relative = path.relative_to(root)
+            except ValueError:
+                continue
+            if any(part in EXCLUDED_NAMES for part in relative.parts) or path.name.endswith(
+                EXCLUDED_SUFFIXES
+            ):
+                continue
+
+            if relative == PurePosixPath(MANIFEST_NAME):
+                entries.append(ArchiveEntry(name, relative, size, "manifest"))
+                manifest = manifests.get(name)
+            elif relative == PurePosixPath(BUNDLE_NAME):
+                entries.append(ArchiveEntry(name, BUNDLE_SCRATCH, size, "bundle"))
+            elif relative.parts[0] == LFS_OBJECTS_DIR:
+                destination = PurePosixPath(".git", "lfs", "objects", *relative.parts[1:])
+                entries.append(ArchiveEntry(name, destination, size, "lfs"))
             else:
-                raise ValueError(f"Unsupported archive format: {file_extension}")
+                entries.append(ArchiveEntry(name, relative, size))
+
+        return entries, root, manifest
+
+    async def _restore_entries(
+        self,
+        archive_path: Path,
+        entries: list[ArchiveEntry],
+        target_path: Path,
+        restore_git: bool,
+        progress_callback: Callable | None,
+    ) -> dict[str, Any]:
+        """Write entries to their destinations and fetch the Git bundle once it is written"""
+        loop = asyncio.get_running_loop()
+        bundle_ready = asyncio.Event()
+        progress = {"bytes": 0}
+        total_bytes = sum(entry.size for entry in entries) or 1
+
+        def on_written(entry: ArchiveEntry):
+            progress["bytes"] += entry.size
+            if entry.kind == "bundle":
+                loop.call_soon_threadsafe(bundle_ready.set)
+
+        async def restore_git_history():
+            await bundle_ready.wait()
+            await self._restore_git_repository(target_path / BUNDLE_SCRATCH, target_path)
+
+        git_task = asyncio.create_task(restore_git_history()) if restore_git else None
+        extraction = asyncio.ensure_future(
+            asyncio.to_thread(self._extract_entries, archive_path, entries, target_path, on_written)
+        )
 
-        # Run extraction in thread pool
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, _extract)
+        try:
+            while not extraction.done():
+                await asyncio.wait({extraction}, timeout=1.0)
+                await self._update_progress(
+                    progress_callback,
+                    0.4 + 0.35 * progress["bytes"] / total_bytes,
+                    "Extracting project files...",
+                )
+            statistics = extraction.result()
+
+            if git_task:
+                await git_task
+        finally:
+            if git_task and not git_task.done():
+                git_task.cancel()
+
+        return statistics
+
+    def _extract_entries(
+        self,
+        archive_path: Path,
+        entries: list[ArchiveEntry],
+        target_path: Path,
+        on_written: Callable[[ArchiveEntry], None],
+    ) -> dict[str, Any]:
+        """
+        Stream archive members into place, collecting import statistics.
+
+        Each file is written next to its destination and renamed into place
+        when complete, so an existing file of the expected size is never
+        written again when an import resumes. ZIP members are written by
+        several threads; a gzip stream is read sequentially.
+        """
+        statistics = {"total_files": 0, "total_size_bytes": 0, "file_types": {}}
+        lock = threading.Lock()
+
+        def write(entry: ArchiveEntry, source_file: Callable):
+            destination = target_path / entry.path
+            try:
+                done = destination.stat().st_size == entry.size
+            except OSError:
+                done = False
+
+            if not done:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                partial = destination.with_name(destination.name + ".part")
+                with source_file() as source, open(partial, "wb") as output:
+                    shutil.copyfileobj(source, output, COPY_BUFFER_SIZE)
+                os.replace(partial, destination)
+
+            with lock:
+                if entry.kind == "file":
+                    statistics["total_files"] += 1
+                    statistics["total_size_bytes"] += entry.size
+                    ext = entry.path.suffix.lower()
+                    if ext:
+                        statistics["file_types"][ext] = statistics["file_types"].get(ext, 0) + 1
+                on_written(entry)
+
+        if archive_path.suffix.lower() == ".zip":
+            # Bundle first, so Git can fetch while the rest is written
+            ordered = sorted(entries, key=lambda entry: (entry.kind != "bundle", -entry.size))
+            batches = [ordered[i :: self.max_workers] for i in range(self.max_workers)]
+
+            def write_batch(batch: list[ArchiveEntry]):
+                with zipfile.ZipFile(archive_path, "r") as zf:
+                    for entry in batch:
+                        write(entry, partial(zf.open, entry.name))
 
-    async def _find_project_root(self, extract_dir: Path) -> Path | None:
-        """Find the project root directory in extracted files."""
-        # Look for project.json or export_manifest.json
-        for root, _, files in os.walk(extract_dir):
-            root_path = Path(root)
-            if "project.json" in files or "export_manifest.json" in files:
-                return root_path
-        return None
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(write_batch, batches))
+        else:
+            by_name = {entry.name: entry for entry in entries}
+            with tarfile.open(archive_path, "r|gz") as tf:
+                for member in tf:
+                    entry = by_name.get(member.name) if member.isfile() else None
+                    if entry:
+                        write(entry, partial(tf.extractfile, member))
+
+        statistics["total_size_mb"] = round(statistics["total_size_bytes"] / (1024 * 1024), 2)
+        return statistics
+
+    def _validate_archive_entries(
+        self, entries: list[ArchiveEntry], manifest: bytes | None
+    ) -> ValidationResult:
+        """Validate the project structure from the archive index and manifest"""
+        paths = {entry.path for entry in entries}
+        directories = {parent for path in paths for parent in path.parents}
+
+        return self._validate_structure(
+            manifest=manifest,
+            has_project_json=PurePosixPath("project.json") in paths,
+            has_directory=lambda name: PurePosixPath(name) in directories,
+            has_bundle=BUNDLE_SCRATCH in paths,
+            has_git_dir=False,
+        )
 
     async def _validate_project_structure(self, project_path: Path) -> ValidationResult:
         """Validate project structure and return validation result."""
+        manifest_path = project_path / MANIFEST_NAME
+        return self._validate_structure(
+            manifest=manifest_path.read_bytes() if manifest_path.exists() else None,
+            has_project_json=(project_path / "project.json").exists(),
+            has_directory=lambda name: (project_path / name).exists(),
+            has_bundle=(project_path / BUNDLE_NAME).exists(),
+            has_git_dir=(project_path / ".git").exists(),
+        )
+
+    def _validate_structure(
+        self,
+        manifest: bytes | None,
+        has_project_json: bool,
+        has_directory: Callable[[str], bool],
+        has_bundle: bool,
+        has_git_dir: bool,
+    ) -> ValidationResult:
+        """Validate a project layout, whether extracted or still in an archive"""
         errors = []
         warnings = []
         version = None
         project_id = None
 
         # Check for manifest
-        manifest_path = project_path / "export_manifest.json"
-        if manifest_path.exists():
+        if manifest is not None:
             try:
-                with open(manifest_path) as f:
-                    manifest = json.load(f)
+                manifest = json.loads(manifest)
                 version = manifest.get("export_version", "1.0")
                 project_id = manifest.get("project_id")
             except Exception as e:
                 errors.append(f"Invalid manifest: {str(e)}")
         else:
             # Try to detect version from structure
-            if (project_path / "project.json").exists():
+            if has_project_json:
                 version = "1.0"
             else:
                 errors.append("No project manifest found")
@@ -210,12 +541,12 @@ class ProjectImportService:
         if version:
             required_dirs = self._get_required_directories(version)
             for dir_name in required_dirs:
-                if not (project_path / dir_name).exists():
+                if not has_directory(dir_name):
                     warnings.append(f"Missing directory: {dir_name}")
 
         # Check for Git repository if bundle exists
-        if (project_path / "git-bundle.bundle").exists():
-            if not (project_path / ".git").exists() and version != "1.0":
+        if has_bundle:
+            if not has_git_dir and version != "1.0":
                 warnings.append("Git bundle found but no .git directory")
 
         return ValidationResult(
@@ -292,78 +623,50 @@ class ProjectImportService:
                 return new_name
             counter += 1
 
-    async def _copy_project_files(self, source: Path, destination: Path):
-        """Copy project files to workspace."""
-        destination.mkdir(parents=True, exist_ok=True)
-
-        # Copy all files except temporary/system files
-        exclude_patterns = [
-            "export_manifest.json",
-            "git-bundle.bundle",
-            ".git-lfs-objects",
-            "__pycache__",
-            "*.pyc",
-            ".DS_Store",
-            "Thumbs.db",
-        ]
-
-        def should_exclude(path: Path) -> bool:
-            name = path.name
-            return any(
-                name == pattern or name.endswith(pattern.replace("*", ""))
-                for pattern in exclude_patterns
-            )
-
-        for item in source.rglob("*"):
-            if item.is_file() and not should_exclude(item):
-                relative_path = item.relative_to(source)
-                dest_path = destination / relative_path
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, dest_path)
+    async def _run_git(self, project_path: Path, *args: str) -> tuple[int, str]:
+        """Run a git command in a project, returning exit code and stderr"""
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "-C",
+            str(project_path),
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        return process.returncode, stderr.decode(errors="replace")
 
     async def _restore_git_repository(self, bundle_path: Path, project_path: Path):
-        """Restore Git repository from bundle."""
-        git_dir = project_path / ".git"
-
+        """Restore Git objects and refs from a bundle, leaving the working tree alone."""
         # Initialize repository
-        await git_service.init_repository(str(project_path))
+        returncode, stderr = await self._run_git(project_path, "init", "-q")
+        if returncode != 0:
+            logger.error(f"Git init failed: {stderr}")
+            raise RuntimeError("Failed to restore Git repository")
 
         # Fetch from bundle
-        cmd = ["git", "-C", str(project_path), "fetch", str(bundle_path), "+refs/*:refs/*"]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        returncode, stderr = await self._run_git(
+            project_path, "fetch", "-q", "--update-head-ok", str(bundle_path), "+refs/*:refs/*"
         )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            logger.error(f"Git restore failed: {stderr.decode()}")
+        if returncode != 0:
+            logger.error(f"Git restore failed: {stderr}")
             raise RuntimeError("Failed to restore Git repository")
 
-        # Checkout default branch
-        cmd = ["git", "-C", str(project_path), "checkout", "-f", "main"]
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        await process.communicate()
-
-    async def _restore_lfs_objects(self, lfs_source: Path, project_path: Path):
-        """Restore Git LFS objects."""
-        lfs_dest = project_path / ".git" / "lfs" / "objects"
-
-        if lfs_source.exists():
-            # Copy LFS objects
-            shutil.copytree(lfs_source, lfs_dest, dirs_exist_ok=True)
+        bundle_path.unlink(missing_ok=True)
 
-            # Run LFS checkout to restore files
-            cmd = ["git", "-C", str(project_path), "lfs", "checkout"]
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+    async def _checkout_restored_history(self, project_path: Path):
+        """Point HEAD at the default branch and build the index from it"""
+        # The extracted files already are the working tree, so only the index is rebuilt
+        await self._run_git(project_path, "symbolic-ref", "HEAD", "refs/heads/main")
+        returncode, stderr = await self._run_git(project_path, "reset", "-q", "--mixed")
+        if returncode != 0:
+            logger.warning(f"Git index rebuild had issues: {stderr}")
 
-            if process.returncode != 0:
-                logger.warning(f"LFS checkout had issues: {stderr.decode()}")
+    async def _checkout_lfs_objects(self, project_path: Path):
+        """Replace LFS pointer files with the restored objects"""
+        returncode, stderr = await self._run_git(project_path, "lfs", "checkout")
+        if returncode != 0:
+            logger.warning(f"LFS checkout had issues: {stderr}")
 
     async def _update_project_metadata(self, project_path: Path, project_name: str):
         """Update project metadata after import."""
@@ -387,44 +690,27 @@ class ProjectImportService:
         with open(metadata_path, "w") as f:
             json.dump(metadata, f, indent=2)
 
-    async def _calculate_import_statistics(self, project_path: Path) -> dict[str, Any]:
-        """Calculate statistics for imported project."""
-        total_files = 0
-        total_size = 0
-        file_types = {}
-
-        for item in project_path.rglob("*"):
-            if item.is_file():
-                total_files += 1
-                size = item.stat().st_size
-                total_size += size
-
-                # Track file types
-                ext = item.suffix.lower()
-                if ext:
-                    file_types[ext] = file_types.get(ext, 0) + 1
-
-        # Count Git commits if repository exists
-        git_commits = 0
-        if (project_path / ".git").exists():
-            try:
-                cmd = ["git", "-C", str(project_path), "rev-list", "--count", "HEAD"]
-                process = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                stdout, _ = await process.communicate()
-                if process.returncode == 0:
-                    git_commits = int(stdout.decode().strip())
-            except Exception as e:
-                logger.warning(f"Failed to count commits: {e}")
-
-        return {
-            "total_files": total_files,
-            "total_size_bytes": total_size,
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
-            "file_types": file_types,
-            "git_commits": git_commits,
-        }
+    async def _count_commits(self, project_path: Path) -> int:
+        """Count Git commits if repository exists"""
+        if not (project_path / ".git").exists():
+            return 0
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git",
+                "-C",
+                str(project_path),
+                "rev-list",
+                "--count",
+                "HEAD",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await process.communicate()
+            if process.returncode == 0:
+                return int(stdout.decode().strip())
+        except Exception as e:
+            logger.warning(f"Failed to count commits: {e}")
+        return 0
 
     async def _update_progress(self, callback: Callable | None, progress: float, message: str):
         """Update progress if callback provided."""
@@ -445,22 +731,18 @@ class ProjectImportService:
         if not archive_path.exists():
             return ValidationResult(valid=False, errors=["Archive file not found"])
 
-        # Extract to temp for validation
-        extract_dir = self.temp_dir / f"validate_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        extract_dir.mkdir(exist_ok=True)
-
+        # Only the archive index and manifest are read
         try:
-            await self._extract_archive(archive_path, extract_dir)
-            project_root = await self._find_project_root(extract_dir)
-
-            if not project_root:
-                return ValidationResult(valid=False, errors=["No valid project found in archive"])
+            entries, root, manifest = await asyncio.to_thread(
+                self._read_archive_index, archive_path
+            )
+        except Exception as e:
+            return ValidationResult(valid=False, errors=[str(e)])
 
-            return await self._validate_project_structure(project_root)
+        if root is None:
+            return ValidationResult(valid=False, errors=["No valid project found in archive"])
 
-        finally:
-            if extract_dir.exists():
-                shutil.rmtree(extract_dir)
+        return self._validate_archive_entries(entries, manifest)
 
 
 # Service singleton
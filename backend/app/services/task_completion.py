@@ -0,0 +1,212 @@
+"""
+Task completion notifications.
+
+Waiters get a per-task future instead of polling task status. Futures are
+resolved in-process when a terminal state is recorded, and across processes
+through a single shared subscription to the completion channel. Finished
+results are also kept under a short-lived Redis key so a waiter arriving after
+the task ended is answered with one read.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+TERMINAL_STATES = {'completed', 'failed', 'cancelled', 'timeout'}
+
+# How long finished results stay readable in Redis
+RESULT_TTL = 3600
+
+
+def completion_key(task_id: str) -> str:
+    """Redis key holding the terminal result of a task"""
+    return f"task:completion:{task_id}"
+
+
+def completion_payload(task_id: str, state: str, **fields) -> dict[str, Any]:
+    """Build the completion message shared by publishers and waiters"""
+    return {'task_id': task_id, 'state': state, 'timestamp': time.time(), **fields}
+
+
+class TaskCompletionRegistry:
+    """Per-task completion futures fed by local and Redis notifications"""
+
+    def __init__(self, channel: str | None = None, recent_size: int = 1000):
+        self.channel = channel or settings.redis_completion_channel
+        self.recent_size = recent_size
+
+        self.redis = None
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+
+        self._futures: dict[str, asyncio.Future] = {}
+        self._waiters: dict[str, int] = {}
+        # Recently finished tasks, so late waiters return immediately
+        self._recent: OrderedDict = OrderedDict()
+
+        # Statistics
+        self.resolved_count = 0
+        self.notifications_received = 0
+        self.timeouts = 0
+
+    async def start(self, redis):
+        """Subscribe to completion notifications from other processes"""
+        if self._task:
+            return
+
+        self.redis = redis
+        self._pubsub = redis.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen_loop())
+        logger.info(f"Task completion listener subscribed to {self.channel}")
+
+    async def stop(self):
+        """Stop listening and release waiters"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.channel)
+                await self._pubsub.close()
+            except Exception as e:
+                logger.debug(f"Error closing completion subscription: {e}")
+            self._pubsub = None
+
+        for future in self._futures.values():
+            if not future.done():
+                future.cancel()
+        self._futures.clear()
+        self._waiters.clear()
+        logger.info("Task completion listener stopped")
+
+    async def _listen_loop(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None:
+                    continue
+
+                result = json.loads(message['data'])
+                self.notifications_received += 1
+                self.resolve(result['task_id'], result)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error receiving task completion: {e}")
+                await asyncio.sleep(1)
+
+    def resolve(self, task_id: str, result: dict[str, Any]) -> bool:
+        """Resolve local waiters for a finished task; returns True if any were waiting"""
+        self._recent[task_id] = result
+        self._recent.move_to_end(task_id)
+        while len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+
+        future = self._futures.pop(task_id, None)
+        self._waiters.pop(task_id, None)
+        if future is None or future.done():
+            return False
+
+        future.set_result(result)
+        self.resolved_count += 1
+        return True
+
+    async def notify(self, task_id: str, state: str, **fields) -> dict[str, Any]:
+        """Record a terminal state, waking local waiters and other processes"""
+        result = completion_payload(task_id, state, **fields)
+        self.resolve(task_id, result)
+
+        if self.redis is not None:
+            try:
+                payload = json.dumps(result, default=str)
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.setex(completion_key(task_id), RESULT_TTL, payload)
+                pipe.publish(self.channel, payload)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to publish completion for task {task_id}: {e}")
+
+        return result
+
+    def get_result(self, task_id: str) -> dict[str, Any] | None:
+        """Terminal result if the task finished recently in view of this process"""
+        return self._recent.get(task_id)
+
+    async def wait(self, task_id: str, timeout: float) -> dict[str, Any] | None:
+        """
+        Wait for a task to reach a terminal state.
+
+        Returns the completion payload, or None if ``timeout`` elapsed first.
+        Costs at most one Redis read per call, none while waiting.
+        """
+        result = self._recent.get(task_id)
+        if result is not None:
+            return result
+
+        future = self._futures.get(task_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[task_id] = future
+        self._waiters[task_id] = self._waiters.get(task_id, 0) + 1
+
+        try:
+            # The task may have finished before the future existed
+            if self.redis is not None and not future.done():
+                stored = await self._fetch_stored(task_id)
+                if stored is not None:
+                    self.resolve(task_id, stored)
+
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            return None
+        finally:
+            remaining = self._waiters.get(task_id, 0) - 1
+            if remaining > 0:
+                self._waiters[task_id] = remaining
+            elif self._futures.get(task_id) is future:
+                # Nobody is waiting any more
+                self._waiters.pop(task_id, None)
+                self._futures.pop(task_id, None)
+
+    async def _fetch_stored(self, task_id: str) -> dict[str, Any] | None:
+        try:
+            data = await self.redis.get(completion_key(task_id))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.debug(f"Could not read stored completion for task {task_id}: {e}")
+            return None
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get waiter statistics"""
+        return {
+            'listening': self.is_running(),
+            'pending_tasks': len(self._futures),
+            'waiters': sum(self._waiters.values()),
+            'resolved': self.resolved_count,
+            'notifications_received': self.notifications_received,
+            'timeouts': self.timeouts
+        }
+
+
+# Global instance
+task_completions = TaskCompletionRegistry()
@@ -3,17 +3,30 @@ Custom Autoscaler for Function Runner Workers
 
 Implements intelligent scaling based on queue depth, resource availability,
 and worker performance metrics.
+
+Queue depth is read straight from the Redis broker (one pipelined round trip
+of LLENs per tick) and scaling targets are derived from the observed arrival
+and service rates rather than from instantaneous thresholds.
 """
 
 import logging
+import math
 import time
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 
 import psutil
 from celery.worker.autoscale import Autoscaler
 
+from app.redis_client import get_redis_client
+from app.worker.queues import QUEUE_CONFIGS
+
 logger = logging.getLogger(__name__)
 
+# Kombu's Redis transport stores prioritised messages in one list per priority
+# step: the base queue name for step 0 and ``<queue>\x06\x16<step>`` otherwise.
+PRIORITY_STEPS = (0, 3, 6, 9)
+PRIORITY_SEP = '\x06\x16'
+
 
 class FunctionRunnerAutoscaler(Autoscaler):
     """
@@ -21,9 +34,9 @@ class FunctionRunnerAutoscaler(Autoscaler):
     when scaling workers.
     """
 
-    def __init__(self, pool, max_concurrency, min_concurrency=0, 
+    def __init__(self, pool, max_concurrency, min_concurrency=0, worker=None,
                  keepalive=30, mutex=None):
-        super().__init__(pool, max_concurrency, min_concurrency, keepalive, mutex)
+        super().__init__(pool, max_concurrency, min_concurrency, worker, keepalive, mutex)
         
         # Scaling configuration
         self.scale_up_threshold = 2.0  # Scale up when queue depth > processes * threshold
@@ -37,6 +50,18 @@ class FunctionRunnerAutoscaler(Autoscaler):
         self.metrics_history = []
         self.max_history_size = 100
         
+        # Predictive scaling configuration
+        self.target_latency = 30.0  # Seconds within which the current backlog should drain
+        self.rate_smoothing = 0.3  # EWMA weight for newly observed rates
+        self.per_process_service_rate: Optional[float] = None  # Tasks/s one process completes
+        
+        # Broker access for queue depth and completion counts
+        self.redis = get_redis_client().redis
+        self.queue_names = self._resolve_queue_names()
+        
+        # Prime psutil so later non-blocking samples measure the interval between ticks
+        psutil.cpu_percent(interval=None)
+        
         logger.info(f"FunctionRunnerAutoscaler initialized: min={min_concurrency}, max={max_concurrency}")
 
     def scale(self):
@@ -63,6 +88,8 @@ class FunctionRunnerAutoscaler(Autoscaler):
             if len(self.metrics_history) > self.max_history_size:
                 self.metrics_history.pop(0)
             
+            self._update_service_rate()
+            
             # Determine scaling action
             scaling_decision = self._make_scaling_decision(metrics)
             
@@ -76,49 +103,74 @@ class FunctionRunnerAutoscaler(Autoscaler):
         except Exception as e:
             logger.error(f"Error in autoscaler: {e}")
 
-    def _collect_metrics(self) -> Dict[str, Any]:
-        """Collect comprehensive metrics for scaling decisions"""
-        inspector = self.pool.app.control.inspect()
+    def _resolve_queue_names(self) -> List[str]:
+        """Names of the queues whose backlog this pool drains"""
+        try:
+            queues = self.pool.app.conf.task_queues or []
+            names = [queue.name for queue in queues if queue.name != 'dlq']
+            if names:
+                return names
+        except Exception:
+            pass
+        return [name for name in QUEUE_CONFIGS if name != 'dlq']
+
+    def _read_broker_counters(self, since: Optional[float]) -> Tuple[Dict[str, int], int]:
+        """
+        Read per-queue depths and completions since ``since`` in one pipeline.
+        
+        Returns a ``(queue_depths, completed)`` tuple. Completions come from the
+        ``queue_completion:<queue>`` sorted sets maintained by the queue monitor.
+        """
+        if self.redis is None:
+            return {}, 0
         
-        # Get queue information
-        active_queues = inspector.active_queues() or {}
-        reserved_tasks = inspector.reserved() or {}
-        scheduled_tasks = inspector.scheduled() or {}
+        pipe = self.redis.pipeline(transaction=False)
+        for queue_name in self.queue_names:
+            for step in PRIORITY_STEPS:
+                pipe.llen(queue_name if step == 0 else f"{queue_name}{PRIORITY_SEP}{step}")
+        if since is not None:
+            for queue_name in self.queue_names:
+                pipe.zcount(f"queue_completion:{queue_name}", f"({since}", '+inf')
+        results = pipe.execute()
         
-        # Calculate queue depths
-        total_queue_depth = 0
         queue_depths = {}
+        steps = len(PRIORITY_STEPS)
+        for i, queue_name in enumerate(self.queue_names):
+            queue_depths[queue_name] = sum(int(n or 0) for n in results[i * steps:(i + 1) * steps])
+        completed = sum(int(n or 0) for n in results[len(self.queue_names) * steps:])
+        return queue_depths, completed
+
+    def _collect_metrics(self) -> Dict[str, Any]:
+        """Collect comprehensive metrics for scaling decisions"""
+        now = time.time()
+        previous = self.metrics_history[-1] if self.metrics_history else None
         
-        for worker, queues in active_queues.items():
-            for queue_info in queues:
-                queue_name = queue_info['name']
-                # In a real implementation, we'd query the broker for actual queue depth
-                # For now, we estimate based on reserved + scheduled tasks
-                reserved_count = len(reserved_tasks.get(worker, []))
-                scheduled_count = len(scheduled_tasks.get(worker, []))
-                queue_depth = reserved_count + scheduled_count
-                
-                queue_depths[queue_name] = queue_depths.get(queue_name, 0) + queue_depth
-                total_queue_depth += queue_depth
+        try:
+            queue_depths, completed = self._read_broker_counters(
+                previous['timestamp'] if previous else None
+            )
+        except Exception as e:
+            logger.warning(f"Could not read queue depths from broker: {e}")
+            queue_depths, completed = {}, 0
         
-        # Get resource utilization
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Non-blocking: utilisation since the previous call
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         
         # Get current worker count
         current_processes = len(self.pool._pool)
         
         metrics = {
-            'timestamp': time.time(),
-            'total_queue_depth': total_queue_depth,
+            'timestamp': now,
+            'total_queue_depth': sum(queue_depths.values()),
             'queue_depths': queue_depths,
+            'completed_tasks': completed,
+            'interval': now - previous['timestamp'] if previous else 0.0,
             'current_processes': current_processes,
             'cpu_percent': cpu_percent,
             'memory_percent': memory.percent,
             'memory_available_gb': memory.available / (1024**3),
             'load_average': psutil.getloadavg()[0] if hasattr(psutil, 'getloadavg') else 0,
-            'active_tasks': sum(len(tasks) for tasks in reserved_tasks.values()),
-            'scheduled_tasks': sum(len(tasks) for tasks in scheduled_tasks.values()),
         }
         
         # Add GPU metrics if available
@@ -132,6 +184,45 @@ class FunctionRunnerAutoscaler(Autoscaler):
         logger.debug(f"Collected metrics: {metrics}")
         return metrics
 
+    def _update_service_rate(self):
+        """
+        Refresh the per-process service rate estimate from the latest interval.
+        
+        Only intervals that started with a backlog are used: otherwise idle
+        processes would drag the estimate down and make the pool look slow.
+        """
+        if len(self.metrics_history) < 2:
+            return
+        
+        previous, latest = self.metrics_history[-2], self.metrics_history[-1]
+        interval = latest['interval']
+        processes = previous['current_processes']
+        if interval <= 0 or processes <= 0 or previous['total_queue_depth'] == 0:
+            return
+        if latest['completed_tasks'] == 0:
+            return
+        
+        observed = latest['completed_tasks'] / interval / processes
+        if self.per_process_service_rate is None:
+            self.per_process_service_rate = observed
+        else:
+            self.per_process_service_rate = (
+                self.rate_smoothing * observed
+                + (1 - self.rate_smoothing) * self.per_process_service_rate
+            )
+
+    def _required_processes(self, queue_depth: int, trend_info: Dict[str, Any]) -> Optional[int]:
+        """
+        Processes needed to keep up with arrivals and drain the backlog within
+        ``target_latency``, or None while no service rate has been observed.
+        """
+        if not self.per_process_service_rate:
+            return None
+        
+        demand = trend_info['arrival_rate'] + queue_depth / self.target_latency
+        required = math.ceil(demand / self.per_process_service_rate)
+        return max(self.min_concurrency, min(self.max_concurrency, required))
+
     def _make_scaling_decision(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Make intelligent scaling decision based on metrics"""
         current_processes = metrics['current_processes']
@@ -150,8 +241,14 @@ class FunctionRunnerAutoscaler(Autoscaler):
         
         # Analyze trends
         trend_info = self._analyze_trends()
+        required_processes = self._required_processes(queue_depth, trend_info)
         
-        # Scale up conditions
+        if required_processes is not None:
+            return self._predictive_decision(
+                current_processes, required_processes, resource_constrained, trend_info
+            )
+        
+        # No service rate observed yet: fall back to queue pressure thresholds
         if (queue_pressure > self.scale_up_threshold and 
             current_processes < self.max_concurrency and
             not resource_constrained):
@@ -204,10 +301,56 @@ class FunctionRunnerAutoscaler(Autoscaler):
             'reason': ', '.join(reason_parts) if reason_parts else 'conditions not met'
         }
 
+    def _predictive_decision(self, current_processes: int, required_processes: int,
+                             resource_constrained: bool,
+                             trend_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Scale towards the process count implied by arrival and service rates"""
+        rates = (
+            f"arrival {trend_info['arrival_rate']:.2f}/s, "
+            f"service {self.per_process_service_rate:.2f}/s per process"
+        )
+        
+        if required_processes > current_processes and not resource_constrained:
+            return {
+                'action': 'scale_up',
+                'target_processes': required_processes,
+                'current_processes': current_processes,
+                'reason': f'{required_processes} processes needed to drain backlog within '
+                          f'{self.target_latency:.0f}s ({rates})'
+            }
+        
+        if required_processes < current_processes and trend_info['sustained_low_load']:
+            return {
+                'action': 'scale_down',
+                'target_processes': required_processes,
+                'current_processes': current_processes,
+                'reason': f'Only {required_processes} processes needed ({rates}), sustained low load'
+            }
+        
+        if required_processes > current_processes:
+            reason = f'resource constrained, {required_processes} processes needed ({rates})'
+        elif required_processes < current_processes:
+            reason = f'load not sustained, {required_processes} processes needed ({rates})'
+        else:
+            reason = f'capacity matches demand ({rates})'
+        
+        return {
+            'action': 'none',
+            'current_processes': current_processes,
+            'reason': reason
+        }
+
     def _analyze_trends(self) -> Dict[str, Any]:
         """Analyze recent metrics trends"""
+        arrival_rate, service_rate = self._estimate_rates(self.metrics_history[-5:])
+        
         if len(self.metrics_history) < 5:
-            return {'sustained_low_load': False, 'load_trend': 'insufficient_data'}
+            return {
+                'sustained_low_load': False,
+                'load_trend': 'insufficient_data',
+                'arrival_rate': arrival_rate,
+                'service_rate': service_rate
+            }
         
         # Look at recent queue pressures
         recent_metrics = self.metrics_history[-5:]
@@ -234,9 +377,32 @@ class FunctionRunnerAutoscaler(Autoscaler):
         return {
             'sustained_low_load': sustained_low_load,
             'load_trend': load_trend,
-            'recent_queue_pressures': queue_pressures
+            'recent_queue_pressures': queue_pressures,
+            'arrival_rate': arrival_rate,
+            'service_rate': service_rate
         }
 
+    @staticmethod
+    def _estimate_rates(window: List[Dict[str, Any]]) -> Tuple[float, float]:
+        """
+        Estimate ``(arrival_rate, service_rate)`` in tasks/s over a history window.
+        
+        Service rate is completions per second; arrival rate follows from
+        conservation: whatever was not served accumulated in the queue.
+        """
+        if len(window) < 2:
+            return 0.0, 0.0
+        
+        elapsed = window[-1]['timestamp'] - window[0]['timestamp']
+        if elapsed <= 0:
+            return 0.0, 0.0
+        
+        completed = sum(m['completed_tasks'] for m in window[1:])
+        service_rate = completed / elapsed
+        depth_change = window[-1]['total_queue_depth'] - window[0]['total_queue_depth']
+        arrival_rate = max(0.0, service_rate + depth_change / elapsed)
+        return arrival_rate, service_rate
+
     def _scale_up(self, decision: Dict[str, Any]):
         """Execute scale up action"""
         current = decision['current_processes']
@@ -291,6 +457,8 @@ class FunctionRunnerAutoscaler(Autoscaler):
             'current_processes': len(self.pool._pool),
             'scale_up_threshold': self.scale_up_threshold,
             'scale_down_threshold': self.scale_down_threshold,
+            'target_latency': self.target_latency,
+            'per_process_service_rate': self.per_process_service_rate,
             'last_scale_action': self.last_scale_action,
             'scale_cooldown': self.scale_cooldown,
             'metrics_history_size': len(self.metrics_history),
@@ -10,13 +10,16 @@ import logging
 from typing import Dict, Any
 
 from celery import Celery
-from celery.signals import task_failure, task_success, task_prerun, task_postrun
+from celery.signals import (
+    heartbeat_sent, task_failure, task_success, task_prerun, task_postrun, worker_ready
+)
 from kombu import Queue
 
 from app.config import settings
 from app.worker.queues import create_queues, task_router
 from app.worker.dead_letter_queue import get_dlq_handler
 from app.worker.queue_monitor import get_queue_monitor
+from app.worker.telemetry import get_telemetry_publisher, telemetry_aggregator
 from app.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
@@ -138,7 +141,26 @@ app.conf.update(WORKER_CONFIG)
 
 # Initialize additional components
 dlq_handler = get_dlq_handler(app, redis_client)
-queue_monitor = get_queue_monitor(app, redis_client)
+queue_monitor = get_queue_monitor(app, redis_client, telemetry=telemetry_aggregator)
+
+
+@worker_ready.connect
+def worker_ready_handler(sender=None, **kwargs):
+    """Report the models this worker serves to the telemetry stream"""
+    try:
+        models = [m.strip() for m in os.getenv('WORKER_MODELS', '').split(',') if m.strip()]
+        get_telemetry_publisher().models(loaded=models, failed=[], total_loading_time=0.0)
+    except Exception as e:
+        logger.warning(f"Error publishing worker model status: {e}")
+
+
+@heartbeat_sent.connect
+def heartbeat_sent_handler(sender=None, **kwargs):
+    """Push heartbeat and resource samples to the telemetry stream"""
+    try:
+        get_telemetry_publisher().heartbeat()
+    except Exception as e:
+        logger.warning(f"Error publishing worker heartbeat: {e}")
 
 
 @task_prerun.connect
@@ -149,6 +171,7 @@ def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=
         queue_name = getattr(task.request, 'delivery_info', {}).get('routing_key', 'unknown')
         if queue_name and hasattr(queue_monitor, 'record_task_started'):
             queue_monitor.record_task_started(queue_name, task_id)
+        get_telemetry_publisher().task_started(task_id, queue_name)
         
         logger.info(f"Task {task_id} ({task.name}) starting on queue {queue_name}")
     except Exception as e:
@@ -172,6 +195,9 @@ def task_postrun_handler(sender=None, task_id=None, task=None, args=None,
         
         if queue_name and hasattr(queue_monitor, 'record_task_completed'):
             queue_monitor.record_task_completed(queue_name, task_id, processing_time)
+        if state != 'FAILURE':
+            # Failures are published by the failure handler
+            get_telemetry_publisher().task_completed(task_id, queue_name, processing_time)
         
         logger.info(f"Task {task_id} completed in {processing_time:.2f}s")
     except Exception as e:
@@ -202,6 +228,7 @@ def task_failure_handler(sender=None, task_id=None, exception=None,
         # Record failure for monitoring
         if queue_name and hasattr(queue_monitor, 'record_task_failed'):
             queue_monitor.record_task_failed(queue_name, task_id, type(exception).__name__)
+        get_telemetry_publisher().task_failed(task_id, queue_name or 'unknown', type(exception).__name__)
         
         # Handle retry logic through DLQ
         if dlq_handler:
@@ -251,7 +251,7 @@ class DeadLetterQueueHandler:
             self.redis.setex(
                 f"retry_metadata:{new_task_id}",
                 delay + 3600,  # Keep metadata for 1 hour after retry
-                json.dumps(retry_metadata)
+                retry_metadata
             )
             
             # Schedule the retry
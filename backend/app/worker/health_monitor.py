@@ -9,6 +9,8 @@ import asyncio
 import logging
 import psutil
 import json
+import tempfile
+import time
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -17,6 +19,7 @@ from abc import ABC, abstractmethod
 
 from app.redis_client import get_redis_client
 from app.worker.pool_manager import worker_pool_manager
+from app.worker.telemetry import TelemetryAggregator, telemetry_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +83,115 @@ class TaskStats:
     throughput: float = 0.0  # tasks per minute
 
 
+# Compact status codes used in the stored health history
+STATUS_CODES = {
+    HealthStatus.HEALTHY: 0,
+    HealthStatus.WARNING: 1,
+    HealthStatus.CRITICAL: 2,
+    HealthStatus.UNKNOWN: 3,
+    HealthStatus.ERROR: 4,
+}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+# Fixed check order for history entries; one status code per position
+HISTORY_CHECKS = (
+    'heartbeat',
+    'resources',
+    'task_performance',
+    'queue_connection',
+    'model_loading',
+    'disk_space',
+)
+
+
+class HostSampler:
+    """
+    Host-level resource sampler shared by all worker checks.
+    
+    psutil, NVML and disk statistics describe the host rather than an
+    individual worker, so they are collected at most once per ``interval``
+    (off the event loop) and the same sample is handed to every check.
+    """
+    
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._sample: Optional[Dict[str, Any]] = None
+        self._sampled_at = 0.0
+        self._lock = asyncio.Lock()
+        self._nvml_handle = None
+        self._nvml_ready: Optional[bool] = None
+        
+        # Prime psutil so non-blocking samples measure the interval between calls
+        psutil.cpu_percent(interval=None)
+    
+    def _is_fresh(self) -> bool:
+        return self._sample is not None and time.monotonic() - self._sampled_at < self.interval
+    
+    async def get_sample(self) -> Dict[str, Any]:
+        """Return the current host sample, refreshing it at most once per interval"""
+        if self._is_fresh():
+            return self._sample
+        
+        async with self._lock:
+            if not self._is_fresh():
+                self._sample = await asyncio.to_thread(self._collect)
+                self._sampled_at = time.monotonic()
+        return self._sample
+    
+    def _gpu_handle(self):
+        """Initialise NVML once; later calls reuse the device handle"""
+        if self._nvml_ready is None:
+            try:
+                import pynvml
+                pynvml.nvmlInit()
+                if pynvml.nvmlDeviceGetCount() > 0:
+                    self._nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                self._nvml_ready = True
+            except Exception:
+                self._nvml_ready = False  # GPU monitoring not available
+        return self._nvml_handle
+    
+    def _collect(self) -> Dict[str, Any]:
+        """Take one blocking host sample"""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        temp_disk = psutil.disk_usage(tempfile.gettempdir())
+        net_io = psutil.net_io_counters()
+        process = psutil.Process()
+        
+        sample = {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': memory.percent,
+            'memory_mb': memory.used / (1024 * 1024),
+            'disk_usage_percent': disk.percent,
+            'disk_free_gb': disk.free / (1024 ** 3),
+            'temp_disk_percent': temp_disk.percent,
+            'temp_disk_free_gb': temp_disk.free / (1024 ** 3),
+            'network_sent_mb': net_io.bytes_sent / (1024 * 1024),
+            'network_recv_mb': net_io.bytes_recv / (1024 * 1024),
+            'open_files': len(process.open_files()),
+            'threads': process.num_threads(),
+            'gpu_memory_percent': None,
+            'gpu_utilization': None,
+        }
+        
+        handle = self._gpu_handle()
+        if handle is not None:
+            try:
+                import pynvml
+                mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                sample['gpu_memory_percent'] = (mem_info.used / mem_info.total) * 100
+                sample['gpu_utilization'] = pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+            except Exception:
+                pass
+        
+        return sample
+
+
+# Shared by every check in this process
+host_sampler = HostSampler()
+
+
 class HealthCheck(ABC):
     """Abstract base class for health checks"""
     
@@ -102,13 +214,22 @@ class HeartbeatCheck(HealthCheck):
     def name(self) -> str:
         return "heartbeat"
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional[TelemetryAggregator] = None):
         self.redis = get_redis_client()
+        self.telemetry = telemetry or telemetry_aggregator
     
     async def execute(self, worker_id: str) -> HealthCheckResult:
         """Check worker heartbeat"""
         try:
-            last_heartbeat = self.redis.get(f"worker:{worker_id}:heartbeat")
+            reported = self.telemetry.last_heartbeat(worker_id)
+            if reported is not None:
+                last_heartbeat = datetime.fromtimestamp(reported).isoformat()
+            else:
+                # Worker not on the telemetry stream yet; the client blocks,
+                # so read in a thread to keep checks concurrent and cancellable
+                last_heartbeat = await asyncio.to_thread(
+                    self.redis.get, f"worker:{worker_id}:heartbeat"
+                )
             
             if not last_heartbeat:
                 return HealthCheckResult(
@@ -172,57 +293,42 @@ class ResourceCheck(HealthCheck):
     def name(self) -> str:
         return "resources"
     
-    def __init__(self):
+    def __init__(self, sampler: Optional[HostSampler] = None,
+                 telemetry: Optional[TelemetryAggregator] = None):
         self.redis = get_redis_client()
+        self.sampler = sampler or host_sampler
+        self.telemetry = telemetry or telemetry_aggregator
     
     async def get_worker_metrics(self, worker_id: str) -> WorkerMetrics:
         """Get current resource metrics for worker"""
         try:
-            # Get process info from Redis (stored by worker)
-            metrics_data = self.redis.get(f"worker:{worker_id}:metrics")
+            # Latest sample pushed by the worker, else legacy metrics key
+            sample = self.telemetry.latest_metrics(worker_id)
+            if sample is not None:
+                metrics_data = {k: v for k, v in sample.items() if k != 'timestamp'}
+            else:
+                metrics_data = await asyncio.to_thread(
+                    self.redis.get, f"worker:{worker_id}:metrics"
+                )
             
             if metrics_data:
                 # Use reported metrics if available
                 return WorkerMetrics(**metrics_data)
             
-            # Fallback to local system metrics
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            # Network stats
-            net_io = psutil.net_io_counters()
-            net_sent_mb = net_io.bytes_sent / (1024 * 1024)
-            net_recv_mb = net_io.bytes_recv / (1024 * 1024)
-            
-            # GPU metrics (if available)
-            gpu_memory_percent = None
-            gpu_utilization = None
-            
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                device_count = pynvml.nvmlDeviceGetCount()
-                if device_count > 0:
-                    handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                    mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                    gpu_memory_percent = (mem_info.used / mem_info.total) * 100
-                    util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                    gpu_utilization = util.gpu
-            except Exception:
-                pass  # GPU monitoring not available
+            # Fallback to the shared host sample
+            sample = await self.sampler.get_sample()
             
             return WorkerMetrics(
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                memory_mb=memory.used / (1024 * 1024),
-                disk_usage_percent=disk.percent,
-                gpu_memory_percent=gpu_memory_percent,
-                gpu_utilization=gpu_utilization,
-                network_sent_mb=net_sent_mb,
-                network_recv_mb=net_recv_mb,
-                open_files=len(psutil.Process().open_files()),
-                threads=psutil.Process().num_threads()
+                cpu_percent=sample['cpu_percent'],
+                memory_percent=sample['memory_percent'],
+                memory_mb=sample['memory_mb'],
+                disk_usage_percent=sample['disk_usage_percent'],
+                gpu_memory_percent=sample['gpu_memory_percent'],
+                gpu_utilization=sample['gpu_utilization'],
+                network_sent_mb=sample['network_sent_mb'],
+                network_recv_mb=sample['network_recv_mb'],
+                open_files=sample['open_files'],
+                threads=sample['threads']
             )
             
         except Exception as e:
@@ -314,20 +420,33 @@ class TaskPerformanceCheck(HealthCheck):
     def name(self) -> str:
         return "task_performance"
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional[TelemetryAggregator] = None):
         self.redis = get_redis_client()
+        self.telemetry = telemetry or telemetry_aggregator
     
     async def get_task_stats(self, worker_id: str, window_minutes: int = 5) -> TaskStats:
         """Get task statistics for time window"""
         try:
             stats = TaskStats()
             
+            aggregated = self.telemetry.task_stats(worker_id, window_minutes * 60)
+            if aggregated is not None:
+                stats.completed = aggregated['completed']
+                stats.failed = aggregated['failed']
+                stats.in_progress = aggregated['in_progress']
+                stats.total_duration = aggregated['total_duration']
+                stats.total = stats.completed + stats.failed + stats.in_progress
+                if window_minutes > 0:
+                    stats.throughput = stats.completed / window_minutes
+                return stats
+            
             # Get task history from Redis
             cutoff_time = datetime.now() - timedelta(minutes=window_minutes)
             
             # Count completed tasks
             completed_key = f"worker:{worker_id}:completed_tasks"
-            completed_tasks = self.redis.zrangebyscore(
+            completed_tasks = await asyncio.to_thread(
+                self.redis.zrangebyscore,
                 completed_key,
                 cutoff_time.timestamp(),
                 '+inf',
@@ -347,12 +466,14 @@ class TaskPerformanceCheck(HealthCheck):
             
             # Count failed tasks
             failed_key = f"worker:{worker_id}:failed_tasks"
-            failed_count = self.redis.zcount(failed_key, cutoff_time.timestamp(), '+inf')
+            failed_count = await asyncio.to_thread(
+                self.redis.zcount, failed_key, cutoff_time.timestamp(), '+inf'
+            )
             stats.failed = failed_count
             
             # Get in-progress tasks
             in_progress_key = f"worker:{worker_id}:in_progress"
-            stats.in_progress = self.redis.scard(in_progress_key)
+            stats.in_progress = await asyncio.to_thread(self.redis.scard, in_progress_key)
             
             # Calculate totals
             stats.total = stats.completed + stats.failed + stats.in_progress
@@ -441,7 +562,7 @@ class QueueConnectionCheck(HealthCheck):
         """Check queue connection status"""
         try:
             # Check if worker is registered in active queues
-            worker_info = self.redis.get(f"worker:{worker_id}:info")
+            worker_info = await asyncio.to_thread(self.redis.get, f"worker:{worker_id}:info")
             
             if not worker_info:
                 return HealthCheckResult(
@@ -466,7 +587,7 @@ class QueueConnectionCheck(HealthCheck):
             queue_depths = {}
             
             for queue in assigned_queues:
-                depth = self.redis.llen(f"celery:{queue}")
+                depth = await asyncio.to_thread(self.redis.llen, f"celery:{queue}")
                 queue_depths[queue] = depth
                 total_tasks += depth
             
@@ -508,14 +629,19 @@ class ModelLoadingCheck(HealthCheck):
     def name(self) -> str:
         return "model_loading"
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional[TelemetryAggregator] = None):
         self.redis = get_redis_client()
+        self.telemetry = telemetry or telemetry_aggregator
     
     async def execute(self, worker_id: str) -> HealthCheckResult:
         """Check model loading status"""
         try:
             # Get model status from worker
-            model_status = self.redis.get(f"worker:{worker_id}:models")
+            model_status = self.telemetry.model_status(worker_id)
+            if model_status is None:
+                model_status = await asyncio.to_thread(
+                    self.redis.get, f"worker:{worker_id}:models"
+                )
             
             if not model_status:
                 return HealthCheckResult(
@@ -574,17 +700,17 @@ class DiskSpaceCheck(HealthCheck):
     def name(self) -> str:
         return "disk_space"
     
+    def __init__(self, sampler: Optional[HostSampler] = None):
+        self.sampler = sampler or host_sampler
+    
     async def execute(self, worker_id: str) -> HealthCheckResult:
         """Check disk space"""
         try:
-            # Check main disk
-            disk = psutil.disk_usage('/')
-            free_gb = disk.free / (1024 ** 3)
+            sample = await self.sampler.get_sample()
             
-            # Check temp directory
-            import tempfile
-            temp_disk = psutil.disk_usage(tempfile.gettempdir())
-            temp_free_gb = temp_disk.free / (1024 ** 3)
+            # Main disk and temp directory
+            free_gb = sample['disk_free_gb']
+            temp_free_gb = sample['temp_disk_free_gb']
             
             issues = []
             status = HealthStatus.HEALTHY
@@ -614,9 +740,9 @@ class DiskSpaceCheck(HealthCheck):
                 message=message,
                 metrics={
                     "main_disk_free_gb": round(free_gb, 2),
-                    "main_disk_percent": disk.percent,
+                    "main_disk_percent": sample['disk_usage_percent'],
                     "temp_disk_free_gb": round(temp_free_gb, 2),
-                    "temp_disk_percent": temp_disk.percent
+                    "temp_disk_percent": sample['temp_disk_percent']
                 }
             )
             
@@ -633,16 +759,20 @@ class DiskSpaceCheck(HealthCheck):
 class WorkerHealthMonitor:
     """Comprehensive health monitoring for function runners"""
     
-    def __init__(self, check_interval: int = 30):
+    def __init__(self, check_interval: int = 30, check_timeout: float = 10.0):
         self.check_interval = check_interval
+        self.check_timeout = check_timeout
         self.redis = get_redis_client()
+        
+        # Host-level samples are taken once per interval and shared by all workers
+        self.sampler = HostSampler(interval=min(check_interval, 5))
         self.health_checks = [
             HeartbeatCheck(),
-            ResourceCheck(),
+            ResourceCheck(self.sampler),
             TaskPerformanceCheck(),
             QueueConnectionCheck(),
             ModelLoadingCheck(),
-            DiskSpaceCheck()
+            DiskSpaceCheck(self.sampler)
         ]
         self.monitoring_tasks = {}
         self.health_cache = {}
@@ -708,23 +838,31 @@ class WorkerHealthMonitor:
                 await asyncio.sleep(self.check_interval)
     
     async def run_health_checks(self, worker_id: str) -> List[HealthCheckResult]:
-        """Execute all health checks for a worker"""
-        results = []
-        
-        for check in self.health_checks:
-            try:
-                result = await check.execute(worker_id)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Health check {check.name} failed for {worker_id}: {e}")
-                results.append(HealthCheckResult(
-                    check_name=check.name,
-                    status=HealthStatus.ERROR,
-                    message=f"Check failed: {str(e)}",
-                    metrics={}
-                ))
-        
-        return results
+        """Execute all health checks for a worker concurrently"""
+        return list(await asyncio.gather(
+            *(self._run_check(check, worker_id) for check in self.health_checks)
+        ))
+    
+    async def _run_check(self, check: HealthCheck, worker_id: str) -> HealthCheckResult:
+        """Run a single check under the per-check timeout"""
+        try:
+            return await asyncio.wait_for(check.execute(worker_id), timeout=self.check_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Health check {check.name} timed out for {worker_id}")
+            return HealthCheckResult(
+                check_name=check.name,
+                status=HealthStatus.ERROR,
+                message=f"Check timed out after {self.check_timeout}s",
+                metrics={}
+            )
+        except Exception as e:
+            logger.error(f"Health check {check.name} failed for {worker_id}: {e}")
+            return HealthCheckResult(
+                check_name=check.name,
+                status=HealthStatus.ERROR,
+                message=f"Check failed: {str(e)}",
+                metrics={}
+            )
     
     def calculate_health_score(self, results: List[HealthCheckResult]) -> float:
         """Calculate overall health score (0.0 to 1.0)"""
@@ -783,11 +921,12 @@ class WorkerHealthMonitor:
                 health_data
             )
             
-            # Add to time series for history
+            # Add a compact numeric entry to the history time series
+            timestamp = datetime.now().timestamp()
             history_key = f"worker:{worker_id}:health_history"
             self.redis.zadd(
                 history_key,
-                {json.dumps(health_data): datetime.now().timestamp()}
+                {self.encode_history_entry(timestamp, health_score, results): timestamp}
             )
             
             # Trim old history (keep 7 days)
@@ -876,6 +1015,40 @@ class WorkerHealthMonitor:
         
         return health_summary
     
+    @staticmethod
+    def encode_history_entry(timestamp: float, health_score: float,
+                             results: List[HealthCheckResult]) -> str:
+        """
+        Encode a health sample as ``<timestamp>:<score>:<codes>``.
+        
+        ``codes`` holds one status code per entry of HISTORY_CHECKS, with
+        ``-`` for checks that did not report.
+        """
+        statuses = {r.check_name: r.status for r in results}
+        codes = ''.join(
+            str(STATUS_CODES[statuses[name]]) if name in statuses else '-'
+            for name in HISTORY_CHECKS
+        )
+        return f"{timestamp:.3f}:{health_score:.3f}:{codes}"
+    
+    @staticmethod
+    def decode_history_entry(entry: str) -> dict:
+        """Decode a history entry into the health data shape"""
+        if entry.startswith('{'):
+            # Entries written before the compact format was introduced
+            return json.loads(entry)
+        
+        timestamp, score, codes = entry.split(':')
+        return {
+            'timestamp': datetime.fromtimestamp(float(timestamp)).isoformat(),
+            'health_score': float(score),
+            'checks': [
+                {'check_name': name, 'status': CODE_STATUSES[int(code)].value}
+                for name, code in zip(HISTORY_CHECKS, codes)
+                if code != '-'
+            ]
+        }
+    
     async def get_health_history(self, worker_id: str, hours: int = 24) -> List[dict]:
         """Get historical health data"""
         try:
@@ -888,7 +1061,7 @@ class WorkerHealthMonitor:
                 '+inf'
             )
             
-            return [json.loads(data) for data in history_data]
+            return [self.decode_history_entry(data) for data in history_data]
             
         except Exception as e:
             logger.error(f"Failed to get health history: {e}")
@@ -15,6 +15,7 @@ from prometheus_client import (
 )
 
 from app.worker.health_monitor import HealthCheckResult, HealthStatus
+from app.worker.telemetry import TelemetryAggregator
 
 logger = logging.getLogger(__name__)
 
@@ -374,6 +375,20 @@ class MetricsCollector:
                     queue_name=queue_name
                 ).set(metrics['processing_rate'])
     
+    def update_from_telemetry(self, aggregator: TelemetryAggregator):
+        """Refresh per-worker gauges from the in-memory telemetry aggregate"""
+        for worker_id in aggregator.worker_ids():
+            sample = aggregator.latest_metrics(worker_id)
+            if sample:
+                self._update_resource_metrics(worker_id, sample)
+            
+            stats = aggregator.task_stats(worker_id, window_seconds=300)
+            if stats:
+                self.task_in_progress_gauge.labels(
+                    worker_id=worker_id,
+                    task_type="all"
+                ).set(stats['in_progress'])
+    
     def generate_metrics(self) -> bytes:
         """Generate metrics in Prometheus format"""
         return generate_latest(self.registry)
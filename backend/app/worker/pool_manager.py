@@ -18,6 +18,7 @@ from pydantic import BaseModel
 
 from app.config import settings
 from app.redis_client import redis_client
+from app.worker.telemetry import telemetry_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -564,6 +565,11 @@ class HealthChecker:
         if not worker:
             return False
 
+        # Prefer the heartbeat the worker pushed to the telemetry stream
+        reported = telemetry_aggregator.last_heartbeat(worker_id)
+        if reported is not None:
+            worker.last_heartbeat = datetime.fromtimestamp(reported)
+
         # Check heartbeat
         if worker.last_heartbeat:
             heartbeat_age = (datetime.now() - worker.last_heartbeat).total_seconds()
@@ -580,8 +586,9 @@ class HealthChecker:
                 await self._handle_unhealthy_worker(worker_id, "high_error_rate")
                 return False
 
-        # Update heartbeat
-        worker.last_heartbeat = datetime.now()
+        # Without telemetry the check itself stands in for the heartbeat
+        if reported is None:
+            worker.last_heartbeat = datetime.now()
         return True
 
     async def _handle_unhealthy_worker(self, worker_id: str, reason: str):
@@ -0,0 +1,226 @@
+"""
+Worker-side Progress Publisher
+
+Publishes task progress from synchronous Celery workers over a pooled Redis
+connection. Updates are buffered, coalesced per task and sent in a single
+pipeline, so high-frequency step updates cost one round trip per flush rather
+than an event loop and two publishes per tick. Terminal statuses also
+publish a completion notification so API-side waiters wake without polling.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+import redis
+from prometheus_client import Histogram
+
+from app.config import settings
+from app.services.task_completion import RESULT_TTL, completion_key, completion_payload
+
+logger = logging.getLogger(__name__)
+
+
+PUBLISH_LATENCY = Histogram(
+    'auteur_progress_publish_seconds',
+    'Latency of flushing buffered progress updates to Redis',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+# Statuses after which no further updates are expected for a task
+TERMINAL_STATUSES = {'completed', 'failed', 'cancelled'}
+
+
+class ProgressPublisher:
+    """
+    Batches and pipelines progress publishes for one worker process.
+
+    Step updates for a task arriving faster than ``min_interval`` are
+    coalesced: only the latest one is kept and sent with the next flush.
+    A trailing timer flushes it once the interval has passed, so a task that
+    goes quiet still publishes its last update. Stage boundaries
+    (``flush=True``) and terminal statuses always flush.
+    """
+
+    def __init__(self, redis_url: str | None = None, min_interval: float = 0.25):
+        self.redis_url = redis_url or settings.redis_url
+        self.min_interval = min_interval
+        self.progress_channel = settings.redis_progress_channel
+        self.completion_channel = settings.redis_completion_channel
+
+        self._pool: redis.ConnectionPool | None = None
+        self._client: redis.Redis | None = None
+        self._lock = threading.Lock()
+
+        # task_id -> list of (channel, payload) waiting for the next flush
+        self._pending: dict[str, list[tuple[str, str]]] = {}
+        # task_id -> completion payload for tasks that reached a terminal status
+        self._completions: dict[str, str] = {}
+        self._last_flush: dict[str, float] = {}
+        # Trailing-edge flush for updates coalesced inside min_interval
+        self._timer: threading.Timer | None = None
+
+        # Publish statistics
+        self.flush_count = 0
+        self.message_count = 0
+        self.coalesced_count = 0
+        self.error_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def client(self) -> redis.Redis:
+        """Lazily created client backed by a per-process connection pool"""
+        if self._client is None:
+            self._pool = redis.ConnectionPool.from_url(self.redis_url, max_connections=4)
+            self._client = redis.Redis(connection_pool=self._pool)
+        return self._client
+
+    def report(self, task_id: str, project_id: str | None, progress: float,
+               message: str, status: str = 'running', flush: bool = False, **kwargs):
+        """Queue a progress update and flush it when due"""
+        progress_data = {
+            'task_id': task_id,
+            'progress': progress,
+            'message': message,
+            'status': status,
+            'timestamp': datetime.utcnow().isoformat(),
+            **kwargs
+        }
+
+        messages = []
+        if project_id:
+            messages.append((
+                self.progress_channel,
+                json.dumps({
+                    'project_id': project_id,
+                    'task_id': task_id,
+                    'type': 'progress',
+                    **progress_data
+                })
+            ))
+        # Also publish to task-specific channel
+        messages.append((f"task:progress:{task_id}", json.dumps(progress_data)))
+
+        completion = None
+        if status in TERMINAL_STATUSES:
+            completion = json.dumps(completion_payload(
+                task_id,
+                status,
+                message=message,
+                outputs=kwargs.get('result') or {},
+                error_message=kwargs.get('error')
+            ), default=str)
+
+        now = time.monotonic()
+        with self._lock:
+            if task_id in self._pending:
+                self.coalesced_count += 1
+            self._pending[task_id] = messages
+            if completion is not None:
+                self._completions[task_id] = completion
+
+            elapsed = now - self._last_flush.get(task_id, 0.0)
+            if not (flush or elapsed >= self.min_interval or status in TERMINAL_STATUSES):
+                self._schedule_flush(self.min_interval - elapsed)
+                return
+
+        self.flush()
+
+        if status in TERMINAL_STATUSES:
+            with self._lock:
+                self._last_flush.pop(task_id, None)
+
+    def _schedule_flush(self, delay: float):
+        """Start the trailing-edge flush timer unless one is already waiting"""
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Send every pending update in a single pipeline"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            completions, self._completions = self._completions, {}
+            now = time.monotonic()
+            for task_id in pending:
+                # Finished tasks send nothing more, including on a retried flush
+                if task_id not in completions:
+                    self._last_flush[task_id] = now
+
+        start = time.perf_counter()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            count = 0
+            for messages in pending.values():
+                for channel, payload in messages:
+                    pipe.publish(channel, payload)
+                    count += 1
+            for task_id, payload in completions.items():
+                pipe.setex(completion_key(task_id), RESULT_TTL, payload)
+                pipe.publish(self.completion_channel, payload)
+                count += 1
+            pipe.execute()
+        except Exception as e:
+            self.error_count += 1
+            logger.warning(f"Failed to publish progress updates: {e}")
+            with self._lock:
+                # Keep the batch for the next flush; newer updates win
+                pending.update(self._pending)
+                self._pending = pending
+                completions.update(self._completions)
+                self._completions = completions
+                self._schedule_flush(self.min_interval)
+            return
+
+        latency = time.perf_counter() - start
+        PUBLISH_LATENCY.observe(latency)
+        self.flush_count += 1
+        self.message_count += count
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get publish statistics for this worker process"""
+        return {
+            'flushes': self.flush_count,
+            'messages': self.message_count,
+            'coalesced': self.coalesced_count,
+            'errors': self.error_count,
+            'pending_tasks': len(self._pending),
+            'avg_latency_ms': (self.total_latency / self.flush_count * 1000) if self.flush_count else 0.0,
+            'max_latency_ms': self.max_latency * 1000
+        }
+
+    def close(self):
+        """Flush outstanding updates and release the connection pool"""
+        self.flush()
+        if self._pool is not None:
+            self._pool.disconnect()
+        self._pool = None
+        self._client = None
+
+
+# Global instance, one per worker process
+_publisher: ProgressPublisher | None = None
+_publisher_pid: int | None = None
+
+
+def get_progress_publisher() -> ProgressPublisher:
+    """Get the publisher for the current process, recreating it after a fork"""
+    global _publisher, _publisher_pid
+    pid = os.getpid()
+    if _publisher is None or _publisher_pid != pid:
+        _publisher = ProgressPublisher()
+        _publisher_pid = pid
+    return _publisher
@@ -15,6 +15,8 @@ from redis import Redis
 from celery import Celery
 from celery.events.state import State
 
+from app.worker.telemetry import TelemetryAggregator
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,9 +58,12 @@ class QueueMonitor:
     }
     
     def __init__(self, app: Celery, redis_client: Redis, 
-                 alert_callback: Optional[Callable] = None):
+                 alert_callback: Optional[Callable] = None,
+                 telemetry: Optional[TelemetryAggregator] = None):
         self.app = app
         self.redis = redis_client
+        # When the telemetry aggregate is running, rates come from memory
+        self.telemetry = telemetry
         self.alert_callback = alert_callback or self._default_alert_handler
         self.alert_configs = self.DEFAULT_ALERT_CONFIGS.copy()
         self.last_alerts = {}  # Track last alert times for cooldown
@@ -163,8 +168,18 @@ class QueueMonitor:
             timestamp=timestamp
         )
     
+    def _telemetry_stats(self, queue_name: str, window: str) -> Optional[Dict[str, Any]]:
+        """Queue stats from the telemetry aggregate, if it is being fed"""
+        if self.telemetry is None or not self.telemetry.is_running:
+            return None
+        return self.telemetry.queue_stats(queue_name, self.rate_windows[window])
+    
     async def _calculate_processing_rate(self, queue_name: str, window: str) -> float:
         """Calculate task processing rate (tasks started per second)"""
+        stats = self._telemetry_stats(queue_name, window)
+        if stats is not None:
+            return stats['started'] / self.rate_windows[window]
+        
         try:
             window_seconds = self.rate_windows[window]
             key = f"queue_processing:{queue_name}"
@@ -188,6 +203,10 @@ class QueueMonitor:
     
     async def _calculate_completion_rate(self, queue_name: str, window: str) -> float:
         """Calculate task completion rate (tasks completed per second)"""
+        stats = self._telemetry_stats(queue_name, window)
+        if stats is not None:
+            return stats['completed'] / self.rate_windows[window]
+        
         try:
             window_seconds = self.rate_windows[window]
             key = f"queue_completion:{queue_name}"
@@ -208,6 +227,11 @@ class QueueMonitor:
     
     async def _calculate_error_rate(self, queue_name: str, window: str) -> float:
         """Calculate error rate as percentage of failed tasks"""
+        stats = self._telemetry_stats(queue_name, window)
+        if stats is not None:
+            total = stats['completed'] + stats['failed']
+            return (stats['failed'] / total) * 100.0 if total else 0.0
+        
         try:
             window_seconds = self.rate_windows[window]
             
@@ -237,6 +261,10 @@ class QueueMonitor:
     
     async def _calculate_avg_processing_time(self, queue_name: str, window: str) -> float:
         """Calculate average task processing time in seconds"""
+        stats = self._telemetry_stats(queue_name, window)
+        if stats is not None:
+            return stats['total_duration'] / stats['completed'] if stats['completed'] else 0.0
+        
         try:
             window_seconds = self.rate_windows[window]
             key = f"queue_processing_times:{queue_name}"
@@ -381,7 +409,7 @@ class QueueMonitor:
             
             # Store in Redis with TTL
             key = f"queue_metrics:{minute_key}"
-            self.redis.setex(key, 86400 * 7, json.dumps(metrics_data))  # Keep for 7 days
+            self.redis.setex(key, 86400 * 7, metrics_data)  # Keep for 7 days
             
         except Exception as e:
             logger.error(f"Error storing metrics: {e}")
@@ -443,16 +471,11 @@ class QueueMonitor:
                 minute_key = current_time.strftime('%Y-%m-%d:%H:%M')
                 key = f"queue_metrics:{minute_key}"
                 
-                data = self.redis.get(key)
-                if data:
-                    try:
-                        all_metrics = json.loads(data)
-                        if queue_name in all_metrics:
-                            metric_data = all_metrics[queue_name]
-                            metric_data['timestamp'] = current_time.isoformat()
-                            metrics.append(metric_data)
-                    except json.JSONDecodeError:
-                        continue
+                all_metrics = self.redis.get(key)
+                if isinstance(all_metrics, dict) and queue_name in all_metrics:
+                    metric_data = all_metrics[queue_name]
+                    metric_data['timestamp'] = current_time.isoformat()
+                    metrics.append(metric_data)
                 
                 current_time += timedelta(minutes=1)
             
@@ -502,9 +525,10 @@ queue_monitor = None
 
 
 def get_queue_monitor(app: Celery, redis_client: Redis, 
-                     alert_callback: Optional[Callable] = None) -> QueueMonitor:
+                     alert_callback: Optional[Callable] = None,
+                     telemetry: Optional[TelemetryAggregator] = None) -> QueueMonitor:
     """Get or create queue monitor instance"""
     global queue_monitor
     if queue_monitor is None:
-        queue_monitor = QueueMonitor(app, redis_client, alert_callback)
+        queue_monitor = QueueMonitor(app, redis_client, alert_callback, telemetry)
     return queue_monitor
\ No newline at end of file
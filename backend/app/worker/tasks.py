@@ -5,7 +5,6 @@ Defines tasks that can be executed by different worker types with proper
 resource allocation and progress tracking.
 """
 
-import asyncio
 import json
 import logging
 import time
@@ -17,7 +16,7 @@ from celery import current_task
 from celery.exceptions import Retry
 
 from app.worker.celery_config import app
-from app.redis_client import redis_client
+from app.worker.progress_publisher import get_progress_publisher
 
 logger = logging.getLogger(__name__)
 
@@ -28,27 +27,23 @@ class TaskProgressReporter:
     def __init__(self, task_id: str, project_id: Optional[str] = None):
         self.task_id = task_id
         self.project_id = project_id
+        self.publisher = get_progress_publisher()
     
-    async def report(self, progress: float, message: str, **kwargs):
-        """Report task progress"""
-        progress_data = {
-            'task_id': self.task_id,
-            'progress': progress,
-            'message': message,
-            'timestamp': datetime.utcnow().isoformat(),
+    def report(self, progress: float, message: str, flush: bool = False, **kwargs):
+        """
+        Report task progress
+        
+        Step updates are rate-limited by the worker's publisher; pass
+        ``flush=True`` at stage boundaries to publish immediately.
+        """
+        self.publisher.report(
+            self.task_id,
+            self.project_id,
+            progress=progress,
+            message=message,
+            flush=flush,
             **kwargs
-        }
-        
-        if self.project_id:
-            await redis_client.publish_progress(
-                self.project_id, 
-                self.task_id, 
-                progress_data
-            )
-        
-        # Also publish to task-specific channel
-        channel = f"task:progress:{self.task_id}"
-        await redis_client.publish(channel, json.dumps(progress_data))
+        )
 
 
 @app.task(bind=True, name='function_runner.execute_generation')
@@ -77,12 +72,15 @@ def execute_generation(self, task_payload: Dict[str, Any]):
     logger.info(f"Starting generation task {task_id} for {node_type} using {pipeline_id}")
     
     # Create progress reporter
-    async def report_progress(progress: float, message: str, status: str = "running", **kwargs):
-        reporter = TaskProgressReporter(task_id, project_id)
-        await reporter.report(
+    reporter = TaskProgressReporter(task_id, project_id)
+    
+    def report_progress(progress: float, message: str, status: str = "running",
+                        flush: bool = True, **kwargs):
+        reporter.report(
             progress=progress,
             message=message,
             status=status,
+            flush=flush,
             node_id=node_id,
             pipeline_id=pipeline_id,
             **kwargs
@@ -104,9 +102,9 @@ def execute_generation(self, task_payload: Dict[str, Any]):
             (95, "Cleaning up resources"),
         ]
         
-        # Execute stages with progress reporting
+        # Execute stages with progress reporting, flushing at each stage boundary
         for progress, message in stages:
-            asyncio.run(report_progress(progress, message))
+            report_progress(progress, message)
             
             # Simulate processing time based on stage
             if "generation algorithm" in message.lower():
@@ -140,12 +138,12 @@ def execute_generation(self, task_payload: Dict[str, Any]):
             json.dump(result_data, f, indent=2)
         
         # Report successful completion
-        asyncio.run(report_progress(
+        report_progress(
             100, 
             "Generation completed successfully", 
             status="completed",
             result=result_data
-        ))
+        )
         
         logger.info(f"Generation task {task_id} completed successfully")
         return result_data
@@ -155,12 +153,12 @@ def execute_generation(self, task_payload: Dict[str, Any]):
         logger.error(f"Generation task {task_id} failed: {error_msg}")
         
         # Report failure
-        asyncio.run(report_progress(
+        report_progress(
             0, 
             f"Generation failed: {error_msg}", 
             status="failed",
             error=error_msg
-        ))
+        )
         
         raise
 
@@ -251,7 +249,8 @@ def health_check(self):
                 'memory_percent': psutil.virtual_memory().percent,
                 'disk_percent': psutil.disk_usage('/').percent,
                 'load_average': psutil.getloadavg()[0] if hasattr(psutil, 'getloadavg') else 0
-            }
+            },
+            'progress_publisher': get_progress_publisher().get_stats()
         }
         
         logger.debug(f"Health check completed for worker {worker_hostname}")
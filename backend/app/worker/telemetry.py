@@ -0,0 +1,370 @@
+"""
+Worker Telemetry Pipeline
+
+Workers push compact heartbeat, resource, task and model samples to a single
+Redis Stream. Every API process reads the whole stream with XREAD and folds
+the samples into in-memory rolling windows per worker and per queue. Health
+checks, queue monitoring, resource monitoring and the Prometheus collector
+read from that aggregate instead of polling ``worker:<id>:*`` keys, so a
+monitoring cycle costs one XREAD regardless of fleet size.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+TELEMETRY_STREAM = "worker:telemetry"
+STREAM_MAXLEN = 100000
+
+# Sample kinds
+HEARTBEAT = "hb"
+METRICS = "m"
+TASK = "t"
+MODELS = "mdl"
+
+# Short stream field names for resource samples -> WorkerMetrics field names
+METRIC_FIELDS = {
+    'cpu': 'cpu_percent',
+    'mem': 'memory_percent',
+    'mem_mb': 'memory_mb',
+    'disk': 'disk_usage_percent',
+    'gpu_mem': 'gpu_memory_percent',
+    'gpu_util': 'gpu_utilization',
+    'net_tx': 'network_sent_mb',
+    'net_rx': 'network_recv_mb',
+    'files': 'open_files',
+    'threads': 'threads',
+}
+
+
+class TelemetryPublisher:
+    """
+    Worker-side publisher of telemetry samples.
+
+    Uses the worker's synchronous Redis connection. Resource samples are
+    throttled to ``metrics_interval`` seconds and repeat the last model
+    report, so API processes started later still learn it; heartbeats and
+    task events are sent as they happen.
+    """
+
+    def __init__(self, redis_client=None, worker_id: str | None = None,
+                 metrics_interval: float = 5.0):
+        self._redis = redis_client
+        self.worker_id = worker_id or os.getenv('WORKER_ID') or socket.gethostname()
+        self.metrics_interval = metrics_interval
+        self._last_metrics = 0.0
+        self._models: dict[str, Any] | None = None
+
+        # Prime psutil so later non-blocking samples are meaningful
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            from app.redis_client import get_redis_client
+            self._redis = get_redis_client().redis
+        return self._redis
+
+    def _send(self, kind: str, fields: dict[str, Any]):
+        if self.redis is None:
+            return
+        sample = {'w': self.worker_id, 'k': kind, 't': f"{time.time():.3f}"}
+        sample.update({k: v for k, v in fields.items() if v is not None})
+        try:
+            self.redis.xadd(TELEMETRY_STREAM, sample, maxlen=STREAM_MAXLEN, approximate=True)
+        except Exception as e:
+            logger.debug(f"Failed to publish telemetry sample: {e}")
+
+    def heartbeat(self):
+        """Publish a heartbeat, with a resource sample when one is due"""
+        self._send(HEARTBEAT, {})
+
+        now = time.monotonic()
+        if now - self._last_metrics >= self.metrics_interval:
+            self._last_metrics = now
+            self._send(METRICS, self._sample_resources())
+            if self._models is not None:
+                self._send(MODELS, self._models)
+
+    def task_started(self, task_id: str, queue_name: str):
+        self._send(TASK, {'task': task_id, 'q': queue_name, 's': 'started'})
+
+    def task_completed(self, task_id: str, queue_name: str, duration: float):
+        self._send(TASK, {'task': task_id, 'q': queue_name, 's': 'completed',
+                          'd': f"{duration:.3f}"})
+
+    def task_failed(self, task_id: str, queue_name: str, error_type: str):
+        self._send(TASK, {'task': task_id, 'q': queue_name, 's': 'failed', 'e': error_type})
+
+    def models(self, loaded: list[str], failed: list[str], total_loading_time: float):
+        self._models = {
+            'loaded': ','.join(loaded),
+            'failed': ','.join(failed),
+            'load_s': f"{total_loading_time:.2f}",
+        }
+        self._send(MODELS, self._models)
+
+    def _sample_resources(self) -> dict[str, Any]:
+        """Take a non-blocking resource sample of this worker"""
+        memory = psutil.virtual_memory()
+        net_io = psutil.net_io_counters()
+        process = psutil.Process()
+        return {
+            'cpu': psutil.cpu_percent(interval=None),
+            'mem': memory.percent,
+            'mem_mb': f"{memory.used / (1024 * 1024):.1f}",
+            'disk': psutil.disk_usage('/').percent,
+            'net_tx': f"{net_io.bytes_sent / (1024 * 1024):.1f}",
+            'net_rx': f"{net_io.bytes_recv / (1024 * 1024):.1f}",
+            'files': len(process.open_files()),
+            'threads': process.num_threads(),
+        }
+
+
+@dataclass
+class WorkerTelemetry:
+    """Rolling telemetry window for one worker"""
+    worker_id: str
+    last_heartbeat: float | None = None
+    metrics: deque[dict[str, float]] = field(default_factory=lambda: deque(maxlen=120))
+    # (timestamp, queue, status, duration)
+    task_events: deque[tuple[float, str, str, float]] = field(
+        default_factory=lambda: deque(maxlen=5000)
+    )
+    in_progress: set[str] = field(default_factory=set)
+    models: dict[str, Any] | None = None
+
+
+class TelemetryAggregator:
+    """
+    API-side consumer of the telemetry stream.
+
+    Each process reads the full stream with XREAD, starting ``window_seconds``
+    back so a fresh process rebuilds its windows, and keeps per-worker and
+    per-queue rolling windows in memory; all read methods are served from
+    memory. Workers silent for longer than the window are pruned.
+    """
+
+    def __init__(self, batch_size: int = 500, block_ms: int = 1000,
+                 window_seconds: int = 3600, prune_interval: float = 60.0):
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.window_seconds = window_seconds
+        self.prune_interval = prune_interval
+
+        self.workers: dict[str, WorkerTelemetry] = {}
+        # queue -> (timestamp, status, duration)
+        self.queue_events: dict[str, deque[tuple[float, str, float]]] = defaultdict(
+            lambda: deque(maxlen=20000)
+        )
+
+        self.redis = None
+        self._task: asyncio.Task | None = None
+        self._last_id = '$'
+        self._last_prune = 0.0
+        self.samples_ingested = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, redis):
+        """Start consuming from the beginning of the rolling window"""
+        if self.is_running:
+            return
+
+        self.redis = redis
+        # Stream IDs start with their millisecond timestamp
+        self._last_id = f"{int((time.time() - self.window_seconds) * 1000)}-0"
+        self._last_prune = time.monotonic()
+
+        self._task = asyncio.create_task(self._consume_loop())
+        logger.info("Worker telemetry aggregator started")
+
+    async def stop(self):
+        """Stop consuming"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("Worker telemetry aggregator stopped")
+
+    async def _consume_loop(self):
+        while True:
+            try:
+                response = await self.redis.xread(
+                    {TELEMETRY_STREAM: self._last_id},
+                    count=self.batch_size,
+                    block=self.block_ms
+                )
+                for _stream, entries in response or []:
+                    if entries:
+                        self.ingest(entries)
+                        self._last_id = entries[-1][0]
+
+                now = time.monotonic()
+                if now - self._last_prune >= self.prune_interval:
+                    self._last_prune = now
+                    self.prune()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error consuming worker telemetry: {e}")
+                await asyncio.sleep(1)
+
+    def ingest(self, entries: list[tuple[str, dict[str, str]]]):
+        """Fold a batch of stream entries into the rolling windows"""
+        for _entry_id, sample in entries:
+            try:
+                self._ingest_sample(sample)
+                self.samples_ingested += 1
+            except Exception as e:
+                logger.debug(f"Skipping malformed telemetry sample {sample}: {e}")
+
+    def _ingest_sample(self, sample: dict[str, str]):
+        worker = self._worker(sample['w'])
+        timestamp = float(sample['t'])
+        kind = sample['k']
+
+        # Every sample proves the worker is alive
+        if worker.last_heartbeat is None or timestamp > worker.last_heartbeat:
+            worker.last_heartbeat = timestamp
+
+        if kind == METRICS:
+            metrics = {'timestamp': timestamp}
+            for short_name, name in METRIC_FIELDS.items():
+                if short_name in sample:
+                    metrics[name] = float(sample[short_name])
+            worker.metrics.append(metrics)
+
+        elif kind == TASK:
+            task_id, queue_name, status = sample['task'], sample.get('q', 'unknown'), sample['s']
+            duration = float(sample.get('d', 0.0))
+            if status == 'started':
+                worker.in_progress.add(task_id)
+            else:
+                worker.in_progress.discard(task_id)
+            worker.task_events.append((timestamp, queue_name, status, duration))
+            self.queue_events[queue_name].append((timestamp, status, duration))
+
+        elif kind == MODELS:
+            worker.models = {
+                'loaded': [m for m in sample.get('loaded', '').split(',') if m],
+                'failed': [m for m in sample.get('failed', '').split(',') if m],
+                'total_loading_time': float(sample.get('load_s', 0.0)),
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+            }
+
+    def _worker(self, worker_id: str) -> WorkerTelemetry:
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            worker = self.workers[worker_id] = WorkerTelemetry(worker_id)
+        return worker
+
+    def has_worker(self, worker_id: str) -> bool:
+        return worker_id in self.workers
+
+    def worker_ids(self) -> list[str]:
+        return list(self.workers)
+
+    def last_heartbeat(self, worker_id: str) -> float | None:
+        """Timestamp of the last sample received from a worker"""
+        worker = self.workers.get(worker_id)
+        return worker.last_heartbeat if worker else None
+
+    def latest_metrics(self, worker_id: str) -> dict[str, float] | None:
+        """Most recent resource sample for a worker"""
+        worker = self.workers.get(worker_id)
+        if worker and worker.metrics:
+            return worker.metrics[-1]
+        return None
+
+    def model_status(self, worker_id: str) -> dict[str, Any] | None:
+        worker = self.workers.get(worker_id)
+        return worker.models if worker else None
+
+    def task_stats(self, worker_id: str, window_seconds: float) -> dict[str, Any] | None:
+        """Completed/failed counts and total duration over a window for a worker"""
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            return None
+
+        completed, failed, total_duration = self._summarise(
+            ((ts, status, duration) for ts, _queue, status, duration in reversed(worker.task_events)),
+            window_seconds
+        )
+        return {
+            'completed': completed,
+            'failed': failed,
+            'in_progress': len(worker.in_progress),
+            'total_duration': total_duration,
+        }
+
+    def queue_stats(self, queue_name: str, window_seconds: float) -> dict[str, Any]:
+        """Started/completed/failed counts and total duration over a window for a queue"""
+        events = self.queue_events.get(queue_name, deque())
+        cutoff = time.time() - window_seconds
+        started = 0
+        for ts, status, _duration in reversed(events):
+            if ts < cutoff:
+                break
+            if status == 'started':
+                started += 1
+
+        completed, failed, total_duration = self._summarise(reversed(events), window_seconds)
+        return {
+            'started': started,
+            'completed': completed,
+            'failed': failed,
+            'total_duration': total_duration,
+        }
+
+    @staticmethod
+    def _summarise(newest_first, window_seconds: float) -> tuple[int, int, float]:
+        # Events arrive roughly in time order, so stop at the first one outside the window
+        cutoff = time.time() - window_seconds
+        completed = failed = 0
+        total_duration = 0.0
+        for ts, status, duration in newest_first:
+            if ts < cutoff:
+                break
+            if status == 'completed':
+                completed += 1
+                total_duration += duration
+            elif status == 'failed':
+                failed += 1
+        return completed, failed, total_duration
+
+    def prune(self, max_age_seconds: float | None = None):
+        """Forget workers that have not reported within ``max_age_seconds``"""
+        cutoff = time.time() - (max_age_seconds or self.window_seconds)
+        for worker_id in [w for w, t in self.workers.items()
+                          if (t.last_heartbeat or 0) < cutoff]:
+            del self.workers[worker_id]
+
+
+# Global instances
+telemetry_aggregator = TelemetryAggregator()
+_telemetry_publisher: TelemetryPublisher | None = None
+
+
+def get_telemetry_publisher() -> TelemetryPublisher:
+    """Get or create the worker-side telemetry publisher"""
+    global _telemetry_publisher
+    if _telemetry_publisher is None:
+        _telemetry_publisher = TelemetryPublisher()
+    return _telemetry_publisher
@@ -0,0 +1,142 @@
+"""
+Benchmark Redis operations spent by tasks waiting for completion.
+
+Compares the previous fixed-interval status polling with the per-task
+completion futures. Durations are scaled down (tasks run 0.2-0.5s, polling
+every 50ms) to keep the run short; the ratio is what matters.
+Run with ``pytest -m performance -s``.
+"""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from app.services.task_completion import TaskCompletionRegistry, completion_key
+
+TASKS = 200
+POLL_INTERVAL = 0.05
+
+
+class CountingRedis:
+    """In-memory Redis stand-in that counts commands"""
+
+    def __init__(self):
+        self.ops = 0
+        self.data = {}
+        self.channels = []
+
+    async def get(self, key):
+        self.ops += 1
+        return self.data.get(key)
+
+    def pipeline(self, transaction=False):
+        return CountingPipeline(self)
+
+    def pubsub(self):
+        pubsub = CountingPubSub()
+        self.channels.append(pubsub)
+        return pubsub
+
+
+class CountingPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(('setex', key, value))
+
+    def publish(self, channel, payload):
+        self.commands.append(('publish', channel, payload))
+
+    async def execute(self):
+        self.redis.ops += len(self.commands)
+        for command, key, value in self.commands:
+            if command == 'setex':
+                self.redis.data[key] = value
+            else:
+                for pubsub in self.redis.channels:
+                    pubsub.queue.put_nowait({'type': 'message', 'data': value})
+        return [True] * len(self.commands)
+
+
+class CountingPubSub:
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        pass
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def close(self):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+async def _finish(publisher, task_id, duration):
+    """Worker side: run the task, then store and publish its completion"""
+    await asyncio.sleep(duration)
+    pipe = publisher.redis.pipeline()
+    payload = json.dumps({'task_id': task_id, 'state': 'completed'})
+    pipe.setex(completion_key(task_id), 3600, payload)
+    pipe.publish(publisher.channel, payload)
+    await pipe.execute()
+
+
+async def _poll(redis, task_id):
+    """Previous behaviour: read status until it is terminal"""
+    while True:
+        if await redis.get(completion_key(task_id)):
+            return
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def _run(mode):
+    random.seed(7)
+    redis = CountingRedis()
+    publisher = TaskCompletionRegistry()
+    publisher.redis = redis
+
+    waiter = TaskCompletionRegistry()
+    if mode == 'futures':
+        await waiter.start(redis)
+
+    durations = [random.uniform(0.2, 0.5) for _ in range(TASKS)]
+    workers = [
+        asyncio.create_task(_finish(publisher, f"task-{i}", d))
+        for i, d in enumerate(durations)
+    ]
+    worker_ops_before_wait = redis.ops
+
+    if mode == 'futures':
+        waits = [waiter.wait(f"task-{i}", timeout=5) for i in range(TASKS)]
+    else:
+        waits = [_poll(redis, f"task-{i}") for i in range(TASKS)]
+    await asyncio.gather(*waits)
+    await asyncio.gather(*workers)
+    await waiter.stop()
+
+    # Exclude the worker's own setex + publish per task
+    return (redis.ops - worker_ops_before_wait - 2 * TASKS) / TASKS
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_redis_ops_per_waiting_task():
+    polling = await _run('polling')
+    futures = await _run('futures')
+
+    print(f"\nRedis ops per waiting task: polling={polling:.1f} futures={futures:.1f}")
+
+    # One existence check per waiter, nothing while parked on the future
+    assert futures <= 1.0
+    assert polling > 4 * futures
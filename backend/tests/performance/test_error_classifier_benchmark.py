@@ -0,0 +1,65 @@
+"""
+Microbenchmark for error classification during an incident storm.
+
+Classifies a stream of repeating errors whose messages differ only in
+numbers and paths, comparing the old per-pattern ``re.search`` loop with
+the compiled alternation, cold and with the template cache warm.
+Run with ``pytest -m performance -s``.
+"""
+
+import re
+import time
+
+import pytest
+
+from app.error_handling.classifier import ErrorClassifier
+from app.error_handling.models import ErrorCategory
+
+ERRORS = 20000
+
+
+def _storm():
+    templates = [
+        lambda i: RuntimeError(f"CUDA out of memory. Tried to allocate {i % 512} MiB on /dev/gpu{i % 4}"),
+        lambda i: RuntimeError(f"Read timeout after {i % 30}.5s from comfyui:{8000 + i % 8}"),
+        lambda i: RuntimeError(f"Model not found: /models/checkpoints/sdxl_{i % 20}.safetensors"),
+        lambda i: RuntimeError(f"Worker {i} exited with status {i % 3}"),
+    ]
+    return [templates[i % len(templates)](i) for i in range(ERRORS)]
+
+
+def _legacy_category(error: Exception):
+    error_str = str(error).lower()
+    for category, config in ErrorClassifier.ERROR_CATEGORIES.items():
+        for pattern in config['patterns']:
+            if re.search(pattern, error_str, re.IGNORECASE):
+                return category
+    return None
+
+
+def _rate(func, errors) -> float:
+    started = time.perf_counter()
+    for error in errors:
+        func(error)
+    return len(errors) / (time.perf_counter() - started)
+
+
+@pytest.mark.performance
+def test_classification_throughput():
+    errors = _storm()
+    classifier = ErrorClassifier()
+
+    legacy = _rate(_legacy_category, errors)
+    # Category resolution alone, without the cache and the result model
+    uncached = _rate(lambda e: classifier._match_category(type(e).__name__, str(e).lower()), errors)
+    cached = _rate(lambda e: classifier._resolve_category(type(e).__name__, str(e)), errors)
+    full = _rate(classifier.classify_error, errors)
+
+    print(f"\n{ERRORS} errors, classifications/s: legacy loop {legacy:,.0f}, "
+          f"compiled {uncached:,.0f}, cached {cached:,.0f}, "
+          f"full classify_error {full:,.0f}")
+    print(f"cache: {classifier.get_cache_stats()}")
+
+    assert [_legacy_category(e) or ErrorCategory.UNKNOWN for e in errors[:8]] == \
+        [classifier.classify_error(e).category for e in errors[:8]]
+    assert cached > legacy
@@ -0,0 +1,58 @@
+"""
+Benchmark multi-GPU gang allocation on a synthetic cluster.
+
+Runs a random allocate/release mix against 64 fake devices in NUMA groups of
+eight, so the scheduler can be exercised without GPUs.
+Run with ``pytest -m performance -s``.
+"""
+
+import random
+import time
+
+import pytest
+
+from app.resources import FakeDeviceProvider, GPUAffinity, GPUResourceManager
+
+DEVICES = 64
+GROUP_SIZE = 8
+OPERATIONS = 5000
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_gang_allocation_throughput():
+    random.seed(11)
+    manager = GPUResourceManager(
+        provider=FakeDeviceProvider.uniform(DEVICES, memory_gb=80.0, group_size=GROUP_SIZE)
+    )
+    await manager.start()
+
+    live = []
+    placed = rejected = 0
+    start = time.perf_counter()
+    for i in range(OPERATIONS):
+        if live and (random.random() < 0.45 or len(live) > 40):
+            await manager.release_task_gpus(live.pop(random.randrange(len(live))))
+            continue
+
+        task_id = f"task-{i}"
+        devices = await manager.allocate_multi_gpu(
+            count=random.choice([1, 2, 4, 8]),
+            memory_per_gpu_gb=random.choice([8.0, 16.0, 40.0]),
+            task_id=task_id,
+            affinity=random.choice(list(GPUAffinity))
+        )
+        if devices:
+            live.append(task_id)
+            placed += 1
+        else:
+            rejected += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{OPERATIONS / elapsed:,.0f} ops/sec ({placed} placed, {rejected} rejected)")
+
+    # Every reservation is accounted to a live task
+    reserved = sum(a.memory_gb for a in manager.allocations.values())
+    recorded = sum(manager.get_task_allocation(t).memory_gb for t in live)
+    assert reserved == pytest.approx(recorded)
+    assert all(a.memory_gb <= 80.0 for a in manager.allocations.values())
@@ -0,0 +1,45 @@
+"""
+Benchmark worker placement with the deterministic simulation harness.
+
+Replays the same seeded burst workload with every built-in strategy and with
+an exhaustive best-fit that scores every fitting worker, which is what each
+placement cost before the capacity index.
+Run with ``pytest -m performance -s``.
+"""
+
+import pytest
+
+from app.resources import AllocationStrategy, PlacementSimulator, SimulationWorkload
+from app.resources.placement import BestFitStrategy
+
+WORKERS = 500
+TASKS = 10000
+
+
+class ExhaustiveBestFit(BestFitStrategy):
+    """Best fit over every fitting worker, in registration order"""
+    tightest_first = None
+    candidate_limit = None
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_placement_strategies():
+    workload = SimulationWorkload.generate(seed=1, workers=WORKERS, tasks=TASKS)
+    simulator = PlacementSimulator(workload, custom_strategies={"exhaustive_best_fit": ExhaustiveBestFit()})
+
+    reports = {report.strategy: report.to_dict() for report in await simulator.compare()}
+
+    print(f"\n{WORKERS} workers, {TASKS} tasks")
+    for name, summary in reports.items():
+        print(
+            f"{name:>20}: {summary['per_task_latency_us']:7.1f} us/task  "
+            f"placed={summary['placed']:5d}  cpu={summary['cpu_utilization']:.1%}  "
+            f"fragmentation={summary['fragmentation']:.1%}"
+        )
+
+    indexed = reports[AllocationStrategy.BEST_FIT.value]
+    exhaustive = reports["exhaustive_best_fit"]
+    assert indexed["per_task_latency_us"] < exhaustive["per_task_latency_us"]
+    # Bounding the scan must not cost placements
+    assert indexed["placed"] >= exhaustive["placed"] * 0.99
@@ -0,0 +1,53 @@
+"""
+Benchmark impact estimation against a large execution history.
+
+Estimates used to scan every stored execution and re-sort their durations;
+they now read one pre-computed aggregate per key from the SQLite store.
+Run with ``pytest -m performance -s``.
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from app.quality.impact import HistoricalDataStore, TaskExecution
+
+EXECUTIONS = 20000
+KEYS = 200
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_aggregate_lookup_vs_insert(tmp_path):
+    store = HistoricalDataStore(tmp_path / "history.sqlite3", max_executions=EXECUTIONS)
+    try:
+        started = time.perf_counter()
+        for i in range(EXECUTIONS):
+            await store.add_execution(TaskExecution(
+                template_id=f"template-{i % KEYS}",
+                preset_id="standard",
+                input_hash=f"input-{i % 7}",
+                duration=float(i % 90),
+                resource_usage={"vram_gb": float(i % 12)},
+                output_metrics={},
+                timestamp=datetime.now()
+            ))
+        insert = (time.perf_counter() - started) / EXECUTIONS
+
+        started = time.perf_counter()
+        for i in range(EXECUTIONS):
+            aggregate = store.get_aggregate(f"template-{i % KEYS}", "standard")
+        lookup = (time.perf_counter() - started) / EXECUTIONS
+
+        started = time.perf_counter()
+        for i in range(1000):
+            await store.find_similar(f"template-{i % KEYS}", "standard", "input-0", limit=3)
+        similar = (time.perf_counter() - started) / 1000
+
+        print(f"\n{EXECUTIONS} executions: insert {insert * 1e6:.1f} us, "
+              f"aggregate lookup {lookup * 1e6:.2f} us, find_similar {similar * 1e6:.1f} us")
+        assert aggregate.count == EXECUTIONS // KEYS
+        assert lookup < insert
+    finally:
+        store.close()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark for Redis state encodings.
+
+Reports stored bytes and CPU time per write for a progress blob with logs and
+a worker health snapshot, comparing the legacy JSON text with each codec.
+Run with ``pytest -m performance -s``.
+"""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from app.redis_codec import RedisCodec, orjson, zstandard
+
+ITERATIONS = 500
+
+
+def _progress_blob(log_entries: int = 300) -> dict:
+    return {
+        'task_id': 'task-0001',
+        'template_id': 'flux_image_generation',
+        'status': 'executing',
+        'current_stage': 2,
+        'total_stages': 4,
+        'overall_progress': 57.5,
+        'stages': {
+            str(i): {
+                'name': name, 'status': 'in_progress', 'progress': 0.5,
+                'message': f'{name} running', 'metadata': {'quality': 'standard'}
+            }
+            for i, name in enumerate(['preparation', 'model_loading', 'generation', 'finalization'])
+        },
+        'resource_usage': {'gpu_memory_mb': 11264.0, 'cpu_percent': 37.5},
+        'logs': [
+            {
+                'timestamp': datetime(2024, 1, 1, 12, 0, i % 60).isoformat(),
+                'level': 'info',
+                'message': f"Stage 'generation' step {i} of {log_entries}",
+                'stage': 2,
+                'metadata': {'progress': i / log_entries}
+            }
+            for i in range(log_entries)
+        ],
+        'created_at': datetime(2024, 1, 1, 12, 0, 0).isoformat(),
+    }
+
+
+def _health_snapshot() -> dict:
+    return {
+        'worker_id': 'worker-gpu-01',
+        'health_score': 0.87,
+        'timestamp': datetime(2024, 1, 1, 12, 0, 0).isoformat(),
+        'checks': [
+            {
+                'check_name': name, 'status': 'healthy', 'message': f'{name} ok',
+                'metrics': {'value': 42.0, 'threshold': 90.0},
+                'timestamp': datetime(2024, 1, 1, 12, 0, 0).isoformat()
+            }
+            for name in ['heartbeat', 'resources', 'task_performance', 'worker_connectivity',
+                         'model_loading', 'disk_space']
+        ]
+    }
+
+
+def _measure(encode, value):
+    size = len(encode(value))
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        encode(value)
+    return size, (time.process_time() - start) / ITERATIONS * 1e6
+
+
+def _encoders():
+    encoders = {'legacy json': lambda v: json.dumps(v).encode()}
+    serializers = ['msgpack', 'json'] + (['orjson'] if orjson is not None else [])
+    for serializer in serializers:
+        encoders[serializer] = RedisCodec(serializer=serializer).encode
+        if zstandard is not None:
+            encoders[f'{serializer}+zstd'] = RedisCodec(
+                serializer=serializer, compression='zstd'
+            ).encode
+    return encoders
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('name,value', [
+    ('progress blob', _progress_blob()),
+    ('health snapshot', _health_snapshot()),
+])
+def test_codec_bytes_and_cpu_per_write(name, value):
+    results = {label: _measure(encode, value) for label, encode in _encoders().items()}
+
+    print(f"\n{name}:")
+    for label, (size, cpu_us) in results.items():
+        print(f"  {label:<14} {size:>7} bytes  {cpu_us:>8.1f} us CPU/write")
+
+    legacy_size = results['legacy json'][0]
+    assert results['msgpack'][0] < legacy_size
+    if zstandard is not None and legacy_size > 2048:
+        assert results['msgpack+zstd'][0] < legacy_size / 4
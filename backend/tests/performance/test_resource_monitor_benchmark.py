@@ -0,0 +1,69 @@
+"""
+Benchmark resource collection and prediction.
+
+Collection used to block on a 0.1s CPU sample per worker (5s per round for
+50 workers); it now takes one non-blocking host sample per round. Prediction
+reads streaming quantiles instead of re-sorting the history.
+Run with ``pytest -m performance -s``.
+"""
+
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+
+from app.resources import ResourceMapper, ResourceMetrics, ResourceMonitor, ResourceSpec
+
+WORKERS = 50
+SAMPLES = 20000
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_collection_round_time():
+    mapper = ResourceMapper()
+    for i in range(WORKERS):
+        await mapper.register_worker(f"worker-{i}", ResourceSpec(cpu_cores=4.0, memory_gb=16.0, disk_gb=0.0))
+        await mapper.allocate(f"worker-{i}", ResourceSpec(cpu_cores=1.0, memory_gb=2.0, disk_gb=0.0), f"image_gen-{i}")
+
+    monitor = ResourceMonitor(mapper)
+    if not monitor._psutil_available:
+        pytest.skip("psutil not installed")
+
+    await monitor.collect_once()
+    started = time.perf_counter()
+    rounds = 20
+    for _ in range(rounds):
+        metrics = await monitor.collect_once()
+    per_round = (time.perf_counter() - started) / rounds
+
+    print(f"\n{WORKERS} workers: {per_round * 1000:.2f} ms per collection "
+          f"(previously >= {WORKERS * 0.1:.1f}s of blocking CPU sampling)")
+    assert len(metrics) == WORKERS
+    assert per_round < 0.5
+
+
+@pytest.mark.performance
+def test_prediction_cost_per_sample():
+    monitor = ResourceMonitor(ResourceMapper())
+    values = []
+
+    started = time.perf_counter()
+    for i in range(SAMPLES):
+        usage = ResourceMetrics(
+            timestamp=datetime.now(), worker_id="w", cpu_percent=float(i % 100),
+            memory_used_gb=float(i % 16), memory_percent=50.0, io_read_mbps=float(i % 40)
+        )
+        monitor.record_task_usage("image_generation", usage)
+        values.append(usage.cpu_percent)
+    streaming = (time.perf_counter() - started) / SAMPLES
+
+    started = time.perf_counter()
+    for i in range(0, SAMPLES, 100):
+        statistics.quantiles(values[:i + 2], n=10)
+    resort = (time.perf_counter() - started) / (SAMPLES / 100)
+
+    print(f"\nstreaming profile update: {streaming * 1e6:.1f} us/sample, "
+          f"re-sorting the history: {resort * 1e6:.1f} us/prediction")
+    assert len(monitor.task_history["image_generation"]) <= 500
@@ -8,6 +8,7 @@ import asyncio
 import tempfile
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 from app.services.agent_integration import (
     AgentIntegrationBridge, AgentRole, TaskType, 
@@ -15,12 +16,42 @@ from app.services.agent_integration import (
 )
 from app.services.asset_registry import AssetRegistry
 from app.models.generative_shotlist import (
-    GenerativeShotList, GenerativeShot, ShotType, ShotRequirements,
+    GenerativeShotList, GenerativeShot, SequenceStructure, ShotType, ShotRequirements,
     ShotComposition, ShotLighting, ShotAudio, ShotTiming
 )
 from app.models.asset_types import AssetType, PropAsset, WardrobeAsset, AssetReference
 
 
+def _shot(shot_id: str, description: str = "Wide shot of the harbour") -> GenerativeShot:
+    return GenerativeShot(
+        shot_id=shot_id,
+        shot_number=shot_id,
+        shot_type=ShotType.WIDE,
+        shot_description=description,
+        shot_synopsis="Establishing the setting",
+        composition=ShotComposition(
+            shot_type=ShotType.WIDE,
+            shot_angle="eye_level",
+            camera_movement="static"
+        ),
+        lighting=ShotLighting(
+            lighting_setup="natural",
+            color_grade_style="cool"
+        ),
+        audio=ShotAudio(
+            audio_design="atmospheric",
+            primary_source="ambient"
+        ),
+        requirements=ShotRequirements(
+            mood="calm",
+            tone="quiet",
+            visual_style="cinematic wide"
+        ),
+        generative_prompt={"prompt_text": description},
+        timing=ShotTiming(estimated_duration=5.0)
+    )
+
+
 class TestAgentIntegrationBridge:
     """Test the Agent Integration Bridge functionality."""
     
@@ -292,6 +323,69 @@ class TestAgentIntegrationBridge:
         assert dramaturg_rec.confidence_score > 0.0
         assert "scene_notes" in dramaturg_rec.recommendation_data
     
+    @pytest.mark.asyncio
+    async def test_recommendations_are_memoised_per_shot(self, bridge):
+        """Test only edited shots are re-analysed on a second run."""
+        shot_list = GenerativeShotList(project_id="memo", project_name="Memo")
+        shot_list.add_sequence(SequenceStructure(
+            sequence_id="seq-001",
+            sequence_name="Harbour",
+            sequence_description="Harbour at dawn",
+            shots=[_shot(f"memo-{i}") for i in range(4)]
+        ))
+        roles = [AgentRole.DRAMATURG, AgentRole.PROP_MASTER]
+        
+        with patch.object(bridge, "_generate_shot_recommendation",
+                          wraps=bridge._generate_shot_recommendation) as generate:
+            first = await bridge.generate_shot_recommendations(shot_list, roles)
+            assert generate.await_count == 8
+            
+            shot_list.get_shot_by_id("memo-2").shot_description = "Wide shot of the harbour in a storm"
+            second = await bridge.generate_shot_recommendations(shot_list, roles)
+            assert generate.await_count == 10
+        
+        assert [rec.metadata["shot_id"] for rec in second["dramaturg"]] == [f"memo-{i}" for i in range(4)]
+        assert second["dramaturg"][0] is first["dramaturg"][0]
+        assert second["prop_master"][2] is not first["prop_master"][2]
+        assert "storm" in second["prop_master"][2].metadata["scene_context"]
+    
+    @pytest.mark.asyncio
+    async def test_recommendations_register_assets_in_one_batch(self, bridge, asset_registry):
+        """Test accepted recommendations are written with a single registry call."""
+        recommendations = [
+            AgentRecommendation(
+                recommendation_id=f"batch-{i}",
+                agent_role=AgentRole.PROP_MASTER,
+                task_id="",
+                asset_type=AssetType.PROP,
+                recommendation_data={
+                    "name": f"Lantern {i}",
+                    "description": "Oil lantern",
+                    "category": "functional"
+                },
+                confidence_score=0.9 if i < 3 else 0.4,
+                reasoning="Harbour at night",
+                metadata={}
+            )
+            for i in range(4)
+        ]
+        
+        with patch.object(asset_registry, "register_assets",
+                          wraps=asset_registry.register_assets) as register_assets:
+            results = await bridge.process_agent_recommendations(recommendations)
+            assert register_assets.await_count == 1
+        
+        assert [r["status"] for r in results] == ["created"] * 3 + ["review_needed"]
+        for result in results[:3]:
+            asset = await asset_registry.get_asset(result["asset_id"])
+            assert asset.name.startswith("Lantern")
+        assert len(list((asset_registry.generative_assets_dir / "Props").glob("*.json"))) == 3
+        
+        # Reused recommendations are not registered again
+        again = await bridge.process_agent_recommendations(recommendations)
+        assert again == results
+        assert len(bridge.recommendations) == 4
+    
     @pytest.mark.asyncio
     async def test_get_task_status(self, bridge):
         """Test retrieving task status."""
@@ -0,0 +1,126 @@
+"""
+Tests for the broker-driven FunctionRunnerAutoscaler
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.worker.autoscaler import PRIORITY_STEPS, FunctionRunnerAutoscaler
+
+
+class FakePipeline:
+    """Records pipelined commands and answers them from a canned table"""
+
+    def __init__(self, lengths, completions):
+        self.lengths = lengths
+        self.completions = completions
+        self.commands = []
+
+    def llen(self, key):
+        self.commands.append(('llen', key))
+
+    def zcount(self, key, min_score, max_score):
+        self.commands.append(('zcount', key))
+
+    def execute(self):
+        results = []
+        for command, key in self.commands:
+            if command == 'llen':
+                results.append(self.lengths.get(key, 0))
+            else:
+                results.append(self.completions.get(key, 0))
+        return results
+
+
+@pytest.fixture
+def autoscaler():
+    pool = MagicMock()
+    pool._pool = [object(), object()]
+    queue = MagicMock()
+    queue.name = 'cpu.analysis'
+    pool.app.conf.task_queues = [queue]
+
+    with patch('app.worker.autoscaler.get_redis_client') as get_client:
+        get_client.return_value.redis = MagicMock()
+        scaler = FunctionRunnerAutoscaler(pool, max_concurrency=10, min_concurrency=1)
+    return scaler
+
+
+def test_queue_depth_read_in_single_pipeline(autoscaler):
+    """All priority lists are summed from one pipelined round trip"""
+    pipe = FakePipeline({'cpu.analysis': 4, 'cpu.analysis\x06\x163': 2}, {})
+    autoscaler.redis.pipeline.return_value = pipe
+
+    with patch('app.worker.autoscaler.psutil.cpu_percent', return_value=10.0) as cpu:
+        metrics = autoscaler._collect_metrics()
+
+    autoscaler.redis.pipeline.assert_called_once()
+    assert len(pipe.commands) == len(PRIORITY_STEPS)
+    assert metrics['queue_depths'] == {'cpu.analysis': 6}
+    assert metrics['total_queue_depth'] == 6
+    cpu.assert_called_with(interval=None)
+    autoscaler.pool.app.control.inspect.assert_not_called()
+
+
+def test_completions_counted_since_previous_tick(autoscaler):
+    """Service rate input comes from the queue monitor's completion sets"""
+    autoscaler.metrics_history.append({'timestamp': time.time() - 10, 'total_queue_depth': 0})
+    pipe = FakePipeline({}, {'queue_completion:cpu.analysis': 7})
+    autoscaler.redis.pipeline.return_value = pipe
+
+    metrics = autoscaler._collect_metrics()
+
+    assert ('zcount', 'queue_completion:cpu.analysis') in pipe.commands
+    assert metrics['completed_tasks'] == 7
+    assert metrics['interval'] == pytest.approx(10, abs=1)
+
+
+def _sample(timestamp, depth, completed, processes=2):
+    return {
+        'timestamp': timestamp,
+        'total_queue_depth': depth,
+        'completed_tasks': completed,
+        'interval': 10.0,
+        'current_processes': processes,
+        'cpu_percent': 10.0,
+        'memory_percent': 10.0,
+    }
+
+
+def test_scales_to_drain_backlog_within_target_latency(autoscaler):
+    """Target = (arrival rate + backlog / target latency) / per-process rate"""
+    autoscaler.target_latency = 30.0
+    # Backlog grows by 10 tasks per 10s while 2 processes complete 20 tasks per 10s
+    autoscaler.metrics_history = [_sample(i * 10.0, 60 + i * 10, 20) for i in range(5)]
+    autoscaler._update_service_rate()
+
+    assert autoscaler.per_process_service_rate == pytest.approx(1.0)
+
+    decision = autoscaler._make_scaling_decision(autoscaler.metrics_history[-1])
+
+    # arrival = 2.0 + 1.0 = 3.0/s, backlog 100 / 30s = 3.33/s -> 7 processes
+    assert decision['action'] == 'scale_up'
+    assert decision['target_processes'] == 7
+
+
+def test_scales_down_when_demand_sustainably_low(autoscaler):
+    """Idle history with a known service rate shrinks to the required size"""
+    autoscaler.per_process_service_rate = 1.0
+    autoscaler.metrics_history = [_sample(i * 10.0, 0, 5, processes=6) for i in range(5)]
+
+    decision = autoscaler._make_scaling_decision(autoscaler.metrics_history[-1])
+
+    assert decision['action'] == 'scale_down'
+    assert decision['target_processes'] == 1
+
+
+def test_threshold_fallback_without_service_rate(autoscaler):
+    """Before any completions are seen, queue pressure thresholds apply"""
+    metrics = _sample(0.0, 20, 0)
+
+    decision = autoscaler._make_scaling_decision(metrics)
+
+    assert autoscaler.per_process_service_rate is None
+    assert decision['action'] == 'scale_up'
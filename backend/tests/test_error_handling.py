@@ -3,6 +3,9 @@
 import pytest
 import asyncio
 import logging
+import os
+import socket
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 
@@ -15,7 +18,82 @@ from app.error_handling import (
     SelfHealingSystem, SystemIssue,
     ErrorHandlingIntegration
 )
-from app.error_handling.models import ErrorSeverity, HealingResult, RecoveryStrategy
+from app.error_handling.analytics import BucketRing
+from app.error_handling.circuit_breaker import SharedCircuitState, SlidingWindow
+from app.error_handling.classifier import normalize_message
+from app.error_handling.context import ErrorContextManager
+from app.error_handling.models import ErrorHistory, ErrorSeverity, HealingResult, RecoveryStrategy
+from app.error_handling.self_healing import SystemDiagnostics
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands error handling uses"""
+    
+    def __init__(self):
+        self.zsets = {}
+        self.hashes = {}
+        self.expiries = {}
+    
+    def pipeline(self, transaction=True):
+        redis = self
+        
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+            
+            def hset(self, key, mapping):
+                self.commands.append(lambda: redis.hashes.setdefault(key, {}).update(mapping))
+            
+            def hincrby(self, key, field, amount):
+                def command():
+                    fields = redis.hashes.setdefault(key, {})
+                    fields[field] = fields.get(field, 0) + amount
+                self.commands.append(command)
+            
+            def hget(self, key, field):
+                self.commands.append(lambda: redis.hashes.get(key, {}).get(field))
+            
+            def hgetall(self, key):
+                self.commands.append(lambda: dict(redis.hashes.get(key, {})))
+            
+            def expire(self, key, seconds):
+                self.commands.append(lambda: redis.expiries.__setitem__(key, seconds))
+            
+            async def execute(self):
+                return [command() for command in self.commands]
+        
+        return Pipeline()
+    
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+    
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    
+    def register_script(self, script):
+        async def pop_due(keys, args):
+            zset = self.zsets.get(keys[0], {})
+            due = sorted((score, member) for member, score in zset.items()
+                         if score <= float(args[0]))[:int(args[1])]
+            for _, member in due:
+                del zset[member]
+            return [member for _, member in due]
+        return pop_due
+
+
+def _retry_context(task_id: str):
+    from app.error_handling.models import ErrorContext
+    return ErrorContext(
+        task_id=task_id,
+        template_id="test-template",
+        operation_type="test",
+        retry_count=0,
+        original_task={"task_id": task_id},
+        start_time=datetime.now()
+    )
 
 
 class TestErrorClassifier:
@@ -84,6 +162,37 @@ class TestErrorClassifier:
         assert classification.category == ErrorCategory.UNKNOWN
         assert classification.strategy == RecoveryStrategy.RETRY_ONCE
         assert classification.recoverable is False
+    
+    def test_first_listed_category_wins(self):
+        """Test pattern priority follows category order, not position in the message"""
+        classifier = ErrorClassifier()
+        
+        classification = classifier.classify_error(RuntimeError("Out of memory after timeout"))
+        
+        assert classification.category == ErrorCategory.TRANSIENT
+    
+    def test_repeated_errors_hit_the_cache(self):
+        """Test errors differing only in numbers and paths share one cache entry"""
+        classifier = ErrorClassifier()
+        
+        first = classifier.classify_error(RuntimeError("CUDA out of memory: tried 2.5 GiB on /dev/gpu0"))
+        second = classifier.classify_error(RuntimeError("CUDA out of memory: tried 8 GiB on /dev/gpu1"))
+        
+        assert first.category == second.category == ErrorCategory.RESOURCE
+        assert second.message == "CUDA out of memory: tried 8 GiB on /dev/gpu1"
+        assert first.metadata is not second.metadata
+        assert classifier.get_cache_stats()["hits"] == 1
+    
+    def test_words_joined_by_a_slash_keep_their_category(self):
+        """Test only whole path tokens are dropped from the template before matching"""
+        classifier = ErrorClassifier()
+        
+        slashed = classifier.classify_error(RuntimeError("Request/timeout while fetching"))
+        other = classifier.classify_error(RuntimeError("Request/parse while fetching"))
+        
+        assert slashed.category == ErrorCategory.TRANSIENT
+        assert other.category == ErrorCategory.UNKNOWN
+        assert normalize_message("Read /tmp/a.txt and 'C:\\x\\y'") == "read # and '#'"
 
 
 class TestCircuitBreaker:
@@ -161,6 +270,196 @@ class TestCircuitBreaker:
         # Need one more success to close
         result = await breaker.call(success_func)
         assert breaker.state == "closed"
+    
+    async def test_circuit_breaker_trips_on_failure_rate(self):
+        """Test scattered failures among many successes keep the circuit closed"""
+        breaker = CircuitBreaker(name="test", failure_threshold=3, failure_rate_threshold=0.5)
+        
+        async def success_func():
+            return "success"
+        
+        async def fail_func():
+            raise Exception("Test failure")
+        
+        for _ in range(3):
+            for _ in range(3):
+                await breaker.call(success_func)
+            with pytest.raises(Exception):
+                await breaker.call(fail_func)
+        assert breaker.state == "closed"
+        
+        for _ in range(5):
+            with pytest.raises(Exception):
+                await breaker.call(fail_func)
+        assert breaker.state == "closed"
+        
+        # Nine failures in eighteen calls reaches the 50% rate
+        with pytest.raises(Exception):
+            await breaker.call(fail_func)
+        assert breaker.state == "open"
+        assert breaker.get_stats()["window_failure_rate"] == 0.5
+    
+    def test_sliding_window_expires_old_buckets(self):
+        """Test outcomes leave the window once their bucket is reused"""
+        window = SlidingWindow(window_seconds=10, buckets=5)
+        
+        window.record(False, now=0.0)
+        window.record(True, now=3.0)
+        assert window.totals(now=9.9) == (1, 1)
+        assert window.totals(now=10.0) == (1, 0)
+        
+        window.record(False, now=11.0)  # same slot as the first failure
+        assert window.totals(now=11.0) == (1, 1)
+    
+    async def test_half_open_limits_concurrent_probes(self):
+        """Test only half_open_max_calls probes reach a recovering service"""
+        breaker = CircuitBreaker(
+            name="test",
+            failure_threshold=1,
+            recovery_timeout=0,
+            success_threshold=1,
+            half_open_max_calls=1
+        )
+        
+        async def fail_func():
+            raise Exception("Test failure")
+        
+        with pytest.raises(Exception):
+            await breaker.call(fail_func)
+        
+        calls = 0
+        release = asyncio.Event()
+        
+        async def probe_func():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "success"
+        
+        tasks = [asyncio.create_task(breaker.call(probe_func)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        assert calls == 1
+        assert results.count("success") == 1
+        assert sum(isinstance(r, CircuitBreakerOpenError) for r in results) == 4
+        assert breaker.state == "closed"
+    
+    async def test_shared_state_opens_breaker_in_other_process(self):
+        """Test a breaker tripped elsewhere rejects calls without running them"""
+        redis = Mock()
+        script = AsyncMock(return_value=["open", 30000])
+        redis.register_script.return_value = script
+        breaker = CircuitBreaker(name="comfyui", shared_state=SharedCircuitState(redis))
+        func = AsyncMock()
+        
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call(func)
+        
+        func.assert_not_called()
+        assert breaker.state == "open"
+        assert script.call_args.kwargs["keys"] == [
+            "circuit_breaker:comfyui", "circuit_breaker:comfyui:probes"
+        ]
+        assert script.call_args.kwargs["args"][0] == "acquire"
+        
+        # Still open locally: no second round trip
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call(func)
+        assert script.await_count == 1
+    
+    async def test_shared_state_records_local_trip(self):
+        """Test tripping locally publishes the open state"""
+        redis = Mock()
+        script = AsyncMock(return_value=["closed", 0])
+        redis.register_script.return_value = script
+        breaker = CircuitBreaker(
+            name="storage",
+            failure_threshold=2,
+            shared_state=SharedCircuitState(redis)
+        )
+        
+        async def fail_func():
+            raise Exception("Test failure")
+        
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await breaker.call(fail_func)
+        
+        assert breaker.state == "open"
+        ops = [call.kwargs["args"][0] for call in script.call_args_list]
+        # Closed breakers consult Redis once per refresh interval
+        assert ops == ["acquire", "trip"]
+
+
+@pytest.fixture
+async def real_redis():
+    """A real Redis server for Lua scripts, from TEST_REDIS_URL"""
+    url = os.environ.get("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+    from redis import asyncio as aioredis
+    client = aioredis.from_url(url)
+    yield client
+    await client.aclose()
+
+
+class TestSharedCircuitStateScript:
+    """Run the shared state machine's Lua script against a real Redis"""
+    
+    @pytest.fixture
+    async def shared(self, real_redis):
+        state = SharedCircuitState(real_redis, key_prefix=f"test_cb_{os.getpid()}_{time.time_ns()}")
+        yield state
+        keys = await real_redis.keys(f"{state.key_prefix}:*")
+        if keys:
+            await real_redis.delete(*keys)
+    
+    @staticmethod
+    def _breaker(**overrides):
+        values = dict(name="render", recovery_timeout=0.05, success_threshold=1,
+                      half_open_max_calls=1, probe_timeout=0.1)
+        values.update(overrides)
+        return CircuitBreaker(**values)
+    
+    async def test_trip_probe_and_close(self, shared):
+        """Test a tripped breaker admits one probe after recovery and closes on success"""
+        breaker = self._breaker()
+        assert await shared.transition(breaker, "acquire", "a") == ("closed", 0)
+        assert (await shared.transition(breaker, "trip"))[0] == "open"
+        assert (await shared.transition(breaker, "acquire", "a"))[0] == "open"
+        
+        await asyncio.sleep(0.06)
+        assert (await shared.transition(breaker, "acquire", "a"))[0] == "probe"
+        assert (await shared.transition(breaker, "acquire", "b"))[0] == "busy"
+        assert (await shared.transition(breaker, "success", "a"))[0] == "closed"
+        assert await shared.redis.keys(f"{shared.key_prefix}:*") == []
+    
+    async def test_probe_failure_reopens(self, shared):
+        """Test a failed probe opens the breaker again"""
+        breaker = self._breaker()
+        await shared.transition(breaker, "trip")
+        await asyncio.sleep(0.06)
+        assert (await shared.transition(breaker, "acquire", "a"))[0] == "probe"
+        state, wait = await shared.transition(breaker, "failure", "a")
+        assert state == "open"
+        assert wait == pytest.approx(0.05)
+    
+    async def test_abandoned_probe_lease_expires(self, shared):
+        """Test a probe that never reports back frees its slot at the lease deadline"""
+        breaker = self._breaker()
+        await shared.transition(breaker, "trip")
+        await asyncio.sleep(0.06)
+        # The process holding this probe dies without releasing it
+        assert (await shared.transition(breaker, "acquire", "lost"))[0] == "probe"
+        assert (await shared.transition(breaker, "acquire", "b"))[0] == "busy"
+        
+        await asyncio.sleep(0.12)
+        assert (await shared.transition(breaker, "acquire", "b"))[0] == "probe"
+        # A late report from the lost probe does not free the new one's slot
+        await shared.transition(breaker, "release", "lost")
+        assert (await shared.transition(breaker, "acquire", "c"))[0] == "busy"
 
 
 class TestRecoveryManager:
@@ -236,6 +535,150 @@ class TestRecoveryManager:
         
         assert result.success is False
         assert result.action == "max_retries_exceeded"
+    
+    async def test_scheduled_retries_survive_restart(self, mock_task_queue):
+        """Test retries stored before a restart are submitted by the next process"""
+        from app.error_handling.recovery import RetryScheduler, RetryWithBackoffStrategy
+        
+        redis = FakeRedis()
+        classification = ErrorClassification(
+            category=ErrorCategory.TRANSIENT,
+            strategy=RecoveryStrategy.RETRY_WITH_BACKOFF,
+            error_type="Exception",
+            message="Transient error",
+            recoverable=True,
+            metadata={"max_retries": 3}
+        )
+        
+        scheduler = RetryScheduler(redis, mock_task_queue)
+        strategy = RetryWithBackoffStrategy(mock_task_queue, scheduler)
+        for n in range(3):
+            result = await strategy.recover(_retry_context(f"task-{n}"), Exception("boom"), classification)
+            assert result.action == "retry_scheduled"
+        
+        # Nothing is due yet, and nothing waits in memory
+        assert await scheduler.run_due() == 0
+        assert await scheduler.pending() == 3
+        
+        # The process restarts before the retries are due
+        restarted = RetryScheduler(redis, mock_task_queue)
+        assert await restarted.run_due(now=time.time() + 120) == 3
+        
+        submitted = sorted(call.args[0]["task_id"] for call in mock_task_queue.submit.call_args_list)
+        assert submitted == ["task-0", "task-1", "task-2"]
+        assert mock_task_queue.submit.call_args_list[0].args[0]["retry_count"] == 1
+        assert await restarted.pending() == 0
+    
+    async def test_scheduler_pops_in_batches_and_requeues_failed_submits(self, mock_task_queue):
+        """Test due retries are taken a batch at a time and kept when submission fails"""
+        from app.error_handling.recovery import RetryScheduler
+        
+        redis = FakeRedis()
+        scheduler = RetryScheduler(redis, mock_task_queue, batch_size=2)
+        for n in range(3):
+            await scheduler.schedule({"task_id": f"task-{n}"}, delay=0)
+        
+        mock_task_queue.submit.side_effect = [None, ConnectionError("queue down"), None]
+        
+        assert await scheduler.run_due() == 2
+        assert await scheduler.pending() == 2
+        assert await scheduler.run_due() == 1
+        # The failed submit is back in the set for a later pass
+        assert await scheduler.pending() == 1
+
+
+def _classification(**overrides) -> ErrorClassification:
+    values = dict(
+        category=ErrorCategory.TRANSIENT,
+        strategy=RecoveryStrategy.RETRY_WITH_BACKOFF,
+        error_type="ConnectionError",
+        message="Connection reset",
+        recoverable=True
+    )
+    values.update(overrides)
+    return ErrorClassification(**values)
+
+
+class TestErrorContextManager:
+    """Test the bounded context tier and its Redis spill"""
+    
+    async def test_lru_eviction_spills_to_redis(self):
+        """Test the least recently used task is evicted and read back from Redis"""
+        redis = FakeRedis()
+        manager = ErrorContextManager(max_entries=2, redis=redis)
+        
+        for task_id in ["task-1", "task-2"]:
+            manager.create_context(task_id, "tpl", "generate", {"task_id": task_id})
+            manager.add_error_to_history(task_id, _classification())
+        manager.get_context("task-1")  # task-2 is now the coldest
+        manager.create_context("task-3", "tpl", "generate", {})
+        
+        assert manager.get_context("task-2") is None
+        assert manager.get_memory_stats()["entries"] == 2
+        # Still visible before the spill is written
+        assert len(manager.get_history("task-2").errors) == 1
+        
+        assert await manager.flush() == 1
+        assert "error_context:task-2" in redis.hashes
+        assert manager.get_history("task-2") is None
+        
+        history = await manager.fetch_history("task-2")
+        assert history.errors[0].error_type == "ConnectionError"
+        assert manager.get_memory_stats()["spilled"] == 1
+    
+    async def test_returning_task_appends_to_spilled_history(self):
+        """Test a task evicted again after its spill keeps its earlier errors"""
+        redis = FakeRedis()
+        manager = ErrorContextManager(max_entries=1, redis=redis)
+        
+        manager.add_error_to_history("task-1", _classification())
+        manager.add_error_to_history("task-2", _classification())  # evicts task-1
+        assert await manager.flush() == 1
+        
+        # task-1 comes back with a fresh in-memory history and is evicted again
+        manager.add_error_to_history("task-1", _classification(error_type="TimeoutError"))
+        manager.add_error_to_history("task-2", _classification())  # evicts task-1
+        await manager.flush()
+        
+        stored = ErrorHistory.model_validate_json(redis.hashes["error_context:task-1"]["history"])
+        assert [e.error_type for e in stored.errors] == ["ConnectionError", "TimeoutError"]
+        
+        # Reads merge the spilled history with what is in memory
+        manager.add_error_to_history("task-1", _classification(error_type="OSError"))
+        history = await manager.fetch_history("task-1")
+        assert [e.error_type for e in history.errors] == [
+            "ConnectionError", "TimeoutError", "OSError"
+        ]
+    
+    def test_idle_entries_expire(self):
+        """Test entries untouched for the TTL are dropped"""
+        manager = ErrorContextManager(ttl_seconds=60)
+        
+        with patch("app.error_handling.context.time.monotonic", return_value=1000.0):
+            manager.create_context("old", "tpl", "generate", {})
+        with patch("app.error_handling.context.time.monotonic", return_value=1100.0):
+            manager.create_context("new", "tpl", "generate", {})
+            
+            assert manager.get_context("old") is None
+            assert manager.get_context("new") is not None
+            stats = manager.get_memory_stats()
+        
+        assert stats["entries"] == 1
+        assert stats["expired"] == 1
+        assert stats["estimated_bytes"] > 0
+    
+    def test_recent_errors_are_time_ordered(self):
+        """Test recent-error queries stop at the cutoff"""
+        manager = ErrorContextManager()
+        old = _classification(timestamp=datetime.now() - timedelta(minutes=30))
+        manager.add_error_to_history("task-1", old)
+        manager.add_error_to_history("task-2", _classification(error_type="TimeoutError"))
+        manager.add_error_to_history("task-1", _classification())
+        
+        assert len(manager.get_recent_errors("task-1", minutes=5)) == 1
+        recent = manager.get_recent_errors_all(minutes=5)
+        assert [task_id for task_id, _ in recent] == ["task-1", "task-2"]
+        assert len(manager.get_recent_errors_all(minutes=60, limit=2)) == 2
 
 
 class TestCompensationManager:
@@ -278,6 +721,91 @@ class TestCompensationManager:
         
         assert result.success is False
         assert result.action_taken == "no_handler"
+    
+    async def test_incomplete_sagas_are_compensated_after_restart(self, tmp_path):
+        """Test steps logged by a crashed process are undone on the next start"""
+        log_path = tmp_path / "sagas.sqlite3"
+        with patch("app.error_handling.compensation._process_owner", return_value={
+            "host": socket.gethostname(), "pid": os.getpid(), "started": 0.0
+        }):
+            # Same pid, different start time: a reused pid, not the owner
+            crashed = CompensationManager(storage_path=str(log_path))
+        
+        leaked = []
+        for i in range(5):
+            output = tmp_path / f"partial-{i}.png"
+            output.write_text("partial")
+            leaked.append(output)
+            await crashed.begin_saga(f"saga-{i}")
+            await crashed.record_step(f"saga-{i}", Operation(
+                operation_id=f"saga-{i}:0",
+                operation_type="output_generation",
+                data={"output_paths": [str(output)]}
+            ))
+        
+        kept = tmp_path / "done.png"
+        kept.write_text("done")
+        await crashed.begin_saga("saga-done")
+        await crashed.record_step("saga-done", Operation(
+            operation_id="saga-done:0",
+            operation_type="output_generation",
+            data={"output_paths": [str(kept)]}
+        ))
+        await crashed.complete_saga("saga-done")
+        crashed.close()
+        
+        restarted = CompensationManager(storage_path=str(log_path), recovery_concurrency=2)
+        try:
+            results = await restarted.recover_incomplete_sagas()
+            
+            assert sorted(results) == [f"saga-{i}" for i in range(5)]
+            assert all(r[0].success for r in results.values())
+            assert not any(path.exists() for path in leaked)
+            assert kept.exists()
+            # Recovered sagas are closed and not replayed again
+            assert await restarted.recover_incomplete_sagas() == {}
+        finally:
+            restarted.close()
+    
+    async def test_recovery_skips_sagas_of_live_processes(self, tmp_path):
+        """Test a process starting up leaves another live process's sagas alone"""
+        log_path = tmp_path / "sagas.sqlite3"
+        running = CompensationManager(storage_path=str(log_path))
+        output = tmp_path / "in-progress.png"
+        output.write_text("rendering")
+        await running.begin_saga("saga-live")
+        await running.record_step("saga-live", Operation(
+            operation_id="saga-live:0",
+            operation_type="output_generation",
+            data={"output_paths": [str(output)]}
+        ))
+        
+        starting = CompensationManager(storage_path=str(log_path))
+        try:
+            assert await starting.recover_incomplete_sagas() == {}
+            assert output.exists()
+            
+            # Once the owner is gone the saga is recovered
+            with patch("app.error_handling.compensation._owner_alive", return_value=False):
+                results = await starting.recover_incomplete_sagas()
+            assert list(results) == ["saga-live"]
+            assert not output.exists()
+        finally:
+            starting.close()
+            running.close()
+    
+    async def test_history_is_bounded(self):
+        """Test compensation history keeps only the latest results"""
+        manager = CompensationManager(history_size=10)
+        
+        for i in range(50):
+            await manager.compensate(
+                Operation(f"op-{i}", "database_write", {}),
+                Exception("failed")
+            )
+        
+        assert len(manager.compensation_history) == 10
+        assert manager.get_compensation_stats()['total_compensations'] == 50
 
 
 class TestErrorAnalytics:
@@ -330,6 +858,72 @@ class TestErrorAnalytics:
         anomaly = report.anomalies[0]
         assert anomaly.type == "frequent_error"
         assert anomaly.error_type == ErrorCategory.RESOURCE
+    
+    def test_bucket_ring_window_sums(self):
+        """Test window sums and running totals as buckets rotate out"""
+        ring = BucketRing(bucket_seconds=1, size=10)
+        ring.add(["errors"], now=100.0)
+        ring.add(["errors", "category:resource"], now=105.5)
+        
+        assert ring.window(3, now=106.0)["errors"] == 1
+        assert ring.window(60, now=106.0)["errors"] == 2
+        
+        # The bucket for t=100 falls out of the ring at t=110
+        assert ring.window(60, now=110.0)["errors"] == 1
+        assert ring.totals == {"errors": 1, "category:resource": 1}
+        ring.window(60, now=200.0)
+        assert not ring.totals
+    
+    async def test_error_rate_and_spike_from_buckets(self):
+        """Test the rate uses request counts and spikes compare with the day's baseline"""
+        analytics = ErrorAnalytics()
+        now = time.time()
+        analytics.metrics.started_at = now - 3600
+        # One error a minute for the past hour
+        for minute in range(6, 60):
+            analytics.metrics.count(["errors", "type:TimeoutError"], now - minute * 60)
+        
+        analytics.record_request(100)
+        for _ in range(30):
+            await analytics.record_error(_classification(error_type="TimeoutError"))
+        
+        report = await analytics.analyze_error_patterns(window_minutes=5)
+        
+        assert report.total_errors == 30
+        assert report.error_rate == pytest.approx(0.3)
+        spike = next(a for a in report.anomalies if a.type == "error_spike")
+        assert spike.value == pytest.approx(30 / 5 / (54 / 55), rel=0.05)
+        assert analytics.get_error_stats()["top_errors"][0] == {"error_type": "TimeoutError", "count": 84}
+    
+    async def test_timer_check_alerts_once_per_anomaly(self):
+        """Test the periodic check alerts when a critical anomaly appears, not on every pass"""
+        alert_service = AsyncMock()
+        analytics = ErrorAnalytics(alert_service)
+        for _ in range(3):
+            await analytics.record_error(_classification(severity=ErrorSeverity.CRITICAL))
+        
+        # Recording alone does not alert
+        alert_service.send_alert.assert_not_called()
+        
+        await analytics.check_anomalies()
+        await analytics.check_anomalies()
+        
+        alert_service.send_alert.assert_called_once()
+    
+    async def test_buckets_survive_restart(self):
+        """Test per-minute counts flushed to Redis seed the next process"""
+        redis = FakeRedis()
+        analytics = ErrorAnalytics(redis=redis)
+        for _ in range(4):
+            await analytics.record_error(_classification(error_type="TimeoutError"))
+        await analytics.stop()
+        
+        restarted = ErrorAnalytics(redis=redis)
+        await restarted.load()
+        
+        assert restarted.metrics.minutes.totals["errors"] == 4
+        report = await restarted.analyze_error_patterns(window_minutes=60)
+        assert report.total_errors == 4
 
 
 class TestSelfHealing:
@@ -381,6 +975,69 @@ class TestSelfHealing:
         assert stats['total_healing_attempts'] == 1
         assert stats['successful_healings'] == 1
         assert stats['success_rate'] == 1.0
+    
+    async def test_checks_run_concurrently_on_their_own_cadence(self):
+        """Test a hanging check times out without delaying the others"""
+        diagnostics = SystemDiagnostics()
+        diagnostics.checks.clear()
+        calls = {'fast': 0, 'slow': 0}
+        
+        async def fast():
+            calls['fast'] += 1
+            return [SystemIssue(type="queue_backlog", severity=ErrorSeverity.MEDIUM)]
+        
+        async def hanging():
+            calls['slow'] += 1
+            await asyncio.sleep(10)
+            return []
+        
+        diagnostics.register_check('fast', fast, interval=1, timeout=1)
+        diagnostics.register_check('slow', hanging, interval=100, timeout=0.05)
+        
+        started = time.monotonic()
+        assert sorted(await diagnostics.run_due_checks()) == ['fast', 'slow']
+        assert time.monotonic() - started < 1
+        
+        snapshot = diagnostics.snapshot()
+        assert [issue.type for issue in snapshot] == ["queue_backlog", "diagnostic_failure"]
+        assert "Timed out" in snapshot[1].details['error']
+        
+        # Only the cheap check is due again
+        assert await diagnostics.run_due_checks(now=time.monotonic() + 5) == ['fast']
+        assert calls == {'fast': 2, 'slow': 1}
+    
+    async def test_slow_heal_is_not_repeated(self, mock_worker_manager):
+        """Test an issue is healed once while its heal is still running"""
+        release = asyncio.Event()
+        
+        async def slow_restart(worker_id, graceful=True):
+            await release.wait()
+            return True
+        
+        mock_worker_manager.restart_worker = AsyncMock(side_effect=slow_restart)
+        healing = SelfHealingSystem(worker_manager=mock_worker_manager, heal_cooldown=0)
+        healing.diagnostics.checks.clear()
+        
+        async def unresponsive():
+            return [SystemIssue(
+                type="worker_unresponsive",
+                severity=ErrorSeverity.HIGH,
+                target="worker-1"
+            )]
+        
+        healing.diagnostics.register_check('worker_health', unresponsive, interval=0)
+        
+        first = asyncio.create_task(healing.diagnose_and_heal())
+        await asyncio.sleep(0.01)
+        assert await healing.diagnose_and_heal() == []
+        
+        release.set()
+        results = await first
+        assert len(results) == 1 and results[0].success
+        assert mock_worker_manager.restart_worker.await_count == 1
+        
+        # A new detection after the heal finished is acted on again
+        assert len(await healing.diagnose_and_heal()) == 1
 
 
 class TestErrorHandlingIntegration:
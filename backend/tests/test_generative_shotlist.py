@@ -16,6 +16,36 @@ from app.models.generative_shotlist import (
 )
 
 
+def _shot(shot_id: str, duration: float = 4.0) -> GenerativeShot:
+    return GenerativeShot(
+        shot_id=shot_id,
+        shot_number=shot_id,
+        shot_type=ShotType.MEDIUM,
+        shot_description=f"Shot {shot_id}, with a comma",
+        shot_synopsis="Indexed shot",
+        composition=ShotComposition(
+            shot_type=ShotType.MEDIUM,
+            shot_angle=ShotAngle.EYE_LEVEL,
+            camera_movement=CameraMovement.STATIC
+        ),
+        lighting=ShotLighting(
+            lighting_setup="three_point",
+            color_grade_style=ColorGradeStyle.NATURAL
+        ),
+        audio=ShotAudio(
+            audio_design="naturalistic",
+            primary_source="dialogue"
+        ),
+        requirements=ShotRequirements(
+            mood="test",
+            tone="test",
+            visual_style="test"
+        ),
+        generative_prompt={"prompt_text": f"Shot {shot_id}"},
+        timing=ShotTiming(estimated_duration=duration)
+    )
+
+
 class TestGenerativeShotModels:
     """Test individual shot model components"""
     
@@ -459,6 +489,90 @@ class TestGenerativeShotList:
         assert csv_export is not None
         assert "shot_id" in csv_export
         assert "shot-001" in csv_export
+    
+    def test_indexed_add_remove_move(self, sample_shot_list):
+        """Test lookups, totals and validation follow the edit helpers"""
+        for seq_id in ["seq-a", "seq-b"]:
+            sample_shot_list.add_sequence(SequenceStructure(
+                sequence_id=seq_id,
+                sequence_name=seq_id,
+                sequence_description=seq_id
+            ))
+        for i in range(5):
+            sample_shot_list.add_shot(_shot(f"a-{i}"), "seq-a")
+        sample_shot_list.add_shot(_shot("loose", 2.0))
+        sample_shot_list.add_shot(_shot("first"), "seq-a", position=0)
+        
+        assert sample_shot_list.total_shots == 7
+        assert sample_shot_list.total_duration == 26.0
+        assert sample_shot_list.get_sequence_by_id("seq-a").shot_order[:2] == ["first", "a-0"]
+        assert sample_shot_list.get_shot_by_id("a-4").shot_id == "a-4"
+        
+        moved = sample_shot_list.move_shot("a-1", "seq-b")
+        assert moved.sequence_id == "seq-b"
+        assert sample_shot_list.get_sequence_by_id("seq-b").shots == [moved]
+        assert sample_shot_list.get_shot_by_id("a-2") is sample_shot_list.sequences[0].shots[2]
+        
+        assert sample_shot_list.remove_shot("first").shot_id == "first"
+        assert sample_shot_list.get_shot_by_id("first") is None
+        assert sample_shot_list.get_shot_by_id("a-0") is sample_shot_list.sequences[0].shots[0]
+        assert sample_shot_list.total_shots == 6
+        assert sample_shot_list.get_sequence_by_id("seq-a").total_duration == 16.0
+        
+        sample_shot_list.add_shot(_shot("a-0"), "seq-b")
+        assert sample_shot_list.validate_shot_list() is False
+        sample_shot_list.remove_shot("a-0")
+        assert sample_shot_list.validate_shot_list() is True
+        assert sample_shot_list.get_shot_by_id("a-0") is not None
+        
+        sample_shot_list.remove_sequence("seq-a")
+        assert sample_shot_list.get_shot_by_id("a-2") is None
+        assert sample_shot_list.get_shot_by_id("a-1") is moved
+        assert (sample_shot_list.total_sequences, sample_shot_list.total_shots) == (1, 2)
+        
+        with pytest.raises(ValueError):
+            sample_shot_list.move_shot("a-1", "missing")
+    
+    def test_direct_edits_are_reindexed(self, sample_shot_list):
+        """Test shots appended straight to the lists are still found"""
+        assert sample_shot_list.get_shot_by_id("late") is None
+        
+        sequence = SequenceStructure(
+            sequence_id="seq-001",
+            sequence_name="Direct",
+            sequence_description="Edited without helpers",
+            shots=[_shot("one"), _shot("two")]
+        )
+        sample_shot_list.sequences.append(sequence)
+        sequence.shots.append(_shot("late"))
+        assert sample_shot_list.get_shot_by_id("late") is sequence.shots[2]
+        
+        sequence.shots.reverse()
+        assert sample_shot_list.get_shot_by_id("late") is sequence.shots[0]
+        assert sample_shot_list.total_shots == 3
+    
+    def test_streamed_exports(self, sample_shot_list):
+        """Test the streamed JSON and CSV exports row by row"""
+        sample_shot_list.add_sequence(SequenceStructure(
+            sequence_id="seq-001",
+            sequence_name="Stream",
+            sequence_description="Streamed export",
+            shots=[_shot(f"s-{i}") for i in range(3)]
+        ))
+        sample_shot_list.add_shot(_shot("loose"))
+        
+        json_export = sample_shot_list.export_to_json()
+        assert "\n" not in json_export
+        restored = GenerativeShotList.model_validate_json(json_export)
+        assert [shot.shot_id for shot in restored.sequences[0].shots] == ["s-0", "s-1", "s-2"]
+        assert restored.standalone_shots[0].shot_id == "loose"
+        assert restored.get_shot_by_id("s-2").shot_description == "Shot s-2, with a comma"
+        
+        rows = list(sample_shot_list.iter_csv())
+        assert len(rows) == 5
+        assert rows[0].startswith("shot_id,sequence_id")
+        assert rows[3].startswith('s-2,seq-001,s-2,medium,"Shot s-2, with a comma",4.0')
+        assert sample_shot_list.export_to_csv() == "".join(rows)
 
 
 class TestFactoryFunctions:
@@ -2,6 +2,8 @@
 Tests for Git LFS service
 """
 
+import hashlib
+import os
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -118,11 +120,14 @@ class TestGitLFSService:
     def test_get_lfs_files(self, mock_run, git_lfs_service, temp_project_path):
         """Test getting list of LFS tracked files"""
         git_lfs_service.lfs_available = True
-        mock_run.return_value = MagicMock(
-            stdout="oid1234 1048576 video.mp4\noid5678 2097152 model.ckpt", returncode=0
+        mock_run.side_effect = _git(
+            {"video.mp4": _pointer("1234", 1048576), "model.ckpt": _pointer("5678", 2097152)}
+        )
+        (temp_project_path / ".gitattributes").write_text(
+            "*.mp4 filter=lfs diff=lfs merge=lfs -text\n*.ckpt filter=lfs diff=lfs merge=lfs -text\n"
         )
 
-        files = git_lfs_service.get_lfs_files(temp_project_path)
+        files = sorted(git_lfs_service.get_lfs_files(temp_project_path), key=lambda f: f["path"], reverse=True)
 
         assert len(files) == 2
         assert files[0]["path"] == "video.mp4"
@@ -170,3 +175,129 @@ class TestGitLFSService:
             assert "*.mp4" in status["tracked_patterns"]
             assert status["file_count"] == 1
             assert status["total_size"] == 1000000
+
+
+def _pointer(oid: str, size: int) -> str:
+    return f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {size}\n"
+
+
+def _git(index: dict[str, str | bytes]):
+    """subprocess.run stand-in for a Git index of path -> staged blob content"""
+
+    def blobs():
+        return {
+            hashlib.sha1(path.encode()).hexdigest(): content.encode() if isinstance(content, str) else content
+            for path, content in index.items()
+        }
+
+    def run(cmd, **kwargs):
+        if cmd[:2] == ["git", "ls-files"]:
+            stdout = "".join(
+                f"100644 {hashlib.sha1(path.encode()).hexdigest()} 0\t{path}\0" for path in index
+            )
+            return MagicMock(returncode=0, stdout=stdout)
+        if cmd[:2] == ["git", "cat-file"] and cmd[2].startswith("--batch-check"):
+            stdout = "".join(f"{blob} {len(blobs()[blob])}\n" for blob in kwargs["input"].split())
+            return MagicMock(returncode=0, stdout=stdout)
+        if cmd[:3] == ["git", "cat-file", "--batch"]:
+            stdout = b"".join(
+                blob + b" blob " + str(len(blobs()[blob.decode()])).encode() + b"\n" + blobs()[blob.decode()] + b"\n"
+                for blob in kwargs["input"].split()
+            )
+            return MagicMock(returncode=0, stdout=stdout)
+        return MagicMock(returncode=0)
+
+    return run
+
+
+class TestLFSInventory:
+    """Test batched tracking and the pointer-file inventory"""
+
+    @patch("subprocess.run")
+    def test_track_files_single_rewrite(self, mock_run, git_lfs_service, temp_project_path):
+        """Test many paths are tracked with one .gitattributes write and one git add"""
+        git_lfs_service.lfs_available = True
+        gitattributes = temp_project_path / ".gitattributes"
+        gitattributes.write_text("*.mp4 filter=lfs diff=lfs merge=lfs -text")
+
+        paths = [f"shots/shot_{i:04d}/take 1.exr" for i in range(2000)]
+        assert git_lfs_service.track_files(temp_project_path, paths + ["*.mp4"])
+
+        mock_run.assert_called_once_with(["git", "add", ".gitattributes"], cwd=temp_project_path, check=True)
+        lines = gitattributes.read_text().splitlines()
+        assert len(lines) == 2001
+        assert lines[1] == "shots/shot_0000/take[[:space:]]1.exr filter=lfs diff=lfs merge=lfs -text"
+
+        # Already tracked: no rewrite
+        mock_run.reset_mock()
+        assert git_lfs_service.track_file(temp_project_path, paths[0])
+        mock_run.assert_not_called()
+
+    @patch("subprocess.run")
+    def test_inventory_from_pointer_files(self, mock_run, git_lfs_service, temp_project_path):
+        """Test pointers are read from the index without touching checked-out objects"""
+        git_lfs_service.lfs_available = True
+        mock_run.side_effect = _git(
+            {
+                "shots/a.mp4": _pointer("ab" * 32, 1048576),
+                "shots/take 1.exr": _pointer("cd" * 32, 6),
+                "shots/notes.txt": "not tracked",
+                # Committed before it was tracked: not an LFS file
+                "shots/legacy.mp4": b"x" * 4096,
+            }
+        )
+        (temp_project_path / ".gitattributes").write_text(
+            "*.mp4 filter=lfs diff=lfs merge=lfs -text\n"
+            "shots/take[[:space:]]1.exr filter=lfs diff=lfs merge=lfs -text\n"
+        )
+        # Matches a pattern but is not in the index
+        (temp_project_path / "shots").mkdir()
+        (temp_project_path / "shots" / "untracked.mp4").write_bytes(b"render")
+
+        files = sorted(git_lfs_service.get_lfs_files(temp_project_path), key=lambda f: f["path"])
+
+        assert files == [
+            {"oid": "ab" * 32, "size": 1048576, "path": "shots/a.mp4"},
+            {"oid": "cd" * 32, "size": 6, "path": "shots/take 1.exr"},
+        ]
+        # The oversized legacy blob is never read
+        batch = next(c for c in mock_run.call_args_list if c.args[0] == ["git", "cat-file", "--batch"])
+        assert len(batch.kwargs["input"].split()) == 2
+
+    def test_patterns_follow_gitattributes_matching(self, git_lfs_service):
+        """Test ``*`` stays within a directory while ``**`` spans them"""
+        entries = [
+            ("1", "assets/x.png"),
+            ("2", "assets/sub/x.png"),
+            ("3", "renders/deep/shot.exr"),
+            ("4", "top.mp4"),
+            ("5", "a/b/clip.mp4"),
+        ]
+        patterns = ["assets/*.png", "renders/**/*.exr", "*.mp4"]
+
+        matched = [path for _, path in git_lfs_service._match_files(entries, patterns)]
+
+        assert matched == ["assets/x.png", "renders/deep/shot.exr", "top.mp4", "a/b/clip.mp4"]
+
+    @patch("subprocess.run")
+    def test_inventory_cached_on_index_mtime(self, mock_run, git_lfs_service, temp_project_path):
+        """Test status is served from cache until the index changes"""
+        git_lfs_service.lfs_available = True
+        index = {"a.mp4": _pointer("01" * 32, 10)}
+        mock_run.side_effect = _git(index)
+        (temp_project_path / ".git").mkdir()
+        index_file = temp_project_path / ".git" / "index"
+        index_file.write_bytes(b"DIRC")
+        (temp_project_path / ".gitattributes").write_text("*.mp4 filter=lfs diff=lfs merge=lfs -text\n")
+
+        assert git_lfs_service.get_lfs_status(temp_project_path)["file_count"] == 1
+        index["b.mp4"] = _pointer("02" * 32, 20)
+        status = git_lfs_service.get_lfs_status(temp_project_path)
+        assert status["file_count"] == 1
+        # git config, git ls-files and the two cat-file batches, once
+        assert mock_run.call_count == 4
+
+        os.utime(index_file, ns=(index_file.stat().st_atime_ns, index_file.stat().st_mtime_ns + 1_000_000))
+        status = git_lfs_service.get_lfs_status(temp_project_path)
+        assert status["file_count"] == 2
+        assert status["total_size"] == 30
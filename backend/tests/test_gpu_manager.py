@@ -6,7 +6,9 @@ import pytest
 import asyncio
 from unittest.mock import MagicMock, patch
 
-from app.resources import GPUResourceManager, GPUDevice, ResourceSpec
+from app.resources import (
+    GPUResourceManager, GPUDevice, ResourceSpec, FakeDeviceProvider, GPUAffinity
+)
 
 
 @pytest.fixture
@@ -291,6 +293,101 @@ class TestGPUResourceManager:
         assert len(successful_allocations) == len(set(successful_allocations))
 
 
+class TestGangAllocation:
+    """Test transactional multi-GPU allocation on fake devices"""
+    
+    @pytest.fixture
+    async def fake_manager(self, mock_gpu_devices):
+        manager = GPUResourceManager(provider=FakeDeviceProvider(mock_gpu_devices))
+        await manager.start()
+        yield manager
+        await manager.stop()
+    
+    @pytest.mark.asyncio
+    async def test_gang_allocation_is_recorded_per_task(self, fake_manager):
+        """Test gang allocation completes and release returns exactly what was taken"""
+        devices = await asyncio.wait_for(
+            fake_manager.allocate_multi_gpu(count=2, memory_per_gpu_gb=6.0, task_id="task-1"),
+            timeout=1.0
+        )
+        
+        # Best fit: the two smallest devices that can hold 6GB
+        assert sorted(devices) == [1, 2]
+        record = fake_manager.get_task_allocation("task-1")
+        assert record.devices == {1: 6.0, 2: 6.0}
+        assert fake_manager.allocations[1].tasks == ["task-1"]
+        
+        await fake_manager.allocate_gpu(memory_gb=2.0, preferred_device=1, task_id="task-2")
+        
+        released = await fake_manager.release_task_gpus("task-1")
+        
+        assert released == {1: 6.0, 2: 6.0}
+        assert fake_manager.allocations[1].memory_gb == 2.0
+        assert fake_manager.allocations[1].tasks == ["task-2"]
+        assert 2 not in fake_manager.allocations
+        assert await fake_manager.release_task_gpus("task-1") == {}
+    
+    @pytest.mark.asyncio
+    async def test_gang_allocation_is_all_or_nothing(self, fake_manager):
+        """Test a gang that cannot be fully placed reserves nothing"""
+        devices = await fake_manager.allocate_multi_gpu(
+            count=3, memory_per_gpu_gb=9.0, task_id="task-1"
+        )
+        
+        assert devices is None
+        assert fake_manager.allocations == {}
+        assert fake_manager.get_task_allocation("task-1") is None
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_gangs_never_oversubscribe(self):
+        """Test concurrent gang requests respect device memory"""
+        manager = GPUResourceManager(provider=FakeDeviceProvider.uniform(8, memory_gb=24.0))
+        await manager.start()
+        
+        results = await asyncio.gather(*[
+            manager.allocate_multi_gpu(count=4, memory_per_gpu_gb=16.0, task_id=f"task-{i}")
+            for i in range(4)
+        ])
+        
+        assert sum(1 for r in results if r) == 2
+        assert all(a.memory_gb <= 24.0 for a in manager.allocations.values())
+    
+    @pytest.mark.asyncio
+    async def test_topology_affinity(self):
+        """Test gangs are kept within one topology group when requested"""
+        manager = GPUResourceManager(
+            provider=FakeDeviceProvider.uniform(8, memory_gb=24.0, group_size=4)
+        )
+        await manager.start()
+        
+        # Occupy part of group 0 so the gang only fits in group 1
+        await manager.allocate_gpu(memory_gb=20.0, preferred_device=0)
+        
+        devices = await manager.allocate_multi_gpu(
+            count=4, memory_per_gpu_gb=16.0, task_id="gang", affinity=GPUAffinity.REQUIRE
+        )
+        assert sorted(devices) == [4, 5, 6, 7]
+        
+        # No group has four free devices left, so a strict request fails
+        assert await manager.allocate_multi_gpu(
+            count=4, memory_per_gpu_gb=16.0, affinity=GPUAffinity.REQUIRE
+        ) is None
+        # ...while a preference falls back to any devices
+        assert await manager.allocate_multi_gpu(
+            count=3, memory_per_gpu_gb=16.0, affinity=GPUAffinity.PREFER
+        ) is not None
+    
+    @pytest.mark.asyncio
+    async def test_compute_capability_compared_numerically(self):
+        """Test "10.0" satisfies a "8.6" requirement"""
+        manager = GPUResourceManager(provider=FakeDeviceProvider.uniform(
+            1, memory_gb=80.0, compute_capability="10.0"
+        ))
+        await manager.start()
+        
+        assert await manager.allocate_gpu(memory_gb=8.0, compute_capability="8.6") == 0
+
+
 class TestGPUDevice:
     """Test GPUDevice model"""
     
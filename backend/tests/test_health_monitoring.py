@@ -4,6 +4,7 @@ Tests for Worker Health Monitoring System
 
 import pytest
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
@@ -11,7 +12,7 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.worker.health_monitor import (
     WorkerHealthMonitor, HeartbeatCheck, ResourceCheck, TaskPerformanceCheck,
-    HealthCheckResult, HealthStatus, WorkerMetrics, TaskStats
+    DiskSpaceCheck, HealthCheckResult, HealthStatus, WorkerMetrics, TaskStats
 )
 from app.worker.metrics_collector import MetricsCollector
 
@@ -284,6 +285,80 @@ class TestHealthMonitor:
             await self.monitor.stop_monitoring()
             
             assert len(self.monitor.monitoring_tasks) == 0
+    
+    @pytest.mark.asyncio
+    async def test_run_health_checks_times_out_slow_check(self):
+        """A hanging check is reported as an error without blocking the others"""
+        async def hang(worker_id):
+            await asyncio.sleep(10)
+        
+        slow_check = MagicMock(execute=hang)
+        slow_check.name = 'slow'
+        fast_check = MagicMock(execute=AsyncMock(return_value=HealthCheckResult(
+            'fast', HealthStatus.HEALTHY, 'OK', {}
+        )))
+        
+        self.monitor.check_timeout = 0.05
+        self.monitor.health_checks = [slow_check, fast_check]
+        results = await self.monitor.run_health_checks('worker-1')
+        
+        assert results[0].status == HealthStatus.ERROR
+        assert 'timed out' in results[0].message
+        assert results[1].status == HealthStatus.HEALTHY
+    
+    @pytest.mark.asyncio
+    async def test_run_health_checks_times_out_blocking_redis_read(self):
+        """A check stuck on a blocking Redis call times out without stalling the loop"""
+        def hang(key):
+            time.sleep(1)
+        
+        heartbeat = HeartbeatCheck(MagicMock(last_heartbeat=MagicMock(return_value=None)))
+        heartbeat.redis = MagicMock(get=hang)
+        fast_check = MagicMock(execute=AsyncMock(return_value=HealthCheckResult(
+            'fast', HealthStatus.HEALTHY, 'OK', {}
+        )))
+        
+        self.monitor.check_timeout = 0.05
+        self.monitor.health_checks = [heartbeat, fast_check]
+        started = time.monotonic()
+        results = await self.monitor.run_health_checks('worker-1')
+        
+        assert time.monotonic() - started < 0.5
+        assert results[0].status == HealthStatus.ERROR
+        assert 'timed out' in results[0].message
+        assert results[1].status == HealthStatus.HEALTHY
+    
+    @pytest.mark.asyncio
+    async def test_host_sample_shared_across_workers(self):
+        """Host metrics are collected once per interval for all workers"""
+        resource_check = ResourceCheck(self.monitor.sampler)
+        resource_check.redis = MagicMock(get=MagicMock(return_value=None))
+        self.monitor.health_checks = [resource_check, DiskSpaceCheck(self.monitor.sampler)]
+        
+        with patch.object(self.monitor.sampler, '_collect',
+                          wraps=self.monitor.sampler._collect) as collect:
+            await asyncio.gather(*(
+                self.monitor.run_health_checks(f'worker-{i}') for i in range(10)
+            ))
+        
+        assert collect.call_count == 1
+    
+    def test_health_history_entry_round_trip(self):
+        """History is stored as score plus per-check status codes"""
+        results = [
+            HealthCheckResult('heartbeat', HealthStatus.HEALTHY, 'OK', {}),
+            HealthCheckResult('disk_space', HealthStatus.CRITICAL, 'Low disk', {})
+        ]
+        
+        entry = self.monitor.encode_history_entry(1700000000.0, 0.75, results)
+        decoded = self.monitor.decode_history_entry(entry)
+        
+        assert entry == '1700000000.000:0.750:0----2'
+        assert decoded['health_score'] == 0.75
+        assert decoded['checks'] == [
+            {'check_name': 'heartbeat', 'status': 'healthy'},
+            {'check_name': 'disk_space', 'status': 'critical'}
+        ]
 
 
 class TestMetricsCollector:
@@ -96,6 +96,25 @@ class TestFunctionRunnerOrchestrator:
         assert result.outputs == {"image": "test_output.png"}
         assert result.execution_time == 25.0
     
+    @pytest.mark.asyncio
+    async def test_wait_for_completion_parks_on_completion_future(self):
+        """Test that waiting reads status once and is woken by the tracker"""
+        orchestrator = FunctionRunnerOrchestrator()
+        orchestrator.progress_tracker.get_status = AsyncMock(
+            return_value=Mock(state=TaskState.RUNNING)
+        )
+        
+        waiter = asyncio.create_task(orchestrator._wait_for_completion("task_42", timeout=5))
+        await asyncio.sleep(0.05)
+        await orchestrator.completions.notify(
+            "task_42", "completed", outputs={"image": "out.png"}, execution_time=3.0
+        )
+        
+        result = await waiter
+        assert result.status == TaskState.COMPLETED
+        assert result.outputs == {"image": "out.png"}
+        assert orchestrator.progress_tracker.get_status.await_count == 1
+    
     @pytest.mark.asyncio
     async def test_task_cancellation(self):
         """Test task cancellation"""
@@ -239,6 +239,65 @@ class TestWebSocketIntegrationLayer:
         stats = integration.get_stats()
         assert stats["active_clients"] == 1
         assert "project.test_project" in stats["channels"]
+    
+    @pytest.mark.asyncio
+    async def test_disconnect_cleans_channel_index(self):
+        """Test disconnect removes the client from every channel it joined"""
+        from app.integration.websocket_integration import WebSocketIntegrationLayer
+        
+        integration = WebSocketIntegrationLayer(Mock())
+        await integration.subscribe_client("client_1", ["task.a", "project.p"])
+        await integration.subscribe_client("client_2", ["project.p"])
+        
+        await integration.handle_client_disconnect("client_1")
+        
+        assert await integration.get_channel_subscribers("task.a") == []
+        assert await integration.get_channel_subscribers("project.p") == ["client_2"]
+        assert integration.get_stats()["channels"] == ["project.p"]
+    
+    @pytest.mark.asyncio
+    async def test_project_events_reach_only_subscribers(self):
+        """Test project targeting is resolved on the server"""
+        from app.integration.websocket_integration import WebSocketIntegrationLayer
+        
+        ws_manager = Mock()
+        ws_manager.send_personal_message = AsyncMock()
+        ws_manager.broadcast = AsyncMock()
+        integration = WebSocketIntegrationLayer(ws_manager)
+        await integration.subscribe_client("client_1", ["project.p1"])
+        await integration.subscribe_client("client_2", ["project.p2"])
+        
+        await integration._send_to_clients(
+            WebSocketEvent(type="generation.completed", data={}),
+            {"project_id": "p1"}
+        )
+        
+        ws_manager.broadcast.assert_not_called()
+        ws_manager.send_personal_message.assert_called_once()
+        assert ws_manager.send_personal_message.call_args[0][1] == "client_1"
+    
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_fan_out(self):
+        """Test a client that exceeds the send timeout is skipped"""
+        from app.integration.websocket_integration import WebSocketIntegrationLayer
+        
+        delivered = []
+        
+        async def send(message, client_id):
+            if client_id == "slow":
+                await asyncio.sleep(10)
+            delivered.append(client_id)
+        
+        ws_manager = Mock()
+        ws_manager.send_personal_message = send
+        integration = WebSocketIntegrationLayer(ws_manager, send_timeout=0.05)
+        for client_id in ["slow", "fast_1", "fast_2"]:
+            await integration.subscribe_client(client_id, ["task.t"])
+        
+        await asyncio.wait_for(integration._send_to_task_subscribers("t", {"type": "x"}), 1.0)
+        
+        assert sorted(delivered) == ["fast_1", "fast_2"]
+        assert integration.get_stats()["send_timeouts"] == 1
 
 
 class TestBasicIntegrationLogic:
@@ -360,6 +419,112 @@ class TestServiceIntegrationLogic:
         # Test exact patterns
         assert event_bus._pattern_matches("test.event", "test.event")
         assert not event_bus._pattern_matches("test.event", "test.other")
+    
+    def test_pattern_index(self):
+        """Test exact, prefix and infix patterns resolve through the indexes"""
+        from app.integration.service_integrator import EventBus
+        
+        event_bus = EventBus()
+        exact, prefix, broad, infix = Mock(), Mock(), Mock(), Mock()
+        event_bus.subscribe("task.completed", exact)
+        event_bus.subscribe("task.*", prefix)
+        event_bus.subscribe("*", broad)
+        event_bus.subscribe("*.completed", infix)
+        
+        assert set(map(id, event_bus._handlers_for("task.completed"))) == {
+            id(exact), id(prefix), id(broad), id(infix)
+        }
+        assert event_bus._handlers_for("takes.created") == [broad]
+        
+        event_bus.unsubscribe("*", broad)
+        assert event_bus._handlers_for("takes.created") == []
+    
+    @pytest.mark.asyncio
+    async def test_per_key_ordering_without_head_of_line_blocking(self):
+        """Test events for one task stay ordered while other tasks proceed"""
+        from app.integration.service_integrator import EventBus
+        
+        event_bus = EventBus(workers=4)
+        handled = []
+        
+        async def handler(event):
+            if event.data["task_id"] == "slow":
+                await asyncio.sleep(0.2)
+            handled.append((event.data["task_id"], event.data["n"]))
+        
+        event_bus.subscribe("task.progress", handler)
+        await event_bus.start()
+        
+        for n in range(3):
+            await event_bus.publish(ServiceEvent(service="task", type="progress",
+                                                 data={"task_id": "slow", "n": n}))
+        for n in range(3):
+            await event_bus.publish(ServiceEvent(service="task", type="progress",
+                                                 data={"task_id": "fast", "n": n}))
+        
+        await asyncio.sleep(0.1)
+        # The fast task finished while the slow one is still on its first event
+        assert handled == [("fast", 0), ("fast", 1), ("fast", 2)]
+        
+        await asyncio.sleep(0.7)
+        assert [n for task_id, n in handled if task_id == "slow"] == [0, 1, 2]
+        
+        stats = event_bus.get_stats()
+        [metrics] = stats["handlers"].values()
+        assert metrics["calls"] == 6
+        assert metrics["max_ms"] >= 200
+        await event_bus.stop()
+    
+    @pytest.mark.asyncio
+    async def test_overflow_policies(self):
+        """Test a full queue drops by policy instead of growing"""
+        from app.integration.models import OverflowPolicy
+        from app.integration.service_integrator import EventBus
+        
+        for policy, expected in [(OverflowPolicy.DROP_NEWEST, [0, 1]),
+                                 (OverflowPolicy.DROP_OLDEST, [3, 4])]:
+            event_bus = EventBus(max_queue_size=2, overflow_policy=policy)
+            handled = []
+            event_bus.subscribe("test.event", lambda event: handled.append(event.data["n"]))
+            # Running but without workers, so the queue fills up
+            event_bus._running = True
+            
+            for n in range(5):
+                await event_bus.publish(ServiceEvent(service="test", type="event", data={"n": n}))
+            
+            assert event_bus.get_stats()["dropped_events"] == 3
+            event_bus._running = False
+            await event_bus.start()
+            await asyncio.sleep(0.05)
+            assert handled == expected
+            await event_bus.stop()
+    
+    @pytest.mark.asyncio
+    async def test_handler_can_publish_into_a_full_queue(self):
+        """Test a blocking publish from a handler waits for the workers, not for itself"""
+        from app.integration.service_integrator import EventBus
+        
+        event_bus = EventBus(workers=2, max_queue_size=1)
+        handled = []
+        
+        async def fan_out(event):
+            # The queue holds one event, so the later publishes wait for a worker
+            for n in range(3):
+                await event_bus.publish(ServiceEvent(service="test", type="leaf", data={"n": n}))
+        
+        event_bus.subscribe("test.root", fan_out)
+        event_bus.subscribe("test.leaf", lambda event: handled.append(event.data["n"]))
+        await event_bus.start()
+        
+        await event_bus.publish(ServiceEvent(service="test", type="root", data={}))
+        for _ in range(100):
+            if len(handled) == 3:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert sorted(handled) == [0, 1, 2]
+        assert not event_bus._slots.locked()
+        await event_bus.stop()
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,112 @@
+"""
+Tests for the request logging, latency and profiling middleware.
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import LoggingMiddleware, get_request_id
+from app.middleware.profiling import RequestProfiler
+from app.worker.metrics_collector import metrics_collector
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def create_app(profiler: RequestProfiler) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware, profiler=profiler)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, request: Request):
+        return {"request_id": get_request_id(), "state_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/slow/{delay_ms}")
+    async def slow(delay_ms: int):
+        busy_wait(delay_ms / 1000)
+        return {"delay_ms": delay_ms}
+
+    return app
+
+
+def latency_count(route: str, status: str = "200") -> float:
+    value = metrics_collector.registry.get_sample_value(
+        "auteur_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status},
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def profiler():
+    profiler = RequestProfiler(enabled=True, interval=0.001, top_n=2)
+    yield profiler
+    profiler.stop()
+
+
+def test_request_id_propagates_through_context():
+    client = TestClient(create_app(RequestProfiler()))
+
+    response = client.get("/items/1")
+    request_id = response.headers["X-Request-ID"]
+    assert response.json() == {"request_id": request_id, "state_id": request_id}
+
+    response = client.get("/items/2", headers={"X-Request-ID": "upstream-42"})
+    assert response.headers["X-Request-ID"] == "upstream-42"
+    assert response.json()["request_id"] == "upstream-42"
+    assert get_request_id() is None
+
+
+def test_latency_is_recorded_per_route_template():
+    client = TestClient(create_app(RequestProfiler()))
+    before = latency_count("/items/{item_id}")
+
+    for item_id in range(3):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+
+    assert latency_count("/items/{item_id}") == before + 3
+    assert latency_count("unmatched", "404") >= 1
+
+
+def test_streaming_response_passes_through():
+    client = TestClient(create_app(RequestProfiler()))
+    before = latency_count("/stream")
+
+    response = client.get("/stream")
+
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert "X-Request-ID" in response.headers
+    assert latency_count("/stream") == before + 1
+
+
+def test_slowest_requests_keep_their_profiles(profiler):
+    client = TestClient(create_app(profiler))
+
+    for delay_ms in (20, 60, 40):
+        client.get(f"/slow/{delay_ms}")
+    client.get("/items/1")
+
+    profiles = profiler.get_profiles("/slow/{delay_ms}")
+    assert [p["path"] for p in profiles] == ["/slow/60", "/slow/40"]
+    assert profiles[0]["samples"] > 0
+    assert any("busy_wait" in s["stack"] for s in profiles[0]["stacks"])
+    assert len(profiler.get_profiles()) == 3
+
+    profiler.reset()
+    assert profiler.get_profiles() == []
@@ -0,0 +1,115 @@
+"""
+Tests for the worker-side progress publisher
+"""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.worker.progress_publisher import ProgressPublisher
+
+
+@pytest.fixture
+def publisher():
+    publisher = ProgressPublisher(redis_url='redis://localhost:6379/0', min_interval=60.0)
+    publisher._client = MagicMock()
+    return publisher
+
+
+def _published(publisher):
+    pipe = publisher._client.pipeline.return_value
+    return [call.args for call in pipe.publish.call_args_list]
+
+
+def test_stage_boundary_publishes_both_channels_in_one_pipeline(publisher):
+    publisher.report('task-1', 'project-1', progress=10, message='Loading', flush=True)
+
+    publisher._client.pipeline.assert_called_once_with(transaction=False)
+    channels = [channel for channel, _ in _published(publisher)]
+    assert channels == [publisher.progress_channel, 'task:progress:task-1']
+
+    project_message = json.loads(_published(publisher)[0][1])
+    assert project_message['project_id'] == 'project-1'
+    assert project_message['type'] == 'progress'
+    assert project_message['status'] == 'running'
+
+
+def test_step_updates_are_rate_limited_and_coalesced(publisher):
+    publisher.report('task-1', None, progress=1, message='step', flush=True)
+    for step in range(2, 50):
+        publisher.report('task-1', None, progress=step, message='step')
+
+    # Only the first flush went out; later steps collapsed into one pending update
+    assert len(_published(publisher)) == 1
+    assert publisher.coalesced_count == 47
+
+    publisher.flush()
+
+    published = _published(publisher)
+    assert len(published) == 2
+    assert json.loads(published[-1][1])['progress'] == 49
+
+
+def test_quiet_task_publishes_its_last_update_after_the_interval(publisher):
+    publisher.min_interval = 0.05
+    publisher.report('task-1', None, progress=1, message='step', flush=True)
+    publisher.report('task-1', None, progress=2, message='step')
+    publisher.report('task-1', None, progress=3, message='step')
+    assert len(_published(publisher)) == 1
+
+    deadline = time.monotonic() + 2.0
+    while len(_published(publisher)) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    published = _published(publisher)
+    assert len(published) == 2
+    assert json.loads(published[-1][1])['progress'] == 3
+    assert publisher._timer is None
+
+
+def test_terminal_status_always_flushes(publisher):
+    publisher.report('task-1', None, progress=1, message='step', flush=True)
+    publisher.report('task-1', None, progress=100, message='done', status='completed')
+
+    # The final update is followed by a completion notification for waiters
+    published = _published(publisher)
+    assert len(published) == 3
+    assert published[-1][0] == publisher.completion_channel
+    assert json.loads(published[-1][1])['state'] == 'completed'
+    pipe = publisher._client.pipeline.return_value
+    assert pipe.setex.call_args.args[0] == 'task:completion:task-1'
+
+    stats = publisher.get_stats()
+    assert stats['flushes'] == 2
+    assert stats['messages'] == 3
+    assert stats['pending_tasks'] == 0
+
+
+def test_publish_errors_are_counted_not_raised(publisher):
+    publisher._client.pipeline.return_value.execute.side_effect = ConnectionError('down')
+
+    publisher.report('task-1', None, progress=1, message='step', flush=True)
+
+    assert publisher.error_count == 1
+
+
+def test_failed_flush_keeps_the_batch_for_the_next_one(publisher):
+    pipe = publisher._client.pipeline.return_value
+    pipe.execute.side_effect = [ConnectionError('down'), None]
+
+    publisher.report('task-1', None, progress=100, message='done', status='completed')
+    assert publisher.error_count == 1
+    assert publisher.get_stats()['pending_tasks'] == 1
+    assert publisher._timer is not None
+
+    publisher.flush()
+
+    # The retry carries the completion that waiters are blocked on
+    assert publisher.get_stats()['pending_tasks'] == 0
+    assert pipe.setex.call_count == 2
+    published = _published(publisher)
+    assert published[-1][0] == publisher.completion_channel
+    assert json.loads(published[-1][1])['state'] == 'completed'
+    assert publisher.get_stats()['flushes'] == 1
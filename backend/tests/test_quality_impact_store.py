@@ -0,0 +1,129 @@
+"""
+Tests for the persistent execution history behind quality impact estimates
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from app.quality import QualityImpactEstimator, QualityLevel, QualityPreset
+from app.quality.impact import ANY_INPUT, HistoricalDataStore, TaskExecution
+from app.templates.base import FunctionTemplate
+
+
+def _execution(duration: float, input_hash: str = "abc", **usage) -> TaskExecution:
+    return TaskExecution(
+        template_id="sdxl",
+        preset_id="high",
+        input_hash=input_hash,
+        duration=duration,
+        resource_usage=usage,
+        output_metrics={"output": f"{duration}.png"},
+        timestamp=datetime.now()
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoricalDataStore(tmp_path / "history.sqlite3", window_size=5)
+    yield store
+    store.close()
+
+
+class TestHistoricalDataStore:
+    """Test persistence and rolling aggregates"""
+
+    @pytest.mark.asyncio
+    async def test_aggregates_per_key_and_rollup(self, store):
+        for duration in [10.0, 20.0, 30.0]:
+            await store.add_execution(_execution(duration, vram_gb=duration / 10))
+        await store.add_execution(_execution(100.0, input_hash="other"))
+
+        exact = store.get_aggregate("sdxl", "high", "abc")
+        assert exact.count == 3
+        assert exact.mean_duration == 20.0
+        assert exact.p50_duration == 20.0
+        assert exact.p90_duration == 30.0
+        assert exact.resource_peaks == {"vram_gb": 3.0}
+
+        rollup = store.get_aggregate("sdxl", "high", ANY_INPUT)
+        assert rollup.count == 4
+        assert rollup.p90_duration == 100.0
+        assert store.get_aggregate("sdxl", "draft") is None
+
+    @pytest.mark.asyncio
+    async def test_window_is_bounded(self, store):
+        for duration in range(1, 21):
+            await store.add_execution(_execution(float(duration)))
+
+        aggregate = store.get_aggregate("sdxl", "high", "abc")
+        assert aggregate.count == 20
+        # Only the last five runs are in the window
+        assert aggregate.mean_duration == 18.0
+
+    @pytest.mark.asyncio
+    async def test_find_similar_prefers_exact_inputs(self, store):
+        await store.add_execution(_execution(1.0))
+        await store.add_execution(_execution(2.0, input_hash="other"))
+        await store.add_execution(_execution(3.0))
+
+        similar = await store.find_similar("sdxl", "high", "abc", limit=3)
+
+        assert [t.duration for t in similar] == [3.0, 1.0, 2.0]
+        assert similar[0].output_metrics == {"output": "3.0.png"}
+
+    @pytest.mark.asyncio
+    async def test_history_survives_reopen(self, tmp_path):
+        path = tmp_path / "history.sqlite3"
+        store = HistoricalDataStore(path)
+        for duration in [10.0, 12.0, 14.0]:
+            await store.add_execution(_execution(duration))
+        store.close()
+
+        reopened = HistoricalDataStore(path)
+        try:
+            assert reopened.get_aggregate("sdxl", "high", "abc").count == 3
+            assert len(await reopened.find_similar("sdxl", "high", "abc")) == 3
+        finally:
+            reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_old_executions_are_pruned(self, tmp_path):
+        store = HistoricalDataStore(tmp_path / "history.sqlite3", max_executions=50)
+        try:
+            for i in range(200):
+                await store.add_execution(_execution(float(i)))
+
+            assert len(await store.find_similar("sdxl", "high", "abc", limit=500)) <= 150
+            assert store.get_aggregate("sdxl", "high", "abc").count == 200
+        finally:
+            store.close()
+
+
+@pytest.mark.asyncio
+async def test_estimate_uses_recorded_history(store):
+    estimator = QualityImpactEstimator(historical_data=store)
+
+    template = Mock(spec=FunctionTemplate)
+    template.id = "sdxl"
+    template.category = "image"
+    template.resources = Mock(estimated_time_seconds=60.0, vram_gb=6.0,
+                              memory_gb=8.0, cpu_cores=4, disk_gb=10.0)
+    preset = QualityPreset(id="high", name="High", description="High",
+                           level=QualityLevel.HIGH, time_multiplier=2.5)
+    inputs = {"width": 512, "height": 512}
+
+    impact = await estimator.estimate_impact(template, preset, inputs)
+    assert impact.estimated_time.expected_seconds == 150.0
+    assert impact.time_confidence == 0.5
+
+    for duration in [40.0, 42.0, 44.0]:
+        await estimator.record_execution(template, preset, inputs, duration,
+                                          resource_usage={"vram_gb": 5.0, "memory_gb": 7.0})
+
+    impact = await estimator.estimate_impact(template, preset, inputs)
+    assert impact.estimated_time.expected_seconds == 42.0
+    assert impact.resource_requirements.vram_gb == pytest.approx(5.5)
+    assert impact.time_confidence > 0.5
+    assert len(impact.sample_outputs) == 3
@@ -10,6 +10,8 @@ Tests the complete quality preset functionality including:
 - Impact estimation
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
@@ -27,6 +29,7 @@ from app.quality import (
     PresetNotFoundError,
     PresetIncompatibleError
 )
+from app.quality.impact import HistoricalDataStore
 from app.quality.recommendation import UseCase, RecommendationContext
 from app.templates.base import FunctionTemplate
 
@@ -456,7 +459,7 @@ class TestQualityImpactEstimator:
     @pytest.mark.asyncio
     async def test_time_estimation(self):
         """Test execution time estimation"""
-        estimator = QualityImpactEstimator()
+        estimator = QualityImpactEstimator(HistoricalDataStore(":memory:"))
         
         template = Mock(spec=FunctionTemplate)
         template.resources.estimated_time_seconds = 60.0
@@ -481,7 +484,7 @@ class TestQualityImpactEstimator:
     @pytest.mark.asyncio
     async def test_resource_estimation(self):
         """Test resource requirement estimation"""
-        estimator = QualityImpactEstimator()
+        estimator = QualityImpactEstimator(HistoricalDataStore(":memory:"))
         
         template = Mock(spec=FunctionTemplate)
         template.resources.vram_gb = 6.0
@@ -512,7 +515,7 @@ class TestQualityImpactEstimator:
     @pytest.mark.asyncio
     async def test_quality_metrics_estimation(self):
         """Test quality metrics estimation"""
-        estimator = QualityImpactEstimator()
+        estimator = QualityImpactEstimator(HistoricalDataStore(":memory:"))
         
         template = Mock(spec=FunctionTemplate)
         template.category = "image"
@@ -659,6 +662,126 @@ class TestPresetStorage:
         assert imported.id != preset.id  # Should have new ID
         assert imported.created_by == "user2"
         assert imported.parameters == preset.parameters
+    
+    @pytest.mark.asyncio
+    async def test_usage_stats_are_buffered(self, tmp_path):
+        """Test usage bumps are written in batches"""
+        storage = PresetStorage(storage_path=tmp_path, usage_flush_interval=3600)
+        
+        preset = QualityPreset(
+            id="popular",
+            name="Popular",
+            description="Test",
+            level=QualityLevel.STANDARD,
+            is_custom=True
+        )
+        await storage.save_preset(preset, "user1")
+        
+        for count in range(1, 6):
+            assert await storage.update_usage_stats("popular", count)
+        assert not await storage.update_usage_stats("missing", 1)
+        
+        # Visible before the flush, but not yet written
+        storage.cache.clear()
+        assert (await storage.get_preset("popular", "user1")).usage_count == 5
+        row = storage._conn.execute("SELECT usage_count FROM presets").fetchone()
+        assert row["usage_count"] == 0
+        
+        storage.close()
+        reopened = PresetStorage(storage_path=tmp_path)
+        assert (await reopened.get_preset("popular", "user1")).usage_count == 5
+    
+    @pytest.mark.asyncio
+    async def test_buffered_usage_is_flushed_without_further_bumps(self, tmp_path):
+        """Test the last usage bump is written once the interval passes"""
+        storage = PresetStorage(storage_path=tmp_path, usage_flush_interval=0.05)
+        await storage.save_preset(QualityPreset(
+            id="quiet",
+            name="Quiet",
+            description="Test",
+            level=QualityLevel.STANDARD,
+            is_custom=True
+        ), "user1")
+        
+        assert await storage.update_usage_stats("quiet", 3)
+        await asyncio.sleep(0.2)
+        
+        row = storage._conn.execute("SELECT usage_count FROM presets").fetchone()
+        assert row["usage_count"] == 3
+        assert not storage._pending_usage
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_old_presets(self, tmp_path):
+        """Test only old, unused and unshared presets are removed"""
+        storage = PresetStorage(storage_path=tmp_path)
+        
+        for preset_id in ["unused", "used", "shared"]:
+            await storage.save_preset(QualityPreset(
+                id=preset_id,
+                name=preset_id,
+                description="Test",
+                level=QualityLevel.DRAFT,
+                is_custom=True,
+                created_by="user1"
+            ), "user1")
+        await storage.update_usage_stats("used", 1)
+        await storage.share_preset("shared", "user1")
+        
+        assert await storage.cleanup_old_presets(days=0) == 1
+        assert {p.id for p in await storage.get_user_presets("user1")} == {"used", "shared"}
+    
+    @pytest.mark.asyncio
+    async def test_preset_files_are_migrated(self, tmp_path):
+        """Test presets stored as JSON files move into the catalog"""
+        import json
+        
+        preset = QualityPreset(
+            id="legacy",
+            name="Legacy",
+            description="Test",
+            level=QualityLevel.HIGH,
+            is_custom=True,
+            created_by="user1",
+            created_at=datetime.now()
+        )
+        user_dir = tmp_path / "users" / "user1"
+        user_dir.mkdir(parents=True)
+        (tmp_path / "shared").mkdir()
+        for path in [user_dir / "legacy.json", tmp_path / "shared" / "legacy.json"]:
+            path.write_text(json.dumps({**preset.to_dict(), 'user_id': 'user1'}))
+        
+        storage = PresetStorage(storage_path=tmp_path)
+        
+        assert [p.id for p in await storage.get_user_presets("user1")] == ["legacy"]
+        assert [p.id for p in await storage.get_shared_presets()] == ["legacy"]
+        assert not list(tmp_path.glob("*/**/*.json"))
+    
+    @pytest.mark.asyncio
+    async def test_failed_preset_files_are_kept(self, tmp_path):
+        """Test files that fail to migrate stay on disk"""
+        import json
+        
+        preset = QualityPreset(
+            id="good",
+            name="Good",
+            description="Test",
+            level=QualityLevel.HIGH,
+            is_custom=True,
+            created_by="user1"
+        )
+        user_dir = tmp_path / "users" / "user1"
+        user_dir.mkdir(parents=True)
+        (tmp_path / "shared").mkdir()
+        (user_dir / "good.json").write_text(json.dumps(preset.to_dict()))
+        (user_dir / "broken.json").write_text("{not json")
+        (tmp_path / "shared" / "broken_shared.json").write_text("{not json")
+        
+        storage = PresetStorage(storage_path=tmp_path)
+        
+        assert [p.id for p in await storage.get_user_presets("user1")] == ["good"]
+        assert sorted(p.name for p in tmp_path.glob("*/**/*.json")) == [
+            "broken.json", "broken_shared.json"
+        ]
 
 
 class TestIntegration:
@@ -709,7 +832,7 @@ class TestIntegration:
         # Setup services
         engine = QualityRecommendationEngine()
         manager = QualityPresetManager()
-        estimator = QualityImpactEstimator()
+        estimator = QualityImpactEstimator(HistoricalDataStore(":memory:"))
         
         # Get recommendation
         context = RecommendationContext(
@@ -0,0 +1,147 @@
+"""
+Tests for the Redis state codec
+"""
+
+import json
+from datetime import datetime
+from enum import StrEnum
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from pydantic import BaseModel
+
+from app.redis_client import SynchronousRedisClient
+from app.redis_codec import (
+    FLAG_ZSTD,
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    RedisCodec,
+    binary_client,
+    zstandard,
+)
+
+
+class Phase(StrEnum):
+    RUNNING = 'running'
+
+
+class Stage(BaseModel):
+    name: str
+    progress: float
+
+
+class Snapshot(BaseModel):
+    task_id: str
+    phase: Phase
+    created_at: datetime
+    stages: dict[int, Stage]
+    logs: list[dict] = []
+
+
+def _snapshot(log_entries: int = 0) -> Snapshot:
+    return Snapshot(
+        task_id='task-1',
+        phase=Phase.RUNNING,
+        created_at=datetime(2024, 1, 1, 12, 0, 0),
+        stages={0: Stage(name='loading', progress=1.0), 1: Stage(name='generation', progress=0.4)},
+        logs=[{'level': 'info', 'message': f'step {i} done'} for i in range(log_entries)]
+    )
+
+
+@pytest.mark.parametrize('serializer', ['msgpack', 'orjson', 'json'])
+def test_values_round_trip(serializer):
+    codec = RedisCodec(serializer=serializer)
+    value = {'worker_id': 'w1', 'score': 0.5, 'checks': [{'name': 'cpu', 'ok': True}],
+             'timestamp': datetime(2024, 1, 1)}
+
+    encoded = codec.encode(value)
+
+    assert encoded[0] == (FORMAT_MSGPACK if serializer == 'msgpack' else FORMAT_JSON)
+    assert codec.decode(encoded) == {**value, 'timestamp': '2024-01-01T00:00:00'}
+
+
+@pytest.mark.parametrize('serializer', ['msgpack', 'orjson'])
+def test_models_round_trip(serializer):
+    codec = RedisCodec(serializer=serializer)
+    snapshot = _snapshot(log_entries=3)
+
+    assert codec.decode_model(Snapshot, codec.encode_model(snapshot)) == snapshot
+
+
+def test_legacy_text_values_are_still_readable():
+    codec = RedisCodec()
+    snapshot = _snapshot()
+
+    assert codec.decode(json.dumps({'a': 1})) == {'a': 1}
+    assert codec.decode(b'{"a": 1}') == {'a': 1}
+    assert codec.decode(b'12.5') == 12.5
+    assert codec.decode(b'processing') == 'processing'
+    assert codec.decode_model(Snapshot, snapshot.model_dump_json().encode()) == snapshot
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard not installed")
+def test_large_payloads_are_compressed_above_threshold():
+    codec = RedisCodec(compression='zstd', compress_threshold=256)
+
+    small = codec.encode_model(_snapshot())
+    large = codec.encode_model(_snapshot(log_entries=200))
+
+    assert not small[0] & FLAG_ZSTD
+    assert large[0] & FLAG_ZSTD
+    assert len(large) < len(RedisCodec().encode_model(_snapshot(log_entries=200))) / 4
+    assert codec.decode_model(Snapshot, large) == _snapshot(log_entries=200)
+    # A reader configured without compression can still decode it
+    assert RedisCodec().decode_model(Snapshot, large) == _snapshot(log_entries=200)
+
+
+def test_binary_client_drops_response_decoding():
+    text = redis.Redis.from_url('redis://localhost:6379/0', decode_responses=True)
+
+    binary = binary_client(text)
+
+    assert binary is not text
+    assert binary.connection_pool.connection_kwargs['decode_responses'] is False
+    assert binary_client(binary) is binary
+    mock = MagicMock()
+    assert binary_client(mock) is mock
+
+
+def test_sync_client_writes_versioned_keys_and_reads_legacy_fallback():
+    client = SynchronousRedisClient(codec=RedisCodec())
+    client.redis = MagicMock()
+    client.binary = MagicMock()
+
+    client.setex('worker:w1:health', 300, {'health_score': 0.9})
+
+    key, ttl, payload = client.binary.setex.call_args.args
+    assert (key, ttl) == ('worker:w1:health:v2', 300)
+    assert client.codec.decode(payload) == {'health_score': 0.9}
+
+    # Plain strings are opaque and stay under the original key, replacing any versioned value
+    pipe = client.binary.pipeline.return_value
+    pipe.execute.return_value = [True, 1]
+    assert client.setex('lock', 10, 'processing')
+    assert pipe.setex.call_args.args == ('lock', 10, 'processing')
+    pipe.delete.assert_called_once_with('lock:v2')
+
+    client.binary.mget.return_value = [None, b'{"health_score": 0.7}']
+    assert client.get('worker:w1:health') == {'health_score': 0.7}
+    client.binary.mget.assert_called_with('worker:w1:health:v2', 'worker:w1:health')
+
+    client.binary.mget.return_value = [payload, b'{"health_score": 0.7}']
+    assert client.get('worker:w1:health') == {'health_score': 0.9}
+
+
+def test_dual_write_keeps_legacy_json_for_old_readers():
+    client = SynchronousRedisClient(codec=RedisCodec())
+    client.binary = MagicMock()
+    pipe = client.binary.pipeline.return_value
+    pipe.execute.return_value = [True, True]
+
+    with patch('app.redis_client.settings.redis_codec_dual_write', True):
+        assert client.setex('queue_metrics:x', 60, {'depth': 3})
+
+    keys = [call.args[0] for call in pipe.setex.call_args_list]
+    assert keys == ['queue_metrics:x:v2', 'queue_metrics:x']
+    assert json.loads(pipe.setex.call_args_list[1].args[2]) == {'depth': 3}
@@ -12,9 +12,14 @@ from app.resources import (
     WorkerResources,
     ResourceConstraints,
     AllocationStrategy,
+    PlacementRequest,
+    PlacementStrategy,
+    PlacementSimulator,
+    SimulationWorkload,
     InsufficientResourcesError,
     ResourceConflictError
 )
+from app.resources.placement import capacity_tier
 
 
 @pytest.fixture
@@ -112,6 +117,27 @@ class TestResourceMapper:
         
         assert worker_id == "worker-cpu-2"
     
+    @pytest.mark.asyncio
+    async def test_compute_capability_compared_numerically(self, resource_mapper):
+        """Test a "10.0" GPU satisfies an "8.6" requirement"""
+        await resource_mapper.register_worker("worker-sm86", ResourceSpec(
+            cpu_cores=2.0, memory_gb=8.0, gpu_count=1, gpu_memory_gb=24.0,
+            gpu_compute_capability="8.6"
+        ))
+        await resource_mapper.register_worker("worker-sm100", ResourceSpec(
+            cpu_cores=2.0, memory_gb=8.0, gpu_count=1, gpu_memory_gb=80.0,
+            gpu_compute_capability="10.0"
+        ))
+        requirements = ResourceSpec(cpu_cores=1.0, memory_gb=2.0, gpu_count=1, gpu_memory_gb=8.0)
+        
+        worker_id = await resource_mapper.find_worker(
+            requirements, ResourceConstraints(require_compute_capability="9.0")
+        )
+        
+        assert worker_id == "worker-sm100"
+        spec = ResourceSpec(gpu_compute_capability="8.6") + ResourceSpec(gpu_compute_capability="10.0")
+        assert spec.gpu_compute_capability == "10.0"
+    
     @pytest.mark.asyncio
     async def test_allocation_strategies(self, mapper_with_workers, sample_resources):
         """Test different allocation strategies"""
@@ -258,6 +284,109 @@ class TestResourceMapper:
         assert worker.reserved.cpu_cores == 0.0
 
 
+class TestPlacement:
+    """Test indexed placement, batch placement and simulation"""
+    
+    def test_capacity_tiers_double(self):
+        """Test free capacity buckets are powers of two"""
+        assert capacity_tier(0.0) == 0
+        assert capacity_tier(0.25) == 1
+        assert capacity_tier(0.49) == 1
+        assert capacity_tier(1.0) == 3
+        assert capacity_tier(1.99) == 3
+        assert capacity_tier(2.0) == 4
+    
+    @pytest.mark.asyncio
+    async def test_index_follows_allocations(self, mapper_with_workers, sample_resources):
+        """Test full workers drop out of the candidate buckets and come back on release"""
+        mapper = mapper_with_workers
+        large = ResourceSpec(cpu_cores=4.0, memory_gb=8.0, disk_gb=0.0)
+        # Smaller workers sit in lower capacity tiers and are never visited
+        assert list(mapper._index.candidates(large)) == ["worker-cpu-2"]
+        
+        allocation = await mapper.allocate("worker-cpu-2", large, "task-1")
+        assert list(mapper._index.candidates(large)) == []
+        assert await mapper.find_worker(large) is None
+        
+        await mapper.release(allocation.id)
+        assert await mapper.find_worker(large) == "worker-cpu-2"
+        
+        # GPU requests only see workers with a free GPU
+        assert list(mapper._index.candidates(sample_resources["gpu"])) == ["worker-gpu-1"]
+    
+    @pytest.mark.asyncio
+    async def test_strategies_choose_expected_worker(self, mapper_with_workers, sample_resources):
+        """Test best fit packs tightly while spread picks the emptiest worker"""
+        mapper = mapper_with_workers
+        small = ResourceSpec(cpu_cores=1.0, memory_gb=2.0, disk_gb=0.0)
+        await mapper.allocate("worker-cpu-2", small, "busy")
+        
+        assert await mapper.find_worker(small, strategy=AllocationStrategy.BEST_FIT) == "worker-cpu-1"
+        assert await mapper.find_worker(small, strategy=AllocationStrategy.PACK) == "worker-cpu-2"
+        assert await mapper.find_worker(small, strategy=AllocationStrategy.SPREAD) == "worker-cpu-1"
+    
+    @pytest.mark.asyncio
+    async def test_custom_strategy(self, mapper_with_workers, sample_resources):
+        """Test strategies can be registered by name"""
+        class MemoryPerCore(PlacementStrategy):
+            def score(self, worker, available, requirements):
+                return available.memory_gb / available.cpu_cores
+        
+        mapper_with_workers.register_strategy("memory_per_core", MemoryPerCore())
+        
+        worker_id = await mapper_with_workers.find_worker(sample_resources["small"], strategy="memory_per_core")
+        assert worker_id == "worker-gpu-1"
+        
+        with pytest.raises(TypeError):
+            PlacementStrategy()
+    
+    @pytest.mark.asyncio
+    async def test_place_batch(self, mapper_with_workers):
+        """Test a burst is placed in one call, largest first, results in request order"""
+        mapper = mapper_with_workers
+        small = ResourceSpec(cpu_cores=1.0, memory_gb=2.0, disk_gb=0.0)
+        large = ResourceSpec(cpu_cores=4.0, memory_gb=8.0, disk_gb=0.0)
+        requests = [PlacementRequest(task_id=f"small-{i}", requirements=small) for i in range(3)]
+        requests.append(PlacementRequest(task_id="large", requirements=large))
+        requests.append(PlacementRequest(task_id="huge", requirements=ResourceSpec(cpu_cores=64.0)))
+        
+        allocations = await mapper.place_batch(requests, strategy=AllocationStrategy.BEST_FIT)
+        
+        assert [a.task_id if a else None for a in allocations] == ["small-0", "small-1", "small-2", "large", None]
+        # Placed before the small tasks could fragment the only worker that fits it
+        assert allocations[3].worker_id == "worker-cpu-2"
+        assert len(mapper.allocations) == 4
+        status = await mapper.get_resource_status()
+        assert status["summary"]["allocated"]["cpu_cores"] == 7.0
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_releases_expired_allocations(self, mapper_with_workers, sample_resources):
+        """Test expired allocations are released without re-entering the lock"""
+        allocation = await mapper_with_workers.allocate(
+            "worker-cpu-1", sample_resources["small"], "task-1", duration_estimate=1
+        )
+        allocation.expires_at = allocation.allocated_at
+        
+        await asyncio.wait_for(mapper_with_workers._cleanup_expired(), timeout=1.0)
+        
+        assert allocation.id not in mapper_with_workers.allocations
+        assert mapper_with_workers.workers["worker-cpu-1"].allocated.cpu_cores == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_simulation_is_deterministic(self):
+        """Test the same seed replays the same placements"""
+        workload = SimulationWorkload.generate(seed=3, workers=20, tasks=300, ticks=20)
+        simulator = PlacementSimulator(workload)
+        
+        first = await simulator.run(AllocationStrategy.BEST_FIT)
+        second = await simulator.run(AllocationStrategy.BEST_FIT)
+        
+        assert first.placed + first.rejected == 300
+        assert (first.placed, first.cpu_utilization, first.fragmentation) == \
+            (second.placed, second.cpu_utilization, second.fragmentation)
+        assert 0.0 <= first.to_dict()["fragmentation"] <= 1.0
+
+
 class TestResourceSpec:
     """Test ResourceSpec operations"""
     
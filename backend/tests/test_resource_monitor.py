@@ -0,0 +1,164 @@
+"""
+Tests for resource monitoring and prediction
+"""
+
+import os
+import random
+import statistics
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.resources import ResourceMapper, ResourceMetrics, ResourceMonitor, ResourceSpec
+from app.resources.monitor import CounterRates, HostSample, ProcessSample
+from app.resources.streaming import P2Quantile, TaskTypeProfile
+
+
+@pytest.fixture
+async def mapper():
+    mapper = ResourceMapper()
+    await mapper.register_worker("worker-1", ResourceSpec(cpu_cores=4.0, memory_gb=16.0, disk_gb=0.0))
+    await mapper.register_worker("worker-2", ResourceSpec(cpu_cores=4.0, memory_gb=16.0, disk_gb=0.0))
+    await mapper.allocate("worker-1", ResourceSpec(cpu_cores=3.0, memory_gb=8.0, disk_gb=0.0), "image_gen-1")
+    await mapper.allocate("worker-2", ResourceSpec(cpu_cores=1.0, memory_gb=2.0, disk_gb=0.0), "video_gen-1")
+    return mapper
+
+
+def _host(**kwargs) -> HostSample:
+    values = {'timestamp': datetime.now(), 'cpu_percent': 50.0, 'io_read_mbps': 40.0,
+              'io_write_mbps': 20.0, 'network_rx_mbps': 100.0, 'network_tx_mbps': 8.0}
+    values.update(kwargs)
+    return HostSample(**values)
+
+
+class TestStreamingStatistics:
+    """Test O(1) estimators behind predictions"""
+
+    def test_p2_quantile_tracks_exact_percentile(self):
+        rng = random.Random(5)
+        values = [rng.gauss(50, 10) for _ in range(5000)]
+        estimate = P2Quantile(0.9)
+        for value in values:
+            estimate.add(value)
+
+        exact = statistics.quantiles(values, n=10)[8]
+        assert estimate.value == pytest.approx(exact, rel=0.02)
+
+    def test_p2_quantile_with_few_samples(self):
+        estimate = P2Quantile(0.9)
+        assert estimate.value is None
+        for value in [3.0, 1.0, 2.0]:
+            estimate.add(value)
+        assert estimate.value == 3.0
+
+    def test_counter_rates(self):
+        rates = CounterRates()
+
+        assert rates.rates("disk", 10.0, (1000, 500)) is None
+        assert rates.rates("disk", 12.0, (3000, 500)) == (1000.0, 0.0)
+        # Same reading again: previous rates
+        assert rates.rates("disk", 12.0, (3000, 500)) == (1000.0, 0.0)
+        # Counter reset does not produce a negative rate
+        assert rates.rates("disk", 14.0, (100, 700)) == (0.0, 100.0)
+
+
+class TestResourceMonitor:
+    """Test collection and prediction"""
+
+    @pytest.mark.asyncio
+    async def test_one_host_sample_per_collection(self, mapper):
+        """Test every worker is attributed from a single host sample"""
+        monitor = ResourceMonitor(mapper)
+        monitor._psutil_available = True
+
+        with patch.object(monitor, "_sample_host", return_value=_host()) as sample_host:
+            metrics = await monitor.collect_once()
+
+        sample_host.assert_called_once()
+        # worker-1 holds 3 of the 4 allocated cores
+        assert metrics["worker-1"].io_read_mbps == pytest.approx(30.0)
+        assert metrics["worker-2"].network_rx_mbps == pytest.approx(25.0)
+        assert metrics["worker-1"].memory_used_gb == 8.0
+        assert len(monitor.task_history["image_generation"]) == 1
+        assert len(monitor.task_history["video_generation"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_process_attribution(self, mapper):
+        """Test a worker with a known PID reports its own process usage"""
+        monitor = ResourceMonitor(mapper)
+        monitor._psutil_available = True
+        host = _host(processes={
+            "worker-1": ProcessSample(cpu_percent=200.0, memory_gb=4.0, io_read_mbps=12.0, io_write_mbps=3.0)
+        })
+
+        with patch.object(monitor, "_sample_host", return_value=host):
+            metrics = await monitor.collect_once()
+
+        usage = metrics["worker-1"]
+        assert usage.cpu_percent == 50.0  # two of four cores
+        assert usage.memory_used_gb == 4.0
+        assert usage.memory_percent == 25.0
+        assert (usage.io_read_mbps, usage.io_write_mbps) == (12.0, 3.0)
+
+    def test_host_sample_of_own_process(self):
+        """Test real counters produce rates from the second sample on"""
+        monitor = ResourceMonitor(ResourceMapper())
+        if not monitor._psutil_available:
+            pytest.skip("psutil not installed")
+        monitor.register_worker_pid("self", os.getpid())
+
+        monitor._sample_host()
+        sample = monitor._sample_host()
+
+        assert sample.io_read_mbps >= 0.0
+        assert sample.network_rx_mbps >= 0.0
+        assert sample.processes["self"].memory_gb > 0
+        assert os.getpid() in monitor._processes
+
+        monitor.unregister_worker_pid("self")
+        assert os.getpid() not in monitor._processes
+
+    def test_task_history_is_bounded(self):
+        monitor = ResourceMonitor(ResourceMapper(), task_history_size=10)
+
+        for i in range(100):
+            monitor.record_task_usage("image_generation", ResourceMetrics(
+                timestamp=datetime.now(), worker_id="w", cpu_percent=float(i),
+                memory_used_gb=2.0, memory_percent=10.0
+            ))
+
+        assert len(monitor.task_history["image_generation"]) == 10
+        assert monitor.task_profiles["image_generation"].count == 100
+
+    @pytest.mark.asyncio
+    async def test_prediction_includes_io_needs(self):
+        monitor = ResourceMonitor(ResourceMapper())
+        for i in range(50):
+            monitor.record_task_usage("video_generation", ResourceMetrics(
+                timestamp=datetime.now(), worker_id="w", cpu_percent=50.0,
+                memory_used_gb=8.0, memory_percent=50.0, gpu_memory_used_gb=12.0,
+                io_read_mbps=float(i), io_write_mbps=5.0,
+                network_rx_mbps=40.0, network_tx_mbps=10.0
+            ))
+
+        prediction = await monitor.predict_resource_needs("video_generation")
+
+        assert prediction.based_on_samples == 50
+        assert prediction.predicted_resources.memory_gb == pytest.approx(8.0)
+        assert prediction.predicted_resources.gpu_count == 1
+        assert prediction.predicted_resources.network_bandwidth_mbps == pytest.approx(50.0)
+        assert prediction.predicted_io_read_mbps == pytest.approx(44.0, abs=2.0)
+        assert prediction.predicted_io_write_mbps == pytest.approx(5.0)
+        assert prediction.confidence == pytest.approx(1.0)
+        assert await monitor.predict_resource_needs("audio_generation") is None
+
+
+def test_profile_skips_missing_metrics():
+    profile = TaskTypeProfile()
+    profile.add(ResourceMetrics(timestamp=datetime.now(), worker_id="w", cpu_percent=10.0,
+                                memory_used_gb=1.0, memory_percent=5.0))
+
+    assert profile.count == 1
+    assert not profile.seen("gpu_memory_used_gb")
+    assert profile.quantile("gpu_memory_used_gb") == 0.0
@@ -0,0 +1,111 @@
+"""
+Tests for event-driven task completion waiting
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.task_completion import TaskCompletionRegistry, completion_key
+
+
+class FakePubSub:
+    """Pub/sub stand-in fed by the test"""
+
+    def __init__(self):
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.subscribe = AsyncMock()
+        self.unsubscribe = AsyncMock()
+        self.close = AsyncMock()
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+def _redis(stored=None):
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=stored)
+    redis.pipeline.return_value.execute = AsyncMock(return_value=[True, 1])
+    redis.pubsub.return_value = FakePubSub()
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_local_notify_resolves_all_waiters():
+    registry = TaskCompletionRegistry()
+
+    waiters = [asyncio.create_task(registry.wait('task-1', timeout=5)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert registry.get_stats()['waiters'] == 3
+
+    await registry.notify('task-1', 'completed', outputs={'image': 'out.png'})
+
+    results = await asyncio.gather(*waiters)
+    assert all(r['state'] == 'completed' for r in results)
+    assert results[0]['outputs'] == {'image': 'out.png'}
+    assert registry.get_stats()['pending_tasks'] == 0
+
+
+@pytest.mark.asyncio
+async def test_late_waiter_gets_recent_result_and_timeout_cleans_up():
+    registry = TaskCompletionRegistry()
+    await registry.notify('done', 'failed', error_message='boom')
+
+    assert (await registry.wait('done', timeout=1))['error_message'] == 'boom'
+
+    assert await registry.wait('never', timeout=0.01) is None
+    stats = registry.get_stats()
+    assert stats['pending_tasks'] == 0
+    assert stats['timeouts'] == 1
+
+
+@pytest.mark.asyncio
+async def test_notify_stores_and_publishes_in_one_pipeline():
+    registry = TaskCompletionRegistry(channel='completions')
+    redis = _redis()
+    await registry.start(redis)
+
+    await registry.notify('task-1', 'completed')
+
+    pipe = redis.pipeline.return_value
+    assert pipe.setex.call_args.args[0] == completion_key('task-1')
+    assert pipe.publish.call_args.args[0] == 'completions'
+    pipe.execute.assert_awaited_once()
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_waiter_is_resolved_by_notification_from_another_process():
+    registry = TaskCompletionRegistry()
+    redis = _redis()
+    await registry.start(redis)
+
+    waiter = asyncio.create_task(registry.wait('task-1', timeout=5))
+    await asyncio.sleep(0.01)
+    await redis.pubsub.return_value.messages.put({
+        'type': 'message',
+        'data': json.dumps({'task_id': 'task-1', 'state': 'completed'})
+    })
+
+    assert (await waiter)['state'] == 'completed'
+    # One read to check for an already stored result, nothing while waiting
+    assert redis.get.await_count == 1
+    assert registry.notifications_received == 1
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_stored_result_answers_waiter_that_arrives_after_completion():
+    stored = json.dumps({'task_id': 'task-1', 'state': 'completed', 'outputs': {'a': 1}})
+    registry = TaskCompletionRegistry()
+    await registry.start(_redis(stored=stored))
+
+    result = await registry.wait('task-1', timeout=5)
+
+    assert result['outputs'] == {'a': 1}
+    await registry.stop()
@@ -0,0 +1,178 @@
+"""
+Tests for the worker telemetry stream and its in-memory aggregate
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.worker.health_monitor import (
+    HealthStatus,
+    HeartbeatCheck,
+    ModelLoadingCheck,
+    ResourceCheck,
+    TaskPerformanceCheck,
+)
+from app.worker.telemetry import TELEMETRY_STREAM, TelemetryAggregator, TelemetryPublisher
+
+
+def _entry(worker_id, kind, timestamp=None, **fields):
+    sample = {'w': worker_id, 'k': kind, 't': f"{timestamp or time.time():.3f}"}
+    sample.update({k: str(v) for k, v in fields.items()})
+    return ('0-0', sample)
+
+
+@pytest.fixture
+def aggregator():
+    return TelemetryAggregator()
+
+
+class TestTelemetryPublisher:
+    """Worker-side sample publishing"""
+
+    def test_samples_are_appended_to_one_capped_stream(self):
+        redis = MagicMock()
+        publisher = TelemetryPublisher(redis_client=redis, worker_id='worker-1')
+
+        publisher.heartbeat()
+        publisher.heartbeat()  # resource sample throttled
+        publisher.task_completed('task-1', 'cpu.analysis', 1.5)
+
+        streams = {call.args[0] for call in redis.xadd.call_args_list}
+        kinds = [call.args[1]['k'] for call in redis.xadd.call_args_list]
+        assert streams == {TELEMETRY_STREAM}
+        assert kinds == ['hb', 'm', 'hb', 't']
+        assert all(call.kwargs['approximate'] for call in redis.xadd.call_args_list)
+
+    def test_model_report_is_repeated_with_resource_samples(self):
+        redis = MagicMock()
+        publisher = TelemetryPublisher(redis_client=redis, worker_id='worker-1',
+                                       metrics_interval=0.0)
+
+        publisher.models(['sdxl', 'flux'], [], 12.5)
+        publisher.heartbeat()
+
+        kinds = [call.args[1]['k'] for call in redis.xadd.call_args_list]
+        assert kinds == ['mdl', 'hb', 'm', 'mdl']
+        assert redis.xadd.call_args.args[1]['loaded'] == 'sdxl,flux'
+
+
+class TestTelemetryAggregator:
+    """Folding stream entries into rolling windows"""
+
+    def test_ingest_tracks_heartbeat_metrics_and_tasks(self, aggregator):
+        now = time.time()
+        aggregator.ingest([
+            _entry('worker-1', 'm', now - 5, cpu=42.0, mem=50.0, mem_mb=2048),
+            _entry('worker-1', 't', now - 4, task='a', q='cpu.analysis', s='started'),
+            _entry('worker-1', 't', now - 3, task='a', q='cpu.analysis', s='completed', d=2.0),
+            _entry('worker-1', 't', now - 2, task='b', q='cpu.analysis', s='started'),
+            _entry('worker-1', 't', now - 1, task='c', q='cpu.analysis', s='failed', e='OOM'),
+            _entry('worker-1', 'hb', now),
+        ])
+
+        assert aggregator.last_heartbeat('worker-1') == pytest.approx(now, abs=0.01)
+        assert aggregator.latest_metrics('worker-1')['cpu_percent'] == 42.0
+
+        stats = aggregator.task_stats('worker-1', window_seconds=60)
+        assert stats == {'completed': 1, 'failed': 1, 'in_progress': 1, 'total_duration': 2.0}
+
+        queue = aggregator.queue_stats('cpu.analysis', window_seconds=60)
+        assert queue['started'] == 2
+        assert queue['completed'] == 1
+        assert queue['failed'] == 1
+
+    def test_window_excludes_old_events(self, aggregator):
+        now = time.time()
+        aggregator.ingest([
+            _entry('worker-1', 't', now - 600, task='old', q='io.storage', s='completed', d=1),
+            _entry('worker-1', 't', now - 1, task='new', q='io.storage', s='completed', d=1),
+        ])
+
+        assert aggregator.task_stats('worker-1', window_seconds=300)['completed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_every_process_reads_the_whole_stream_and_prunes(self):
+        now = time.time()
+        aggregator = TelemetryAggregator(prune_interval=0.0, window_seconds=300)
+        aggregator.ingest([_entry('gone', 'hb', now - 600)])
+
+        redis = MagicMock()
+        redis.xread = AsyncMock(side_effect=[
+            [(TELEMETRY_STREAM, [('5-0', _entry('worker-1', 'hb', now)[1]),
+                                 ('6-0', _entry('worker-1', 'mdl', now, loaded='sdxl')[1])])],
+            asyncio.CancelledError(),
+        ])
+
+        await aggregator.start(redis)
+        await aggregator._task
+
+        first, second = redis.xread.call_args_list
+        start_id = first.args[0][TELEMETRY_STREAM]
+        assert int(start_id.split('-')[0]) == pytest.approx((now - 300) * 1000, abs=5000)
+        assert second.args[0] == {TELEMETRY_STREAM: '6-0'}
+        assert aggregator.worker_ids() == ['worker-1']
+        assert aggregator.model_status('worker-1')['loaded'] == ['sdxl']
+
+    def test_malformed_samples_are_skipped(self, aggregator):
+        aggregator.ingest([('0-0', {'k': 'm'}), _entry('worker-1', 'hb')])
+
+        assert aggregator.worker_ids() == ['worker-1']
+        assert aggregator.samples_ingested == 1
+
+
+class TestChecksReadAggregate:
+    """Health checks use the aggregate and no longer poll worker keys"""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_check(self, aggregator):
+        aggregator.ingest([_entry('worker-1', 'hb', time.time() - 45)])
+        check = HeartbeatCheck(telemetry=aggregator)
+        check.redis = MagicMock()
+
+        result = await check.execute('worker-1')
+
+        assert result.status == HealthStatus.WARNING
+        check.redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resource_check(self, aggregator):
+        aggregator.ingest([_entry('worker-1', 'm', cpu=97.0, mem=40.0, mem_mb=1024, disk=10.0)])
+        check = ResourceCheck(telemetry=aggregator)
+        check.redis = MagicMock()
+
+        result = await check.execute('worker-1')
+
+        assert result.status == HealthStatus.CRITICAL
+        assert result.metrics['cpu_percent'] == 97.0
+        check.redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_task_performance_check(self, aggregator):
+        now = time.time()
+        aggregator.ingest([
+            _entry('worker-1', 't', now, task=f't{i}', q='q', s='completed', d=1.0)
+            for i in range(5)
+        ])
+        check = TaskPerformanceCheck(telemetry=aggregator)
+        check.redis = MagicMock()
+
+        result = await check.execute('worker-1')
+
+        assert result.status == HealthStatus.HEALTHY
+        assert result.metrics['completed_tasks'] == 5
+        check.redis.zrangebyscore.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_model_loading_check(self, aggregator):
+        aggregator.ingest([_entry('worker-1', 'mdl', loaded='sdxl,flux', failed='', load_s=30)])
+        check = ModelLoadingCheck(telemetry=aggregator)
+        check.redis = MagicMock()
+
+        result = await check.execute('worker-1')
+
+        assert result.status == HealthStatus.HEALTHY
+        assert result.metrics['loaded_models'] == ['sdxl', 'flux']
+        check.redis.get.assert_not_called()